@@ -314,28 +314,31 @@ class Command(BaseCommand):
         
         # Campagnes
         self.stdout.write("   -> Campagnes...")
-        Campaign.objects.get_or_create(
-            name="Rénovation du temple",
-            defaults={
+        campagnes = [
+            ("Rénovation du temple", {
                 'description': "Collecte pour la rénovation de la toiture et la climatisation du temple de Cabassou.",
                 'goal_amount': Decimal('25000.00'),
-                'collected_amount': Decimal('12500.00'),
                 'start_date': today - timedelta(days=30),
                 'end_date': today + timedelta(days=60),
                 'is_active': True,
-            }
-        )
-        Campaign.objects.get_or_create(
-            name="Matériel Club Biblique",
-            defaults={
+            }, Decimal('12500.00')),
+            ("Matériel Club Biblique", {
                 'description': "Achat de nouveau matériel pédagogique pour les enfants du Club Biblique.",
                 'goal_amount': Decimal('3000.00'),
-                'collected_amount': Decimal('2650.00'),
                 'start_date': today - timedelta(days=15),
                 'end_date': today + timedelta(days=15),
                 'is_active': True,
-            }
-        )
+            }, Decimal('2650.00')),
+        ]
+        for name, defaults, collected in campagnes:
+            campaign, created = Campaign.objects.get_or_create(name=name, defaults=defaults)
+            if created:
+                # Le montant collecté découle des dons (cf. Donation.save)
+                Donation.objects.create(
+                    campaign=campaign,
+                    donor_name="Solde d'ouverture",
+                    amount=collected,
+                )
         
         # Chauffeur
         self.stdout.write("   -> Chauffeurs...")
@@ -3,8 +3,10 @@ from django.db import models
 from django.utils import timezone
 import secrets
 
+from apps.core.models import AuditSnapshotMixin
 
-class User(AbstractUser):
+
+class User(AuditSnapshotMixin, AbstractUser):
     """
     Modèle utilisateur personnalisé pour Gestion EEBC.
     Permet d'ajouter des rôles et des informations supplémentaires.
@@ -223,6 +223,9 @@ class Attendance(models.Model):
         LATE = 'late', 'En retard'
         EXCUSED = 'excused', 'Excusé'
     
+    # Statuts comptés comme une absence (notifiée ou non)
+    ABSENT_STATUSES = (Status.ABSENT, Status.ABSENT_NOTIFIED)
+    
     session = models.ForeignKey(
         Session,
         on_delete=models.CASCADE,
@@ -2,6 +2,9 @@
 Service de notifications pour le Club Biblique.
 Couche métier - logique spécifique au domaine.
 """
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
 from apps.core.infrastructure.email_backend import EmailBackend
 
 
@@ -56,14 +59,17 @@ class BibleClubNotificationService:
         return logs
     
     @staticmethod
-    def notify_recurring_absence(child, absences, threshold=3):
+    def notify_recurring_absence(child, absences, threshold=3, recipients=None, fail_silently=False):
         """
         Notifie les parents d'absences récurrentes.
         
         Args:
             child: Instance de Child
-            absences: QuerySet des absences récentes
+            absences: Absences récentes (QuerySet ou liste)
             threshold: Seuil d'absences pour déclencher la notification
+            recipients: Limiter aux adresses indiquées (nouvel essai après échec)
+            fail_silently: Poursuivre avec l'autre parent si un envoi échoue
+                (l'échec est consigné dans l'EmailLog)
             
         Returns:
             list[EmailLog]: Liste des logs d'emails envoyés
@@ -73,7 +79,7 @@ class BibleClubNotificationService:
         context = {
             'child': child,
             'absences': absences,
-            'absence_count': absences.count(),
+            'absence_count': len(absences),
             'threshold': threshold,
             'bible_class': child.bible_class,
         }
@@ -81,24 +87,26 @@ class BibleClubNotificationService:
         subject = f"⚠️ Absences récurrentes de {child.first_name} - Club Biblique"
         
         # Notifier le père
-        if child.father_email:
+        if child.father_email and (recipients is None or child.father_email in recipients):
             log = EmailBackend.send_email(
                 recipient_email=child.father_email,
                 recipient_name=child.father_name,
                 subject=subject,
                 template_name='bibleclub/emails/recurring_absence.html',
-                context={**context, 'parent_name': child.father_name}
+                context={**context, 'parent_name': child.father_name},
+                fail_silently=fail_silently
             )
             logs.append(log)
         
         # Notifier la mère
-        if child.mother_email:
+        if child.mother_email and (recipients is None or child.mother_email in recipients):
             log = EmailBackend.send_email(
                 recipient_email=child.mother_email,
                 recipient_name=child.mother_name,
                 subject=subject,
                 template_name='bibleclub/emails/recurring_absence.html',
-                context={**context, 'parent_name': child.mother_name}
+                context={**context, 'parent_name': child.mother_name},
+                fail_silently=fail_silently
             )
             logs.append(log)
         
@@ -149,6 +157,137 @@ class BibleClubNotificationService:
         
         return logs
     
+    @staticmethod
+    def find_recurring_absences(session, threshold=3, bible_class=None):
+        """
+        Détecte, pour toute une session, les enfants dont la série
+        d'absences consécutives atteint `threshold` à cette session.
+        
+        Une seule requête : les présences des enfants absents à la session
+        sont numérotées par enfant, de la plus récente à la plus ancienne
+        (ROW_NUMBER() OVER (PARTITION BY child ORDER BY session.date DESC)),
+        et seules les `threshold + 1` dernières sont lues. La présence
+        précédant la série permet de ne notifier qu'une fois par série,
+        lorsqu'elle atteint exactement le seuil ; une série dont une
+        absence est « Absent (notifié) » a déjà été signalée.
+        
+        Args:
+            session: Instance de Session
+            threshold: Nombre d'absences consécutives
+            bible_class: Limiter aux enfants d'une classe (optionnel)
+            
+        Returns:
+            dict: {Child: [Attendance, ...]} absences de la série, plus
+            récente en premier
+        """
+        from apps.bibleclub.models import Attendance
+        
+        absent_in_session = session.attendances.filter(status__in=Attendance.ABSENT_STATUSES)
+        if bible_class is not None:
+            absent_in_session = absent_in_session.filter(bible_class=bible_class)
+        
+        ranked = Attendance.objects.filter(
+            child_id__in=absent_in_session.values('child_id'),
+            session__date__lte=session.date,
+        ).annotate(
+            recent_rank=Window(
+                RowNumber(),
+                partition_by=[F('child_id')],
+                order_by=[F('session__date').desc(), F('session_id').desc()],
+            )
+        ).filter(
+            recent_rank__lte=threshold + 1
+        ).select_related('child__bible_class', 'session').order_by('child_id', 'recent_rank')
+        
+        history = {}
+        for attendance in ranked:
+            history.setdefault(attendance.child, []).append(attendance)
+        
+        streaks = {}
+        for child, attendances in history.items():
+            latest, previous = attendances[:threshold], attendances[threshold:]
+            if len(latest) < threshold:
+                continue
+            if not all(attendance.status in Attendance.ABSENT_STATUSES for attendance in latest):
+                continue
+            if previous and previous[0].status in Attendance.ABSENT_STATUSES:
+                # Série déjà signalée lorsqu'elle a atteint le seuil
+                continue
+            if any(attendance.status == Attendance.Status.ABSENT_NOTIFIED for attendance in latest):
+                # Série déjà signalée (appel ré-enregistré)
+                continue
+            streaks[child] = latest
+        return streaks
+    
+    @staticmethod
+    def notify_recurring_absences_for_session(session, threshold=3, bible_class=None):
+        """
+        Notifie les parents de tous les enfants en absence récurrente
+        à une session (cf. find_recurring_absences).
+        
+        La dernière absence de chaque série notifiée passe à « Absent
+        (notifié) » : la série n'est plus signalée si l'appel est
+        ré-enregistré. Un envoi en échec n'empêche pas les autres.
+        
+        Returns:
+            dict: {Child: [EmailLog, ...]}
+        """
+        from apps.bibleclub.models import Attendance
+        from apps.core.cache import invalidate_models
+        
+        results = {}
+        streaks = BibleClubNotificationService.find_recurring_absences(
+            session, threshold=threshold, bible_class=bible_class
+        )
+        for child, absences in streaks.items():
+            results[child] = BibleClubNotificationService.notify_recurring_absence(
+                child=child,
+                absences=absences,
+                threshold=threshold,
+                fail_silently=True
+            )
+            Attendance.objects.filter(pk=absences[0].pk).update(
+                status=Attendance.Status.ABSENT_NOTIFIED
+            )
+        if results:
+            invalidate_models(Attendance)
+        return results
+    
+    @staticmethod
+    def resend_recurring_absences(session, failed_recipients, threshold=3):
+        """
+        Renvoie les emails d'absences récurrentes en échec, aux seuls
+        destinataires concernés.
+        
+        Args:
+            session: Session de la série
+            failed_recipients: Liste de paires [child_id, email]
+            threshold: Nombre d'absences consécutives
+            
+        Returns:
+            dict: {Child: [EmailLog, ...]}
+        """
+        from apps.bibleclub.models import Attendance, Child
+        
+        emails_by_child = {}
+        for child_id, email in failed_recipients:
+            emails_by_child.setdefault(child_id, set()).add(email)
+        
+        results = {}
+        for child in Child.objects.filter(pk__in=emails_by_child).select_related('bible_class'):
+            absences = list(Attendance.objects.filter(
+                child=child,
+                session__date__lte=session.date,
+            ).select_related('session').order_by('-session__date', '-session_id')[:threshold])
+            results[child] = BibleClubNotificationService.notify_recurring_absence(
+                child=child,
+                absences=absences,
+                threshold=threshold,
+                recipients=emails_by_child[child.pk],
+                fail_silently=True
+            )
+        return results
+    
     @staticmethod
     def check_and_notify_recurring_absences(child, threshold=3):
         """
@@ -171,7 +310,7 @@ class BibleClubNotificationService:
         # Vérifier si toutes sont des absences
         if recent_attendances.count() >= threshold:
             all_absent = all(
-                att.status in ['absent', 'absent_notified'] 
+                att.status in Attendance.ABSENT_STATUSES
                 for att in recent_attendances
             )
             
@@ -1,13 +1,182 @@
 """
 Services optimisés pour le Club Biblique.
 """
+from datetime import datetime
 from django.db.models import Count, Q, Prefetch
-from django.core.cache import cache
-from django.conf import settings
-from apps.core.decorators import cache_result, handle_external_service_errors
+from django.utils import timezone
+from apps.core.cache import cached, invalidate_models
+from apps.core.decorators import handle_external_service_errors
 from .models import Child, Session, Attendance, BibleClass, Monitor
 
 
+class AttendanceWriter:
+    """
+    Écriture ensembliste des présences d'une session.
+    
+    Un appel coûte un nombre constant de requêtes, quel que soit le nombre
+    d'enfants : un bulk_create(ignore_conflicts=True) des lignes
+    manquantes, une lecture des lignes, un bulk_update des lignes
+    modifiées. Les statistiques de la session sont calculées dans la même
+    passe.
+    """
+    
+    UPDATE_FIELDS = ['status', 'check_in_time', 'notes', 'recorded_by', 'updated_at']
+    
+    @staticmethod
+    def ensure_attendances(session, bible_class, child_ids=None):
+        """
+        Crée les présences manquantes (statut absent) pour une classe.
+        
+        Args:
+            session: Instance de Session
+            bible_class: Instance de BibleClass
+            child_ids: IDs des enfants (enfants actifs de la classe par défaut)
+            
+        Returns:
+            QuerySet des présences de la classe pour la session
+        """
+        if child_ids is None:
+            child_ids = list(bible_class.children.filter(is_active=True).values_list('id', flat=True))
+        
+        existing = set(
+            session.attendances.filter(child_id__in=child_ids).values_list('child_id', flat=True)
+        )
+        missing = [
+            Attendance(
+                session=session,
+                child_id=child_id,
+                bible_class=bible_class,
+                status=Attendance.Status.ABSENT
+            )
+            for child_id in child_ids
+            if child_id not in existing
+        ]
+        if missing:
+            # ignore_conflicts : un appel concurrent a pu créer les mêmes lignes
+            Attendance.objects.bulk_create(missing, ignore_conflicts=True)
+            invalidate_models(Attendance)
+        
+        return session.attendances.filter(bible_class=bible_class).select_related('child')
+    
+    @staticmethod
+    def _parse_time(value):
+        if not value or not isinstance(value, str):
+            return value or None
+        return datetime.strptime(value, '%H:%M').time()
+    
+    @classmethod
+    def apply(cls, session, entries, bible_class=None, recorded_by=None):
+        """
+        Enregistre un lot de présences (création ou mise à jour).
+        
+        Args:
+            session: Instance de Session
+            entries: Liste de dictionnaires {child_id, status, check_in_time
+                (time ou 'HH:MM', inchangée si absente), notes}
+            bible_class: Classe de l'appel ; si absente, chaque présence créée
+                prend la classe de l'enfant
+            recorded_by: Utilisateur qui fait l'appel
+            
+        Returns:
+            dict: {
+                'created': présences créées,
+                'updated': présences modifiées,
+                'attendances': présences lues (classe + lot),
+                'stats': statistiques de l'appel (cf. compute_stats),
+            }
+        """
+        entries_by_child = {entry['child_id']: entry for entry in entries}
+        child_ids = list(entries_by_child)
+        
+        # 1. Lignes manquantes, en une requête
+        if bible_class is not None:
+            classes = {child_id: bible_class.pk for child_id in child_ids}
+        else:
+            classes = dict(
+                Child.objects.filter(id__in=child_ids).values_list('id', 'bible_class_id')
+            )
+        started = timezone.now()
+        Attendance.objects.bulk_create([
+            Attendance(
+                session=session,
+                child_id=child_id,
+                bible_class_id=class_id,
+                status=entries_by_child[child_id]['status'],
+                recorded_by=recorded_by
+            )
+            for child_id, class_id in classes.items()
+        ], ignore_conflicts=True)
+        
+        # 2. Lecture des lignes du lot (et de toute la classe pour les stats)
+        scope = Q(child_id__in=classes)
+        if bible_class is not None:
+            scope |= Q(bible_class=bible_class)
+        attendances = list(session.attendances.filter(scope).select_related('child'))
+        
+        # 3. Application des changements, en une requête
+        now = timezone.now()
+        changed = []
+        for attendance in attendances:
+            entry = entries_by_child.get(attendance.child_id)
+            if entry is None:
+                continue
+            
+            status = entry['status']
+            if status == Attendance.Status.ABSENT and attendance.status == Attendance.Status.ABSENT_NOTIFIED:
+                # Absence déjà signalée aux parents : le ré-enregistrement
+                # de l'appel ne réarme pas la notification
+                status = attendance.status
+            values = {
+                'status': status,
+                'notes': entry.get('notes', '') or '',
+            }
+            check_in_time = cls._parse_time(entry.get('check_in_time'))
+            if check_in_time is not None:
+                values['check_in_time'] = check_in_time
+            
+            if any(getattr(attendance, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(attendance, field, value)
+                attendance.recorded_by = recorded_by or attendance.recorded_by
+                attendance.updated_at = now
+                changed.append(attendance)
+        
+        if changed:
+            Attendance.objects.bulk_update(changed, cls.UPDATE_FIELDS)
+        # ignore_conflicts ne distingue pas les lignes insérées : elles
+        # portent la date de création de ce lot
+        created = sum(1 for attendance in attendances if attendance.created_at >= started)
+        if created or changed:
+            invalidate_models(Attendance)
+        
+        return {
+            'created': created,
+            'updated': len(changed),
+            'attendances': attendances,
+            'stats': cls.compute_stats(attendances, bible_class),
+        }
+    
+    @staticmethod
+    def compute_stats(attendances, bible_class=None):
+        """Statistiques d'un appel, calculées en mémoire."""
+        counts = {value: 0 for value, _label in Attendance.Status.choices}
+        for attendance in attendances:
+            counts[attendance.status] = counts.get(attendance.status, 0) + 1
+        
+        total = len(attendances)
+        present = counts[Attendance.Status.PRESENT] + counts[Attendance.Status.LATE]
+        return {
+            'bible_class': bible_class,
+            'total_count': total,
+            'present_count': counts[Attendance.Status.PRESENT],
+            'late_count': counts[Attendance.Status.LATE],
+            'absent_count': sum(counts[status] for status in Attendance.ABSENT_STATUSES),
+            'excused_count': counts[Attendance.Status.EXCUSED],
+            'by_status': counts,
+            'attendance_rate': round(present / total * 100, 1) if total else 0,
+        }
+
+
 class OptimizedBibleClubService:
     """
     Service optimisé pour les opérations du Club Biblique.
@@ -15,10 +184,14 @@ class OptimizedBibleClubService:
     """
     
     @staticmethod
-    @cache_result(timeout=300, key_prefix='bibleclub_stats')
+    @cached(
+        timeout=300, key_prefix='bibleclub_stats',
+        tags=['bibleclub.Child', 'bibleclub.BibleClass', 'bibleclub.Monitor']
+    )
     def get_dashboard_stats(user):
         """
         Récupère les statistiques du dashboard de manière optimisée.
+        En cache par utilisateur (clé sur user.pk).
         """
         from .permissions import is_club_admin, get_monitor_for_user
         
@@ -69,7 +242,7 @@ class OptimizedBibleClubService:
         queryset = queryset.annotate(
             total_sessions=Count('attendances'),
             present_count=Count('attendances', filter=Q(attendances__status='present')),
-            absent_count=Count('attendances', filter=Q(attendances__status__in=['absent', 'absent_notified']))
+            absent_count=Count('attendances', filter=Q(attendances__status__in=Attendance.ABSENT_STATUSES))
         )
         
         return queryset.filter(is_active=True)
@@ -87,15 +260,18 @@ class OptimizedBibleClubService:
         ).annotate(
             total_children=Count('attendances'),
             present_count=Count('attendances', filter=Q(attendances__status='present')),
-            absent_count=Count('attendances', filter=Q(attendances__status__in=['absent', 'absent_notified']))
+            absent_count=Count('attendances', filter=Q(attendances__status__in=Attendance.ABSENT_STATUSES))
         ).order_by('-date')[:limit]
     
     @staticmethod
-    @cache_result(timeout=600, key_prefix='attendance_chart')
+    @cached(
+        timeout=600, key_prefix='attendance_chart',
+        tags=['bibleclub.Session', 'bibleclub.Attendance']
+    )
     def get_attendance_chart_data(months=12):
         """
         Génère les données pour le graphique de présences.
-        Cache pendant 10 minutes.
+        Cache pendant 10 minutes, invalidé à chaque saisie de présence.
         """
         from datetime import date, timedelta
         from django.db.models import Count
@@ -147,56 +323,25 @@ class OptimizedBibleClubService:
             session: Instance de Session
             attendance_data: Liste de dictionnaires {child_id, status, notes}
         """
-        from apps.bibleclub.notifications import BibleClubNotificationService
+        from django.db import transaction as db_transaction
+        from apps.bibleclub.tasks import notify_recurring_absences
         
-        # Récupérer tous les enfants en une requête
-        child_ids = [data['child_id'] for data in attendance_data]
-        children = Child.objects.filter(id__in=child_ids).select_related('bible_class')
-        children_dict = {child.id: child for child in children}
-        
-        # Créer/mettre à jour les présences en lot
-        attendances_to_create = []
-        attendances_to_update = []
-        
-        for data in attendance_data:
-            child = children_dict.get(data['child_id'])
-            if not child:
-                continue
-            
-            attendance, created = Attendance.objects.get_or_create(
-                session=session,
-                child=child,
-                defaults={
-                    'bible_class': child.bible_class,
-                    'status': data['status'],
-                    'notes': data.get('notes', '')
-                }
-            )
-            
-            if not created and attendance.status != data['status']:
-                attendance.status = data['status']
-                attendance.notes = data.get('notes', '')
-                attendances_to_update.append(attendance)
-        
-        # Mise à jour en lot
-        if attendances_to_update:
-            Attendance.objects.bulk_update(attendances_to_update, ['status', 'notes'])
-        
-        # Notifications d'absence (traitement asynchrone recommandé)
-        absent_children = [
-            children_dict[data['child_id']] 
-            for data in attendance_data 
-            if data['status'] in ['absent', 'absent_notified'] and data['child_id'] in children_dict
-        ]
+        # Création / mise à jour ensembliste (cf. AttendanceWriter)
+        result = AttendanceWriter.apply(session, attendance_data)
+        absent_count = sum(1 for data in attendance_data if data['status'] in Attendance.ABSENT_STATUSES)
         
-        for child in absent_children:
-            # Vérifier les absences récurrentes
-            BibleClubNotificationService.check_and_notify_recurring_absences(child)
+        # Absences récurrentes : détection ensembliste et envoi en tâche Celery
+        # (seulement si l'appel a changé)
+        if absent_count and (result['created'] or result['updated']):
+            db_transaction.on_commit(lambda: notify_recurring_absences.delay(session.pk))
         
         return {
             'success': True,
             'processed': len(attendance_data),
-            'absent_notifications': len(absent_children)
+            'created': result['created'],
+            'updated': result['updated'],
+            'stats': result['stats'],
+            'absent_count': absent_count
         }
     
     @staticmethod
@@ -238,7 +383,7 @@ class OptimizedBibleClubService:
                 
                 if attendance.status == 'present':
                     children_stats[child_id]['present'] += 1
-                elif attendance.status in ['absent', 'absent_notified']:
+                elif attendance.status in Attendance.ABSENT_STATUSES:
                     children_stats[child_id]['absent'] += 1
                 elif attendance.status == 'late':
                     children_stats[child_id]['late'] += 1
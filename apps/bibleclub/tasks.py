@@ -0,0 +1,71 @@
+"""
+Tâches Celery pour le Club Biblique.
+"""
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def notify_recurring_absences(self, session_id, bible_class_id=None, threshold=None, failed_recipients=None):
+    """
+    Détecte les absences récurrentes d'une session (une requête fenêtrée)
+    et notifie les parents, hors de la requête HTTP de l'appel.
+    
+    Le seuil par défaut est RECURRING_ABSENCE_THRESHOLD. Les séries
+    notifiées sont marquées (Absent (notifié)) ; en cas d'échec d'envoi,
+    seuls les destinataires en échec sont retentés (failed_recipients :
+    paires [child_id, email]).
+    """
+    from apps.bibleclub.models import BibleClass, Session
+    from apps.bibleclub.notifications import BibleClubNotificationService
+    from apps.communication.models import EmailLog
+    
+    try:
+        session = Session.objects.get(pk=session_id)
+    except Session.DoesNotExist:
+        logger.error(f"Session {session_id} not found")
+        return
+    
+    if threshold is None:
+        threshold = getattr(settings, 'RECURRING_ABSENCE_THRESHOLD', 3)
+    
+    bible_class = None
+    if bible_class_id is not None:
+        bible_class = BibleClass.objects.filter(pk=bible_class_id).first()
+    
+    try:
+        if failed_recipients:
+            results = BibleClubNotificationService.resend_recurring_absences(
+                session, failed_recipients, threshold=threshold
+            )
+        else:
+            results = BibleClubNotificationService.notify_recurring_absences_for_session(
+                session, threshold=threshold, bible_class=bible_class
+            )
+    except Exception as exc:
+        logger.error(f"Recurring absence check failed for session {session_id}: {exc}")
+        raise self.retry(exc=exc, countdown=60)
+    
+    logs = [log for child_logs in results.values() for log in child_logs]
+    failed = [
+        [child.pk, log.recipient_email]
+        for child, child_logs in results.items()
+        for log in child_logs
+        if log.status == EmailLog.Status.FAILED
+    ]
+    logger.info(
+        f"Recurring absence notifications for session {session_id}: "
+        f"{len(logs) - len(failed)} emails sent, {len(failed)} failed"
+    )
+    
+    if failed:
+        raise self.retry(
+            args=(session_id, bible_class_id, threshold),
+            kwargs={'failed_recipients': failed},
+            countdown=60,
+        )
+    return len(logs)
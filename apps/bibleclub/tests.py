@@ -0,0 +1,175 @@
+"""Tests des présences du Club Biblique (écriture et absences récurrentes)."""
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.cache import get_tag_versions, model_tag
+
+from .models import AgeGroup, Attendance, BibleClass, Child, Session
+from .notifications import BibleClubNotificationService
+from .services import AttendanceWriter
+
+
+def make_child(bible_class, first_name):
+    return Child.objects.create(
+        first_name=first_name,
+        last_name='Test',
+        date_of_birth=date(2018, 5, 1),
+        gender='F',
+        bible_class=bible_class,
+        father_name='Parent',
+        father_phone='0600000000',
+    )
+
+
+class AttendanceWriterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        age_group = AgeGroup.objects.create(name='6-8 ans', min_age=6, max_age=8)
+        cls.small_class = BibleClass.objects.create(age_group=age_group)
+        cls.large_class = BibleClass.objects.create(age_group=age_group)
+        cls.small_children = [make_child(cls.small_class, f'Petit {i}') for i in range(2)]
+        cls.large_children = [make_child(cls.large_class, f'Grand {i}') for i in range(6)]
+        cls.session = Session.objects.create(date=date(2026, 10, 10))
+
+    def attendance_tag(self):
+        return get_tag_versions([model_tag(Attendance)])[model_tag(Attendance)]
+
+    def test_ensure_attendances_creates_missing_rows_and_invalidates_cache(self):
+        before = self.attendance_tag()
+        with self.captureOnCommitCallbacks(execute=True):
+            attendances = AttendanceWriter.ensure_attendances(self.session, self.small_class)
+
+        self.assertEqual(len(attendances), 2)
+        self.assertTrue(all(a.status == Attendance.Status.ABSENT for a in attendances))
+        self.assertNotEqual(self.attendance_tag(), before)
+
+    def test_ensure_attendances_without_insert_keeps_cache(self):
+        AttendanceWriter.ensure_attendances(self.session, self.small_class)
+        before = self.attendance_tag()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            AttendanceWriter.ensure_attendances(self.session, self.small_class)
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.attendance_tag(), before)
+
+    def test_apply_creates_and_updates_in_one_call(self):
+        first, second = self.small_children
+        Attendance.objects.create(
+            session=self.session, child=first, bible_class=self.small_class,
+            status=Attendance.Status.ABSENT,
+        )
+
+        result = AttendanceWriter.apply(self.session, [
+            {'child_id': first.pk, 'status': Attendance.Status.PRESENT, 'check_in_time': '09:30'},
+            {'child_id': second.pk, 'status': Attendance.Status.LATE},
+        ], bible_class=self.small_class)
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['updated'], 1)
+        statuses = dict(self.session.attendances.values_list('child_id', 'status'))
+        self.assertEqual(statuses, {
+            first.pk: Attendance.Status.PRESENT,
+            second.pk: Attendance.Status.LATE,
+        })
+        self.assertEqual(result['stats']['present_count'], 1)
+        self.assertEqual(result['stats']['late_count'], 1)
+
+    def test_apply_keeps_absent_notified_on_resave(self):
+        child = self.small_children[0]
+        Attendance.objects.create(
+            session=self.session, child=child, bible_class=self.small_class,
+            status=Attendance.Status.ABSENT_NOTIFIED,
+        )
+
+        result = AttendanceWriter.apply(
+            self.session,
+            [{'child_id': child.pk, 'status': Attendance.Status.ABSENT}],
+            bible_class=self.small_class,
+        )
+
+        self.assertEqual(result['updated'], 0)
+        self.assertEqual(
+            Attendance.objects.get(session=self.session, child=child).status,
+            Attendance.Status.ABSENT_NOTIFIED,
+        )
+        self.assertEqual(result['stats']['absent_count'], 1)
+
+    def _count_queries(self, func):
+        with CaptureQueriesContext(connection) as context:
+            func()
+        return len(context.captured_queries)
+
+    def test_query_count_does_not_depend_on_class_size(self):
+        def roll_call(bible_class, children):
+            return lambda: AttendanceWriter.apply(self.session, [
+                {'child_id': child.pk, 'status': Attendance.Status.PRESENT} for child in children
+            ], bible_class=bible_class)
+
+        self.assertEqual(
+            self._count_queries(lambda: AttendanceWriter.ensure_attendances(self.session, self.small_class)),
+            self._count_queries(lambda: AttendanceWriter.ensure_attendances(self.session, self.large_class)),
+        )
+        self.assertEqual(
+            self._count_queries(roll_call(self.small_class, self.small_children)),
+            self._count_queries(roll_call(self.large_class, self.large_children)),
+        )
+
+
+class RecurringAbsenceTests(TestCase):
+    """Séries d'absences consécutives (seuil : 3)."""
+
+    P = Attendance.Status.PRESENT
+    A = Attendance.Status.ABSENT
+    N = Attendance.Status.ABSENT_NOTIFIED
+
+    @classmethod
+    def setUpTestData(cls):
+        age_group = AgeGroup.objects.create(name='9-11 ans', min_age=9, max_age=11)
+        cls.bible_class = BibleClass.objects.create(age_group=age_group)
+        cls.sessions = [Session.objects.create(date=date(2026, 9, day)) for day in (6, 13, 20, 27)]
+        cls.session = cls.sessions[-1]
+
+    def child_with_history(self, name, statuses):
+        """Enfant dont les dernières sessions ont les statuts donnés (du plus ancien au plus récent)."""
+        child = make_child(self.bible_class, name)
+        for session, status in zip(self.sessions[-len(statuses):], statuses):
+            Attendance.objects.create(
+                session=session, child=child, bible_class=self.bible_class, status=status,
+            )
+        return child
+
+    def find(self):
+        return BibleClubNotificationService.find_recurring_absences(self.session, threshold=3)
+
+    def test_streak_reaching_threshold_is_reported(self):
+        after_presence = self.child_with_history('Après présence', [self.P, self.A, self.A, self.A])
+        first_rows = self.child_with_history('Premières séances', [self.A, self.A, self.A])
+
+        streaks = self.find()
+
+        self.assertEqual(set(streaks), {after_presence, first_rows})
+        self.assertEqual(
+            [attendance.session for attendance in streaks[after_presence]],
+            self.sessions[:0:-1],
+        )
+
+    def test_streak_beyond_threshold_is_not_reported_again(self):
+        self.child_with_history('Quatre absences', [self.A, self.A, self.A, self.A])
+        self.assertEqual(self.find(), {})
+
+    def test_streak_with_notified_absence_is_not_reported(self):
+        self.child_with_history('Déjà notifié', [self.P, self.A, self.A, self.N])
+        self.child_with_history('Notifié plus tôt', [self.P, self.N, self.A, self.A])
+        self.assertEqual(self.find(), {})
+
+    def test_fewer_rows_than_threshold(self):
+        self.child_with_history('Nouvel inscrit', [self.A, self.A])
+        self.assertEqual(self.find(), {})
+
+    def test_present_at_session_is_ignored(self):
+        self.child_with_history('Revenu', [self.A, self.A, self.A, self.P])
+        self.assertEqual(self.find(), {})
@@ -15,7 +15,7 @@ from .permissions import (
     get_user_classes, get_monitor_for_user, can_access_class,
     can_access_child, is_club_admin, is_club_staff
 )
-from .services import OptimizedBibleClubService
+from .services import AttendanceWriter, OptimizedBibleClubService
 
 
 @login_required
@@ -388,19 +388,8 @@ def take_attendance(request, session_pk, class_pk):
         messages.error(request, "Vous ne pouvez faire l'appel que pour votre classe.")
         return redirect('bibleclub:session_detail', pk=session_pk)
     
-    # Initialiser les présences pour la classe
-    children = bible_class.children.filter(is_active=True)
-    for child in children:
-        Attendance.objects.get_or_create(
-            session=session,
-            child=child,
-            defaults={
-                'bible_class': bible_class,
-                'status': 'absent'
-            }
-        )
-    
-    attendances = session.attendances.filter(bible_class=bible_class).select_related('child')
+    # Initialiser les présences pour la classe (une requête)
+    attendances = AttendanceWriter.ensure_attendances(session, bible_class)
     
     if request.method == 'POST':
         # Collecter les données de présence
@@ -418,42 +407,35 @@ def take_attendance(request, session_pk, class_pk):
                     'notes': notes
                 })
         
-        # Enregistrer les présences
-        for data in attendance_data:
-            try:
-                attendance = Attendance.objects.get(
-                    session=session,
-                    child_id=data['child_id']
-                )
-                attendance.status = data['status']
-                if data.get('check_in_time'):
-                    from datetime import datetime
-                    attendance.check_in_time = datetime.strptime(data['check_in_time'], '%H:%M').time()
-                attendance.notes = data.get('notes', '')
-                attendance.save()
-            except Attendance.DoesNotExist:
-                continue
+        # Enregistrer les présences (statistiques calculées dans la même passe)
+        try:
+            result = AttendanceWriter.apply(
+                session, attendance_data,
+                bible_class=bible_class,
+                recorded_by=request.user
+            )
+        except ValueError:
+            messages.error(request, "Heure d'arrivée invalide (format attendu HH:MM).")
+            return redirect('bibleclub:take_attendance', session_pk=session_pk, class_pk=class_pk)
         
-        result = {'success': True}
+        messages.success(request, f"Appel enregistré pour {bible_class}")
         
-        if result.success:
-            messages.success(request, f"Appel enregistré pour {bible_class}")
-        else:
-            messages.error(request, result.error)
+        # Absences récurrentes : détection et emails aux parents en tâche Celery
+        # (un appel ré-enregistré sans changement ne relance pas la détection)
+        if result['stats']['absent_count'] and (result['created'] or result['updated']):
+            from django.db import transaction as db_transaction
+            from .tasks import notify_recurring_absences
+            
+            db_transaction.on_commit(
+                lambda: notify_recurring_absences.delay(session.pk, bible_class.pk)
+            )
         
         # Envoyer notification de fin d'appel aux responsables
         try:
             from apps.communication.email_service import send_session_completed
             from apps.bibleclub.models import Monitor
             
-            # Calculer les stats simples
-            present_count = session.attendances.filter(bible_class=bible_class, status='present').count()
-            total_count = session.attendances.filter(bible_class=bible_class).count()
-            stats = {
-                'present_count': present_count,
-                'total_count': total_count,
-                'bible_class': bible_class
-            }
+            stats = result['stats']
             
             # Notifier les moniteurs principaux et admins
             lead_monitors = Monitor.objects.filter(
@@ -15,6 +15,7 @@ class CampaignAdmin(admin.ModelAdmin):
     list_filter = ['is_active', 'start_date', 'end_date']
     search_fields = ['name', 'description']
     date_hierarchy = 'start_date'
+    readonly_fields = ['collected_amount']
     inlines = [DonationInline]
     
     def progress_percentage(self, obj):
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.9 on 2026-10-16 21:40
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+OPENING_BALANCE_DONOR = "Solde d'ouverture"
+
+
+def create_opening_balances(apps, schema_editor):
+    """
+    Convertit les montants saisis à la main en dons « Solde d'ouverture ».
+
+    collected_amount devient la somme des dons (recalculée chaque jour par
+    reconcile_campaign_totals) : l'écart entre le montant saisi et les dons
+    enregistrés est conservé sous forme de don pour ne pas être perdu.
+    """
+    Campaign = apps.get_model('campaigns', 'Campaign')
+    Donation = apps.get_model('campaigns', 'Donation')
+
+    totals = dict(
+        Donation.objects.order_by().values('campaign').annotate(total=Sum('amount'))
+        .values_list('campaign', 'total')
+    )
+    Donation.objects.bulk_create([
+        Donation(
+            campaign_id=campaign_id,
+            donor_name=OPENING_BALANCE_DONOR,
+            amount=collected - totals.get(campaign_id, Decimal('0')),
+            notes="Montant collecté avant l'enregistrement des dons dans l'application",
+        )
+        for campaign_id, collected in Campaign.objects.values_list('pk', 'collected_amount')
+        if collected > totals.get(campaign_id, Decimal('0'))
+    ])
+
+
+def remove_opening_balances(apps, schema_editor):
+    Donation = apps.get_model('campaigns', 'Donation')
+    Donation.objects.filter(donor_name=OPENING_BALANCE_DONOR).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0002_add_site_field'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='campaign',
+            name='collected_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, help_text='Somme des dons enregistrés, tenue à jour automatiquement', max_digits=12, verbose_name='Montant collecté (€)'),
+        ),
+        migrations.RunPython(create_opening_balances, remove_opening_balances),
+    ]
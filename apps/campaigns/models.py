@@ -1,8 +1,81 @@
-from django.db import models
+from django.db import models, transaction as db_transaction
+from django.db.models import Case, DecimalField, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Floor, Greatest
 from django.conf import settings
 from decimal import Decimal
 
 
+# Seuils de l'alerte « campagne critique » (cf. Campaign.is_critical)
+CRITICAL_DAYS_REMAINING = 14
+CRITICAL_PROGRESS_PERCENTAGE = 50
+
+
+class CampaignQuerySet(models.QuerySet):
+    """QuerySet des campagnes : progression et criticité calculées en SQL."""
+    
+    def with_progress(self):
+        """
+        Annote la progression (progress_anno, en % entier) et la
+        criticité (is_critical_anno) de chaque campagne.
+        
+        Les propriétés progress_percentage et is_critical utilisent ces
+        annotations lorsqu'elles sont présentes.
+        """
+        from datetime import date, timedelta
+        
+        progress = Case(
+            When(
+                goal_amount__gt=0,
+                then=Cast(
+                    Floor(F('collected_amount') * 100 / F('goal_amount')),
+                    IntegerField()
+                ),
+            ),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        critical_deadline = date.today() + timedelta(days=CRITICAL_DAYS_REMAINING)
+        
+        return self.annotate(progress_anno=progress).annotate(
+            is_critical_anno=Case(
+                When(
+                    Q(is_active=True,
+                      collected_amount__lt=F('goal_amount'),
+                      end_date__lte=critical_deadline,
+                      progress_anno__lt=CRITICAL_PROGRESS_PERCENTAGE),
+                    then=Value(True),
+                ),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            )
+        )
+    
+    def critical(self):
+        """Campagnes critiques, échéance la plus proche en premier."""
+        return self.with_progress().filter(is_critical_anno=True).order_by('end_date', 'pk')
+    
+    def recompute_collected_amounts(self):
+        """
+        Recalcule collected_amount à partir des dons enregistrés.
+        
+        Une seule requête UPDATE, quel que soit le nombre de campagnes.
+        
+        Returns:
+            Nombre de campagnes recalculées
+        """
+        amount_field = DecimalField(max_digits=12, decimal_places=2)
+        donations_total = Donation.objects.filter(
+            campaign=OuterRef('pk')
+        ).order_by().values('campaign').annotate(total=Sum('amount')).values('total')
+        
+        return self.update(
+            collected_amount=Coalesce(
+                Subquery(donations_total, output_field=amount_field),
+                Value(Decimal('0.00'), output_field=amount_field),
+            )
+        )
+
+
 class Campaign(models.Model):
     """
     Modèle représentant une campagne de collecte de fonds.
@@ -30,7 +103,9 @@ class Campaign(models.Model):
         max_digits=12,
         decimal_places=2,
         default=0,
-        verbose_name="Montant collecté (€)"
+        editable=False,
+        verbose_name="Montant collecté (€)",
+        help_text="Somme des dons enregistrés, tenue à jour automatiquement"
     )
     
     start_date = models.DateField(verbose_name="Date de début")
@@ -50,6 +125,8 @@ class Campaign(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CampaignQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Campagne"
         verbose_name_plural = "Campagnes"
@@ -60,6 +137,9 @@ class Campaign(models.Model):
     
     @property
     def progress_percentage(self):
+        # Utiliser l'annotation si disponible (cf. CampaignQuerySet.with_progress)
+        if hasattr(self, 'progress_anno'):
+            return self.progress_anno
         if self.goal_amount > 0:
             return int((self.collected_amount / self.goal_amount) * 100)
         return 0
@@ -96,13 +176,17 @@ class Campaign(models.Model):
     def is_critical(self):
         """Campagne critique si deadline proche et objectif loin."""
         from datetime import date
-        today = date.today()
+        
+        # Utiliser l'annotation si disponible (cf. CampaignQuerySet.with_progress)
+        if hasattr(self, 'is_critical_anno'):
+            return self.is_critical_anno
         
         if not self.is_active or self.collected_amount >= self.goal_amount:
             return False
         
-        days_remaining = (self.end_date - today).days
-        return days_remaining <= 14 and self.progress_percentage < 50
+        days_remaining = (self.end_date - date.today()).days
+        return (days_remaining <= CRITICAL_DAYS_REMAINING
+                and self.progress_percentage < CRITICAL_PROGRESS_PERCENTAGE)
 
 
 class Donation(models.Model):
@@ -135,28 +219,76 @@ class Donation(models.Model):
         donor = "Anonyme" if self.is_anonymous else (self.donor_name or "Inconnu")
         return f"{donor} - {self.amount}€"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Mémorise la contribution du don telle que chargée depuis la base."""
+        instance = super().from_db(db, field_names, values)
+        if 'campaign_id' in instance.__dict__ and 'amount' in instance.__dict__:
+            instance._loaded_contribution = instance.contribution
+        return instance
+    
+    @property
+    def contribution(self):
+        """Contribution du don : tuple (campaign_id, montant) ou None."""
+        if self.campaign_id and self.amount is not None:
+            return (self.campaign_id, self.amount)
+        return None
+    
+    def _get_previous_contribution(self):
+        """Contribution enregistrée en base avant la modification en cours."""
+        if self._state.adding or self.pk is None:
+            return None
+        if hasattr(self, '_loaded_contribution'):
+            return self._loaded_contribution
+        
+        # Instance chargée partiellement (.only/.defer) : relire l'état en base
+        stored = Donation.objects.filter(pk=self.pk).values('campaign_id', 'amount').first()
+        if stored is None:
+            return None
+        return (stored['campaign_id'], stored['amount'])
+    
+    def _apply_contribution_change(self, previous, current):
+        """
+        Répercute la variation de contribution sur collected_amount.
+        
+        Les mises à jour utilisent des expressions F() : pas de lecture
+        préalable, pas de perte de mise à jour lorsque plusieurs dons sont
+        enregistrés en même temps. Le montant ne descend jamais sous zéro.
+        """
+        if previous == current:
+            return
+        
+        deltas = {}
+        if previous:
+            deltas[previous[0]] = deltas.get(previous[0], Decimal('0')) - previous[1]
+        if current:
+            deltas[current[0]] = deltas.get(current[0], Decimal('0')) + current[1]
+        
+        for campaign_id, delta in deltas.items():
+            if delta:
+                Campaign.objects.filter(pk=campaign_id).update(
+                    collected_amount=Greatest(
+                        F('collected_amount') + delta,
+                        Value(Decimal('0.00'), output_field=DecimalField(max_digits=12, decimal_places=2)),
+                    )
+                )
+        
+        # Rafraîchir la campagne en mémoire (utilisée ensuite par les vues)
+        campaign = self._state.fields_cache.get('campaign')
+        if campaign is not None and campaign.pk in deltas:
+            campaign.refresh_from_db(fields=['collected_amount'])
+    
     def save(self, *args, **kwargs):
-        is_new = self.pk is None
-        old_amount = None
-        if not is_new:
-            old_donation = Donation.objects.filter(pk=self.pk).first()
-            if old_donation:
-                old_amount = old_donation.amount
-        
-        super().save(*args, **kwargs)
-        
-        # Mise à jour incrémentale du montant collecté
-        if is_new:
-            self.campaign.collected_amount += self.amount
-        elif old_amount is not None:
-            self.campaign.collected_amount += (self.amount - old_amount)
-        self.campaign.save(update_fields=['collected_amount'])
+        with db_transaction.atomic():
+            previous = self._get_previous_contribution()
+            super().save(*args, **kwargs)
+            self._apply_contribution_change(previous, self.contribution)
+            self._loaded_contribution = self.contribution
     
     def delete(self, *args, **kwargs):
-        campaign = self.campaign
-        amount = self.amount
-        super().delete(*args, **kwargs)
-        # Décrémenter le montant collecté
-        campaign.collected_amount = max(campaign.collected_amount - amount, 0)
-        campaign.save(update_fields=['collected_amount'])
-
+        with db_transaction.atomic():
+            previous = self._get_previous_contribution()
+            result = super().delete(*args, **kwargs)
+            self._apply_contribution_change(previous, None)
+            self._loaded_contribution = None
+        return result
@@ -0,0 +1,33 @@
+"""
+Tâches Celery pour le module Campagnes.
+
+Ce module contient les tâches asynchrones pour :
+- La réconciliation des montants collectés avec les dons enregistrés
+"""
+
+import logging
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def reconcile_campaign_totals():
+    """
+    Recalcule le montant collecté de chaque campagne à partir des dons.
+    
+    Les totaux sont tenus à jour de façon incrémentale par Donation.save()
+    et Donation.delete() ; cette tâche corrige les écarts laissés par les
+    écritures qui les contournent (QuerySet.update(), suppressions en masse,
+    corrections manuelles en base). Les montants collectés hors application
+    sont saisis comme des dons (cf. migration 0003, « Solde d'ouverture »),
+    pas directement sur la campagne.
+    
+    Returns:
+        int: Nombre de campagnes recalculées
+    """
+    from .models import Campaign
+    
+    count = Campaign.objects.recompute_collected_amounts()
+    logger.info(f"Montants collectés recalculés pour {count} campagne(s)")
+    return count
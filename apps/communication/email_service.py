@@ -384,7 +384,7 @@ def check_and_notify_recurring_absences(child, threshold=3):
     
     # Vérifier si toutes sont des absences
     if recent_attendances.count() >= threshold:
-        all_absent = all(att.status in ['absent', 'absent_notified'] for att in recent_attendances)
+        all_absent = all(att.status in Attendance.ABSENT_STATUSES for att in recent_attendances)
         
         if all_absent:
             logs = []
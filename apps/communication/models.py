@@ -303,6 +303,36 @@ class EmailTemplate(models.Model):
             ).exclude(pk=self.pk).update(is_default=False)
         
         super().save(*args, **kwargs)
+        
+        from .template_cache import clear_compiled_email_templates
+        clear_compiled_email_templates()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        
+        from .template_cache import clear_compiled_email_templates
+        clear_compiled_email_templates()
+        return result
+    
+    @classmethod
+    def get_template_by_type(cls, template_type, template_name=None, queryset=None):
+        """
+        Retourne le template actif d'un type donné.
+        
+        Args:
+            template_type: Type de template (TemplateType)
+            template_name: Nom précis du template (optionnel)
+            queryset: QuerySet de base (ex: .only() pour une lecture légère)
+        
+        Returns:
+            Le template nommé s'il est demandé, sinon le template par défaut
+            du type, sinon le premier template actif ; None si aucun
+        """
+        queryset = cls.objects.all() if queryset is None else queryset
+        templates = queryset.filter(template_type=template_type, is_active=True)
+        if template_name:
+            templates = templates.filter(name=template_name)
+        return templates.order_by('-is_default', 'name').first()
 
 
 class SMSLog(models.Model):
@@ -8,13 +8,13 @@ import logging
 from typing import List, Dict, Optional, Union
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
-from django.template import Template, Context
 from django.utils.html import strip_tags
 from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
-from .models import EmailLog, EmailTemplate
+from .models import EmailLog
+from .template_cache import get_compiled_email_template
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -61,16 +61,11 @@ class EmailService:
         from_email = from_email or settings.DEFAULT_FROM_EMAIL
         
         # Enrichir le contexte avec des variables globales
-        context.update({
-            'site_name': 'EEBC - Église Évangélique Baptiste de Cabassou',
-            'site_url': getattr(settings, 'SITE_URL', 'https://eebc-guyane.org'),
-            'current_year': timezone.now().year,
-            'contact_email': getattr(settings, 'CONTACT_EMAIL', 'contact@eglise-ebc.org'),
-            'recipient_name': recipient_name,
-        })
+        context.update(EmailService._site_context())
+        context['recipient_name'] = recipient_name
         
-        # Récupérer le template depuis la base de données
-        email_template = EmailTemplate.get_template_by_type(template_type, template_name)
+        # Template compilé (cache par processus, cf. template_cache)
+        email_template = get_compiled_email_template(template_type, template_name)
         
         if not email_template:
             # Fallback sur template par défaut
@@ -85,32 +80,7 @@ class EmailService:
                 fail_silently=fail_silently
             )
         
-        # Générer le sujet avec le contexte
-        try:
-            subject_template = Template(email_template.subject)
-            subject = subject_template.render(Context(context))
-        except Exception as e:
-            logger.error(f"Erreur génération sujet template {email_template.name}: {e}")
-            subject = email_template.subject  # Utiliser le sujet brut
-        
-        # Générer le contenu HTML avec le contexte
-        try:
-            html_template = Template(email_template.html_content)
-            html_content = html_template.render(Context(context))
-        except Exception as e:
-            logger.error(f"Erreur génération HTML template {email_template.name}: {e}")
-            html_content = f"<p>Erreur de template: {e}</p>"
-        
-        # Générer le contenu texte
-        if email_template.text_content:
-            try:
-                text_template = Template(email_template.text_content)
-                text_content = text_template.render(Context(context))
-            except Exception as e:
-                logger.error(f"Erreur génération texte template {email_template.name}: {e}")
-                text_content = strip_tags(html_content)
-        else:
-            text_content = strip_tags(html_content)
+        subject, html_content, text_content = email_template.render(context)
         
         # Créer le log d'email
         email_log = EmailLog.objects.create(
@@ -118,7 +88,6 @@ class EmailService:
             recipient_name=recipient_name,
             subject=subject,
             body=text_content,
-            template_type=template_type,
             status=EmailLog.Status.PENDING
         )
         
@@ -183,26 +152,8 @@ class EmailService:
         Raises:
             Exception: Si fail_silently=False et erreur d'envoi
         """
-        context = context or {}
         from_email = from_email or settings.DEFAULT_FROM_EMAIL
-        
-        # Enrichir le contexte avec des variables globales
-        context.update({
-            'site_name': 'EEBC - Église Évangélique Baptiste de Cabassou',
-            'site_url': getattr(settings, 'SITE_URL', 'https://eebc-guyane.org'),
-            'current_year': timezone.now().year,
-            'contact_email': getattr(settings, 'CONTACT_EMAIL', 'contact@eglise-ebc.org'),
-        })
-        
-        # Générer le contenu HTML et texte
-        try:
-            html_content = render_to_string(template_name, context)
-            text_content = strip_tags(html_content)
-        except Exception as e:
-            logger.error(f"Erreur génération template {template_name}: {e}")
-            # Fallback sur message texte simple
-            text_content = f"Sujet: {subject}\n\nMessage depuis EEBC"
-            html_content = f"<p>{text_content}</p>"
+        html_content, text_content = EmailService._render_template(template_name, subject, context)
         
         # Créer le log d'email
         email_log = EmailLog.objects.create(
@@ -246,6 +197,41 @@ class EmailService:
         
         return email_log
     
+    @staticmethod
+    def _site_context() -> Dict:
+        """Variables globales communes à tous les emails."""
+        return {
+            'site_name': 'EEBC - Église Évangélique Baptiste de Cabassou',
+            'site_url': getattr(settings, 'SITE_URL', 'https://eebc-guyane.org'),
+            'current_year': timezone.now().year,
+            'contact_email': getattr(settings, 'CONTACT_EMAIL', 'contact@eglise-ebc.org'),
+        }
+    
+    @staticmethod
+    def _render_template(template_name: str, subject: str, context: Optional[Dict] = None) -> tuple:
+        """
+        Rend un template d'email avec les variables globales du site.
+        
+        Returns:
+            tuple (html_content, text_content)
+        """
+        context = context or {}
+        
+        # Enrichir le contexte avec des variables globales
+        context.update(EmailService._site_context())
+        
+        # Générer le contenu HTML et texte
+        try:
+            html_content = render_to_string(template_name, context)
+            text_content = strip_tags(html_content)
+        except Exception as e:
+            logger.error(f"Erreur génération template {template_name}: {e}")
+            # Fallback sur message texte simple
+            text_content = f"Sujet: {subject}\n\nMessage depuis EEBC"
+            html_content = f"<p>{text_content}</p>"
+        
+        return html_content, text_content
+    
     @staticmethod
     def send_bulk_emails(
         recipients: List[Union[str, tuple]],
@@ -257,6 +243,9 @@ class EmailService:
         """
         Envoie un email à plusieurs destinataires.
         
+        Le template est rendu une seule fois ; les messages partent par lots,
+        une connexion SMTP par lot (cf. BulkEmailSender).
+        
         Args:
             recipients: Liste d'emails ou tuples (email, nom)
             subject: Sujet de l'email
@@ -267,30 +256,80 @@ class EmailService:
         Returns:
             List[EmailLog]: Liste des logs créés
         """
-        logs = []
+        from apps.core.infrastructure.bulk_email import BulkEmailSender
         
-        for recipient in recipients:
-            if isinstance(recipient, tuple):
-                email, name = recipient
-            else:
-                email, name = recipient, ''
+        html_content, text_content = EmailService._render_template(
+            template_name, subject, dict(context or {})
+        )
+        
+        return BulkEmailSender.send(
+            recipients,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content,
+            fail_silently=fail_silently
+        )
+
+
+    @staticmethod
+    def send_bulk_emails_with_template(
+        recipients: List[Union[str, tuple]],
+        template_type: str,
+        context: Optional[Dict] = None,
+        template_name: Optional[str] = None,
+        from_email: Optional[str] = None,
+        fail_silently: bool = True
+    ) -> List[EmailLog]:
+        """
+        Envoie un template configurable à plusieurs destinataires.
+        
+        Le template est lu et compilé une fois, puis rendu pour chaque
+        destinataire (recipient_name personnalisé) et envoyé par lots
+        (cf. BulkEmailSender.send_rendered).
+        
+        Args:
+            recipients: Liste d'emails ou tuples (email, nom)
+            template_type: Type de template (EmailTemplate.TemplateType)
+            context: Variables communes pour le template
+            template_name: Nom spécifique du template (optionnel)
+            from_email: Email expéditeur (utilise DEFAULT_FROM_EMAIL si non fourni)
+            fail_silently: Ne pas lever d'exception en cas d'erreur
             
-            try:
-                log = EmailService.send_email(
-                    recipient_email=email,
-                    subject=subject,
-                    template_name=template_name,
-                    context=context,
-                    recipient_name=name,
-                    fail_silently=fail_silently
-                )
-                logs.append(log)
-            except Exception as e:
-                logger.error(f"Erreur envoi email bulk à {email}: {e}")
-                if not fail_silently:
-                    raise
+        Returns:
+            List[EmailLog]: Liste des logs créés
+        """
+        from apps.core.infrastructure.bulk_email import BulkEmailSender
         
-        return logs
+        recipients = BulkEmailSender.normalize_recipients(recipients)
+        base_context = dict(context or {})
+        base_context.update(EmailService._site_context())
+        
+        email_template = get_compiled_email_template(template_type, template_name)
+        if not email_template:
+            logger.warning(f"Aucun template trouvé pour {template_type}, utilisation du fallback")
+            return EmailService.send_bulk_emails(
+                recipients,
+                subject="Notification EEBC",
+                template_name='emails/default.html',
+                context=base_context,
+                fail_silently=fail_silently
+            )
+        
+        contexts = (
+            {**base_context, 'recipient_name': name}
+            for _email, name in recipients
+        )
+        rendered = (
+            (email, name, *content)
+            for (email, name), content in zip(recipients, email_template.render_many(contexts))
+        )
+        
+        return BulkEmailSender.send_rendered(
+            rendered,
+            from_email=from_email,
+            fail_silently=fail_silently,
+            label=email_template.name
+        )
 
 
 class NotificationService:
@@ -341,64 +380,12 @@ class NotificationService:
             'is_cancelled': notification_type == 'cancelled',
         }
         
-        # Envoyer à tous les destinataires
-        logs = []
-        for recipient in recipients:
-            if isinstance(recipient, dict):
-                email = recipient.get('email')
-                name = recipient.get('name', '')
-            elif hasattr(recipient, 'email'):
-                email = recipient.email
-                name = getattr(recipient, 'get_full_name', lambda: '')() or str(recipient)
-            else:
-                email = str(recipient)
-                name = ''
-            
-            if email:
-                try:
-                    # Utiliser le service d'email avec template configurable
-                    log = EmailService.send_email_with_template(
-                        recipient_email=email,
-                        template_type=template_type,
-                        context=context,
-                        recipient_name=name,
-                        fail_silently=True
-                    )
-                    logs.append(log)
-                except Exception as e:
-                    logger.error(f"Erreur notification événement à {email}: {e}")
-        
-        logger.info(f"Notification événement '{event.title}' envoyée à {len(logs)} destinataires")
-        return logs
-        logs = []
-        for recipient in recipients:
-            if isinstance(recipient, dict):
-                email = recipient.get('email')
-                name = recipient.get('name', '')
-            elif hasattr(recipient, 'email'):
-                email = recipient.email
-                name = getattr(recipient, 'get_full_name', lambda: '')() or str(recipient)
-            else:
-                email = str(recipient)
-                name = ''
-            
-            if email:
-                try:
-                    # Ajouter le nom du destinataire au contexte
-                    recipient_context = context.copy()
-                    recipient_context['recipient_name'] = name
-                    
-                    log = EmailService.send_email(
-                        recipient_email=email,
-                        subject=subject,
-                        template_name=template_name,
-                        context=recipient_context,
-                        recipient_name=name,
-                        fail_silently=True
-                    )
-                    logs.append(log)
-                except Exception as e:
-                    logger.error(f"Erreur notification événement à {email}: {e}")
+        # Envoyer à tous les destinataires (template compilé une fois, envoi par lots)
+        logs = EmailService.send_bulk_emails_with_template(
+            NotificationService._recipient_tuples(recipients),
+            template_type=template_type,
+            context=context
+        )
         
         logger.info(f"Notification événement '{event.title}' envoyée à {len(logs)} destinataires")
         return logs
@@ -432,7 +419,22 @@ class NotificationService:
         }
         
         # Envoyer les rappels en utilisant le template configurable
-        logs = []
+        logs = EmailService.send_bulk_emails_with_template(
+            NotificationService._recipient_tuples(recipients),
+            template_type='event_reminder',
+            context=context
+        )
+        
+        logger.info(f"Rappel événement '{event.title}' envoyé à {len(logs)} destinataires")
+        return logs
+    
+    @staticmethod
+    def _recipient_tuples(recipients) -> List[tuple]:
+        """
+        Convertit des destinataires (dicts, objets avec email ou chaînes)
+        en tuples (email, nom), sans les destinataires sans email.
+        """
+        tuples = []
         for recipient in recipients:
             if isinstance(recipient, dict):
                 email = recipient.get('email')
@@ -445,26 +447,15 @@ class NotificationService:
                 name = ''
             
             if email:
-                try:
-                    # Utiliser le service d'email avec template configurable
-                    log = EmailService.send_email_with_template(
-                        recipient_email=email,
-                        template_type='event_reminder',
-                        context=context,
-                        recipient_name=name,
-                        fail_silently=True
-                    )
-                    logs.append(log)
-                except Exception as e:
-                    logger.error(f"Erreur rappel événement à {email}: {e}")
-        
-        logger.info(f"Rappel événement '{event.title}' envoyé à {len(logs)} destinataires")
-        return logs
+                tuples.append((email, name))
+        return tuples
     
     @staticmethod
     def _get_event_recipients(event) -> List[Dict]:
         """
-        Récupère la liste des destinataires pour un événement.
+        Récupère la liste des destinataires pour un événement : les
+        inscrits, à défaut les membres actifs, à défaut les utilisateurs
+        actifs (emails résolus en SQL, désabonnés exclus), avec leur nom.
         
         Args:
             event: Instance d'Event
@@ -472,48 +463,15 @@ class NotificationService:
         Returns:
             List[Dict]: Liste de dictionnaires {'email': str, 'name': str}
         """
-        recipients = []
-        
-        # Si l'événement a des inscrits
-        if hasattr(event, 'registrations'):
-            for registration in event.registrations.filter(is_active=True):
-                if hasattr(registration, 'member') and registration.member.email:
-                    recipients.append({
-                        'email': registration.member.email,
-                        'name': registration.member.get_full_name()
-                    })
-        
-        # Si pas d'inscrits, utiliser tous les membres actifs avec email
-        if not recipients:
-            try:
-                from apps.members.models import Member
-                members = Member.objects.filter(
-                    is_active=True,
-                    email__isnull=False
-                ).exclude(email='')
-                
-                for member in members:
-                    recipients.append({
-                        'email': member.email,
-                        'name': member.get_full_name()
-                    })
-            except Exception as e:
-                logger.warning(f"Impossible de récupérer les membres: {e}")
-        
-        # Fallback: utiliser tous les utilisateurs actifs
-        if not recipients:
-            users = User.objects.filter(
-                is_active=True,
-                email__isnull=False
-            ).exclude(email='')
-            
-            for user in users:
-                recipients.append({
-                    'email': user.email,
-                    'name': user.get_full_name()
-                })
+        from apps.events.audience import AudienceResolver
         
-        return recipients
+        resolver = AudienceResolver()
+        emails = (
+            resolver.registrants(event)
+            or resolver.active_members()
+            or resolver.active_users()
+        )
+        return resolver.with_names(emails)
     
     @staticmethod
     def send_transport_confirmation(
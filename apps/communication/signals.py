@@ -138,21 +138,17 @@ def get_members_needing_visit():
     À appeler depuis une tâche Celery hebdomadaire.
     """
     from apps.members.models import Member
-    from datetime import date, timedelta
     
-    six_months_ago = date.today() - timedelta(days=180)
-    
-    members_needing_visit = []
-    
-    for member in Member.objects.filter(status='actif'):
-        last_visit = member.last_visit_date
-        
-        if last_visit is None or last_visit < six_months_ago:
-            members_needing_visit.append({
-                'member': member,
-                'last_visit': last_visit,
-                'days_since': member.days_since_last_visit
-            })
+    members_needing_visit = [
+        {
+            'member': member,
+            'last_visit': member.last_visit_date,
+            'days_since': member.days_since_last_visit
+        }
+        for member in Member.objects.filter(
+            status=Member.Status.ACTIF
+        ).needing_visit_ranked(threshold_days=180)
+    ]
     
     return members_needing_visit
 
@@ -22,35 +22,45 @@ def send_event_reminders():
     Envoie les rappels d'événements.
     
     Exécuté quotidiennement pour envoyer les rappels
-    selon le paramètre notify_before de chaque événement.
+    selon le paramètre notify_before de chaque événement. Chaque occurrence
+    d'un événement récurrent reçoit son propre rappel.
     """
-    from apps.events.models import Event
+    from django.db.models import Max
+    from apps.events.audience import AudienceResolver
+    from apps.events.models import Event, EventOccurrence
     from .notification_service import notification_service
     
     today = date.today()
+    resolver = AudienceResolver()
+    max_notify_before = Event.objects.aggregate(value=Max('notify_before'))['value'] or 0
     
-    # Trouver les événements à notifier
-    events = Event.objects.filter(
-        is_cancelled=False,
+    # Trouver les occurrences à notifier (une requête par plage de dates)
+    occurrences = EventOccurrence.objects.active().between(
+        today, today + timedelta(days=max_notify_before)
+    ).filter(
         notification_sent=False,
-        start_date__gte=today,
     ).exclude(
-        notification_scope='none'
-    )
+        event__notification_scope='none'
+    ).select_related('event')
     
     sent_count = 0
     
-    for event in events:
+    for occurrence in occurrences:
+        event = occurrence.event
         # Vérifier si c'est le bon jour pour notifier
-        notify_date = event.start_date - timedelta(days=event.notify_before)
+        notify_date = occurrence.start_date - timedelta(days=event.notify_before)
         
         if notify_date <= today:
             try:
-                notification_service.send_event_reminder(event)
-                event.notification_sent = True
-                event.save(update_fields=['notification_sent'])
+                notification_service.send_event_reminder(
+                    occurrence.as_event(),
+                    recipients=event.get_notification_recipients(resolver),
+                )
+                occurrence.notification_sent = True
+                occurrence.save(update_fields=['notification_sent'])
+                Event.objects.filter(pk=event.pk).update(notification_sent=True)
                 sent_count += 1
-                logger.info(f"Reminder sent for event: {event.title}")
+                logger.info(f"Reminder sent for event: {event.title} ({occurrence.start_date})")
             except Exception as e:
                 logger.error(f"Failed to send reminder for event {event.id}: {e}")
     
@@ -130,80 +140,50 @@ def generate_annual_tax_receipts(year=None):
     Génère les reçus fiscaux annuels.
     
     Exécuté en janvier pour générer les reçus
-    de l'année précédente.
+    de l'année précédente (cf. TaxReceiptService).
     """
-    from apps.finance.models import FinancialTransaction, TaxReceipt
-    from apps.members.models import Member
-    from django.db.models import Sum
+    from apps.finance.services import TaxReceiptService
     
     if year is None:
         year = date.today().year - 1
     
-    # Trouver tous les membres avec des dons validés cette année
-    members_with_donations = Member.objects.filter(
-        transactions__transaction_date__year=year,
-        transactions__status='valide',
-        transactions__transaction_type__in=['don', 'dime', 'offrande'],
-    ).distinct()
-    
-    created_count = 0
-    
-    for member in members_with_donations:
-        # Calculer le total des dons
-        transactions = FinancialTransaction.objects.filter(
-            member=member,
-            transaction_date__year=year,
-            status='valide',
-            transaction_type__in=['don', 'dime', 'offrande'],
-        )
-        
-        total = transactions.aggregate(total=Sum('amount'))['total']
-        
-        if total and total > 0:
-            # Créer le reçu fiscal
-            receipt = TaxReceipt.objects.create(
-                fiscal_year=year,
-                donor_name=member.full_name,
-                donor_address=f"{member.address}\n{member.postal_code} {member.city}",
-                donor_email=member.email,
-                member=member,
-                total_amount=total,
-                status='draft',
-            )
-            
-            # Associer les transactions
-            receipt.transactions.set(transactions)
-            
-            created_count += 1
-            logger.info(f"Tax receipt created for {member.full_name}: {total}€")
-    
-    return f"Created {created_count} tax receipts for year {year}"
+    result = TaxReceiptService.generate_annual_receipts(year)
+    logger.info(
+        f"{result.data['created']} tax receipts created for {year}: {result.data['total_amount']}€"
+    )
+    
+    return f"Created {result.data['created']} tax receipts for year {year}"
 
 
 @shared_task
 def send_donation_receipts_batch():
     """
     Envoie les reçus fiscaux en attente par email.
+    
+    Les reçus sont répartis en lots (TAX_RECEIPT_BATCH_SIZE) traités en
+    parallèle par les workers : chaque lot génère ses PDF puis envoie
+    ses emails.
     """
+    from celery import group
+    from django.conf import settings
     from apps.finance.models import TaxReceipt
+    from apps.finance.tasks import send_tax_receipts
     
-    receipts = TaxReceipt.objects.filter(
+    receipt_ids = list(TaxReceipt.objects.filter(
         status='issued',
         donor_email__isnull=False,
-    ).exclude(donor_email='')
+    ).exclude(donor_email='').values_list('id', flat=True))
     
-    sent_count = 0
+    if not receipt_ids:
+        return "Sent 0 tax receipts"
     
-    for receipt in receipts:
-        try:
-            if not receipt.pdf_file:
-                receipt.generate_pdf()
-            receipt.send_by_email()
-            sent_count += 1
-        except Exception as e:
-            logger.error(f"Failed to send receipt {receipt.receipt_number}: {e}")
+    batch_size = getattr(settings, 'TAX_RECEIPT_BATCH_SIZE', 20)
+    group(
+        send_tax_receipts.s(receipt_ids[start:start + batch_size])
+        for start in range(0, len(receipt_ids), batch_size)
+    ).apply_async()
     
-    return f"Sent {sent_count} tax receipts"
+    return f"Queued {len(receipt_ids)} tax receipts"
 
 
 @shared_task
@@ -0,0 +1,139 @@
+"""
+Cache des templates d'email compilés (EmailTemplate stockés en base).
+
+Les templates sont compilés une fois par processus et mis en cache sous la
+clé (template_type, name, updated_at) : une modification en base change la
+clé, y compris pour les autres processus. EmailTemplate.save() et delete()
+vident en plus le cache du processus courant.
+"""
+import logging
+import threading
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from django.template import Context, Template
+from django.utils.html import strip_tags
+
+logger = logging.getLogger(__name__)
+
+_compiled_templates: Dict[tuple, 'CompiledEmailTemplate'] = {}
+_lock = threading.Lock()
+
+
+class CompiledEmailTemplate:
+    """
+    Sujet, HTML et texte d'un EmailTemplate compilés une seule fois.
+    
+    Les erreurs de syntaxe sont conservées et appliquent, au rendu, les
+    mêmes solutions de repli que l'envoi unitaire.
+    """
+    
+    def __init__(self, email_template):
+        self.name = email_template.name
+        self.template_type = email_template.template_type
+        self.updated_at = email_template.updated_at
+        self.raw_subject = email_template.subject
+        
+        self.subject_template, self.subject_error = self._compile(email_template.subject, 'sujet')
+        self.html_template, self.html_error = self._compile(email_template.html_content, 'HTML')
+        self.text_template, self.text_error = (None, None)
+        if email_template.text_content:
+            self.text_template, self.text_error = self._compile(email_template.text_content, 'texte')
+    
+    def _compile(self, source: str, part: str):
+        try:
+            return Template(source), None
+        except Exception as e:
+            logger.error(f"Erreur compilation {part} template {self.name}: {e}")
+            return None, e
+    
+    def render(self, context: dict) -> Tuple[str, str, str]:
+        """
+        Rend le template pour un contexte.
+        
+        Returns:
+            tuple (subject, html_content, text_content)
+        """
+        return next(self.render_many([context]))
+    
+    def render_many(self, context_iter: Iterable[dict]) -> Iterator[Tuple[str, str, str]]:
+        """
+        Rend le template pour chaque contexte, sans recompilation.
+        
+        Lorsque le contenu texte est dérivé du HTML, strip_tags n'est
+        recalculé que si le HTML rendu change d'un destinataire à l'autre.
+        
+        Yields:
+            tuple (subject, html_content, text_content) par contexte
+        """
+        last_html = None
+        last_stripped = None
+        
+        for context in context_iter:
+            subject = self._render_part(self.subject_template, context, 'sujet')
+            if subject is None:
+                subject = self.raw_subject  # Utiliser le sujet brut
+            
+            html_content = self._render_part(self.html_template, context, 'HTML')
+            if html_content is None:
+                error = self.html_error or 'rendu impossible'
+                html_content = f"<p>Erreur de template: {error}</p>"
+            
+            text_content = self._render_part(self.text_template, context, 'texte')
+            if text_content is None:
+                if html_content != last_html:
+                    last_html = html_content
+                    last_stripped = strip_tags(html_content)
+                text_content = last_stripped
+            
+            yield subject, html_content, text_content
+    
+    def _render_part(self, template, context: dict, part: str) -> Optional[str]:
+        if template is None:
+            return None
+        try:
+            return template.render(Context(context))
+        except Exception as e:
+            logger.error(f"Erreur génération {part} template {self.name}: {e}")
+            return None
+
+
+def get_compiled_email_template(template_type: str, template_name: Optional[str] = None) -> Optional[CompiledEmailTemplate]:
+    """
+    Retourne le template compilé correspondant au type (et au nom).
+    
+    Une requête légère (pk, updated_at) identifie la version en base ; le
+    contenu n'est relu et compilé que si cette version n'est pas en cache.
+    
+    Returns:
+        CompiledEmailTemplate ou None si aucun template actif
+    """
+    from .models import EmailTemplate
+    
+    version = EmailTemplate.get_template_by_type(
+        template_type, template_name, queryset=EmailTemplate.objects.only('pk', 'name', 'updated_at')
+    )
+    if version is None:
+        return None
+    
+    key = (template_type, version.name, version.updated_at)
+    compiled = _compiled_templates.get(key)
+    if compiled is not None:
+        return compiled
+    
+    email_template = EmailTemplate.objects.filter(pk=version.pk).first()
+    if email_template is None:
+        return None
+    compiled = CompiledEmailTemplate(email_template)
+    
+    with _lock:
+        # Ne garder qu'une version par (type, nom)
+        for stale_key in [k for k in _compiled_templates if k[:2] == key[:2]]:
+            del _compiled_templates[stale_key]
+        _compiled_templates[(template_type, compiled.name, compiled.updated_at)] = compiled
+    return compiled
+
+
+def clear_compiled_email_templates():
+    """Vide le cache des templates compilés du processus courant."""
+    with _lock:
+        _compiled_templates.clear()
@@ -175,9 +175,10 @@ class NeighborhoodAdmin(admin.ModelAdmin):
 @admin.register(Family)
 class FamilyAdmin(admin.ModelAdmin):
     list_display = ['name', 'site', 'neighborhood', 'city', 'member_count_display', 'phone', 'is_active']
-    list_filter = ['site', 'neighborhood__city', 'is_active']
+    list_filter = ['site', 'neighborhood__city', 'is_active', 'geocode_status']
     search_fields = ['name', 'address', 'phone', 'email']
     autocomplete_fields = ['site', 'neighborhood']
+    readonly_fields = ['geocode_status', 'geocoded_at']
     
     fieldsets = (
         ('Informations', {
@@ -187,7 +188,7 @@ class FamilyAdmin(admin.ModelAdmin):
             'fields': ('neighborhood', 'address', 'city', 'postal_code')
         }),
         ('Coordonnées GPS', {
-            'fields': ('latitude', 'longitude'),
+            'fields': ('latitude', 'longitude', 'geocode_status', 'geocoded_at'),
             'classes': ('collapse',)
         }),
         ('Contact', {
@@ -816,3 +817,31 @@ class DatabaseBackupAdmin(admin.ModelAdmin):
         extra_context = extra_context or {}
         extra_context['show_manual_backup_button'] = True
         return super().changelist_view(request, extra_context)
+
+
+# =============================================================================
+# EXPORTS EN TÂCHE DE FOND
+# =============================================================================
+
+from .models import ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """Suivi des exports générés en tâche de fond (lecture seule)."""
+    
+    list_display = [
+        'created_at', 'user', 'export_type', 'export_format', 'status',
+        'progress', 'record_count', 'expires_at'
+    ]
+    list_filter = ['status', 'export_format', 'export_type']
+    search_fields = ['user__username', 'export_type', 'filename']
+    readonly_fields = [
+        'user', 'export_type', 'export_format', 'path', 'query_string', 'request_meta',
+        'status', 'progress', 'record_count', 'file', 'filename', 'celery_task_id',
+        'error_message', 'created_at', 'completed_at', 'expires_at'
+    ]
+    date_hierarchy = 'created_at'
+    
+    def has_add_permission(self, request):
+        return False
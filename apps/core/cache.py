@@ -0,0 +1,278 @@
+"""
+Cache applicatif à clés déterministes et invalidation par tags.
+
+Les clés sont un hash SHA-256 d'une représentation stable des arguments
+(instances de modèles réduites à « app.Model:pk », dates ISO, dictionnaires
+triés) : elles sont identiques d'un worker gunicorn / Celery à l'autre,
+contrairement à hash() dont le sel change à chaque processus.
+
+Chaque entrée dépend de tags de modèles (ex. 'bibleclub.Attendance',
+'finance.FinancialTransaction'). La version courante de chaque tag fait
+partie de la clé : incrémenter un tag rend obsolètes d'un coup toutes les
+entrées qui en dépendent. Les tags sont incrémentés automatiquement après
+chaque save() / delete() (cf. signals.bump_model_cache_tag) ; les écritures
+en masse (bulk_create, bulk_update, update) doivent appeler
+invalidate_models() explicitement.
+
+Sur un défaut de cache, un verrou (cache.add) garantit qu'un seul
+processus calcule la valeur ; les autres attendent son résultat.
+
+Usage:
+    @cached(timeout=300, key_prefix='bibleclub_stats', tags=['bibleclub.Child'])
+    def get_dashboard_stats(user):
+        ...
+"""
+import functools
+import hashlib
+import logging
+import time
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Optional
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction as db_transaction
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'appcache'
+TAG_PREFIX = 'appcache:tag'
+STATS_PREFIX = 'appcache:stats'
+
+_MISSING = object()
+
+
+# ----------------------------------------------------------------------
+# Clés
+# ----------------------------------------------------------------------
+
+def stable_repr(value) -> str:
+    """
+    Représentation textuelle stable d'une valeur, indépendante du processus.
+    """
+    if isinstance(value, models.Model):
+        return f"{value._meta.label}:{value.pk}"
+    if getattr(value, 'is_anonymous', False) and getattr(value, 'pk', None) is None:
+        return 'anonymous'
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, (str, int, float, bool, Decimal, UUID)) or value is None:
+        return repr(value)
+    if isinstance(value, dict):
+        items = sorted((stable_repr(k), stable_repr(v)) for k, v in value.items())
+        return '{' + ','.join(f"{k}:{v}" for k, v in items) + '}'
+    if isinstance(value, (set, frozenset)):
+        return '{' + ','.join(sorted(stable_repr(v) for v in value)) + '}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(stable_repr(v) for v in value) + ']'
+    if isinstance(value, models.QuerySet):
+        raise TypeError("Un QuerySet ne peut pas servir de clé de cache")
+    return repr(value)
+
+
+def make_key(name: str, *parts, tag_versions: Optional[Dict[str, int]] = None) -> str:
+    """
+    Construit une clé de cache déterministe.
+
+    Args:
+        name: Nom lisible de l'entrée (préfixe et fonction)
+        parts: Valeurs qui différencient les entrées (arguments)
+        tag_versions: Versions courantes des tags dont dépend l'entrée
+    """
+    payload = stable_repr([list(parts), sorted((tag_versions or {}).items())])
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    return f"{KEY_PREFIX}:{name}:{digest}"
+
+
+# ----------------------------------------------------------------------
+# Tags
+# ----------------------------------------------------------------------
+
+def model_tag(model) -> str:
+    """Tag d'un modèle (classe ou instance) : son label 'app.Model'."""
+    return model._meta.label
+
+
+def _initial_version() -> int:
+    # Horodatage : une version évincée puis recréée ne ressuscite pas
+    # d'anciennes entrées
+    return time.time_ns()
+
+
+def get_tag_versions(tags: Iterable[str]) -> Dict[str, int]:
+    """Retourne la version courante de chaque tag (une requête au cache)."""
+    tags = sorted(set(tags))
+    if not tags:
+        return {}
+
+    keys = {f"{TAG_PREFIX}:{tag}": tag for tag in tags}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, tag in keys.items():
+        version = found.get(key)
+        if version is None:
+            cache.add(key, _initial_version(), None)
+            version = cache.get(key)
+        versions[tag] = version
+    return versions
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Rend obsolètes toutes les entrées qui dépendent de ces tags."""
+    for tag in tags:
+        key = f"{TAG_PREFIX}:{tag}"
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), None)
+
+
+def invalidate_models(*models_or_instances, on_commit: bool = True) -> None:
+    """
+    Invalide les tags de modèles, après le commit de la transaction en cours.
+
+    À appeler après les écritures qui n'émettent pas de signaux
+    (bulk_create, bulk_update, QuerySet.update).
+    """
+    tags = sorted({model_tag(model) for model in models_or_instances})
+    if on_commit:
+        db_transaction.on_commit(lambda: invalidate_tags(*tags))
+    else:
+        invalidate_tags(*tags)
+
+
+def is_tagged_model(model) -> bool:
+    """
+    Indique si les écritures d'un modèle incrémentent son tag.
+
+    Seuls les modèles du projet sont concernés, hors journaux écrits en
+    continu (CACHE_UNTAGGED_MODELS).
+    """
+    untagged = getattr(settings, 'CACHE_UNTAGGED_MODELS', ())
+    return model.__module__.startswith('apps.') and model._meta.label not in untagged
+
+
+# ----------------------------------------------------------------------
+# Compteurs
+# ----------------------------------------------------------------------
+
+def _count(name: str, outcome: str) -> None:
+    key = f"{STATS_PREFIX}:{name}:{outcome}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_cache_stats(name: str) -> Dict[str, Any]:
+    """
+    Compteurs de succès / défauts d'une entrée, partagés entre processus.
+
+    Returns:
+        {'hits': int, 'misses': int, 'hit_rate': float (en %)}
+    """
+    keys = {outcome: f"{STATS_PREFIX}:{name}:{outcome}" for outcome in ('hits', 'misses')}
+    found = cache.get_many(list(keys.values()))
+    hits = found.get(keys['hits'], 0)
+    misses = found.get(keys['misses'], 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total * 100, 1) if total else 0.0,
+    }
+
+
+# ----------------------------------------------------------------------
+# Lecture / calcul
+# ----------------------------------------------------------------------
+
+def get_or_compute(
+    name: str,
+    parts: Iterable = (),
+    compute: Callable[[], Any] = None,
+    timeout: Optional[int] = None,
+    tags: Iterable[str] = (),
+):
+    """
+    Retourne la valeur en cache, ou la calcule une seule fois.
+
+    Args:
+        name: Nom de l'entrée (utilisé aussi pour les compteurs)
+        parts: Valeurs qui différencient les entrées
+        compute: Fonction sans argument qui calcule la valeur
+        timeout: Durée de vie en secondes (CACHE_DEFAULT_TIMEOUT par défaut)
+        tags: Tags de modèles dont dépend la valeur
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'CACHE_DEFAULT_TIMEOUT', 300)
+    key = make_key(name, *parts, tag_versions=get_tag_versions(tags))
+
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        _count(name, 'hits')
+        return value
+
+    _count(name, 'misses')
+
+    lock_key = f"{key}:lock"
+    lock_timeout = getattr(settings, 'CACHE_STAMPEDE_LOCK_TIMEOUT', 30)
+    if cache.add(lock_key, 1, lock_timeout):
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    # Un autre processus calcule la valeur : attendre son résultat
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if cache.get(lock_key) is None:
+            break
+
+    logger.warning(f"Cache '{name}': verrou expiré ou libéré sans résultat, calcul local")
+    value = compute()
+    cache.set(key, value, timeout)
+    return value
+
+
+def cached(timeout: Optional[int] = None, key_prefix: str = '', tags: Iterable[str] = ()):
+    """
+    Décorateur : met en cache le résultat d'une fonction.
+
+    La clé dépend du nom qualifié de la fonction, de ses arguments
+    (cf. stable_repr) et des versions des tags.
+
+    Args:
+        timeout: Durée du cache en secondes
+        key_prefix: Préfixe de la clé (nom des compteurs)
+        tags: Tags de modèles dont dépend le résultat
+    """
+    tags = tuple(tags)
+
+    def decorator(func):
+        name = f"{key_prefix}:{func.__module__}.{func.__qualname__}" if key_prefix else \
+            f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return get_or_compute(
+                name,
+                (args, kwargs),
+                lambda: func(*args, **kwargs),
+                timeout=timeout,
+                tags=tags,
+            )
+
+        wrapper.cache_name = name
+        wrapper.cache_tags = tags
+        return wrapper
+    return decorator
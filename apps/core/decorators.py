@@ -32,31 +32,21 @@ def handle_external_service_errors(func):
     return wrapper
 
 
-def cache_result(timeout=300, key_prefix=''):
+def cache_result(timeout=300, key_prefix='', tags=()):
     """
     Décorateur pour mettre en cache le résultat d'une fonction.
     
+    Clés déterministes et invalidation par tags de modèles : voir
+    apps.core.cache.cached.
+    
     Args:
         timeout: Durée du cache en secondes (défaut: 5 minutes)
         key_prefix: Préfixe pour la clé de cache
+        tags: Tags de modèles dont dépend le résultat (ex. 'bibleclub.Attendance')
     """
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            # Générer une clé de cache basée sur les arguments
-            cache_key = f"{key_prefix}:{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
-            
-            # Vérifier le cache
-            result = cache.get(cache_key)
-            if result is not None:
-                return result
-            
-            # Calculer et mettre en cache
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, timeout)
-            return result
-        return wrapper
-    return decorator
+    from apps.core.cache import cached
+    
+    return cached(timeout=timeout, key_prefix=key_prefix, tags=tags)
 
 
 def require_ajax(func):
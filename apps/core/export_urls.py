@@ -122,4 +122,14 @@ urlpatterns = [
     path('utilisateurs/pdf/', 
          export_views.UsersPrintView.as_view(), 
          name='users_print'),
+    
+    # =========================================================================
+    # EXPORTS EN TÂCHE DE FOND
+    # =========================================================================
+    path('taches/<int:pk>/', 
+         export_views.ExportJobDetailView.as_view(), 
+         name='job_detail'),
+    path('taches/<int:pk>/telecharger/', 
+         export_views.ExportJobDownloadView.as_view(), 
+         name='job_download'),
 ]
@@ -6,14 +6,17 @@ Ce module fournit des vues génériques pour :
 - Génération PDF avec WeasyPrint
 """
 
+from django.conf import settings
 from django.views.generic import View, TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, render, redirect
+from django.urls import reverse
 from django.utils import timezone
 from datetime import datetime
 from decimal import Decimal
+from io import BytesIO
 import json
 
 from .services import ExportService
@@ -77,6 +80,13 @@ EXPORT_PERMISSIONS = {
 }
 
 
+# En-têtes conservés pour rejouer une requête d'export en tâche de fond
+EXPORT_JOB_META_KEYS = (
+    'HTTP_HOST', 'SERVER_NAME', 'SERVER_PORT', 'REMOTE_ADDR',
+    'HTTP_X_FORWARDED_FOR', 'HTTP_X_FORWARDED_PROTO', 'HTTP_X_REAL_IP', 'HTTP_USER_AGENT',
+)
+
+
 class ExportPermissionMixin:
     """
     Mixin pour contrôler les permissions d'export par type de données.
@@ -104,6 +114,8 @@ class ExportPermissionMixin:
     Requirements: 4.1, 4.2, 4.3, 4.4, 4.5
     """
     export_type = None
+    # Nombre d'enregistrements compté par should_export_async (ou None)
+    export_record_count = None
     permission_denied_message = "Vous n'avez pas les permissions nécessaires pour effectuer cet export."
     permission_denied_redirect = 'dashboard:home'
     
@@ -178,8 +190,69 @@ class ExportPermissionMixin:
             )
             return self.handle_no_permission()
         
+        # Export volumineux : génération en tâche de fond
+        if hasattr(self, 'export_to_file') and self.should_export_async():
+            return self.start_export_job()
+        
         return super().dispatch(request, *args, **kwargs)
     
+    def should_export_async(self):
+        """
+        Indique si l'export doit être généré en tâche de fond.
+        
+        ?async=1 / ?async=0 forcent le choix ; sinon, les exports de plus de
+        EXPORT_ASYNC_THRESHOLD enregistrements (0 = jamais) passent en tâche
+        de fond, pour ne pas bloquer la requête. Le nombre compté est
+        conservé (export_record_count) pour la progression de la tâche.
+        """
+        requested = self.request.GET.get('async')
+        if requested is not None:
+            return requested == '1'
+        
+        threshold = getattr(settings, 'EXPORT_ASYNC_THRESHOLD', 1000)
+        if not threshold:
+            return False
+        
+        queryset = self.get_queryset()
+        if hasattr(queryset, 'model'):
+            self.export_record_count = queryset.count()
+        else:
+            self.export_record_count = len(queryset)
+        return self.export_record_count > threshold
+    
+    def start_export_job(self):
+        """
+        Crée un ExportJob et délègue la génération à Celery.
+        
+        La requête (chemin, filtres, IP, User-Agent) est conservée pour être
+        rejouée par la tâche, qui appelle log_export à la fin de l'export.
+        """
+        from django.db import transaction as db_transaction
+        from apps.core.models import ExportJob
+        from apps.core.tasks import run_export_job
+        
+        query = self.request.GET.copy()
+        query.pop('async', None)
+        
+        job = ExportJob.objects.create(
+            user=self.request.user,
+            export_type=self.export_type or '',
+            export_format=getattr(self, 'export_format', 'excel'),
+            path=self.request.path,
+            query_string=query.urlencode(),
+            record_count=self.export_record_count or 0,
+            request_meta={
+                key: self.request.META[key]
+                for key in EXPORT_JOB_META_KEYS
+                if key in self.request.META
+            },
+        )
+        db_transaction.on_commit(lambda: run_export_job.delay(job.pk))
+        
+        if getattr(self.request, 'htmx', False):
+            return render(self.request, 'core/exports/partials/job_status.html', {'job': job})
+        return redirect(reverse('exports:job_detail', args=[job.pk]))
+    
     def handle_no_permission(self):
         """
         Gère le cas où l'utilisateur n'a pas les permissions d'export.
@@ -194,12 +267,21 @@ class ExportPermissionMixin:
 
 
 class BaseExportView(LoginRequiredMixin, View):
-    """Vue de base pour les exports Excel."""
+    """
+    Vue de base pour les exports Excel.
+    
+    Avec `export_streaming = True`, le queryset est parcouru par blocs
+    (`iterator(chunk_size=export_chunk_size)`) et écrit dans un classeur en
+    écriture seule, renvoyé depuis un fichier temporaire : la mémoire ne
+    dépend plus du volume exporté.
+    """
     
     model = None
     export_title = "Export"
     export_filename_prefix = "export"
     export_format = 'excel'
+    export_streaming = False
+    export_chunk_size = 2000
     
     def get_queryset(self):
         """Retourne le queryset à exporter."""
@@ -216,14 +298,27 @@ class BaseExportView(LoginRequiredMixin, View):
     def get_export_data(self):
         """Prépare les données pour l'export."""
         data = []
+        headers = self.get_headers()
         for obj in self.get_queryset():
             row = self.get_row_data(obj)
             if isinstance(row, dict):
                 data.append(row)
             else:
-                data.append(dict(zip(self.get_headers(), row)))
+                data.append(dict(zip(headers, row)))
         return data
     
+    def iter_export_data(self):
+        """Génère les lignes de l'export sans charger tout le queryset."""
+        queryset = self.get_queryset()
+        if hasattr(queryset, 'iterator'):
+            queryset = queryset.iterator(chunk_size=self.export_chunk_size)
+        for obj in queryset:
+            yield self.get_row_data(obj)
+    
+    def get_export_title(self):
+        """Retourne le titre du document exporté."""
+        return self.export_title
+    
     def get_metadata(self):
         """Retourne les métadonnées de l'export."""
         return {
@@ -231,14 +326,19 @@ class BaseExportView(LoginRequiredMixin, View):
             'Date': timezone.now().strftime('%d/%m/%Y %H:%M'),
         }
     
+    def get_filename(self):
+        """Génère le nom du fichier Excel."""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return f"{self.export_filename_prefix}_{timestamp}.xlsx"
+    
     def get(self, request, *args, **kwargs):
         """Génère et retourne le fichier Excel."""
+        if self.export_streaming:
+            return self.get_streaming_response()
+        
         data = self.get_export_data()
         headers = self.get_headers()
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{self.export_filename_prefix}_{timestamp}.xlsx"
-        
         # Logger l'export si le mixin ExportPermissionMixin est présent
         if hasattr(self, 'log_export'):
             self.log_export(success=True, record_count=len(data))
@@ -246,10 +346,54 @@ class BaseExportView(LoginRequiredMixin, View):
         return ExportService.export_to_excel(
             data=data,
             headers=headers,
-            title=self.export_title,
-            filename=filename,
+            title=self.get_export_title(),
+            filename=self.get_filename(),
             metadata=self.get_metadata()
         )
+    
+    def get_streaming_response(self):
+        """Écrit l'export ligne par ligne puis le renvoie par blocs."""
+        fileobj, filename, record_count = self.export_to_file()
+        return ExportService.excel_file_response(fileobj, filename)
+    
+    def export_to_file(self, progress=None):
+        """
+        Écrit l'export dans un fichier temporaire.
+        
+        Args:
+            progress: Fonction appelée avec un pourcentage (tâche asynchrone)
+        
+        Returns:
+            Tuple (fichier rembobiné, nom du fichier, nombre d'enregistrements)
+        """
+        rows = self.iter_export_data()
+        if progress:
+            # Nombre déjà compté par la requête d'origine, s'il est connu
+            total = getattr(self, 'export_record_count', None)
+            if total is None:
+                total = self.get_queryset().count()
+            rows = _track_progress(rows, total, progress)
+        
+        fileobj, record_count = ExportService.build_excel_file(
+            rows=rows,
+            headers=self.get_headers(),
+            title=self.get_export_title(),
+            metadata=self.get_metadata()
+        )
+        
+        if hasattr(self, 'log_export'):
+            self.log_export(success=True, record_count=record_count)
+        
+        return fileobj, self.get_filename(), record_count
+
+
+def _track_progress(rows, total, progress, step=500):
+    """Relaie les lignes en signalant la progression toutes les `step` lignes."""
+    for index, row in enumerate(rows, 1):
+        if total and index % step == 0:
+            # 95 % au plus : l'écriture du classeur reste à faire
+            progress(min(95, index * 95 // total))
+        yield row
 
 
 class BasePDFView(LoginRequiredMixin, View):
@@ -278,27 +422,57 @@ class BasePDFView(LoginRequiredMixin, View):
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         return f"{self.pdf_filename_prefix}_{timestamp}.pdf"
     
-    def get(self, request, *args, **kwargs):
-        """Génère et retourne le PDF."""
+    def get_record_count(self, context):
+        """Nombre d'enregistrements imprimés, pour le journal d'audit."""
+        object_list = context.get('object_list', [])
+        if hasattr(object_list, 'model'):
+            return object_list.count()
+        if hasattr(object_list, '__len__'):
+            return len(object_list)
+        return 0
+    
+    def render_pdf(self, progress=None):
+        """
+        Génère le PDF et journalise l'export.
+        
+        Args:
+            progress: Fonction appelée avec un pourcentage (tâche asynchrone)
+        
+        Returns:
+            HttpResponse avec le PDF et nombre d'enregistrements
+        """
         context = self.get_context_data()
+        record_count = self.get_record_count(context)
         
         # Logger l'export si le mixin ExportPermissionMixin est présent
         if hasattr(self, 'log_export'):
-            record_count = context.get('object_list', [])
-            if hasattr(record_count, 'count'):
-                record_count = record_count.count()
-            elif hasattr(record_count, '__len__'):
-                record_count = len(record_count)
-            else:
-                record_count = 0
             self.log_export(success=True, record_count=record_count)
         
-        return PDFService.generate_pdf(
+        if progress:
+            progress(20)
+        
+        response = PDFService.generate_pdf(
             template_name=self.template_name,
             context=context,
             filename=self.get_filename(),
-            request=request
+            request=self.request
         )
+        return response, record_count
+    
+    def get(self, request, *args, **kwargs):
+        """Génère et retourne le PDF."""
+        response, _ = self.render_pdf()
+        return response
+    
+    def export_to_file(self, progress=None):
+        """
+        Génère le PDF dans un fichier (tâche asynchrone).
+        
+        Returns:
+            Tuple (fichier rembobiné, nom du fichier, nombre d'enregistrements)
+        """
+        response, record_count = self.render_pdf(progress=progress)
+        return BytesIO(response.content), self.get_filename(), record_count
 
 
 # Alias pour compatibilité
@@ -407,6 +581,7 @@ class MembersExportView(ExportPermissionMixin, BaseExportView):
     export_type = 'members'
     export_title = "Liste des Membres"
     export_filename_prefix = "membres"
+    export_streaming = True
     
     def get_queryset(self):
         from apps.members.models import Member
@@ -560,10 +735,9 @@ class BudgetDetailExportView(ExportPermissionMixin, BaseExportView):
             'Statut': item.get_approval_status_display()
         }
     
-    def get(self, request, *args, **kwargs):
+    def get_export_title(self):
         budget = self.get_budget()
-        self.export_title = f"Budget {budget.year} - {budget.entity}"
-        return super().get(request, *args, **kwargs)
+        return f"Budget {budget.year} - {budget.entity}"
 
 
 class TransactionsExportView(ExportPermissionMixin, BaseExportView):
@@ -576,6 +750,7 @@ class TransactionsExportView(ExportPermissionMixin, BaseExportView):
     export_type = 'transactions'
     export_title = "Transactions Financières"
     export_filename_prefix = "transactions"
+    export_streaming = True
     
     def get_queryset(self):
         from apps.finance.models import FinancialTransaction
@@ -809,10 +984,9 @@ class GroupMembersExportView(ExportPermissionMixin, BaseExportView):
             'Statut': member.get_status_display()
         }
     
-    def get(self, request, *args, **kwargs):
+    def get_export_title(self):
         group = self.get_group()
-        self.export_title = f"Membres du groupe - {group.name}"
-        return super().get(request, *args, **kwargs)
+        return f"Membres du groupe - {group.name}"
 
 
 class GroupsPrintView(ExportPermissionMixin, BasePDFView):
@@ -859,6 +1033,7 @@ class AttendanceExportView(ExportPermissionMixin, BaseExportView):
     export_type = 'attendance'
     export_title = "Présences - Club Biblique"
     export_filename_prefix = "presences_club_biblique"
+    export_streaming = True
     
     def get_queryset(self):
         from apps.bibleclub.models import Attendance
@@ -927,11 +1102,12 @@ class AttendancePrintView(ExportPermissionMixin, BasePDFView):
         return queryset.order_by('-session__date', 'child__last_name')
     
     def get_context_data(self):
+        from apps.bibleclub.models import Attendance
         context = super().get_context_data()
         attendances = context['object_list']
         context['total_records'] = attendances.count()
         context['present_count'] = attendances.filter(status='present').count()
-        context['absent_count'] = attendances.filter(status__in=['absent', 'absent_notified']).count()
+        context['absent_count'] = attendances.filter(status__in=Attendance.ABSENT_STATUSES).count()
         return context
 
 
@@ -1275,3 +1451,45 @@ class UsersPrintView(ExportPermissionMixin, BasePDFView):
         context['total_users'] = context['object_list'].count()
         context['active_users'] = context['object_list'].filter(is_active=True).count()
         return context
+
+
+# =============================================================================
+# EXPORTS EN TÂCHE DE FOND
+# =============================================================================
+
+class ExportJobMixin(LoginRequiredMixin):
+    """Restreint l'accès aux exports à leur auteur (et aux superutilisateurs)."""
+    
+    def get_job(self):
+        from apps.core.models import ExportJob
+        job = get_object_or_404(ExportJob, pk=self.kwargs['pk'])
+        if job.user_id != self.request.user.pk and not self.request.user.is_superuser:
+            raise Http404
+        return job
+
+
+class ExportJobDetailView(ExportJobMixin, View):
+    """
+    Suivi d'un export en tâche de fond.
+    
+    La page complète inclut un fragment rafraîchi par HTMX tant que
+    l'export n'est pas terminé.
+    """
+    
+    def get(self, request, *args, **kwargs):
+        job = self.get_job()
+        if getattr(request, 'htmx', False):
+            return render(request, 'core/exports/partials/job_status.html', {'job': job})
+        return render(request, 'core/exports/job_detail.html', {'job': job})
+
+
+class ExportJobDownloadView(ExportJobMixin, View):
+    """Téléchargement du fichier d'un export terminé."""
+    
+    def get(self, request, *args, **kwargs):
+        job = self.get_job()
+        if not job.is_downloadable:
+            messages.error(request, "Ce fichier n'est plus disponible.")
+            return redirect('exports:job_detail', pk=job.pk)
+        
+        return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.filename)
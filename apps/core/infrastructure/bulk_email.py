@@ -0,0 +1,222 @@
+"""
+Envoi d'emails en masse - une connexion SMTP par lot.
+
+Le contenu est rendu une seule fois par l'appelant (ou une fois par
+destinataire avec un template compilé, cf. send_rendered) ; les messages sont
+envoyés par lots de EMAIL_BULK_CHUNK_SIZE via un seul appel à
+send_messages() sur une connexion ouverte pour le lot, et les EmailLog
+sont écrits avec bulk_create / bulk_update.
+"""
+import logging
+import time
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from apps.communication.models import EmailLog
+
+logger = logging.getLogger(__name__)
+
+
+class BulkEmailSender:
+    """
+    Pipeline d'envoi d'un même email à de nombreux destinataires.
+    """
+    
+    @staticmethod
+    def normalize_recipients(recipients: Iterable[Union[str, tuple]]) -> List[tuple]:
+        """
+        Normalise les destinataires en tuples (email, nom).
+        
+        Les adresses vides et les doublons (insensibles à la casse) sont ignorés.
+        """
+        normalized = []
+        seen = set()
+        for recipient in recipients:
+            if isinstance(recipient, tuple):
+                email, name = recipient
+            else:
+                email, name = recipient, ''
+            
+            key = (email or '').strip().lower()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            normalized.append((email.strip(), name or ''))
+        return normalized
+    
+    @classmethod
+    def send(
+        cls,
+        recipients: Iterable[Union[str, tuple]],
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        from_email: Optional[str] = None,
+        connection=None,
+        chunk_size: Optional[int] = None,
+        fail_silently: bool = True
+    ) -> List[EmailLog]:
+        """
+        Envoie un email déjà rendu à une liste de destinataires.
+        
+        Args:
+            recipients: Liste d'emails ou tuples (email, nom)
+            subject: Sujet de l'email
+            html_content: Contenu HTML rendu
+            text_content: Contenu texte (généré depuis le HTML si absent)
+            from_email: Email expéditeur (DEFAULT_FROM_EMAIL par défaut)
+            connection: Backend email à utiliser (EMAIL_BACKEND par défaut)
+            chunk_size: Nombre de messages par connexion
+            fail_silently: Ne pas lever d'exception si un lot ne peut être envoyé
+            
+        Returns:
+            List[EmailLog]: Logs créés, dans l'ordre des destinataires
+        """
+        text_content = text_content or strip_tags(html_content)
+        rendered = (
+            (email, name, subject, html_content, text_content)
+            for email, name in cls.normalize_recipients(recipients)
+        )
+        return cls.send_rendered(
+            rendered,
+            from_email=from_email,
+            connection=connection,
+            chunk_size=chunk_size,
+            fail_silently=fail_silently,
+            label=subject,
+        )
+    
+    @classmethod
+    def send_rendered(
+        cls,
+        rendered: Iterable[tuple],
+        from_email: Optional[str] = None,
+        connection=None,
+        chunk_size: Optional[int] = None,
+        fail_silently: bool = True,
+        label: str = ''
+    ) -> List[EmailLog]:
+        """
+        Envoie des emails déjà rendus, personnalisés par destinataire.
+        
+        L'itérable est consommé lot par lot : les rendus d'un générateur
+        (cf. CompiledEmailTemplate.render_many) ne sont pas tous en mémoire.
+        
+        Args:
+            rendered: Itérable de tuples (email, nom, sujet, html, texte)
+            from_email: Email expéditeur (DEFAULT_FROM_EMAIL par défaut)
+            connection: Backend email à utiliser (EMAIL_BACKEND par défaut)
+            chunk_size: Nombre de messages par connexion
+            fail_silently: Ne pas lever d'exception si un lot ne peut être envoyé
+            label: Libellé de l'envoi pour les logs applicatifs
+            
+        Returns:
+            List[EmailLog]: Logs créés, dans l'ordre des destinataires
+        """
+        from_email = from_email or settings.DEFAULT_FROM_EMAIL
+        chunk_size = chunk_size or getattr(settings, 'EMAIL_BULK_CHUNK_SIZE', 50)
+        if connection is None:
+            # log_emails=False : les logs sont écrits ici en masse
+            connection = get_connection(fail_silently=True, log_emails=False)
+        
+        logs = []
+        started = time.monotonic()
+        rendered = iter(rendered)
+        
+        while True:
+            chunk = list(islice(rendered, chunk_size))
+            if not chunk:
+                break
+            
+            chunk_logs = EmailLog.objects.bulk_create([
+                EmailLog(
+                    recipient_email=email,
+                    recipient_name=name,
+                    subject=subject,
+                    body=text_content,
+                    status=EmailLog.Status.PENDING,
+                )
+                for email, name, subject, _html, text_content in chunk
+            ])
+            
+            messages = []
+            for email, _name, subject, html_content, text_content in chunk:
+                message = EmailMultiAlternatives(
+                    subject=subject,
+                    body=text_content,
+                    from_email=from_email,
+                    to=[email],
+                    connection=connection,
+                )
+                message.attach_alternative(html_content, "text/html")
+                messages.append(message)
+            
+            errors, exception = cls._send_chunk(connection, messages)
+            
+            now = timezone.now()
+            for index, log in enumerate(chunk_logs):
+                if index in errors:
+                    log.status = EmailLog.Status.FAILED
+                    log.error_message = errors[index]
+                else:
+                    log.status = EmailLog.Status.SENT
+                    log.sent_at = now
+            EmailLog.objects.bulk_update(chunk_logs, ['status', 'sent_at', 'error_message'])
+            logs.extend(chunk_logs)
+            
+            if exception is not None and not fail_silently:
+                raise exception
+        
+        if logs:
+            elapsed = time.monotonic() - started
+            sent = sum(1 for log in logs if log.status == EmailLog.Status.SENT)
+            rate = sent / elapsed if elapsed > 0 else float(sent)
+            logger.info(
+                f"Envoi en masse '{label or logs[0].subject}': {sent}/{len(logs)} envoyés "
+                f"en {elapsed:.1f}s ({rate:.1f} messages/s)"
+            )
+        return logs
+    
+    @staticmethod
+    def _send_chunk(connection, messages) -> Tuple[Dict[int, str], Optional[Exception]]:
+        """
+        Envoie un lot de messages sur une connexion ouverte pour le lot.
+        
+        Returns:
+            Tuple ({index du message: message d'erreur} pour les échecs,
+            exception si le lot entier n'a pu être envoyé)
+        """
+        try:
+            connection.open()
+            try:
+                sent = connection.send_messages(messages)
+            finally:
+                connection.close()
+        except Exception as e:
+            logger.error(f"Échec d'envoi d'un lot de {len(messages)} emails: {e}")
+            return {index: str(e) for index in range(len(messages))}, e
+        
+        # Backend Hostinger : détail des échecs par message
+        errors = {}
+        failed_messages = getattr(connection, 'failed_messages', None)
+        if failed_messages is not None:
+            failures = {id(message): error for message, error in failed_messages}
+            errors = {
+                index: failures[id(message)]
+                for index, message in enumerate(messages)
+                if id(message) in failures
+            }
+        
+        # Tout message dont l'envoi n'est pas confirmé par le nombre retourné
+        # est compté en échec (autres backends : seul ce nombre est connu)
+        sent = sent or 0
+        if len(messages) - len(errors) > sent:
+            error = f"Envoi non confirmé ({sent}/{len(messages)} envoyés), détail indisponible"
+            for index in range(len(messages)):
+                errors.setdefault(index, error)
+        return errors, None
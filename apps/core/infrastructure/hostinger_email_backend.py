@@ -148,11 +148,21 @@ class HostingerEmailBackend(BaseEmailBackend):
     - HOSTINGER_EMAIL_USE_SSL: True pour SSL
     - HOSTINGER_EMAIL_HOST_USER: Votre email Hostinger
     - HOSTINGER_EMAIL_HOST_PASSWORD: Mot de passe email
+    
+    Avec log_emails=False, le backend n'écrit pas d'EmailLog : l'appelant
+    (cf. BulkEmailSender) enregistre les résultats en masse à partir de
+    `failed_messages`, renseigné à chaque appel de send_messages() : tout
+    message non envoyé y figure, y compris faute de connexion.
     """
     
+    # Codes SMTP signalant une fermeture de connexion côté serveur
+    RECONNECT_SMTP_CODES = (421,)
+    
     def __init__(self, host=None, port=None, username=None, password=None,
-                 use_tls=None, use_ssl=None, fail_silently=False, **kwargs):
+                 use_tls=None, use_ssl=None, fail_silently=False, log_emails=True, **kwargs):
         super().__init__(fail_silently=fail_silently)
+        self.log_emails = log_emails
+        self.failed_messages = []
         
         # Configuration Hostinger depuis les settings
         self.api_key = getattr(settings, 'HOSTINGER_API_KEY', '')
@@ -252,8 +262,11 @@ class HostingerEmailBackend(BaseEmailBackend):
             return 0
         
         with self._lock:
+            self.failed_messages = []
             new_conn_created = self.open()
             if not self.connection:
+                error = f"Connexion SMTP Hostinger impossible ({self.host}:{self.port})"
+                self.failed_messages = [(message, error) for message in email_messages]
                 return 0
             
             num_sent = 0
@@ -272,10 +285,12 @@ class HostingerEmailBackend(BaseEmailBackend):
         Envoie un message email individuel et log le résultat.
         """
         if not self.connection:
+            # Connexion perdue (reconnexion échouée) : message non envoyé
+            self.failed_messages.append((email_message, "Connexion SMTP Hostinger perdue"))
             return False
         
         # Créer le log avant l'envoi
-        log = self._create_email_log(email_message)
+        log = self._create_email_log(email_message) if self.log_emails else None
         
         try:
             # Préparer le message MIME
@@ -285,21 +300,24 @@ class HostingerEmailBackend(BaseEmailBackend):
             from_email = email_message.from_email or self.username
             recipients = email_message.recipients()
             
-            self.connection.sendmail(from_email, recipients, msg.as_string())
+            self._sendmail(from_email, recipients, msg.as_string())
             
             # Marquer comme envoyé
-            log.status = 'sent'
-            log.sent_at = timezone.now()
-            log.save()
+            if log:
+                log.status = 'sent'
+                log.sent_at = timezone.now()
+                log.save()
             
             logger.info(f"Email envoyé via Hostinger à {recipients}: {email_message.subject}")
             return True
             
         except Exception as e:
             # Marquer comme échoué
-            log.status = 'failed'
-            log.error_message = str(e)
-            log.save()
+            if log:
+                log.status = 'failed'
+                log.error_message = str(e)
+                log.save()
+            self.failed_messages.append((email_message, str(e)))
             
             logger.error(f"Échec envoi email Hostinger à {email_message.recipients()}: {e}")
             
@@ -307,6 +325,32 @@ class HostingerEmailBackend(BaseEmailBackend):
                 raise
             return False
     
+    def _sendmail(self, from_email, recipients, message):
+        """
+        Envoie un message sur la connexion courante.
+        
+        Si le serveur a fermé la connexion (inactivité, quota de messages
+        par session), elle est rouverte et l'envoi retenté une fois.
+        """
+        try:
+            self.connection.sendmail(from_email, recipients, message)
+        except smtplib.SMTPServerDisconnected:
+            self._reconnect()
+            self.connection.sendmail(from_email, recipients, message)
+        except smtplib.SMTPResponseException as e:
+            if e.smtp_code not in self.RECONNECT_SMTP_CODES:
+                raise
+            self._reconnect()
+            self.connection.sendmail(from_email, recipients, message)
+    
+    def _reconnect(self):
+        """Rouvre la connexion SMTP après une déconnexion côté serveur."""
+        logger.warning(f"Connexion SMTP Hostinger interrompue, reconnexion à {self.host}:{self.port}")
+        self.close()
+        self.open()
+        if not self.connection:
+            raise smtplib.SMTPServerDisconnected("Reconnexion SMTP Hostinger impossible")
+    
     def _prepare_mime_message(self, email_message):
         """
         Prépare le message MIME à partir du message Django.
@@ -507,6 +551,9 @@ class HostingerEmailService:
         """
         Envoie des emails en masse via Hostinger.
         
+        Le contenu est rendu une seule fois et envoyé par lots sur une
+        connexion SMTP par lot (cf. BulkEmailSender).
+        
         Args:
             recipients: Liste de tuples (email, name)
             subject: Sujet commun
@@ -520,28 +567,30 @@ class HostingerEmailService:
         Returns:
             List[EmailLog]: Liste des logs créés
         """
-        logs = []
+        from django.template.loader import render_to_string
+        from .bulk_email import BulkEmailSender
         
-        for recipient in recipients:
-            if isinstance(recipient, tuple):
-                email, name = recipient
-            else:
-                email, name = recipient, ''
-            
-            log = HostingerEmailService.send_email(
-                recipient_email=email,
-                subject=subject,
-                html_content=html_content,
-                text_content=text_content,
-                template_name=template_name,
-                context=context,
-                recipient_name=name,
-                from_email=from_email,
-                fail_silently=fail_silently
-            )
-            logs.append(log)
+        from_email = from_email or getattr(settings, 'HOSTINGER_EMAIL_HOST_USER', settings.DEFAULT_FROM_EMAIL)
         
-        return logs
+        # Générer le contenu une seule fois pour tous les destinataires
+        if template_name and not html_content:
+            context = dict(context or {})
+            context.update({
+                'site_name': getattr(settings, 'SITE_NAME', 'EEBC'),
+                'site_url': getattr(settings, 'SITE_URL', 'localhost'),
+                'current_year': timezone.now().year,
+            })
+            html_content = render_to_string(template_name, context)
+        
+        return BulkEmailSender.send(
+            recipients,
+            subject=subject,
+            html_content=html_content or '',
+            text_content=text_content,
+            from_email=from_email,
+            connection=HostingerEmailBackend(fail_silently=True, log_emails=False),
+            fail_silently=fail_silently
+        )
     
     @staticmethod
     def test_connection() -> Dict[str, Any]:
@@ -6,7 +6,8 @@ from django.contrib.auth import logout
 from django.shortcuts import redirect
 from django.utils import timezone
 from django.contrib import messages
-from django.core.cache import cache
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
 from django.http import JsonResponse
 import time
 
@@ -134,11 +135,18 @@ class RateLimitMiddleware:
     Middleware de rate limiting.
     Limite le nombre de requêtes par utilisateur/IP pour protéger contre les abus.
     
+    Compteurs à fenêtre fixe : une clé par (portée, utilisateur/IP, fenêtre),
+    incrémentée atomiquement. Dans le cas courant, une seule opération de
+    cache par requête (un pipeline INCR + EXPIRE avec Redis).
+    
     Configuration via settings:
     - RATE_LIMIT_ENABLED: activer/désactiver le rate limiting (défaut: True)
     - RATE_LIMIT_REQUESTS: nombre de requêtes autorisées (défaut: 100)
     - RATE_LIMIT_WINDOW: fenêtre de temps en secondes (défaut: 60)
     - RATE_LIMIT_EXCLUDED_PATHS: liste de chemins exclus du rate limiting
+    - RATE_LIMIT_PATH_LIMITS: limites spécifiques par préfixe de chemin,
+      {prefix: (requêtes, fenêtre en secondes)}, appliquées à tous
+      (administrateurs compris) et comptées séparément
     
     Requirements: 9.1, 9.2, 9.3, 9.4
     """
@@ -155,6 +163,12 @@ class RateLimitMiddleware:
             '/media/',
             '/admin/jsi18n/',
         ])
+        # Préfixes les plus longs d'abord
+        self.path_limits = sorted(
+            getattr(settings, 'RATE_LIMIT_PATH_LIMITS', {}).items(),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
     
     def __call__(self, request):
         # Check if rate limiting is enabled (read dynamically to support testing)
@@ -166,19 +180,23 @@ class RateLimitMiddleware:
         if self._is_excluded_path(request.path):
             return self.get_response(request)
         
-        # Check if user is admin (admins are excluded from strict limits)
-        if self._is_admin_user(request):
+        # Limite spécifique au chemin (connexion, dons...) ou limite globale
+        scope, max_requests, window = self._get_limit(request.path)
+        
+        # Check if user is admin (admins are excluded from the global limit)
+        if scope == 'global' and self._is_admin_user(request):
             return self.get_response(request)
         
         # Get the rate limit key (based on user or IP)
-        rate_key = self._get_rate_key(request)
+        rate_key = self._get_rate_key(request, scope)
         
-        # Check rate limit
-        if self._is_rate_limited(rate_key):
-            return self._rate_limit_response(request, rate_key)
-        
-        # Increment request count
-        self._increment_request_count(rate_key)
+        # Count this request and check the limit
+        window_index = int(time.time() // window)
+        count = self._hit(f"{rate_key}:{window_index}", window)
+        if count > max_requests:
+            retry_after = max(1, int((window_index + 1) * window - time.time()))
+            # Une seule entrée d'audit par fenêtre dépassée
+            return self._rate_limit_response(request, retry_after, log=count == max_requests + 1)
         
         return self.get_response(request)
     
@@ -189,6 +207,18 @@ class RateLimitMiddleware:
                 return True
         return False
     
+    def _get_limit(self, path):
+        """
+        Retourne la portée et la limite applicables au chemin.
+        
+        Returns:
+            tuple: (portée, requêtes autorisées, fenêtre en secondes)
+        """
+        for prefix, (max_requests, window) in self.path_limits:
+            if path.startswith(prefix):
+                return prefix, max_requests, window
+        return 'global', self.max_requests, self.window_seconds
+    
     def _is_admin_user(self, request):
         """
         Check if the user is an admin (excluded from strict rate limits).
@@ -207,7 +237,7 @@ class RateLimitMiddleware:
         
         return False
     
-    def _get_rate_key(self, request):
+    def _get_rate_key(self, request, scope='global'):
         """
         Get the cache key for rate limiting.
         Uses user ID for authenticated users, IP for anonymous.
@@ -217,7 +247,7 @@ class RateLimitMiddleware:
         else:
             identifier = f"ip_{self._get_client_ip(request)}"
         
-        return f"{self.CACHE_PREFIX}:{identifier}"
+        return f"{self.CACHE_PREFIX}:{scope}:{identifier}"
     
     def _get_client_ip(self, request):
         """Get the client IP address from the request."""
@@ -228,59 +258,48 @@ class RateLimitMiddleware:
             ip = request.META.get('REMOTE_ADDR', '0.0.0.0')
         return ip
     
-    def _is_rate_limited(self, rate_key):
-        """Check if the rate limit has been exceeded."""
-        data = cache.get(rate_key)
-        if data is None:
-            return False
+    def _hit(self, key, window):
+        """
+        Incrémente atomiquement le compteur d'une fenêtre.
         
-        request_count = data.get('count', 0)
-        return request_count >= self.max_requests
-    
-    def _increment_request_count(self, rate_key):
-        """Increment the request count for the given key."""
-        data = cache.get(rate_key)
-        current_time = time.time()
+        Returns:
+            int: Nombre de requêtes dans la fenêtre, celle-ci comprise
+        """
+        client = self._get_redis_client(key)
+        if client is not None:
+            redis_key = cache.make_and_validate_key(key)
+            pipe = client.pipeline()
+            pipe.incr(redis_key)
+            pipe.expire(redis_key, window + 1)
+            count, _ = pipe.execute()
+            return count
         
-        if data is None:
-            # First request in this window
-            cache.set(rate_key, {
-                'count': 1,
-                'window_start': current_time
-            }, timeout=self.window_seconds)
-        else:
-            window_start = data.get('window_start', current_time)
-            
-            # Check if we're still in the same window
-            if current_time - window_start < self.window_seconds:
-                # Same window, increment count
-                data['count'] = data.get('count', 0) + 1
-                remaining_time = self.window_seconds - (current_time - window_start)
-                cache.set(rate_key, data, timeout=int(remaining_time) + 1)
-            else:
-                # New window, reset count
-                cache.set(rate_key, {
-                    'count': 1,
-                    'window_start': current_time
-                }, timeout=self.window_seconds)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Première requête de la fenêtre ; si une requête concurrente
+            # a créé la clé entre-temps, add échoue et on incrémente.
+            if cache.add(key, 1, timeout=window + 1):
+                return 1
+            return cache.incr(key)
     
-    def _get_retry_after(self, rate_key):
-        """Calculate the Retry-After value in seconds."""
-        data = cache.get(rate_key)
-        if data is None:
-            return self.window_seconds
+    def _get_redis_client(self, key):
+        """
+        Client Redis brut si le cache par défaut est RedisCache.
         
-        window_start = data.get('window_start', time.time())
-        elapsed = time.time() - window_start
-        retry_after = max(1, int(self.window_seconds - elapsed))
-        return retry_after
+        L'incr du backend Django vérifie d'abord l'existence de la clé
+        (deux allers-retours) ; le pipeline n'en fait qu'un.
+        """
+        backend = caches['default']
+        if isinstance(backend, RedisCache):
+            return backend._cache.get_client(key, write=True)
+        return None
     
-    def _rate_limit_response(self, request, rate_key):
+    def _rate_limit_response(self, request, retry_after, log=True):
         """Return a 429 Too Many Requests response."""
-        retry_after = self._get_retry_after(rate_key)
-        
         # Log the rate limit event
-        self._log_rate_limit(request)
+        if log:
+            self._log_rate_limit(request)
         
         # Check if it's an AJAX/API request
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest' or \
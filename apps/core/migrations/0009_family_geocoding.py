@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_alter_auditlog_action'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='family',
+            name='address_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=40, verbose_name="Empreinte de l'adresse"),
+        ),
+        migrations.AddField(
+            model_name='family',
+            name='geocode_status',
+            field=models.CharField(choices=[('pending', 'En attente'), ('ok', 'Géocodée'), ('not_found', 'Introuvable'), ('no_address', 'Sans adresse')], default='pending', max_length=10, verbose_name='Statut du géocodage'),
+        ),
+        migrations.AddField(
+            model_name='family',
+            name='geocoded_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Géocodée le'),
+        ),
+        migrations.AddIndex(
+            model_name='family',
+            index=models.Index(fields=['geocode_status'], name='core_family_geocode_9d9faf_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.9 on 2026-10-16 11:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_family_geocoding'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('export_type', models.CharField(blank=True, max_length=50, verbose_name="Type d'export")),
+                ('export_format', models.CharField(default='excel', max_length=10, verbose_name='Format')),
+                ('path', models.CharField(max_length=500, verbose_name='Chemin de la vue')),
+                ('query_string', models.TextField(blank=True, verbose_name='Paramètres')),
+                ('request_meta', models.JSONField(blank=True, default=dict, verbose_name='En-têtes de la requête')),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('success', 'Terminé'), ('failed', 'Échoué')], default='pending', max_length=10, verbose_name='Statut')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='Progression (%)')),
+                ('record_count', models.PositiveIntegerField(default=0, verbose_name="Nombre d'enregistrements")),
+                ('file', models.FileField(blank=True, upload_to='exports/%Y/%m/', verbose_name='Fichier')),
+                ('filename', models.CharField(blank=True, max_length=255, verbose_name='Nom du fichier')),
+                ('celery_task_id', models.CharField(blank=True, max_length=255, verbose_name='ID de tâche Celery')),
+                ('error_message', models.TextField(blank=True, verbose_name="Message d'erreur")),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Créé le')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Terminé le')),
+                ('expires_at', models.DateTimeField(blank=True, null=True, verbose_name='Expire le')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur')),
+            ],
+            options={
+                'verbose_name': 'Export en tâche de fond',
+                'verbose_name_plural': 'Exports en tâche de fond',
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(fields=['user', '-created_at'], name='core_export_user_id_5e38ea_idx'),
+                    models.Index(fields=['expires_at'], name='core_export_expires_de1b86_idx'),
+                ],
+            },
+        ),
+    ]
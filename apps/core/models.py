@@ -202,6 +202,14 @@ class Neighborhood(models.Model):
         return self.families.count()
 
 
+class GeocodeStatus(models.TextChoices):
+    """Statut du géocodage d'une adresse (membres et familles)."""
+    PENDING = 'pending', 'En attente'
+    OK = 'ok', 'Géocodée'
+    NOT_FOUND = 'not_found', 'Introuvable'
+    NO_ADDRESS = 'no_address', 'Sans adresse'
+
+
 class Family(models.Model):
     """
     Famille/Foyer regroupant plusieurs membres.
@@ -249,6 +257,21 @@ class Family(models.Model):
         verbose_name="Longitude"
     )
     
+    # Géocodage automatique (cf. apps.members.tasks.geocode_pending_addresses)
+    geocode_status = models.CharField(
+        max_length=10,
+        choices=GeocodeStatus.choices,
+        default=GeocodeStatus.PENDING,
+        verbose_name="Statut du géocodage"
+    )
+    address_fingerprint = models.CharField(
+        max_length=40,
+        blank=True,
+        editable=False,
+        verbose_name="Empreinte de l'adresse"
+    )
+    geocoded_at = models.DateTimeField(null=True, blank=True, verbose_name="Géocodée le")
+    
     # Contact principal
     phone = models.CharField(max_length=20, blank=True, verbose_name="Téléphone")
     email = models.EmailField(blank=True, verbose_name="Email")
@@ -267,6 +290,9 @@ class Family(models.Model):
         verbose_name = "Famille"
         verbose_name_plural = "Familles"
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['geocode_status']),
+        ]
     
     def __str__(self):
         return self.name
@@ -1004,6 +1030,75 @@ class SiteSettings(models.Model):
 # AUDIT LOGGING
 # =============================================================================
 
+class AuditSnapshotMixin:
+    """
+    Mémorise les valeurs des champs au chargement depuis la base.
+    
+    Les signaux d'audit (apps.core.signals) comparent l'instance à cet
+    instantané, sans relire l'objet en base avant chaque sauvegarde.
+    Les clés étrangères sont mémorisées par leur identifiant (attname),
+    ce qui évite aussi de charger les objets liés.
+    
+    À placer avant models.Model dans l'héritage :
+        class Member(AuditSnapshotMixin, models.Model): ...
+    """
+    
+    # Champs jamais comparés ni journalisés
+    AUDIT_EXCLUDED_FIELDS = frozenset({
+        'updated_at', 'created_at', 'last_login', 'password',
+        'two_factor_secret', 'two_factor_backup_codes',
+    })
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.take_audit_snapshot()
+        return instance
+    
+    def take_audit_snapshot(self):
+        """Mémorise les valeurs actuelles des champs chargés."""
+        self._audit_snapshot = self.get_audit_values()
+    
+    def get_audit_values(self):
+        """
+        Valeurs brutes des champs audités déjà présents en mémoire.
+        
+        Les champs différés (only/defer) sont ignorés pour ne pas
+        déclencher de requête.
+        """
+        loaded = self.__dict__
+        return {
+            field.name: loaded[field.attname]
+            for field in self._meta.concrete_fields
+            if field.name not in self.AUDIT_EXCLUDED_FIELDS and field.attname in loaded
+        }
+    
+    def get_audit_changes(self):
+        """
+        Différences entre l'instantané et l'état courant.
+        
+        Returns:
+            dict: {field: {'old': x, 'new': y}} (valeurs en chaînes), vide si
+            l'instance n'a pas été chargée depuis la base.
+        """
+        snapshot = getattr(self, '_audit_snapshot', None)
+        if not snapshot:
+            return {}
+        
+        changes = {}
+        current = self.get_audit_values()
+        for field_name, old_value in snapshot.items():
+            if field_name not in current:
+                continue
+            new_value = current[field_name]
+            if old_value != new_value:
+                changes[field_name] = {
+                    'old': str(old_value) if old_value is not None else None,
+                    'new': str(new_value) if new_value is not None else None
+                }
+        return changes
+
+
 class AuditLog(models.Model):
     """
     Journal d'audit des actions utilisateurs.
@@ -1128,10 +1223,17 @@ class AuditLog(models.Model):
             path: Chemin URL de la requête
             extra_data: Données supplémentaires
         
+        Dans une requête HTTP ou une tâche Celery, l'entrée est mise en
+        tampon et écrite avec les autres en fin de traitement
+        (cf. apps.core.signals.audit_buffer) ; sinon elle est écrite
+        immédiatement.
+        
         Returns:
-            AuditLog: L'entrée d'audit créée
+            AuditLog: L'entrée d'audit (pas encore sauvegardée si mise en tampon)
         """
-        return cls.objects.create(
+        from apps.core.signals import buffer_audit_entry
+        
+        entry = cls(
             action=action,
             user=user,
             model_name=model_name,
@@ -1143,6 +1245,24 @@ class AuditLog(models.Model):
             path=path[:500] if path else '',
             extra_data=extra_data or {}
         )
+        if not buffer_audit_entry(entry):
+            entry.save()
+        return entry
+    
+    def as_record(self):
+        """Valeurs sérialisables de l'entrée (écriture différée par Celery)."""
+        return {
+            'user_id': self.user_id,
+            'action': self.action,
+            'model_name': self.model_name,
+            'object_id': self.object_id,
+            'object_repr': self.object_repr,
+            'changes': self.changes,
+            'ip_address': self.ip_address,
+            'user_agent': self.user_agent,
+            'path': self.path,
+            'extra_data': self.extra_data,
+        }
     
     @classmethod
     def log_from_request(cls, request, action, model_name='', object_id='',
@@ -1382,3 +1502,113 @@ class DatabaseBackup(models.Model):
                 
                 # Supprimer l'enregistrement
                 record.delete()
+
+
+class ExportJob(models.Model):
+    """
+    Export (Excel ou PDF) généré en tâche de fond.
+    
+    Les exports volumineux sont produits par une tâche Celery à partir de
+    la vue d'export d'origine ; le fichier est conservé sous MEDIA jusqu'à
+    son expiration, puis supprimé par cleanup_expired_export_jobs.
+    """
+    
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'En attente'
+        RUNNING = 'running', 'En cours'
+        SUCCESS = 'success', 'Terminé'
+        FAILED = 'failed', 'Échoué'
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='export_jobs',
+        verbose_name="Utilisateur"
+    )
+    export_type = models.CharField(max_length=50, blank=True, verbose_name="Type d'export")
+    export_format = models.CharField(max_length=10, default='excel', verbose_name="Format")
+    
+    # Requête d'origine, rejouée par la tâche
+    path = models.CharField(max_length=500, verbose_name="Chemin de la vue")
+    query_string = models.TextField(blank=True, verbose_name="Paramètres")
+    request_meta = models.JSONField(default=dict, blank=True, verbose_name="En-têtes de la requête")
+    
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Statut"
+    )
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name="Progression (%)")
+    record_count = models.PositiveIntegerField(default=0, verbose_name="Nombre d'enregistrements")
+    
+    file = models.FileField(upload_to='exports/%Y/%m/', blank=True, verbose_name="Fichier")
+    filename = models.CharField(max_length=255, blank=True, verbose_name="Nom du fichier")
+    
+    celery_task_id = models.CharField(max_length=255, blank=True, verbose_name="ID de tâche Celery")
+    error_message = models.TextField(blank=True, verbose_name="Message d'erreur")
+    
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Terminé le")
+    expires_at = models.DateTimeField(null=True, blank=True, verbose_name="Expire le")
+    
+    class Meta:
+        verbose_name = "Export en tâche de fond"
+        verbose_name_plural = "Exports en tâche de fond"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.export_type or self.path} - {self.get_status_display()}"
+    
+    @property
+    def is_finished(self):
+        """True si la tâche est terminée (succès ou échec)."""
+        return self.status in (self.Status.SUCCESS, self.Status.FAILED)
+    
+    @property
+    def is_expired(self):
+        """True si le fichier généré a expiré."""
+        from django.utils import timezone
+        return bool(self.expires_at and self.expires_at <= timezone.now())
+    
+    @property
+    def is_downloadable(self):
+        """True si le fichier peut être téléchargé."""
+        return self.status == self.Status.SUCCESS and bool(self.file) and not self.is_expired
+    
+    def set_progress(self, progress):
+        """Met à jour la progression sans passer par save()."""
+        type(self).objects.filter(pk=self.pk).update(progress=progress)
+        self.progress = progress
+    
+    def mark_as_success(self, fileobj, filename, record_count=0):
+        """Enregistre le fichier généré et marque l'export comme terminé."""
+        from datetime import timedelta
+        from django.core.files import File
+        from django.utils import timezone
+        
+        self.file.save(filename, File(fileobj), save=False)
+        self.filename = filename
+        self.record_count = record_count
+        self.status = self.Status.SUCCESS
+        self.progress = 100
+        self.completed_at = timezone.now()
+        self.expires_at = self.completed_at + timedelta(
+            hours=getattr(settings, 'EXPORT_JOB_EXPIRY_HOURS', 24)
+        )
+        self.save(update_fields=[
+            'file', 'filename', 'record_count', 'status', 'progress',
+            'completed_at', 'expires_at'
+        ])
+    
+    def mark_as_failed(self, error_message=''):
+        """Marque l'export comme échoué."""
+        from django.utils import timezone
+        self.status = self.Status.FAILED
+        self.completed_at = timezone.now()
+        self.error_message = error_message
+        self.save(update_fields=['status', 'completed_at', 'error_message'])
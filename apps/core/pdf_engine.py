@@ -0,0 +1,282 @@
+"""
+Moteur de rendu PDF partagé (WeasyPrint).
+
+La configuration des polices et les feuilles de style sont construites une
+seule fois par processus puis réutilisées : l'analyse du CSS et le
+chargement des polices ne sont plus payés à chaque document.
+
+Les ressources des documents (images, CSS) sont lues directement sur le
+disque (local_url_fetcher) : les URLs /static/ et /media/ sont résolues
+vers les fichiers, aucune requête HTTP n'est émise et les ressources
+externes sont ignorées.
+
+Les rendus en lot (reçus fiscaux, fiches de déroulement...) sont répartis
+sur un pool de processus ; le HTML est rendu au préalable dans le processus
+appelant (accès à la base), les processus du pool ne font que la mise en
+page.
+
+Le temps de rendu de chaque document est mesuré et cumulé par type de
+document (cf. get_render_stats).
+
+Usage:
+    pdf_bytes = render_template('worship/pdf/run_sheet.html', context,
+                                name='run_sheet')
+"""
+import logging
+import mimetypes
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+from urllib.parse import unquote, urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+logger = logging.getLogger(__name__)
+
+# Base des URLs relatives des documents : résolue par local_url_fetcher
+BASE_URL = 'http://pdf.local/'
+
+STATS_PREFIX = 'pdfengine:stats'
+
+_font_config = None
+_stylesheets: Dict[str, object] = {}
+
+
+def is_available() -> bool:
+    """Indique si WeasyPrint est installé."""
+    try:
+        import weasyprint  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ----------------------------------------------------------------------
+# Ressources partagées par processus
+# ----------------------------------------------------------------------
+
+def get_font_config():
+    """Configuration des polices, créée une fois par processus."""
+    global _font_config
+    if _font_config is None:
+        from weasyprint.text.fonts import FontConfiguration
+        _font_config = FontConfiguration()
+    return _font_config
+
+
+def get_stylesheet(css: str):
+    """Feuille de style analysée une fois par processus (clé : le CSS)."""
+    stylesheet = _stylesheets.get(css)
+    if stylesheet is None:
+        from weasyprint import CSS
+        stylesheet = CSS(string=css, font_config=get_font_config(), url_fetcher=local_url_fetcher)
+        _stylesheets[css] = stylesheet
+    return stylesheet
+
+
+def _resolve_local_path(path: str) -> Optional[Path]:
+    """Fichier local correspondant à un chemin d'URL /static/... ou /media/..."""
+    static_url = '/' + settings.STATIC_URL.strip('/') + '/'
+    media_url = '/' + settings.MEDIA_URL.strip('/') + '/'
+
+    if path.startswith(static_url):
+        from django.contrib.staticfiles import finders
+
+        relative = path[len(static_url):]
+        found = finders.find(relative)
+        if found:
+            return Path(found)
+        candidate = Path(settings.STATIC_ROOT) / relative
+    elif path.startswith(media_url):
+        candidate = Path(settings.MEDIA_ROOT) / path[len(media_url):]
+    else:
+        return None
+
+    return candidate if candidate.is_file() else None
+
+
+def local_url_fetcher(url: str, timeout: int = 10, ssl_context=None):
+    """
+    Résout les ressources d'un document sans HTTP.
+
+    Les URLs (relatives ou absolues, quel que soit l'hôte) dont le chemin
+    commence par STATIC_URL ou MEDIA_URL sont lues sur le disque ; les
+    URLs data: et file: sont déléguées à WeasyPrint. Toute autre URL est
+    refusée (WeasyPrint ignore alors la ressource).
+    """
+    from weasyprint import default_url_fetcher
+
+    parsed = urlparse(url)
+    if parsed.scheme in ('data', 'file'):
+        return default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
+
+    path = _resolve_local_path(unquote(parsed.path))
+    if path is None:
+        raise ValueError(f"Ressource non locale ignorée : {url}")
+
+    return {
+        'file_obj': path.open('rb'),
+        'mime_type': mimetypes.guess_type(path.name)[0],
+        'redirected_url': path.as_uri(),
+        'filename': path.name,
+    }
+
+
+# ----------------------------------------------------------------------
+# Métriques
+# ----------------------------------------------------------------------
+
+def _record_render(name: str, duration_ms: int) -> None:
+    for suffix, value in (('count', 1), ('total_ms', duration_ms)):
+        key = f"{STATS_PREFIX}:{name}:{suffix}"
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            if not cache.add(key, value, None):
+                cache.incr(key, value)
+    logger.info(f"PDF '{name}' rendu en {duration_ms} ms")
+
+
+def get_render_stats(name: str) -> Dict[str, Union[int, float]]:
+    """
+    Temps de rendu cumulés d'un type de document, partagés entre processus.
+
+    Returns:
+        {'count': int, 'total_ms': int, 'avg_ms': float}
+    """
+    keys = {suffix: f"{STATS_PREFIX}:{name}:{suffix}" for suffix in ('count', 'total_ms')}
+    found = cache.get_many(list(keys.values()))
+    count = found.get(keys['count'], 0)
+    total_ms = found.get(keys['total_ms'], 0)
+    return {
+        'count': count,
+        'total_ms': total_ms,
+        'avg_ms': round(total_ms / count, 1) if count else 0.0,
+    }
+
+
+# ----------------------------------------------------------------------
+# Rendu
+# ----------------------------------------------------------------------
+
+def _write_pdf(html: str, stylesheets: Sequence[str] = (), target=None):
+    """
+    Met en page un document ; retourne (PDF ou None si target, durée en ms).
+    """
+    from weasyprint import HTML
+
+    started = time.perf_counter()
+    document = HTML(string=html, base_url=BASE_URL, url_fetcher=local_url_fetcher)
+    pdf = document.write_pdf(
+        target,
+        stylesheets=[get_stylesheet(css) for css in stylesheets],
+        font_config=get_font_config(),
+    )
+    return pdf, round((time.perf_counter() - started) * 1000)
+
+
+def render_html(
+    html: str,
+    stylesheets: Sequence[str] = (),
+    name: str = 'document',
+    target=None,
+) -> Optional[bytes]:
+    """
+    Génère un PDF à partir de HTML.
+
+    Args:
+        html: Document HTML
+        stylesheets: Feuilles de style (CSS texte, mises en cache par processus)
+        name: Type de document (métriques)
+        target: Chemin ou fichier où écrire le PDF (sinon retourné en bytes)
+
+    Returns:
+        bytes du PDF, ou None si target est fourni
+    """
+    pdf, duration_ms = _write_pdf(html, tuple(stylesheets), target)
+    _record_render(name, duration_ms)
+    return pdf
+
+
+def render_template(
+    template_name: str,
+    context: dict,
+    stylesheets: Sequence[str] = (),
+    name: Optional[str] = None,
+    request=None,
+    target=None,
+) -> Optional[bytes]:
+    """Génère un PDF à partir d'un template (cf. render_html)."""
+    html = render_to_string(template_name, context, request=request)
+    return render_html(html, stylesheets, name=name or template_name, target=target)
+
+
+def _render_job(html: str, stylesheets: tuple, path: Optional[str]):
+    # Exécutée dans un processus du pool : polices et CSS y sont mis en
+    # cache pour tous les documents suivants
+    return _write_pdf(html, stylesheets, path)
+
+
+def get_render_workers() -> int:
+    """
+    Nombre de processus pour les rendus en lot (PDF_RENDER_WORKERS, 0 = un
+    par cœur). Les processus démons (enfants d'un worker Celery prefork) ne
+    pouvant pas créer de pool, le rendu y reste séquentiel.
+    """
+    if multiprocessing.current_process().daemon:
+        return 1
+    return getattr(settings, 'PDF_RENDER_WORKERS', 0) or os.cpu_count() or 1
+
+
+def render_many(
+    documents: Iterable[dict],
+    name: str = 'document',
+    output_dir: Union[str, Path, None] = None,
+    workers: Optional[int] = None,
+) -> List[Union[bytes, Path]]:
+    """
+    Génère plusieurs PDF, en parallèle sur un pool de processus.
+
+    Args:
+        documents: Dictionnaires {'html': str} ou {'template_name', 'context'},
+            avec 'stylesheets' (optionnel) et 'filename' (si output_dir)
+        name: Type de document (métriques)
+        output_dir: Répertoire où écrire les fichiers (sinon bytes retournés)
+        workers: Nombre de processus (cf. get_render_workers)
+
+    Returns:
+        list: bytes de chaque PDF, ou chemins des fichiers écrits, dans
+        l'ordre des documents
+    """
+    jobs = []
+    for document in documents:
+        html = document.get('html')
+        if html is None:
+            html = render_to_string(document['template_name'], document.get('context', {}))
+        path = None
+        if output_dir is not None:
+            path = str(Path(output_dir) / document['filename'])
+        jobs.append((html, tuple(document.get('stylesheets', ())), path))
+
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    workers = min(workers or get_render_workers(), len(jobs))
+    if workers > 1:
+        # fork : les processus héritent des réglages Django déjà chargés
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            rendered = list(executor.map(_render_job, *zip(*jobs)))
+    else:
+        rendered = [_render_job(*job) for job in jobs]
+
+    results = []
+    for (pdf, duration_ms), (_html, _stylesheets, path) in zip(rendered, jobs):
+        _record_render(name, duration_ms)
+        results.append(Path(path) if path is not None else pdf)
+    return results
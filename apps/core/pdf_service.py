@@ -1,18 +1,17 @@
 """
 Service de génération PDF avec WeasyPrint.
 
-Ce module fournit des fonctions pour générer des PDF à partir de templates HTML.
+Ce module fournit des fonctions pour générer des PDF à partir de templates HTML
+(rendu par le moteur partagé apps.core.pdf_engine).
 """
 
-from django.template.loader import render_to_string
 from django.http import HttpResponse
 from django.conf import settings
-from weasyprint import HTML, CSS
-from weasyprint.text.fonts import FontConfiguration
-from io import BytesIO
 from datetime import datetime
 import logging
 
+from . import pdf_engine
+
 logger = logging.getLogger(__name__)
 
 
@@ -176,27 +175,21 @@ class PDFService:
             context['print_date'] = datetime.now()
             context['site_name'] = getattr(settings, 'SITE_NAME', 'EEBC')
             
-            # Rendre le template HTML
-            html_string = render_to_string(template_name, context, request=request)
-            
-            # Configuration des polices
-            font_config = FontConfiguration()
-            
-            # Créer le PDF
-            html = HTML(string=html_string, base_url=request.build_absolute_uri('/') if request else None)
-            css = CSS(string=cls.BASE_CSS, font_config=font_config)
-            
-            # Générer le PDF en mémoire
-            pdf_buffer = BytesIO()
-            html.write_pdf(pdf_buffer, stylesheets=[css], font_config=font_config)
-            pdf_buffer.seek(0)
+            # Rendre le PDF (polices et CSS de base mis en cache par processus)
+            pdf = pdf_engine.render_template(
+                template_name,
+                context,
+                stylesheets=[cls.BASE_CSS],
+                name=template_name,
+                request=request,
+            )
             
             # Créer la réponse HTTP
             if not filename:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f"document_{timestamp}.pdf"
             
-            response = HttpResponse(pdf_buffer.read(), content_type='application/pdf')
+            response = HttpResponse(pdf, content_type='application/pdf')
             response['Content-Disposition'] = f'inline; filename="{filename}"'
             
             return response
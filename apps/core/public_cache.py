@@ -0,0 +1,172 @@
+"""
+Cache du site vitrine public.
+
+Deux niveaux, tous deux adossés au cache à tags (cf. apps.core.cache) :
+
+- fragments de contexte communs à toutes les pages (paramètres du site,
+  sites, menu, slides), partagés par tous les visiteurs ;
+- pages complètes servies aux visiteurs anonymes (PublicPageCacheMixin),
+  avec ETag / Last-Modified et réponses 304.
+
+Toute écriture sur un modèle du site public incrémente son tag
+(signals.bump_model_cache_tag) : les pages et fragments concernés sont
+recalculés à la requête suivante.
+
+Les fenêtres d'affichage planifiées sont gérées par le temps : la date du
+jour fait partie des clés (display_start_date / display_end_date et
+événements à venir changent à minuit), et la durée de vie d'une page est
+bornée par la prochaine publication programmée (publish_date).
+"""
+import hashlib
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .cache import get_or_compute
+
+PUBLIC_CACHE_TAGS = (
+    'core.NewsArticle',
+    'core.PageContent',
+    'core.PublicEvent',
+    'core.Site',
+    'core.SiteSettings',
+    'core.Slider',
+)
+
+
+def _compute_fragments():
+    from .models import PageContent, Site, SiteSettings, Slider
+
+    return {
+        'settings': SiteSettings.get_settings(),
+        'sites': list(Site.objects.filter(is_active=True)),
+        'menu_pages': list(PageContent.objects.filter(
+            is_published=True,
+            show_in_menu=True
+        ).order_by('menu_order')),
+        'slides': list(Slider.objects.filter(is_active=True).order_by('order')),
+    }
+
+
+def get_public_fragments() -> dict:
+    """
+    Fragments de contexte communs aux pages publiques.
+
+    Returns:
+        {'settings': SiteSettings, 'sites': [Site], 'menu_pages': [PageContent],
+         'slides': [Slider]}
+    """
+    return get_or_compute(
+        'public:fragments',
+        compute=_compute_fragments,
+        timeout=getattr(settings, 'PUBLIC_PAGE_CACHE_TIMEOUT', 600),
+        tags=PUBLIC_CACHE_TAGS,
+    )
+
+
+def _compute_next_publication():
+    from .models import NewsArticle
+
+    return NewsArticle.objects.filter(
+        is_published=True,
+        publish_date__gt=timezone.now(),
+    ).order_by('publish_date').values_list('publish_date', flat=True).first()
+
+
+def get_page_timeout() -> int:
+    """
+    Durée de vie d'une page en cache : PUBLIC_PAGE_CACHE_TIMEOUT, bornée
+    par la prochaine publication programmée et par minuit.
+    """
+    timeout = getattr(settings, 'PUBLIC_PAGE_CACHE_TIMEOUT', 600)
+    now = timezone.now()
+
+    next_publication = get_or_compute(
+        'public:next_publication',
+        parts=(date.today(),),
+        compute=_compute_next_publication,
+        timeout=timeout,
+        tags=('core.NewsArticle',),
+    )
+    if next_publication is not None and next_publication > now:
+        timeout = min(timeout, int((next_publication - now).total_seconds()) + 1)
+
+    midnight = timezone.make_aware(datetime.combine(date.today() + timedelta(days=1), time.min))
+    return max(1, min(timeout, int((midnight - now).total_seconds()) + 1))
+
+
+def _is_cacheable_request(request) -> bool:
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.user.is_authenticated or request.headers.get('HX-Request'):
+        return False
+    # Messages en attente (affichés par le gabarit) : page propre au visiteur
+    if request.COOKIES.get(getattr(settings, 'MESSAGE_COOKIE_NAME', 'messages')):
+        return False
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if session_key and request.session.get('_messages'):
+        return False
+    return True
+
+
+class PublicPageCacheMixin:
+    """
+    Cache de page complète pour les visiteurs anonymes.
+
+    La page est rendue une fois puis servie depuis le cache jusqu'à la
+    prochaine modification d'un modèle public (ou à l'expiration planifiée,
+    cf. get_page_timeout). Les requêtes conditionnelles (If-None-Match,
+    If-Modified-Since) reçoivent un 304 sans corps.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not _is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        rendered = {}
+
+        def render_page():
+            response = super(PublicPageCacheMixin, self).dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+            rendered['response'] = response
+            if response.status_code != 200 or response.cookies:
+                return None
+            content = response.content
+            return {
+                'content': content,
+                'content_type': response['Content-Type'],
+                'etag': f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+                'last_modified': int(timezone.now().timestamp()),
+            }
+
+        page = get_or_compute(
+            'public:page',
+            parts=(type(self).__name__, request.get_full_path(), date.today()),
+            compute=render_page,
+            timeout=get_page_timeout(),
+            tags=PUBLIC_CACHE_TAGS,
+        )
+        if page is None:
+            # Réponse non cachable (redirection, cookie...) : rendu normal
+            return rendered.get('response') or super().dispatch(request, *args, **kwargs)
+
+        return self._cached_response(request, page)
+
+    @staticmethod
+    def _cached_response(request, page):
+        from django.http import HttpResponse
+
+        response = HttpResponse(page['content'], content_type=page['content_type'])
+        response['ETag'] = page['etag']
+        response['Last-Modified'] = http_date(page['last_modified'])
+        patch_vary_headers(response, ('Cookie',))
+        return get_conditional_response(
+            request,
+            etag=page['etag'],
+            last_modified=page['last_modified'],
+            response=response,
+        )
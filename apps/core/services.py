@@ -8,14 +8,16 @@ Ce module fournit des services réutilisables pour :
 """
 
 import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
-from django.http import HttpResponse
+from django.http import HttpResponse, FileResponse
 from django.template.loader import render_to_string
 from django.conf import settings
 import io
+import tempfile
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -153,6 +155,131 @@ class ExportService:
             logger.error(f"Erreur lors de l'export Excel: {e}")
             raise
     
+    EXCEL_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    
+    @classmethod
+    def _add_named_styles(cls, wb):
+        """
+        Enregistre les styles nommés du classeur.
+        
+        Un style nommé est partagé par toutes les cellules qui l'utilisent,
+        au lieu d'un objet bordure/alignement par cellule.
+        """
+        styles = [
+            NamedStyle(name='eebc_title', font=cls.TITLE_FONT),
+            NamedStyle(name='eebc_subtitle', font=cls.SUBTITLE_FONT),
+            NamedStyle(name='eebc_label', font=Font(bold=True)),
+            NamedStyle(
+                name='eebc_header', font=cls.HEADER_FONT, fill=cls.HEADER_FILL,
+                border=cls.BORDER, alignment=Alignment(horizontal='center')
+            ),
+            NamedStyle(name='eebc_cell', border=cls.BORDER),
+            NamedStyle(name='eebc_number', border=cls.BORDER, alignment=Alignment(horizontal='right')),
+            NamedStyle(
+                name='eebc_amount', border=cls.BORDER, alignment=Alignment(horizontal='right'),
+                number_format='#,##0.00 "€"'
+            ),
+        ]
+        for style in styles:
+            wb.add_named_style(style)
+    
+    @classmethod
+    def build_excel_file(
+        cls,
+        rows: Iterable[Any],
+        headers: List[str],
+        title: str,
+        subtitle: str = "",
+        metadata: Dict[str, Any] = None,
+        fileobj=None
+    ) -> Tuple[Any, int]:
+        """
+        Écrit un fichier Excel ligne par ligne (classeur en écriture seule).
+        
+        La mémoire utilisée ne dépend pas du nombre de lignes : `rows` peut
+        être un générateur alimenté par `queryset.iterator()`.
+        
+        Args:
+            rows: Lignes à écrire (dictionnaires indexés par en-tête ou séquences)
+            headers: Liste des en-têtes de colonnes
+            title: Titre principal du document
+            subtitle: Sous-titre optionnel
+            metadata: Métadonnées additionnelles à afficher
+            fileobj: Fichier de destination (fichier temporaire si None)
+        
+        Returns:
+            Tuple (fichier rembobiné, nombre de lignes de données)
+        """
+        if fileobj is None:
+            fileobj = tempfile.TemporaryFile()
+        
+        wb = openpyxl.Workbook(write_only=True)
+        cls._add_named_styles(wb)
+        ws = wb.create_sheet("Export")
+        
+        # Les largeurs doivent être fixées avant la première ligne
+        for col_num in range(1, len(headers) + 1):
+            ws.column_dimensions[get_column_letter(col_num)].width = 15
+        
+        def styled(value, style):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            return cell
+        
+        ws.append([styled(title, 'eebc_title')])
+        ws.append([])
+        
+        if subtitle:
+            ws.append([styled(subtitle, 'eebc_subtitle')])
+            ws.append([])
+        
+        if metadata:
+            for key, value in metadata.items():
+                ws.append([styled(f"{key}:", 'eebc_label'), str(value)])
+            ws.append([])
+        
+        ws.append([styled("Date d'export:", 'eebc_label'), datetime.now().strftime('%d/%m/%Y %H:%M')])
+        ws.append([])
+        
+        ws.append([styled(header, 'eebc_header') for header in headers])
+        
+        amount_columns = {i for i, header in enumerate(headers) if 'montant' in header.lower()}
+        count = 0
+        for row_data in rows:
+            cells = []
+            for col_index, header in enumerate(headers):
+                if isinstance(row_data, dict):
+                    value = row_data.get(header, "")
+                else:
+                    value = row_data[col_index] if col_index < len(row_data) else ""
+                
+                if isinstance(value, (int, float)):
+                    style = 'eebc_amount' if col_index in amount_columns else 'eebc_number'
+                else:
+                    style = 'eebc_cell'
+                cells.append(styled(value, style))
+            ws.append(cells)
+            count += 1
+        
+        wb.save(fileobj)
+        fileobj.seek(0)
+        return fileobj, count
+    
+    @classmethod
+    def excel_file_response(cls, fileobj, filename: str) -> FileResponse:
+        """
+        Renvoie un fichier Excel par blocs (StreamingHttpResponse).
+        
+        Le fichier est fermé, donc supprimé s'il est temporaire, à la fin
+        de la réponse.
+        """
+        return FileResponse(
+            fileobj,
+            as_attachment=True,
+            filename=filename,
+            content_type=cls.EXCEL_CONTENT_TYPE
+        )
+    
     @classmethod
     def prepare_print_context(
         cls,
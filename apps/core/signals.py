@@ -9,12 +9,20 @@ Ce module contient les signals Django pour:
 Requirements: 8.2, 8.3
 """
 
-from django.db.models.signals import post_save, post_delete, pre_save
+import logging
+import threading
+from contextlib import contextmanager
+
+from celery.signals import task_prerun, task_postrun
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
 
+logger = logging.getLogger(__name__)
+
 # Thread-local storage pour stocker le contexte de la requête
-import threading
 _thread_locals = threading.local()
 
 
@@ -34,10 +42,143 @@ def clear_current_request():
         del _thread_locals.request
 
 
+# =============================================================================
+# TAMPON D'AUDIT
+# =============================================================================
+
+def get_audit_buffer():
+    """Retourne le tampon d'audit actif du thread courant (ou None)."""
+    return getattr(_thread_locals, 'audit_buffer', None)
+
+
+def start_audit_buffer():
+    """
+    Active la mise en tampon des entrées d'audit pour le thread courant.
+    
+    Returns:
+        bool: True si le tampon a été créé, False s'il était déjà actif
+    """
+    if get_audit_buffer() is not None:
+        return False
+    _thread_locals.audit_buffer = []
+    return True
+
+
+def buffer_audit_entry(entry):
+    """
+    Ajoute une entrée (AuditLog non sauvegardée) au tampon actif.
+    
+    Dans une transaction, l'entrée n'est ajoutée qu'à sa validation
+    (transaction.on_commit) : une modification annulée n'est pas journalisée.
+    
+    Returns:
+        bool: False si aucun tampon n'est actif (l'appelant écrit directement)
+    """
+    if get_audit_buffer() is None:
+        return False
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _append_audit_entry(entry))
+    else:
+        _append_audit_entry(entry)
+    return True
+
+
+def _append_audit_entry(entry):
+    """
+    Ajoute une entrée validée au tampon (ou l'écrit si le tampon a été vidé).
+    
+    Le tampon est vidé par blocs de AUDIT_LOG_BUFFER_SIZE pour borner la
+    mémoire lors des traitements massifs (imports).
+    """
+    buffer = get_audit_buffer()
+    if buffer is None:
+        write_audit_entries([entry])
+        return
+    buffer.append(entry)
+    if len(buffer) >= getattr(settings, 'AUDIT_LOG_BUFFER_SIZE', 500):
+        write_audit_entries(buffer[:])
+        buffer.clear()
+
+
+def flush_audit_buffer():
+    """Écrit les entrées en attente et désactive le tampon."""
+    buffer = get_audit_buffer()
+    if buffer is None:
+        return
+    del _thread_locals.audit_buffer
+    write_audit_entries(buffer)
+
+
+def write_audit_entries(entries):
+    """
+    Écrit des entrées d'audit en un seul INSERT groupé.
+    
+    Avec AUDIT_LOG_ASYNC, l'écriture est confiée à une tâche Celery.
+    Un échec d'écriture directe ne fait pas échouer la requête ou la tâche
+    (le tampon est écrit après la réponse) : les entrées sont confiées à la
+    tâche write_audit_log_entries, qui retente l'écriture, ou à défaut
+    consignées dans les logs. Le journal ne perd pas d'entrées en silence.
+    """
+    if not entries:
+        return
+    
+    from apps.core.models import AuditLog
+    from apps.core.tasks import write_audit_log_entries
+    
+    # Celery joignable : un échec d'écriture directe est retenté par la tâche
+    can_defer = True
+    if getattr(settings, 'AUDIT_LOG_ASYNC', False):
+        try:
+            write_audit_log_entries.delay([entry.as_record() for entry in entries])
+            return
+        except Exception as e:
+            logger.warning(f"Écriture différée du journal d'audit impossible, écriture directe: {e}")
+            can_defer = False
+    
+    try:
+        AuditLog.objects.bulk_create(entries, batch_size=500)
+        return
+    except Exception:
+        logger.exception(f"Erreur lors de l'écriture de {len(entries)} entrée(s) d'audit")
+    
+    records = [entry.as_record() for entry in entries]
+    if can_defer:
+        try:
+            write_audit_log_entries.delay(records)
+            return
+        except Exception:
+            logger.exception("Nouvel essai différé du journal d'audit impossible")
+    logger.error(f"Entrées d'audit non écrites: {records}")
+
+
+@contextmanager
+def audit_buffer():
+    """
+    Regroupe les entrées d'audit d'un bloc de code en une écriture.
+    
+    Usage (commandes, traitements hors requête) :
+        with audit_buffer():
+            for row in rows:
+                Member.objects.create(...)
+    
+    Sans effet si un tampon est déjà actif (requête HTTP, tâche Celery) :
+    c'est le tampon englobant qui écrira les entrées.
+    """
+    started = start_audit_buffer()
+    try:
+        yield
+    finally:
+        if started:
+            flush_audit_buffer()
+
+
 class AuditMiddleware:
     """
     Middleware pour stocker la requête courante dans le thread local.
     Permet aux signals d'accéder au contexte de la requête.
+    
+    Les entrées d'audit produites pendant la requête sont mises en tampon
+    et écrites en une fois à la fin de la réponse.
     """
     
     def __init__(self, get_response):
@@ -45,18 +186,42 @@ class AuditMiddleware:
     
     def __call__(self, request):
         set_current_request(request)
+        started = start_audit_buffer()
         try:
             response = self.get_response(request)
         finally:
+            if started:
+                flush_audit_buffer()
             clear_current_request()
         return response
 
 
+@task_prerun.connect
+def start_task_audit_buffer(task_id=None, **kwargs):
+    """Met en tampon les entrées d'audit d'une tâche Celery."""
+    if start_audit_buffer():
+        _thread_locals.audit_buffer_owner = task_id
+
+
+@task_postrun.connect
+def flush_task_audit_buffer(task_id=None, **kwargs):
+    """
+    Écrit les entrées d'audit de la tâche à sa fin.
+    
+    Une tâche exécutée en mode eager dans une requête laisse le tampon de
+    la requête intact.
+    """
+    if getattr(_thread_locals, 'audit_buffer_owner', None) == task_id:
+        del _thread_locals.audit_buffer_owner
+        flush_audit_buffer()
+
+
 # =============================================================================
 # SIGNALS POUR LES MODÈLES SENSIBLES
 # =============================================================================
 
-# Liste des modèles à auditer automatiquement
+# Liste des modèles à auditer automatiquement.
+# Ces modèles héritent de AuditSnapshotMixin (apps.core.models).
 AUDITED_MODELS = [
     'members.Member',
     'finance.FinancialTransaction',
@@ -64,10 +229,29 @@ AUDITED_MODELS = [
     'accounts.User',
 ]
 
+_audited_model_classes = None
+
+
+def get_audited_model_classes():
+    """
+    Classes des modèles audités, résolues une seule fois.
+    
+    Returns:
+        frozenset: Classes de modèles correspondant à AUDITED_MODELS
+    """
+    global _audited_model_classes
+    if _audited_model_classes is None:
+        from django.apps import apps
+        _audited_model_classes = frozenset(apps.get_model(label) for label in AUDITED_MODELS)
+    return _audited_model_classes
+
 
 def get_model_changes(instance, created):
     """
-    Calcule les changements entre l'ancienne et la nouvelle version d'un objet.
+    Calcule les changements entre l'état chargé et l'état courant d'un objet.
+    
+    Les valeurs d'origine proviennent de l'instantané pris au chargement
+    (AuditSnapshotMixin) : aucune requête n'est effectuée.
     
     Args:
         instance: L'instance du modèle
@@ -79,63 +263,12 @@ def get_model_changes(instance, created):
     if created:
         return {'_created': True}
     
-    changes = {}
-    
-    # Récupérer l'ancienne version depuis la base de données
-    try:
-        old_instance = instance.__class__.objects.get(pk=instance.pk)
-    except instance.__class__.DoesNotExist:
-        return {'_created': True}
-    
-    # Comparer les champs
-    for field in instance._meta.fields:
-        field_name = field.name
-        
-        # Ignorer certains champs
-        if field_name in ['updated_at', 'created_at', 'last_login', 'password']:
-            continue
-        
-        old_value = getattr(old_instance, field_name, None)
-        new_value = getattr(instance, field_name, None)
-        
-        # Convertir les valeurs pour la comparaison
-        if hasattr(old_value, 'pk'):
-            old_value = old_value.pk
-        if hasattr(new_value, 'pk'):
-            new_value = new_value.pk
-        
-        if old_value != new_value:
-            changes[field_name] = {
-                'old': str(old_value) if old_value is not None else None,
-                'new': str(new_value) if new_value is not None else None
-            }
-    
-    return changes
+    return instance.get_audit_changes()
 
 
 def should_audit_model(sender):
     """Vérifie si un modèle doit être audité."""
-    model_path = f"{sender._meta.app_label}.{sender._meta.object_name}"
-    return model_path in AUDITED_MODELS
-
-
-@receiver(pre_save)
-def store_old_instance(sender, instance, **kwargs):
-    """
-    Stocke l'ancienne version de l'instance avant la sauvegarde.
-    Utilisé pour calculer les changements.
-    """
-    if not should_audit_model(sender):
-        return
-    
-    if instance.pk:
-        try:
-            old_instance = sender.objects.get(pk=instance.pk)
-            instance._old_instance = old_instance
-        except sender.DoesNotExist:
-            instance._old_instance = None
-    else:
-        instance._old_instance = None
+    return sender in get_audited_model_classes()
 
 
 @receiver(post_save)
@@ -154,32 +287,9 @@ def audit_model_save(sender, instance, created, **kwargs):
     # Déterminer l'action
     action = AuditLog.Action.CREATE if created else AuditLog.Action.UPDATE
     
-    # Calculer les changements
-    changes = {}
-    if not created and hasattr(instance, '_old_instance') and instance._old_instance:
-        old_instance = instance._old_instance
-        for field in instance._meta.fields:
-            field_name = field.name
-            
-            # Ignorer certains champs sensibles ou techniques
-            if field_name in ['updated_at', 'created_at', 'last_login', 'password', 
-                              'two_factor_secret', 'two_factor_backup_codes']:
-                continue
-            
-            old_value = getattr(old_instance, field_name, None)
-            new_value = getattr(instance, field_name, None)
-            
-            # Convertir les FK en leur PK pour comparaison
-            if hasattr(old_value, 'pk'):
-                old_value = old_value.pk
-            if hasattr(new_value, 'pk'):
-                new_value = new_value.pk
-            
-            if old_value != new_value:
-                changes[field_name] = {
-                    'old': str(old_value) if old_value is not None else None,
-                    'new': str(new_value) if new_value is not None else None
-                }
+    # Calculer les changements depuis le dernier chargement/sauvegarde
+    changes = {} if created else instance.get_audit_changes()
+    instance.take_audit_snapshot()
     
     # Récupérer le contexte de la requête
     request = get_current_request()
@@ -189,7 +299,7 @@ def audit_model_save(sender, instance, created, **kwargs):
         AuditLog.log_from_request(
             request=request,
             action=action,
-            model_name=f"{sender._meta.app_label}.{sender._meta.object_name}",
+            model_name=sender._meta.label,
             object_id=instance.pk,
             object_repr=str(instance),
             changes=changes
@@ -198,7 +308,7 @@ def audit_model_save(sender, instance, created, **kwargs):
         # Pas de requête (ex: commande manage.py, tâche Celery)
         AuditLog.log(
             action=action,
-            model_name=f"{sender._meta.app_label}.{sender._meta.object_name}",
+            model_name=sender._meta.label,
             object_id=instance.pk,
             object_repr=str(instance),
             changes=changes,
@@ -223,13 +333,12 @@ def audit_model_delete(sender, instance, **kwargs):
     request = get_current_request()
     
     # Préparer les données de l'objet supprimé
+    # (clés étrangères par leur identifiant, sans charger les objets liés)
     deleted_data = {}
-    for field in instance._meta.fields:
+    for field in instance._meta.concrete_fields:
         field_name = field.name
         if field_name not in ['password', 'two_factor_secret', 'two_factor_backup_codes']:
-            value = getattr(instance, field_name, None)
-            if hasattr(value, 'pk'):
-                value = value.pk
+            value = getattr(instance, field.attname, None)
             deleted_data[field_name] = str(value) if value is not None else None
     
     # Créer l'entrée d'audit
@@ -237,7 +346,7 @@ def audit_model_delete(sender, instance, **kwargs):
         AuditLog.log_from_request(
             request=request,
             action=AuditLog.Action.DELETE,
-            model_name=f"{sender._meta.app_label}.{sender._meta.object_name}",
+            model_name=sender._meta.label,
             object_id=instance.pk,
             object_repr=str(instance),
             changes={'_deleted_data': deleted_data}
@@ -245,7 +354,7 @@ def audit_model_delete(sender, instance, **kwargs):
     else:
         AuditLog.log(
             action=AuditLog.Action.DELETE,
-            model_name=f"{sender._meta.app_label}.{sender._meta.object_name}",
+            model_name=sender._meta.label,
             object_id=instance.pk,
             object_repr=str(instance),
             changes={'_deleted_data': deleted_data},
@@ -258,6 +367,19 @@ def audit_model_delete(sender, instance, **kwargs):
 # SIGNALS POUR LES CONNEXIONS/DÉCONNEXIONS
 # =============================================================================
 
+@receiver(post_save)
+@receiver(post_delete)
+def bump_model_cache_tag(sender, instance, **kwargs):
+    """
+    Invalide les entrées de cache qui dépendent du modèle modifié
+    (cf. apps.core.cache), après le commit de la transaction.
+    """
+    from apps.core.cache import invalidate_models, is_tagged_model
+    
+    if is_tagged_model(sender):
+        invalidate_models(sender)
+
+
 @receiver(user_logged_in)
 def audit_user_login(sender, request, user, **kwargs):
     """
@@ -409,4 +409,179 @@ def cleanup_backup_directory(self):
         logger.info(f"Nettoyage terminé. {cleaned_files} fichiers corrompus supprimés")
         
     except Exception as e:
-        logger.error(f"Erreur lors du nettoyage du répertoire de sauvegarde: {e}")
\ No newline at end of file
+        logger.error(f"Erreur lors du nettoyage du répertoire de sauvegarde: {e}")
+
+
+def _build_export_request(job):
+    """
+    Reconstruit la requête d'origine d'un ExportJob.
+    
+    La vue d'export est rejouée telle quelle (filtres GET, utilisateur,
+    IP et User-Agent pour le journal d'audit).
+    """
+    from django.http import HttpRequest, QueryDict
+    
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = job.path
+    request.GET = QueryDict(job.query_string)
+    request.META.update(job.request_meta or {})
+    request.user = job.user
+    return request
+
+
+def _notify_export_job(job):
+    """Informe l'utilisateur de la fin de son export."""
+    from django.urls import reverse
+    from apps.communication.models import Notification
+    
+    if job.status == job.Status.SUCCESS:
+        Notification.objects.create(
+            user=job.user,
+            title="Export prêt",
+            message=f"Votre export « {job.filename} » ({job.record_count} enregistrement(s)) "
+                    f"est disponible jusqu'au {job.expires_at:%d/%m/%Y à %H:%M}.",
+            notification_type=Notification.Type.SUCCESS,
+            action_url=reverse('exports:job_download', args=[job.pk]),
+            action_text="Télécharger",
+        )
+    else:
+        Notification.objects.create(
+            user=job.user,
+            title="Échec de l'export",
+            message=f"L'export {job.export_type or job.path} n'a pas pu être généré.",
+            notification_type=Notification.Type.ERROR,
+            action_url=reverse('exports:job_detail', args=[job.pk]),
+            action_text="Voir le détail",
+        )
+
+
+@shared_task(bind=True, ignore_result=True)
+def run_export_job(self, job_id):
+    """
+    Génère un export Excel ou PDF hors requête HTTP.
+    
+    La vue d'export d'origine est résolue à partir du chemin enregistré,
+    puis sa méthode export_to_file produit le fichier, stocké sous MEDIA
+    jusqu'à son expiration.
+    
+    Args:
+        job_id: ID de l'ExportJob à traiter
+    """
+    from django.urls import resolve
+    from apps.core.models import ExportJob
+    
+    try:
+        job = ExportJob.objects.select_related('user').get(pk=job_id)
+    except ExportJob.DoesNotExist:
+        logger.error(f"ExportJob {job_id} introuvable")
+        return
+    
+    if job.status != ExportJob.Status.PENDING:
+        return
+    
+    ExportJob.objects.filter(pk=job.pk).update(
+        status=ExportJob.Status.RUNNING,
+        celery_task_id=self.request.id or '',
+    )
+    job.status = ExportJob.Status.RUNNING
+    
+    try:
+        request = _build_export_request(job)
+        match = resolve(job.path)
+        view = match.func.view_class()
+        view.setup(request, *match.args, **match.kwargs)
+        
+        # Les droits ont pu changer depuis la demande
+        if hasattr(view, 'has_export_permission') and not view.has_export_permission():
+            raise PermissionError("Permissions insuffisantes pour cet export")
+        
+        # Nombre d'enregistrements compté lors de la demande (cf. should_export_async)
+        if job.record_count:
+            view.export_record_count = job.record_count
+        
+        fileobj, filename, record_count = view.export_to_file(progress=job.set_progress)
+        try:
+            job.mark_as_success(fileobj, filename, record_count)
+        finally:
+            fileobj.close()
+        
+        logger.info(f"Export {job.pk} terminé: {filename} ({record_count} enregistrements)")
+        
+    except Exception as e:
+        logger.error(f"Erreur lors de l'export {job.pk}: {e}")
+        job.mark_as_failed(str(e))
+    
+    try:
+        _notify_export_job(job)
+    except Exception as e:
+        logger.warning(f"Impossible de notifier l'utilisateur de l'export {job.pk}: {e}")
+
+
+@shared_task(ignore_result=True)
+def cleanup_expired_export_jobs():
+    """
+    Supprime les exports expirés et leurs fichiers.
+    
+    Les exports échoués sont conservés une durée équivalente à partir de
+    leur date de fin.
+    """
+    from datetime import timedelta
+    from django.db.models import Q
+    from django.utils import timezone
+    from apps.core.models import ExportJob
+    
+    now = timezone.now()
+    failed_cutoff = now - timedelta(hours=getattr(settings, 'EXPORT_JOB_EXPIRY_HOURS', 24))
+    
+    expired = ExportJob.objects.filter(
+        Q(expires_at__lte=now) |
+        Q(status=ExportJob.Status.FAILED, completed_at__lte=failed_cutoff)
+    )
+    
+    deleted = 0
+    for job in expired.iterator():
+        if job.file:
+            try:
+                job.file.delete(save=False)
+            except Exception as e:
+                logger.warning(f"Impossible de supprimer le fichier de l'export {job.pk}: {e}")
+        job.delete()
+        deleted += 1
+    
+    logger.info(f"Nettoyage des exports: {deleted} export(s) expiré(s) supprimé(s)")
+    return deleted
+
+
+@shared_task(bind=True, ignore_result=True)
+def write_audit_log_entries(self, records):
+    """
+    Écrit en un seul INSERT groupé des entrées d'audit mises en tampon.
+    
+    Utilisée lorsque AUDIT_LOG_ASYNC est activé (cf. apps.core.signals).
+    En cas d'échec, l'écriture est retentée.
+    
+    Args:
+        records: Liste de dictionnaires produits par AuditLog.as_record()
+    """
+    from apps.core.models import AuditLog
+    
+    try:
+        AuditLog.objects.bulk_create([AuditLog(**record) for record in records], batch_size=500)
+    except Exception as e:
+        logger.error(f"Erreur lors de l'écriture de {len(records)} entrée(s) d'audit: {e}")
+        raise self.retry(exc=e, countdown=60, max_retries=5)
+
+
+@shared_task(ignore_result=True)
+def flush_article_view_counts():
+    """
+    Reporte en base les vues d'articles accumulées dans le cache
+    (une requête UPDATE pour tous les articles, cf. view_counters).
+    """
+    from apps.core.view_counters import flush_article_views
+    
+    flushed = flush_article_views()
+    if flushed:
+        logger.info(f"{flushed} vues d'articles reportées en base")
+    return flushed
@@ -0,0 +1,131 @@
+"""
+Compteurs de vues des articles, tamponnés dans le cache.
+
+Chaque vue incrémente atomiquement un compteur en cache (cache.incr),
+indexé par le slug de l'article : l'enregistrement d'une vue ne touche
+pas la base, et la page de l'article peut être servie depuis le cache
+(cf. public_cache.PublicPageCacheMixin).
+
+La tâche périodique flush_article_view_counts reporte les deltas sur
+NewsArticle.views_count en une seule requête UPDATE (F() + Case/When).
+Les deltas sont décrémentés du compteur (cache.decr) et non remis à zéro :
+les vues enregistrées pendant le report ne sont pas perdues.
+
+Les vues répétées d'un même visiteur (IP + navigateur) sur un même
+article ne sont comptées qu'une fois par ARTICLE_VIEW_DEDUPE_SECONDS.
+
+Sans cache partagé (LocMemCache), les vues sont écrites directement en
+base par une mise à jour F().
+"""
+import hashlib
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+COUNTER_PREFIX = 'public:views'
+SEEN_PREFIX = 'public:views:seen'
+
+# Les compteurs n'expirent pas : seuls les articles visibles sont comptés
+# (cf. NewsDetailView), leur nombre est borné par celui des articles, et
+# une expiration ferait perdre les vues non encore reportées
+COUNTER_TIMEOUT = None
+
+
+def _counter_key(slug: str) -> str:
+    return f"{COUNTER_PREFIX}:{slug}"
+
+
+def _is_shared_cache() -> bool:
+    """Indique si le cache est partagé entre processus (Redis, Memcached...)."""
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    return not backend.endswith(('LocMemCache', 'DummyCache'))
+
+
+def get_visitor_key(request) -> str:
+    """Empreinte anonyme d'un visiteur (IP et navigateur hachés)."""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip_address = x_forwarded_for.split(',')[0].strip()
+    else:
+        ip_address = request.META.get('REMOTE_ADDR', '')
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    return hashlib.sha256(f"{ip_address}|{user_agent}".encode('utf-8')).hexdigest()[:32]
+
+
+def record_article_view(slug: str, visitor_key: Optional[str] = None) -> bool:
+    """
+    Enregistre une vue d'article dans le cache.
+
+    Args:
+        slug: Slug de l'article
+        visitor_key: Empreinte du visiteur (cf. get_visitor_key), pour ne
+            compter qu'une vue par fenêtre de déduplication
+
+    Returns:
+        bool: True si la vue a été comptée
+    """
+    window = getattr(settings, 'ARTICLE_VIEW_DEDUPE_SECONDS', 1800)
+    if visitor_key and window > 0:
+        if not cache.add(f"{SEEN_PREFIX}:{slug}:{visitor_key}", 1, window):
+            return False
+
+    if not _is_shared_cache():
+        # Cache propre à chaque processus : la tâche de report ne verrait
+        # pas ces compteurs, la vue est écrite directement
+        from django.db.models import F
+        from .models import NewsArticle
+
+        NewsArticle.objects.filter(slug=slug).update(views_count=F('views_count') + 1)
+        return True
+    
+    key = _counter_key(slug)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, COUNTER_TIMEOUT):
+            cache.incr(key)
+    return True
+
+
+def get_pending_views(slugs) -> Dict[str, int]:
+    """Vues en attente de report, par slug (une lecture groupée du cache)."""
+    keys = {_counter_key(slug): slug for slug in slugs}
+    found = cache.get_many(list(keys))
+    return {keys[key]: count for key, count in found.items() if count}
+
+
+def flush_article_views() -> int:
+    """
+    Reporte les vues en attente sur NewsArticle.views_count.
+
+    Returns:
+        int: Nombre de vues reportées
+    """
+    from django.db.models import Case, F, IntegerField, Value, When
+
+    from .models import NewsArticle
+
+    pending = get_pending_views(NewsArticle.objects.values_list('slug', flat=True))
+
+    deltas = {}
+    for slug, count in pending.items():
+        try:
+            # Décrément atomique : les vues arrivées entre-temps restent en cache
+            cache.decr(_counter_key(slug), count)
+        except ValueError:
+            # Compteur expiré entre la lecture et le décrément
+            continue
+        deltas[slug] = count
+
+    if not deltas:
+        return 0
+
+    NewsArticle.objects.filter(slug__in=list(deltas)).update(
+        views_count=F('views_count') + Case(
+            *[When(slug=slug, then=Value(count)) for slug, count in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    return sum(deltas.values())
@@ -10,8 +10,10 @@ from django.db.models import Q
 
 from .models import (
     Site, PageContent, NewsArticle, ContactMessage, 
-    VisitorRegistration, PublicEvent, Slider, SiteSettings
+    VisitorRegistration, PublicEvent
 )
+from .public_cache import PublicPageCacheMixin, get_public_fragments
+from .view_counters import get_visitor_key, record_article_view
 
 
 def get_visible_articles_queryset():
@@ -33,28 +35,31 @@ def get_visible_articles_queryset():
 
 
 class PublicMixin:
-    """Mixin pour ajouter les données communes aux vues publiques."""
+    """
+    Mixin pour ajouter les données communes aux vues publiques
+    (fragments mis en cache, cf. public_cache.get_public_fragments).
+    """
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['settings'] = SiteSettings.get_settings()
-        context['sites'] = Site.objects.filter(is_active=True)
-        context['menu_pages'] = PageContent.objects.filter(
-            is_published=True, 
-            show_in_menu=True
-        ).order_by('menu_order')
+        fragments = get_public_fragments()
+        context['settings'] = fragments['settings']
+        context['sites'] = fragments['sites']
+        context['menu_pages'] = fragments['menu_pages']
         return context
 
 
-class HomeView(PublicMixin, TemplateView):
+class HomeView(PublicPageCacheMixin, PublicMixin, TemplateView):
     """Page d'accueil du site vitrine."""
     template_name = 'public/home.html'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
+        fragments = get_public_fragments()
+        
         # Slides du carrousel
-        context['slides'] = Slider.objects.filter(is_active=True).order_by('order')
+        context['slides'] = fragments['slides']
         
         # Articles à la une (visibles uniquement)
         context['featured_articles'] = get_visible_articles_queryset().order_by(
@@ -68,12 +73,12 @@ class HomeView(PublicMixin, TemplateView):
         ).order_by('start_date')[:4]
         
         # Sites avec leurs infos
-        context['church_sites'] = Site.objects.filter(is_active=True)
+        context['church_sites'] = fragments['sites']
         
         return context
 
 
-class PageDetailView(PublicMixin, DetailView):
+class PageDetailView(PublicPageCacheMixin, PublicMixin, DetailView):
     """Affichage d'une page statique."""
     model = PageContent
     template_name = 'public/page.html'
@@ -84,7 +89,7 @@ class PageDetailView(PublicMixin, DetailView):
         return PageContent.objects.filter(is_published=True)
 
 
-class NewsListView(PublicMixin, ListView):
+class NewsListView(PublicPageCacheMixin, PublicMixin, ListView):
     """Liste des articles."""
     model = NewsArticle
     template_name = 'public/news_list.html'
@@ -108,25 +113,28 @@ class NewsListView(PublicMixin, ListView):
         return context
 
 
-class NewsDetailView(PublicMixin, DetailView):
+class NewsDetailView(PublicPageCacheMixin, PublicMixin, DetailView):
     """Détail d'un article."""
     model = NewsArticle
     template_name = 'public/news_detail.html'
     context_object_name = 'article'
     slug_field = 'slug'
     
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if request.method == 'GET' and response.status_code in (200, 304):
+            # Compteur de vues tamponné en cache (cf. view_counters), reporté
+            # en base par la tâche flush_article_view_counts. Compté après la
+            # réponse (servie ou non depuis le cache de page) : un slug
+            # inconnu ou un article non publié lève Http404 et n'est pas compté
+            record_article_view(kwargs.get('slug'), get_visitor_key(request))
+        return response
+    
     def get_queryset(self):
         return get_visible_articles_queryset()
-    
-    def get_object(self, queryset=None):
-        obj = super().get_object(queryset)
-        # Incrémenter le compteur de vues
-        obj.views_count += 1
-        obj.save(update_fields=['views_count'])
-        return obj
 
 
-class EventListView(PublicMixin, ListView):
+class EventListView(PublicPageCacheMixin, PublicMixin, ListView):
     """Liste des événements publics."""
     model = PublicEvent
     template_name = 'public/events_list.html'
@@ -1,6 +1,6 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Sum, Q
+from django.db.models import Count, Q
 from datetime import date, timedelta
 
 
@@ -16,11 +16,10 @@ def home(request):
     from apps.campaigns.models import Campaign
     from apps.communication.models import Announcement
     from apps.groups.models import Group
-    from apps.finance.models import FinancialTransaction
+    from apps.finance.stats import FinanceStats
     from apps.worship.models import WorshipService, ServiceRole
     
     today = date.today()
-    start_of_month = today.replace(day=1)
     
     # Événements à venir (30 prochains jours)
     upcoming_events_count = Event.objects.filter(
@@ -39,29 +38,19 @@ def home(request):
     }
     
     # ========== STATS FINANCE ==========
-    month_transactions = FinancialTransaction.objects.filter(
-        transaction_date__gte=start_of_month,
-        status='valide'
-    )
+    totals = FinanceStats.get_totals()
     finance_stats = {
-        'month_income': month_transactions.filter(
-            transaction_type__in=['don', 'dime', 'offrande']
-        ).aggregate(total=Sum('amount'))['total'] or 0,
-        'month_expenses': month_transactions.filter(
-            transaction_type='depense'
-        ).aggregate(total=Sum('amount'))['total'] or 0,
-        'pending_transactions': FinancialTransaction.objects.filter(
-            status='en_attente'
-        ).count(),
+        'month_income': totals['month_income'],
+        'month_expenses': totals['month_expenses'],
+        'month_balance': totals['month_balance'],
+        'pending_transactions': totals['pending_count'],
     }
-    finance_stats['month_balance'] = finance_stats['month_income'] - finance_stats['month_expenses']
     
     # ========== STATS PASTORAL CRM ==========
-    # Membres nécessitant une visite (pas visités depuis 6 mois)
-    members_needing_visit = []
-    for member in Member.objects.filter(status='actif')[:100]:  # Limiter pour perf
-        if member.needs_visit:
-            members_needing_visit.append(member)
+    # Membres nécessitant une visite (pas visités depuis le seuil configuré)
+    members_needing_visit_count = Member.objects.filter(
+        status=Member.Status.ACTIF
+    ).needing_visit_ranked().count()
     
     # Événements de vie récents (30 derniers jours)
     recent_life_events = LifeEvent.objects.filter(
@@ -74,7 +63,7 @@ def home(request):
     ).select_related('member').order_by('scheduled_date')[:5]
     
     pastoral_stats = {
-        'members_needing_visit': len(members_needing_visit[:10]),
+        'members_needing_visit': members_needing_visit_count,
         'recent_life_events_count': recent_life_events.count(),
         'pending_visits_count': pending_visits.count(),
     }
@@ -105,8 +94,8 @@ def home(request):
     ).select_related('category').order_by('start_date')[:4]
     
     # Campagnes actives avec alertes
-    active_campaigns = Campaign.objects.filter(is_active=True)
-    critical_campaigns = [c for c in active_campaigns if c.is_critical]
+    active_campaigns = Campaign.objects.filter(is_active=True).with_progress()
+    critical_campaigns = Campaign.objects.critical()
     
     # Dernière session du club biblique
     last_session = Session.objects.filter(is_cancelled=False).order_by('-date').first()
@@ -5,4 +5,7 @@ class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.events'
     verbose_name = 'Événements'
-
+    
+    def ready(self):
+        """Connecte les signals au démarrage de l'application."""
+        import apps.events.signals  # noqa: F401
@@ -0,0 +1,185 @@
+"""
+Résolution des destinataires des notifications d'événements.
+
+Chaque portée (Event.NotificationScope) est résolue par une seule requête
+SQL : union dédupliquée (UNION) des emails des membres et utilisateurs
+concernés, normalisés en minuscules, sans les adresses désabonnées
+(UnsubscribePreference, exclues par sous-requête).
+
+Une instance d'AudienceResolver mémorise les audiences résolues par
+portée : une tâche qui traite plusieurs événements de même portée
+(« tous les membres », par ex.) ne lance la requête qu'une fois.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import Exists, OuterRef, Q, QuerySet
+from django.db.models.functions import Lower
+
+
+class AudienceResolver:
+    """Destinataires des notifications d'événements, par portée."""
+
+    def __init__(self, notification_types: Optional[Tuple[str, ...]] = None):
+        """
+        Args:
+            notification_types: Types de désabonnement à respecter
+                (« toutes les notifications » et « événements » par défaut)
+        """
+        from apps.communication.models import UnsubscribePreference
+
+        self.notification_types = notification_types or (
+            UnsubscribePreference.NotificationType.ALL,
+            UnsubscribePreference.NotificationType.EVENTS,
+        )
+        self._cache: Dict[tuple, List[str]] = {}
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    def _emails(self, queryset: QuerySet) -> QuerySet:
+        """
+        Emails normalisés d'un QuerySet (Member ou User), sans adresses
+        vides ni désabonnées.
+
+        L'ordre par défaut (Meta.ordering nom/prénom) est retiré : il
+        ajouterait les colonnes de tri au SELECT DISTINCT (doublons
+        d'emails) et est refusé dans les membres d'un UNION par SQLite.
+        """
+        from apps.communication.models import UnsubscribePreference
+
+        unsubscribed = UnsubscribePreference.objects.annotate(
+            email_norm=Lower('email')
+        ).filter(
+            email_norm=OuterRef('email_norm'),
+            notification_type__in=self.notification_types,
+        )
+        return queryset.exclude(
+            Q(email__isnull=True) | Q(email='')
+        ).annotate(
+            email_norm=Lower('email')
+        ).exclude(
+            Exists(unsubscribed)
+        ).order_by().values_list('email_norm', flat=True)
+
+    def _scope_querysets(self, event) -> List[QuerySet]:
+        """Sources des destinataires d'un événement selon sa portée."""
+        from apps.accounts.models import User
+        from apps.members.models import Member
+
+        scope = event.notification_scope
+        Scope = event.NotificationScope
+
+        if scope == Scope.ORGANIZER:
+            return [User.objects.filter(organized_events=event.pk)]
+        if scope == Scope.GROUP:
+            if not event.group_id:
+                return []
+            return [Member.objects.filter(groups=event.group_id)]
+        if scope == Scope.DEPARTMENT:
+            if not event.department_id:
+                return []
+            return [
+                Member.objects.filter(departments=event.department_id),
+                User.objects.filter(led_departments=event.department_id),
+            ]
+        if scope == Scope.MEMBERS:
+            return [Member.objects.filter(status=Member.Status.ACTIF)]
+        if scope == Scope.ALL:
+            return [User.objects.filter(is_active=True), Member.objects.all()]
+        return []
+
+    def _union(self, querysets: List[QuerySet]) -> Optional[QuerySet]:
+        """Requête unique (UNION) des emails de plusieurs sources."""
+        querysets = [self._emails(queryset) for queryset in querysets]
+        if not querysets:
+            return None
+        first, *others = querysets
+        return first.union(*others) if others else first.distinct()
+
+    def audience_query(self, event) -> Optional[QuerySet]:
+        """
+        Requête des emails de la portée d'un événement, ou None si la
+        portée n'a aucun destinataire.
+        """
+        return self._union(self._scope_querysets(event))
+
+    # ------------------------------------------------------------------
+    # Résolution mémorisée
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def cache_key(event) -> tuple:
+        """Clé de mémorisation : la portée et l'objet qui la détermine."""
+        scope = event.notification_scope
+        Scope = event.NotificationScope
+        if scope == Scope.ORGANIZER:
+            return (scope, event.pk)
+        if scope == Scope.GROUP:
+            return (scope, event.group_id)
+        if scope == Scope.DEPARTMENT:
+            return (scope, event.department_id)
+        return (scope,)
+
+    def _resolve(self, key: tuple, querysets: Callable[[], List[QuerySet]]) -> List[str]:
+        if key not in self._cache:
+            query = self._union(querysets())
+            self._cache[key] = sorted(query) if query is not None else []
+        return self._cache[key]
+
+    def resolve(self, event) -> List[str]:
+        """Emails (dédupliqués) à notifier pour un événement."""
+        return self._resolve(self.cache_key(event), lambda: self._scope_querysets(event))
+
+    def registrants(self, event) -> List[str]:
+        """Emails des inscrits à un événement."""
+        from apps.accounts.models import User
+
+        return self._resolve(
+            ('registrants', event.pk),
+            lambda: [User.objects.filter(event_registrations__event=event.pk)],
+        )
+
+    def active_members(self) -> List[str]:
+        """Emails des membres actifs."""
+        from apps.members.models import Member
+
+        return self._resolve(
+            ('active_members',),
+            lambda: [Member.objects.filter(status=Member.Status.ACTIF)],
+        )
+
+    def active_users(self) -> List[str]:
+        """Emails des utilisateurs actifs."""
+        from apps.accounts.models import User
+
+        return self._resolve(('active_users',), lambda: [User.objects.filter(is_active=True)])
+
+    # ------------------------------------------------------------------
+    # Noms des destinataires
+    # ------------------------------------------------------------------
+
+    def with_names(self, emails: Iterable[str]) -> List[Dict[str, str]]:
+        """
+        Destinataires {'email', 'name'} d'une liste d'emails résolus.
+
+        Le nom est celui de l'utilisateur portant l'adresse, à défaut celui
+        du membre (une requête par modèle, quel que soit le nombre d'emails).
+        """
+        from apps.accounts.models import User
+        from apps.members.models import Member
+
+        emails = list(emails)
+        names: Dict[str, str] = {}
+        # Les utilisateurs, lus en dernier, l'emportent sur les membres
+        for model in (Member, User):
+            rows = model.objects.annotate(
+                email_norm=Lower('email')
+            ).filter(
+                email_norm__in=emails
+            ).order_by().values_list('email_norm', 'first_name', 'last_name')
+            for email, first_name, last_name in rows:
+                name = f"{first_name} {last_name}".strip()
+                if name:
+                    names[email] = name
+        return [{'email': email, 'name': names.get(email, '')} for email in emails]
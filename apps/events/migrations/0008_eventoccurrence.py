@@ -0,0 +1,118 @@
+# Generated by Django 5.2.9 on 2026-10-16 10:20
+
+import calendar
+from datetime import date, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Copie figée de apps.events.recurrence au moment de cette migration :
+# les évolutions ultérieures du moteur ne doivent pas modifier son effet.
+RECURRENCE_RULES = {
+    'daily': ('days', 1),
+    'weekly': ('days', 7),
+    'biweekly': ('days', 14),
+    'monthly': ('months', 1),
+    'trimesterly': ('months', 3),
+    'yearly': ('months', 12),
+}
+
+HORIZON_DAYS = 400
+
+
+def _add_months(start, months):
+    month_index = start.month - 1 + months
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    if start.day > calendar.monthrange(year, month)[1]:
+        return None
+    return date(year, month, start.day)
+
+
+def _occurrence_dates(start, recurrence, window_end, until=None):
+    if until is not None and until < window_end:
+        window_end = until
+    if start > window_end:
+        return
+
+    rule = RECURRENCE_RULES.get(recurrence)
+    if rule is None:
+        yield start
+        return
+
+    unit, interval = rule
+    if unit == 'days':
+        current = start
+        while current <= window_end:
+            yield current
+            current += timedelta(days=interval)
+        return
+
+    step = 0
+    while True:
+        if _add_months(start.replace(day=1), step * interval) > window_end:
+            return
+        current = _add_months(start, step * interval)
+        if current is not None and current <= window_end:
+            yield current
+        step += 1
+
+
+def materialize_occurrences(apps, schema_editor):
+    """
+    Matérialise les occurrences des événements existants.
+
+    Les occurrences passées, et celles déjà dans la fenêtre de préavis d'un
+    événement notifié (Event.notification_sent), sont marquées notifiées :
+    le déploiement ne renvoie pas les notifications déjà parties.
+    """
+    Event = apps.get_model('events', 'Event')
+    EventOccurrence = apps.get_model('events', 'EventOccurrence')
+
+    today = date.today()
+    horizon = today + timedelta(days=HORIZON_DAYS)
+    for event in Event.objects.all().iterator():
+        duration = (event.end_date - event.start_date) if event.end_date else None
+        notified_until = today + timedelta(days=event.notify_before)
+        EventOccurrence.objects.bulk_create([
+            EventOccurrence(
+                event_id=event.pk,
+                start_date=day,
+                end_date=day + duration if duration is not None else None,
+                notification_sent=day < today or (event.notification_sent and day <= notified_until),
+            )
+            for day in _occurrence_dates(
+                event.start_date,
+                event.recurrence,
+                max(horizon, event.start_date),
+                until=event.recurrence_end_date,
+            )
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_public_website'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField(verbose_name='Date')),
+                ('end_date', models.DateField(blank=True, null=True, verbose_name='Date de fin')),
+                ('notification_sent', models.BooleanField(default=False, verbose_name='Notification envoyée')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='events.event', verbose_name='Événement')),
+            ],
+            options={
+                'verbose_name': "Occurrence d'événement",
+                'verbose_name_plural': "Occurrences d'événements",
+                'ordering': ['start_date'],
+                'indexes': [models.Index(fields=['start_date'], name='events_occ_start_idx')],
+                'unique_together': {('event', 'start_date')},
+            },
+        ),
+        migrations.RunPython(materialize_occurrences, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,5 @@
+import copy
+
 from django.db import models
 from django.conf import settings
 
@@ -176,50 +178,19 @@ class Event(models.Model):
         from datetime import date
         return self.start_date == date.today()
     
-    def get_notification_recipients(self):
-        """Retourne la liste des emails à notifier selon la portée."""
-        from apps.members.models import Member
-        from apps.accounts.models import User
-        
-        emails = set()
-        
+    def get_notification_recipients(self, resolver=None):
+        """
+        Retourne la liste des emails à notifier selon la portée.
+
+        Args:
+            resolver: AudienceResolver partagé (mémorise les audiences
+                déjà résolues pendant une même tâche)
+        """
+        from .audience import AudienceResolver
+
         if self.notification_scope == self.NotificationScope.NONE:
             return []
-        
-        if self.notification_scope == self.NotificationScope.ORGANIZER:
-            # ManyToMany - récupérer tous les organisateurs
-            for organizer in self.organizers.all():
-                if organizer.email:
-                    emails.add(organizer.email)
-        
-        elif self.notification_scope == self.NotificationScope.GROUP:
-            if self.group:
-                for member in self.group.members.all():
-                    if member.email:
-                        emails.add(member.email)
-        
-        elif self.notification_scope == self.NotificationScope.DEPARTMENT:
-            if self.department:
-                for member in self.department.members.all():
-                    if member.email:
-                        emails.add(member.email)
-                if self.department.leader and self.department.leader.email:
-                    emails.add(self.department.leader.email)
-        
-        elif self.notification_scope == self.NotificationScope.MEMBERS:
-            for member in Member.objects.filter(status='actif'):
-                if member.email:
-                    emails.add(member.email)
-        
-        elif self.notification_scope == self.NotificationScope.ALL:
-            for user in User.objects.filter(is_active=True):
-                if user.email:
-                    emails.add(user.email)
-            for member in Member.objects.all():
-                if member.email:
-                    emails.add(member.email)
-        
-        return list(emails)
+        return (resolver or AudienceResolver()).resolve(self)
 
 
 class EventRegistration(models.Model):
@@ -247,3 +218,64 @@ class EventRegistration(models.Model):
     
     def __str__(self):
         return f"{self.user} - {self.event}"
+
+
+class EventOccurrenceQuerySet(models.QuerySet):
+    """QuerySet des occurrences matérialisées."""
+    
+    def between(self, start, end):
+        """Occurrences débutant dans [start, end] (une requête par plage)."""
+        return self.filter(start_date__gte=start, start_date__lte=end)
+    
+    def for_events(self, events):
+        """Restreint aux occurrences d'un QuerySet d'événements déjà filtré."""
+        return self.filter(event__in=events.values('pk'))
+    
+    def active(self):
+        """Occurrences d'événements non annulés."""
+        return self.filter(event__is_cancelled=False)
+
+
+class EventOccurrence(models.Model):
+    """
+    Occurrence matérialisée d'un événement (récurrent ou ponctuel).
+    
+    Tenue à jour à chaque enregistrement de l'événement (cf.
+    recurrence.sync_event_occurrences) ; les récurrences sans fin sont
+    matérialisées jusqu'à EVENT_OCCURRENCE_HORIZON_DAYS, horizon étendu
+    chaque nuit par tasks.extend_event_occurrences.
+    """
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='occurrences',
+        verbose_name="Événement"
+    )
+    start_date = models.DateField(verbose_name="Date")
+    end_date = models.DateField(blank=True, null=True, verbose_name="Date de fin")
+    notification_sent = models.BooleanField(default=False, verbose_name="Notification envoyée")
+    
+    objects = EventOccurrenceQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = "Occurrence d'événement"
+        verbose_name_plural = "Occurrences d'événements"
+        ordering = ['start_date']
+        unique_together = ['event', 'start_date']
+        indexes = [
+            models.Index(fields=['start_date'], name='events_occ_start_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event.title} - {self.start_date}"
+    
+    def as_event(self):
+        """
+        Copie de l'événement aux dates de cette occurrence, pour les
+        templates qui affichent event.start_date / event.end_date.
+        """
+        event = copy.copy(self.event)
+        event.start_date = self.start_date
+        event.end_date = self.end_date
+        event.occurrence = self
+        return event
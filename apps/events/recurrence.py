@@ -0,0 +1,168 @@
+"""
+Moteur d'expansion des événements récurrents.
+
+Génère les occurrences d'une récurrence (à la manière d'une RRULE
+FREQ/INTERVAL) sur une fenêtre de dates. La n-ième occurrence est calculée
+directement depuis la date de départ : pas de dérive d'un mois à l'autre,
+et la génération saute sans itérer jusqu'au début de la fenêtre.
+
+Comme pour une RRULE, une date inexistante est ignorée (un événement
+mensuel du 31 n'a pas lieu en avril), sans être reportée.
+
+Les occurrences sont matérialisées dans EventOccurrence (cf.
+sync_event_occurrences) pour que calendriers et rappels les lisent en une
+requête par plage de dates.
+"""
+import calendar
+from datetime import date, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+
+# Récurrence -> (unité, intervalle), unité 'days' ou 'months'
+RECURRENCE_RULES = {
+    'daily': ('days', 1),
+    'weekly': ('days', 7),
+    'biweekly': ('days', 14),
+    'monthly': ('months', 1),
+    'trimesterly': ('months', 3),
+    'yearly': ('months', 12),
+}
+
+
+def _add_months(start: date, months: int) -> Optional[date]:
+    """Ajoute des mois ; None si le jour n'existe pas dans le mois cible."""
+    month_index = start.month - 1 + months
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    if start.day > calendar.monthrange(year, month)[1]:
+        return None
+    return date(year, month, start.day)
+
+
+def iter_occurrence_dates(
+    start: date,
+    recurrence: str,
+    window_start: date,
+    window_end: date,
+    until: Optional[date] = None,
+) -> Iterator[date]:
+    """
+    Dates d'occurrence comprises dans [window_start, window_end].
+
+    Args:
+        start: Date de la première occurrence (Event.start_date)
+        recurrence: Valeur de Event.RecurrenceType
+        window_start, window_end: Bornes incluses de la fenêtre
+        until: Fin de récurrence incluse (Event.recurrence_end_date)
+    """
+    if until is not None and until < window_end:
+        window_end = until
+    window_start = max(window_start, start)
+    if window_start > window_end:
+        return
+
+    rule = RECURRENCE_RULES.get(recurrence)
+    if rule is None:
+        # Événement ponctuel
+        if window_start <= start <= window_end:
+            yield start
+        return
+
+    unit, interval = rule
+    if unit == 'days':
+        # Première occurrence >= window_start, par calcul direct
+        step = -(-(window_start - start).days // interval)
+        current = start + timedelta(days=step * interval)
+        while current <= window_end:
+            yield current
+            current += timedelta(days=interval)
+        return
+
+    months_offset = (window_start.year - start.year) * 12 + window_start.month - start.month
+    step = max(0, months_offset // interval)
+    while True:
+        current_month = _add_months(start.replace(day=1), step * interval)
+        if current_month > window_end:
+            return
+        current = _add_months(start, step * interval)
+        if current is not None and window_start <= current <= window_end:
+            yield current
+        step += 1
+
+
+def get_materialization_horizon(today: Optional[date] = None) -> date:
+    """Dernière date matérialisée pour les récurrences sans fin."""
+    today = today or date.today()
+    return today + timedelta(days=getattr(settings, 'EVENT_OCCURRENCE_HORIZON_DAYS', 400))
+
+
+def expand_event(event, window_start: date, window_end: date) -> List[Tuple[date, Optional[date]]]:
+    """
+    Occurrences (début, fin) d'un événement dans une fenêtre.
+
+    La durée de l'événement (end_date - start_date) est conservée pour
+    chaque occurrence.
+    """
+    duration = (event.end_date - event.start_date) if event.end_date else None
+    return [
+        (occurrence, occurrence + duration if duration is not None else None)
+        for occurrence in iter_occurrence_dates(
+            event.start_date,
+            event.recurrence,
+            window_start,
+            window_end,
+            until=event.recurrence_end_date,
+        )
+    ]
+
+
+def sync_event_occurrences(event, occurrence_model=None, horizon: Optional[date] = None) -> Tuple[int, int]:
+    """
+    Met à jour les occurrences matérialisées d'un événement (incrémental).
+
+    Seules les différences sont écrites : occurrences manquantes créées,
+    occurrences disparues supprimées, dates de fin corrigées. Les
+    occurrences existantes conservent leur état (notification envoyée).
+
+    Args:
+        event: Instance d'Event
+        occurrence_model: Modèle EventOccurrence (historique en migration)
+        horizon: Dernière date matérialisée (cf. get_materialization_horizon)
+
+    Returns:
+        tuple (créées, supprimées)
+    """
+    if occurrence_model is None:
+        from .models import EventOccurrence as occurrence_model
+
+    horizon = horizon or get_materialization_horizon()
+    # Un événement ponctuel est toujours matérialisé, même au-delà de l'horizon
+    window_end = max(horizon, event.start_date)
+    expected = dict(expand_event(event, event.start_date, window_end))
+
+    existing = {
+        occurrence.start_date: occurrence
+        for occurrence in occurrence_model.objects.filter(event_id=event.pk)
+    }
+
+    stale = [occurrence.pk for day, occurrence in existing.items() if day not in expected]
+    if stale:
+        occurrence_model.objects.filter(pk__in=stale).delete()
+
+    occurrence_model.objects.bulk_create([
+        occurrence_model(event_id=event.pk, start_date=day, end_date=end)
+        for day, end in expected.items()
+        if day not in existing
+    ])
+
+    changed = []
+    for day, occurrence in existing.items():
+        if day in expected and occurrence.end_date != expected[day]:
+            occurrence.end_date = expected[day]
+            changed.append(occurrence)
+    if changed:
+        occurrence_model.objects.bulk_update(changed, ['end_date'])
+
+    created = len([day for day in expected if day not in existing])
+    return created, len(stale)
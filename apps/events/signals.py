@@ -0,0 +1,23 @@
+"""Signaux pour le module Événements."""
+
+from django.db import transaction as db_transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Event
+
+
+@receiver(post_save, sender=Event)
+def refresh_event_occurrences(sender, instance, update_fields=None, **kwargs):
+    """
+    Recalcule les occurrences matérialisées lorsque les dates ou la
+    récurrence d'un événement changent.
+    """
+    if update_fields is not None and not (
+        {'start_date', 'end_date', 'recurrence', 'recurrence_end_date'} & set(update_fields)
+    ):
+        return
+    
+    from .recurrence import sync_event_occurrences
+    
+    db_transaction.on_commit(lambda: sync_event_occurrences(instance))
@@ -12,11 +12,30 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _load_occurrence(event, occurrence_id):
+    """
+    Retourne l'occurrence demandée et une copie de l'événement à ses dates,
+    ou (None, event) si aucune occurrence n'est précisée.
+    """
+    from apps.events.models import EventOccurrence
+    
+    if occurrence_id is None:
+        return None, event
+    try:
+        occurrence = event.occurrences.get(pk=occurrence_id)
+    except EventOccurrence.DoesNotExist:
+        return None, event
+    return occurrence, occurrence.as_event()
+
+
 @shared_task(bind=True, max_retries=3)
-def send_event_notification_email(self, event_id, recipient_emails):
+def send_event_notification_email(self, event_id, recipient_emails, occurrence_id=None):
     """
-    Envoie une notification email pour un événement à une liste de destinataires.
+    Envoie une notification email pour un événement (ou une occurrence
+    d'un événement récurrent) à une liste de destinataires.
     """
+    from apps.communication.models import EmailLog
+    from apps.core.infrastructure.bulk_email import BulkEmailSender
     from apps.events.models import Event
     
     try:
@@ -25,6 +44,8 @@ def send_event_notification_email(self, event_id, recipient_emails):
         logger.error(f"Event {event_id} not found")
         return
     
+    occurrence, event = _load_occurrence(event, occurrence_id)
+    
     if not recipient_emails:
         logger.info(f"No recipients for event {event_id}")
         return
@@ -40,57 +61,74 @@ def send_event_notification_email(self, event_id, recipient_emails):
     html_message = render_to_string('events/email/event_notification.html', context)
     plain_message = strip_tags(html_message)
     
-    try:
-        # Envoyer l'email à chaque destinataire
-        for email in recipient_emails:
-            send_mail(
-                subject=subject,
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[email],
-                html_message=html_message,
-                fail_silently=False,
-            )
-        
-        # Marquer l'événement comme notifié
-        event.notification_sent = True
-        event.save(update_fields=['notification_sent'])
-        
-        logger.info(f"Notifications sent for event {event_id} to {len(recipient_emails)} recipients")
-        return f"Sent to {len(recipient_emails)} recipients"
+    # Envoi par lots, une connexion SMTP par lot
+    logs = BulkEmailSender.send(
+        recipient_emails,
+        subject=subject,
+        html_content=html_message,
+        text_content=plain_message,
+    )
     
-    except Exception as exc:
-        logger.error(f"Failed to send notification for event {event_id}: {exc}")
-        raise self.retry(exc=exc, countdown=60)
+    # Marquer l'occurrence (et l'événement) comme notifiés
+    if occurrence is not None:
+        occurrence.notification_sent = True
+        occurrence.save(update_fields=['notification_sent'])
+    Event.objects.filter(pk=event_id).update(notification_sent=True)
+    
+    failed = [log for log in logs if log.status == EmailLog.Status.FAILED]
+    sent_count = len(logs) - len(failed)
+    logger.info(f"Notifications sent for event {event_id} to {sent_count} recipients")
+    
+    if failed:
+        # Ne réessayer que pour les destinataires en échec
+        logger.error(
+            f"Failed to send notification for event {event_id} "
+            f"to {len(failed)} recipients: {failed[0].error_message}"
+        )
+        raise self.retry(
+            args=[event_id, [log.recipient_email for log in failed], occurrence_id],
+            exc=Exception(failed[0].error_message),
+            countdown=60,
+        )
+    
+    return f"Sent to {sent_count} recipients"
 
 
 @shared_task
 def send_event_notifications():
     """
-    Tâche planifiée : vérifie les événements qui doivent être notifiés.
+    Tâche planifiée : vérifie les occurrences d'événements qui doivent être
+    notifiées (chaque occurrence d'un événement récurrent l'est une fois).
     Exécutée quotidiennement.
     """
-    from apps.events.models import Event
+    from django.db.models import Max
+    from apps.events.audience import AudienceResolver
+    from apps.events.models import Event, EventOccurrence
     
     today = date.today()
     events_to_notify = []
+    # Audiences résolues une fois par portée pour toute la tâche
+    resolver = AudienceResolver()
     
-    # Récupérer les événements à venir non encore notifiés
-    upcoming_events = Event.objects.filter(
-        start_date__gte=today,
-        is_cancelled=False,
+    max_notify_before = Event.objects.aggregate(value=Max('notify_before'))['value'] or 0
+    
+    # Occurrences à venir non encore notifiées, dans la plus grande fenêtre de préavis
+    upcoming_occurrences = EventOccurrence.objects.active().between(
+        today, today + timedelta(days=max_notify_before)
+    ).filter(
         notification_sent=False,
-    ).exclude(notification_scope='none')
+    ).exclude(event__notification_scope='none').select_related('event')
     
-    for event in upcoming_events:
-        days_until = (event.start_date - today).days
+    for occurrence in upcoming_occurrences:
+        event = occurrence.event
+        days_until = (occurrence.start_date - today).days
         
         # Vérifier si c'est le moment de notifier
         if days_until <= event.notify_before:
-            recipients = event.get_notification_recipients()
+            recipients = event.get_notification_recipients(resolver)
             if recipients:
                 # Lancer la tâche d'envoi
-                send_event_notification_email.delay(event.id, recipients)
+                send_event_notification_email.delay(event.id, recipients, occurrence.id)
                 events_to_notify.append(event.title)
     
     logger.info(f"Processed {len(events_to_notify)} events for notifications")
@@ -102,23 +140,25 @@ def send_event_reminders():
     """
     Tâche planifiée : envoie un rappel le jour même de l'événement.
     """
-    from apps.events.models import Event
+    from apps.events.audience import AudienceResolver
+    from apps.events.models import EventOccurrence
     
     today = date.today()
+    resolver = AudienceResolver()
     
-    # Événements d'aujourd'hui
-    todays_events = Event.objects.filter(
+    # Occurrences du jour (récurrences comprises)
+    todays_occurrences = EventOccurrence.objects.active().filter(
         start_date=today,
-        is_cancelled=False,
-    ).exclude(notification_scope='none')
+    ).exclude(event__notification_scope='none').select_related('event')
     
     events_reminded = []
     
-    for event in todays_events:
-        recipients = event.get_notification_recipients()
+    for occurrence in todays_occurrences:
+        event = occurrence.event
+        recipients = event.get_notification_recipients(resolver)
         if recipients:
             # Envoyer le rappel
-            send_event_reminder_email.delay(event.id, recipients)
+            send_event_reminder_email.delay(event.id, recipients, occurrence.id)
             events_reminded.append(event.title)
     
     logger.info(f"Sent reminders for {len(events_reminded)} events")
@@ -126,9 +166,9 @@ def send_event_reminders():
 
 
 @shared_task(bind=True, max_retries=3)
-def send_event_reminder_email(self, event_id, recipient_emails):
+def send_event_reminder_email(self, event_id, recipient_emails, occurrence_id=None):
     """
-    Envoie un rappel email le jour de l'événement.
+    Envoie un rappel email le jour de l'événement (ou de l'occurrence).
     """
     from apps.events.models import Event
     
@@ -138,6 +178,8 @@ def send_event_reminder_email(self, event_id, recipient_emails):
         logger.error(f"Event {event_id} not found")
         return
     
+    _occurrence, event = _load_occurrence(event, occurrence_id)
+    
     if not recipient_emails:
         return
     
@@ -189,3 +231,27 @@ def send_immediate_notification(event_id):
     
     return "No recipients"
 
+
+@shared_task
+def extend_event_occurrences():
+    """
+    Tâche planifiée : prolonge l'horizon des occurrences matérialisées
+    des événements récurrents sans fin (ou finissant après l'horizon).
+    """
+    from django.db.models import Q
+    from apps.events.models import Event
+    from apps.events.recurrence import get_materialization_horizon, sync_event_occurrences
+    
+    horizon = get_materialization_horizon()
+    recurring_events = Event.objects.exclude(
+        recurrence=Event.RecurrenceType.NONE
+    ).filter(
+        Q(recurrence_end_date__isnull=True) | Q(recurrence_end_date__gte=date.today())
+    )
+    
+    created = 0
+    for event in recurring_events.iterator():
+        created += sync_event_occurrences(event, horizon=horizon)[0]
+    
+    logger.info(f"Occurrences d'événements prolongées jusqu'au {horizon}: {created} créées")
+    return created
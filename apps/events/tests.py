@@ -0,0 +1,128 @@
+"""Tests de la résolution des destinataires d'événements (AudienceResolver)."""
+from datetime import date
+
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.communication.models import UnsubscribePreference
+from apps.departments.models import Department
+from apps.groups.models import Group
+from apps.members.models import Member
+
+from .audience import AudienceResolver
+from .models import Event
+
+
+class AudienceResolverTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user(
+            username='orga', email='Orga@example.com', first_name='Paul', last_name='Zed'
+        )
+        cls.leader = User.objects.create_user(
+            username='leader', email='shared@example.com', first_name='Anne', last_name='Alpha'
+        )
+        User.objects.create_user(username='inactive', email='inactive@example.com', is_active=False)
+
+        # Deux personnes partageant une adresse (casse différente)
+        cls.alice = Member.objects.create(
+            first_name='Alice', last_name='Martin', email='shared@example.com',
+            status=Member.Status.ACTIF,
+        )
+        cls.bob = Member.objects.create(
+            first_name='Bob', last_name='Durand', email='SHARED@example.com',
+            status=Member.Status.ACTIF,
+        )
+        cls.carla = Member.objects.create(
+            first_name='Carla', last_name='Bernard', email='carla@example.com',
+            status=Member.Status.ACTIF,
+        )
+        cls.no_email = Member.objects.create(
+            first_name='Denis', last_name='Petit', status=Member.Status.ACTIF,
+        )
+        cls.unsubscribed = Member.objects.create(
+            first_name='Eve', last_name='Leroy', email='eve@example.com',
+            status=Member.Status.ACTIF,
+        )
+        UnsubscribePreference.objects.create(
+            email='EVE@example.com',
+            notification_type=UnsubscribePreference.NotificationType.EVENTS,
+            unsubscribe_token='00000000-0000-0000-0000-000000000001',
+        )
+
+        cls.group = Group.objects.create(name='Chorale')
+        cls.group.members.add(cls.alice, cls.bob, cls.no_email)
+
+        cls.department = Department.objects.create(name='Accueil', leader=cls.leader)
+        cls.department.members.add(cls.alice, cls.bob, cls.carla, cls.unsubscribed)
+
+    def _event(self, scope):
+        event = Event.objects.create(
+            title=f'Événement {scope}',
+            start_date=date(2026, 11, 1),
+            notification_scope=scope,
+            group=self.group,
+            department=self.department,
+        )
+        event.organizers.add(self.organizer)
+        return event
+
+    def assertNoDuplicates(self, emails):
+        self.assertEqual(len(emails), len(set(emails)))
+
+    def test_organizer_scope(self):
+        emails = AudienceResolver().resolve(self._event(Event.NotificationScope.ORGANIZER))
+        self.assertEqual(emails, ['orga@example.com'])
+
+    def test_group_scope(self):
+        emails = AudienceResolver().resolve(self._event(Event.NotificationScope.GROUP))
+        self.assertNoDuplicates(emails)
+        self.assertEqual(emails, ['shared@example.com'])
+
+    def test_department_scope(self):
+        emails = AudienceResolver().resolve(self._event(Event.NotificationScope.DEPARTMENT))
+        self.assertNoDuplicates(emails)
+        self.assertEqual(emails, ['carla@example.com', 'shared@example.com'])
+
+    def test_members_scope(self):
+        emails = AudienceResolver().resolve(self._event(Event.NotificationScope.MEMBERS))
+        self.assertNoDuplicates(emails)
+        self.assertEqual(emails, ['carla@example.com', 'shared@example.com'])
+
+    def test_all_scope(self):
+        emails = AudienceResolver().resolve(self._event(Event.NotificationScope.ALL))
+        self.assertNoDuplicates(emails)
+        self.assertEqual(emails, ['carla@example.com', 'orga@example.com', 'shared@example.com'])
+
+    def test_none_scope(self):
+        self.assertEqual(AudienceResolver().resolve(self._event(Event.NotificationScope.NONE)), [])
+
+    def test_resolution_is_memoized_per_scope(self):
+        resolver = AudienceResolver()
+        first = self._event(Event.NotificationScope.MEMBERS)
+        second = self._event(Event.NotificationScope.MEMBERS)
+        resolver.resolve(first)
+        with self.assertNumQueries(0):
+            resolver.resolve(second)
+
+    def test_with_names_prefers_user_names(self):
+        recipients = AudienceResolver().with_names(
+            ['carla@example.com', 'shared@example.com', 'unknown@example.com']
+        )
+        self.assertEqual(recipients, [
+            {'email': 'carla@example.com', 'name': 'Carla Bernard'},
+            {'email': 'shared@example.com', 'name': 'Anne Alpha'},
+            {'email': 'unknown@example.com', 'name': ''},
+        ])
+
+    def test_event_recipients_have_names(self):
+        from apps.communication.services import NotificationService
+
+        recipients = NotificationService._get_event_recipients(
+            self._event(Event.NotificationScope.MEMBERS)
+        )
+        self.assertEqual(recipients, [
+            {'email': 'carla@example.com', 'name': 'Carla Bernard'},
+            {'email': 'shared@example.com', 'name': 'Anne Alpha'},
+        ])
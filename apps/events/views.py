@@ -2,7 +2,6 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse, HttpResponse
-from django.template.loader import render_to_string
 from django.db.models import Q
 from django.urls import reverse
 from datetime import date, timedelta
@@ -10,10 +9,42 @@ from calendar import monthrange
 import calendar as cal_module
 
 from apps.core.permissions import role_required
-from .models import Event, EventCategory, EventRegistration
+from .models import Event, EventCategory, EventOccurrence, EventRegistration
 from .forms import EventForm, EventCancelForm, EventDuplicateForm, EventSearchForm
 
 
+# Champs chargés pour l'affichage des calendriers (grilles mois / semaine)
+CALENDAR_EVENT_FIELDS = ('id', 'title', 'start_time', 'location', 'category__name', 'category__color')
+
+
+def _event_occurrences(first_day, last_day, fields=None, events=None):
+    """
+    Occurrences (récurrences comprises) débutant dans [first_day, last_day],
+    en une requête sur EventOccurrence.
+    
+    Args:
+        fields: Champs d'Event à charger (tous par défaut)
+        events: QuerySet d'événements déjà filtré (visibilité...)
+    
+    Returns:
+        Liste de copies d'Event aux dates de chaque occurrence (cf.
+        EventOccurrence.as_event), triées par date et heure.
+    """
+    occurrences = EventOccurrence.objects.between(first_day, last_day).select_related('event__category')
+    if events is None:
+        occurrences = occurrences.active()
+    else:
+        occurrences = occurrences.for_events(events)
+    if fields:
+        occurrences = occurrences.only(
+            'start_date', 'end_date', 'event_id', *(f'event__{field}' for field in fields)
+        )
+    return [
+        occurrence.as_event()
+        for occurrence in occurrences.order_by('start_date', 'event__start_time')
+    ]
+
+
 @login_required
 def calendar_view(request):
     """Vue calendrier avec FullCalendar."""
@@ -24,21 +55,22 @@ def calendar_view(request):
     
     # Stats
     upcoming_count = Event.objects.filter(
-        start_date__gte=today,
+        occurrences__start_date__gte=today,
         is_cancelled=False
-    ).count()
+    ).distinct().count()
     
-    this_month_count = Event.objects.filter(
+    this_month_count = EventOccurrence.objects.active().filter(
         start_date__year=today.year,
         start_date__month=today.month,
-        is_cancelled=False
     ).count()
     
-    # Prochains événements
-    upcoming_events = Event.objects.filter(
-        start_date__gte=today,
-        is_cancelled=False
-    ).select_related('category').order_by('start_date', 'start_time')[:5]
+    # Prochaines occurrences
+    upcoming_events = [
+        occurrence.as_event()
+        for occurrence in EventOccurrence.objects.active().filter(
+            start_date__gte=today
+        ).select_related('event__category').order_by('start_date', 'event__start_time')[:5]
+    ]
     
     context = {
         'categories': categories,
@@ -57,11 +89,6 @@ def events_json(request):
     
     events = Event.objects.all()
     
-    if start:
-        events = events.filter(start_date__gte=start[:10])
-    if end:
-        events = events.filter(start_date__lte=end[:10])
-    
     # Filtrer par visibilité
     if not request.user.is_authenticated:
         events = events.filter(visibility='public')
@@ -72,8 +99,24 @@ def events_json(request):
     if not (request.user.role in ['admin', 'secretariat']):
         events = events.filter(is_cancelled=False)
     
+    # Occurrences de la plage demandée (récurrences comprises), une requête
+    occurrences = EventOccurrence.objects.for_events(events).select_related('event__category')
+    if start:
+        occurrences = occurrences.filter(start_date__gte=start[:10])
+    if end:
+        occurrences = occurrences.filter(start_date__lte=end[:10])
+    
+    organizers_by_event = {}
+    for event in Event.objects.filter(
+        pk__in=occurrences.values('event_id')
+    ).prefetch_related('organizers'):
+        organizers_by_event[event.pk] = [
+            org.get_full_name() or org.username for org in event.organizers.all()
+        ]
+    
     events_data = []
-    for event in events.select_related('category').prefetch_related('organizers'):
+    for occurrence in occurrences.order_by('start_date', 'event__start_time'):
+        event = occurrence.as_event()
         event_dict = {
             'id': event.id,
             'title': event.title,
@@ -87,7 +130,9 @@ def events_json(request):
                 'is_cancelled': event.is_cancelled,
                 'visibility': event.visibility,
                 'category_name': event.category.name if event.category else None,
-                'organizers': [org.get_full_name() or org.username for org in event.organizers.all()],
+                'organizers': organizers_by_event.get(event.pk, []),
+                'occurrence_date': event.start_date.isoformat(),
+                'recurrence': event.recurrence,
             }
         }
         
@@ -159,11 +204,7 @@ def event_detail(request, pk):
 def upcoming_events_partial(request):
     """Événements à venir (partiel HTMX)."""
     today = date.today()
-    events = Event.objects.filter(
-        start_date__gte=today,
-        start_date__lte=today + timedelta(days=30),
-        is_cancelled=False
-    ).select_related('category')[:5]
+    events = _event_occurrences(today, today + timedelta(days=30))[:5]
     
     return render(request, 'events/partials/upcoming_events.html', {'events': events})
 
@@ -189,10 +230,9 @@ def calendar_pdf(request):
     Génère un PDF du calendrier avec WeasyPrint.
     Modes: week, month, quarter, brochure
     """
-    try:
-        from weasyprint import HTML, CSS
-        from weasyprint.text.fonts import FontConfiguration
-    except ImportError:
+    from apps.core import pdf_engine
+    
+    if not pdf_engine.is_available():
         return calendar_print(request)
     
     today = date.today()
@@ -207,7 +247,6 @@ def calendar_pdf(request):
     }
     
     jours_semaine = ['Lun', 'Mar', 'Mer', 'Jeu', 'Ven', 'Sam', 'Dim']
-    font_config = FontConfiguration()
     
     # Mode brochure = format portrait professionnel avec couverture
     if mode == 'brochure':
@@ -225,11 +264,7 @@ def calendar_pdf(request):
         first_day = date(start_year, start_month, 1)
         last_day = date(end_year, end_month, monthrange(end_year, end_month)[1])
         
-        all_events = list(Event.objects.filter(
-            start_date__gte=first_day,
-            start_date__lte=last_day,
-            is_cancelled=False
-        ).select_related('category').order_by('start_date', 'start_time'))
+        all_events = _event_occurrences(first_day, last_day)
         
         # Regrouper par catégorie avec structure simplifiée pour le template
         events_by_category = {}
@@ -266,22 +301,15 @@ def calendar_pdf(request):
         template = 'events/pdf/calendar_brochure.html'
         filename = f"brochure_calendrier_T{quarter_num}_{year}.pdf"
         
-        css = CSS(string='''
+        css = '''
             @page { size: A4 landscape; margin: 0; }
-        ''', font_config=font_config)
+        '''
     
     elif mode == 'week':
         week_start = today - timedelta(days=today.weekday())
         week_end = week_start + timedelta(days=6)
         
-        events = list(Event.objects.filter(
-            start_date__gte=week_start,
-            start_date__lte=week_end,
-            is_cancelled=False
-        ).select_related('category').only(
-            'id', 'title', 'start_date', 'start_time', 'location',
-            'category__name', 'category__color'
-        ).order_by('start_date', 'start_time'))
+        events = _event_occurrences(week_start, week_end, fields=CALENDAR_EVENT_FIELDS)
         
         events_by_date = {}
         for e in events:
@@ -307,9 +335,9 @@ def calendar_pdf(request):
         template = 'events/pdf/calendar_week.html'
         filename = f"calendrier_semaine_{week_start.strftime('%Y%m%d')}.pdf"
         
-        css = CSS(string='''
+        css = '''
             @page { size: A4 landscape; margin: 8mm; }
-        ''', font_config=font_config)
+        '''
     
     else:
         context = _build_calendar_context_optimized(mode, year, month)
@@ -321,15 +349,13 @@ def calendar_pdf(request):
         else:
             filename = f"calendrier_{mois_fr[month].lower()}_{year}.pdf"
         
-        css = CSS(string='''
+        css = '''
             @page { size: A4 landscape; margin: 6mm; }
             .calendar-page { page-break-after: always; }
             .calendar-page:last-child { page-break-after: auto; }
-        ''', font_config=font_config)
+        '''
     
-    html_string = render_to_string(template, context)
-    html = HTML(string=html_string, base_url='.')
-    pdf = html.write_pdf(stylesheets=[css], font_config=font_config)
+    pdf = pdf_engine.render_template(template, context, stylesheets=[css], name=template)
     
     response = HttpResponse(pdf, content_type='application/pdf')
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
@@ -360,15 +386,8 @@ def _build_calendar_context_optimized(mode, year, month):
     first_day = date(start_year, start_month, 1)
     last_day = date(end_year, end_month, monthrange(end_year, end_month)[1])
     
-    # UNE SEULE requête pour tous les événements de la période
-    all_events = list(Event.objects.filter(
-        start_date__gte=first_day,
-        start_date__lte=last_day,
-        is_cancelled=False
-    ).select_related('category').only(
-        'id', 'title', 'start_date', 'start_time', 'location',
-        'category__name', 'category__color'
-    ).order_by('start_date', 'start_time'))
+    # UNE SEULE requête pour toutes les occurrences de la période
+    all_events = _event_occurrences(first_day, last_day, fields=CALENDAR_EVENT_FIELDS)
     
     # Indexer par (année, mois, jour)
     events_index = {}
@@ -462,11 +481,7 @@ def _build_calendar_context_with_description(mode, year, month):
     last_day = date(end_year, end_month, monthrange(end_year, end_month)[1])
     
     # Charger TOUS les champs y compris description
-    all_events = list(Event.objects.filter(
-        start_date__gte=first_day,
-        start_date__lte=last_day,
-        is_cancelled=False
-    ).select_related('category').order_by('start_date', 'start_time'))
+    all_events = _event_occurrences(first_day, last_day)
     
     # Indexer par date
     events_index = {}
@@ -3,7 +3,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.db import models
-from .models import FinancialTransaction, FinanceCategory, ReceiptProof, BudgetLine
+from .models import FinancialTransaction, FinanceCategory, ReceiptProof, OCRBatch, BudgetLine
 
 
 class ReceiptProofInline(admin.TabularInline):
@@ -145,6 +145,16 @@ class ReceiptProofAdmin(admin.ModelAdmin):
     process_ocr_action.short_description = "Traiter avec OCR"
 
 
+@admin.register(OCRBatch)
+class OCRBatchAdmin(admin.ModelAdmin):
+    """Admin pour les traitements OCR en lot."""
+    
+    list_display = ['__str__', 'status', 'succeeded', 'failed', 'created_by', 'created_at', 'completed_at']
+    list_filter = ['status', 'created_at']
+    readonly_fields = ['receipt_ids', 'total', 'processed', 'succeeded', 'failed', 'errors',
+                       'created_by', 'created_at', 'completed_at']
+
+
 @admin.register(BudgetLine)
 class BudgetLineAdmin(admin.ModelAdmin):
     """Admin pour les lignes budgétaires."""
@@ -0,0 +1,31 @@
+"""
+Commande pour recalculer les cumuls dépensés des budgets.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.finance.models import Budget
+from apps.finance.services import BudgetService
+
+
+class Command(BaseCommand):
+    help = 'Recalcule les montants dépensés des budgets à partir des transactions validées'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--year',
+            type=int,
+            help='Limiter le recalcul aux budgets de cette année'
+        )
+
+    def handle(self, *args, **options):
+        """Reconstruit spent_total sur les lignes et les budgets."""
+        
+        budgets = Budget.objects.all()
+        if options['year']:
+            budgets = budgets.filter(year=options['year'])
+        
+        count = BudgetService.recompute_budget_spend(budgets)
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ Cumuls dépensés recalculés pour {count} budget(s)')
+        )
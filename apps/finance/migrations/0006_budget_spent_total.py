@@ -0,0 +1,51 @@
+# Generated by Django 5.2.9 on 2026-10-16 10:05
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def compute_spent_totals(apps, schema_editor):
+    """Initialise les cumuls dépensés à partir des transactions validées."""
+    FinancialTransaction = apps.get_model('finance', 'FinancialTransaction')
+    BudgetItem = apps.get_model('finance', 'BudgetItem')
+    Budget = apps.get_model('finance', 'Budget')
+    
+    item_totals = FinancialTransaction.objects.filter(
+        budget_item__isnull=False,
+        status='valide',
+        transaction_type='depense',
+    ).order_by().values('budget_item').annotate(total=Sum('amount'))
+    
+    budget_totals = {}
+    for row in item_totals:
+        item = BudgetItem.objects.filter(pk=row['budget_item']).first()
+        if item is None:
+            continue
+        BudgetItem.objects.filter(pk=item.pk).update(spent_total=row['total'])
+        budget_totals[item.budget_id] = budget_totals.get(item.budget_id, Decimal('0')) + row['total']
+    
+    for budget_id, total in budget_totals.items():
+        Budget.objects.filter(pk=budget_id).update(spent_total=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0005_budgetitem_approval_comments_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='spent_total',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=12, verbose_name='Montant dépensé'),
+        ),
+        migrations.AddField(
+            model_name='budgetitem',
+            name='spent_total',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=12, verbose_name='Montant dépensé'),
+        ),
+        migrations.RunPython(compute_spent_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-16 12:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0006_budget_spent_total'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OCRBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('en_cours', 'En cours'), ('termine', 'Terminé')], default='en_cours', max_length=15, verbose_name='Statut')),
+                ('receipt_ids', models.JSONField(default=list, verbose_name='Justificatifs')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Justificatifs à traiter')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Justificatifs traités')),
+                ('succeeded', models.PositiveIntegerField(default=0, verbose_name='Succès')),
+                ('failed', models.PositiveIntegerField(default=0, verbose_name='Échecs')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Erreurs')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Lancé le')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Terminé le')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ocr_batches', to=settings.AUTH_USER_MODEL, verbose_name='Lancé par')),
+            ],
+            options={
+                'verbose_name': 'Traitement OCR en lot',
+                'verbose_name_plural': 'Traitements OCR en lot',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
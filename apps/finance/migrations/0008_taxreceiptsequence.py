@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-16 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0007_ocrbatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaxReceiptSequence',
+            fields=[
+                ('fiscal_year', models.PositiveIntegerField(primary_key=True, serialize=False, verbose_name='Année fiscale')),
+                ('last_number', models.PositiveIntegerField(default=0, verbose_name='Dernier numéro attribué')),
+            ],
+            options={
+                'verbose_name': 'Séquence de reçus fiscaux',
+                'verbose_name_plural': 'Séquences de reçus fiscaux',
+            },
+        ),
+    ]
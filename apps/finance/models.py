@@ -9,12 +9,15 @@ Ce module gère :
 """
 
 from django.db import models
+from django.db import transaction as db_transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
+from apps.core.models import AuditSnapshotMixin
 
-class FinancialTransaction(models.Model):
+
+class FinancialTransaction(AuditSnapshotMixin, models.Model):
     """
     Transaction financière de l'église.
     
@@ -175,11 +178,65 @@ class FinancialTransaction(models.Model):
     def __str__(self):
         return f"{self.reference} - {self.get_transaction_type_display()} {self.amount}€"
     
+    # Champs déterminant l'imputation d'une dépense sur une ligne de budget
+    BUDGET_SPEND_FIELDS = ('budget_item_id', 'amount', 'status', 'transaction_type')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Mémorise l'imputation budgétaire telle que chargée depuis la base."""
+        instance = super().from_db(db, field_names, values)
+        if all(name in instance.__dict__ for name in cls.BUDGET_SPEND_FIELDS):
+            instance._loaded_budget_spend = instance.budget_spend
+        return instance
+    
     def save(self, *args, **kwargs):
-        """Génère une référence unique si absente."""
+        """
+        Génère une référence unique si absente et répercute la variation
+        de dépense sur le budget dans la même transaction.
+        """
         if not self.reference:
             self.reference = self._generate_reference()
-        super().save(*args, **kwargs)
+        
+        with db_transaction.atomic():
+            previous = self._get_previous_budget_spend()
+            super().save(*args, **kwargs)
+            
+            from .services import BudgetService
+            BudgetService.apply_spend_change(previous, self.budget_spend)
+            self._loaded_budget_spend = self.budget_spend
+    
+    @property
+    def budget_spend(self):
+        """
+        Imputation budgétaire de la transaction.
+        
+        Returns:
+            tuple (budget_item_id, montant) pour une dépense validée liée
+            à une ligne de budget, None sinon
+        """
+        if (self.budget_item_id and self.amount is not None
+                and self.status == self.Status.VALIDE
+                and self.transaction_type == self.TransactionType.DEPENSE):
+            return (self.budget_item_id, self.amount)
+        return None
+    
+    def _get_previous_budget_spend(self):
+        """Retourne l'imputation enregistrée en base avant cette sauvegarde."""
+        if self._state.adding or self.pk is None:
+            return None
+        if hasattr(self, '_loaded_budget_spend'):
+            return self._loaded_budget_spend
+        
+        # Instance chargée partiellement (.only/.defer) : relire l'état en base
+        stored = FinancialTransaction.objects.filter(pk=self.pk).values(
+            *self.BUDGET_SPEND_FIELDS
+        ).first()
+        if stored is None:
+            return None
+        if (stored['budget_item_id'] and stored['status'] == self.Status.VALIDE
+                and stored['transaction_type'] == self.TransactionType.DEPENSE):
+            return (stored['budget_item_id'], stored['amount'])
+        return None
     
     def _generate_reference(self):
         """Génère une référence au format TRX-YYYYMM-XXXX."""
@@ -369,6 +426,60 @@ class ReceiptProof(models.Model):
         return ocr_service.process_receipt(self)
 
 
+class OCRBatch(models.Model):
+    """
+    Traitement OCR en lot de plusieurs justificatifs.
+    
+    Les compteurs sont incrémentés par chaque tâche OCR (mises à jour
+    atomiques) : la progression se lit sur cet enregistrement, sans
+    interroger chaque justificatif.
+    """
+    
+    class Status(models.TextChoices):
+        EN_COURS = 'en_cours', 'En cours'
+        TERMINE = 'termine', 'Terminé'
+    
+    status = models.CharField(
+        max_length=15,
+        choices=Status.choices,
+        default=Status.EN_COURS,
+        verbose_name="Statut"
+    )
+    
+    receipt_ids = models.JSONField(default=list, verbose_name="Justificatifs")
+    
+    total = models.PositiveIntegerField(default=0, verbose_name="Justificatifs à traiter")
+    processed = models.PositiveIntegerField(default=0, verbose_name="Justificatifs traités")
+    succeeded = models.PositiveIntegerField(default=0, verbose_name="Succès")
+    failed = models.PositiveIntegerField(default=0, verbose_name="Échecs")
+    errors = models.JSONField(default=list, blank=True, verbose_name="Erreurs")
+    
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ocr_batches',
+        verbose_name="Lancé par"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Lancé le")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Terminé le")
+    
+    class Meta:
+        verbose_name = "Traitement OCR en lot"
+        verbose_name_plural = "Traitements OCR en lot"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Lot OCR #{self.pk} ({self.processed}/{self.total})"
+    
+    @property
+    def progress_percentage(self):
+        if not self.total:
+            return 100
+        return round(self.processed / self.total * 100)
+
+
 class BudgetLine(models.Model):
     """
     Ligne budgétaire pour le suivi prévisionnel.
@@ -570,6 +681,69 @@ class OnlineDonation(models.Model):
         return f"{self.donor_email} - {self.amount}€ ({self.get_status_display()})"
 
 
+class TaxReceiptSequence(models.Model):
+    """
+    Compteur des numéros de reçus fiscaux, par année fiscale.
+    
+    Les numéros sont réservés par blocs sous verrou de ligne
+    (select_for_update) : deux générations simultanées ne peuvent pas
+    attribuer le même numéro.
+    """
+    
+    fiscal_year = models.PositiveIntegerField(primary_key=True, verbose_name="Année fiscale")
+    last_number = models.PositiveIntegerField(default=0, verbose_name="Dernier numéro attribué")
+    
+    class Meta:
+        verbose_name = "Séquence de reçus fiscaux"
+        verbose_name_plural = "Séquences de reçus fiscaux"
+    
+    def __str__(self):
+        return f"{self.fiscal_year} : {self.last_number}"
+    
+    @staticmethod
+    def format_number(year, number):
+        return f"RF-{year}-{number:04d}"
+    
+    @classmethod
+    def _initial_number(cls, year):
+        """Plus grand numéro déjà attribué pour l'année (reçus existants)."""
+        numbers = [
+            int(receipt_number.rsplit('-', 1)[-1])
+            for receipt_number in TaxReceipt.objects.filter(
+                fiscal_year=year
+            ).values_list('receipt_number', flat=True)
+            if receipt_number.rsplit('-', 1)[-1].isdigit()
+        ]
+        return max(numbers, default=0)
+    
+    @classmethod
+    def reserve(cls, year, count=1):
+        """
+        Réserve un bloc de numéros de reçus consécutifs.
+        
+        Args:
+            year: Année fiscale
+            count: Nombre de numéros à réserver
+        
+        Returns:
+            list: Numéros de reçus (« RF-AAAA-NNNN »)
+        """
+        if count <= 0:
+            return []
+        
+        with db_transaction.atomic():
+            cls.objects.get_or_create(
+                fiscal_year=year,
+                defaults={'last_number': cls._initial_number(year)},
+            )
+            sequence = cls.objects.select_for_update().get(fiscal_year=year)
+            first = sequence.last_number + 1
+            sequence.last_number += count
+            sequence.save(update_fields=['last_number'])
+        
+        return [cls.format_number(year, number) for number in range(first, first + count)]
+
+
 class TaxReceipt(models.Model):
     """
     Reçu fiscal pour les dons.
@@ -668,15 +842,11 @@ class TaxReceipt(models.Model):
         super().save(*args, **kwargs)
     
     def _generate_receipt_number(self):
-        """Génère un numéro de reçu unique."""
+        """Génère un numéro de reçu unique (cf. TaxReceiptSequence)."""
         import datetime
         
         year = self.fiscal_year or datetime.date.today().year
-        
-        # Compter les reçus existants pour cette année
-        count = TaxReceipt.objects.filter(fiscal_year=year).count() + 1
-        
-        return f"RF-{year}-{count:04d}"
+        return TaxReceiptSequence.reserve(year)[0]
     
     def generate_pdf(self):
         """Génère le PDF du reçu fiscal."""
@@ -746,7 +916,7 @@ class BudgetCategory(models.Model):
         return self.name
 
 
-class Budget(models.Model):
+class Budget(AuditSnapshotMixin, models.Model):
     """
     Budget annuel pour un groupe/département.
     """
@@ -793,6 +963,15 @@ class Budget(models.Model):
         verbose_name="Montant approuvé"
     )
     
+    # Cumul des dépenses validées des lignes, maintenu par
+    # BudgetService.apply_spend_change (cf. recompute_budget_spend)
+    spent_total = models.DecimalField(
+        max_digits=12, decimal_places=2,
+        default=Decimal('0.00'),
+        editable=False,
+        verbose_name="Montant dépensé"
+    )
+    
     # Statut et suivi
     status = models.CharField(
         max_length=20,
@@ -848,10 +1027,8 @@ class Budget(models.Model):
     
     @property
     def spent_amount(self):
-        """Calcule le montant déjà dépensé."""
-        from decimal import Decimal
-        total = sum(item.spent_amount for item in self.items.all())
-        return Decimal(str(total)) if total else Decimal('0.00')
+        """Montant déjà dépensé (cumul maintenu dans `spent_total`)."""
+        return self.spent_total
     
     @property
     def remaining_amount(self):
@@ -904,6 +1081,14 @@ class BudgetItem(models.Model):
         verbose_name="Montant approuvé"
     )
     
+    # Cumul des dépenses validées imputées sur cette ligne
+    spent_total = models.DecimalField(
+        max_digits=12, decimal_places=2,
+        default=Decimal('0.00'),
+        editable=False,
+        verbose_name="Montant dépensé"
+    )
+    
     # Approbation ligne par ligne
     approval_status = models.CharField(
         max_length=20,
@@ -957,16 +1142,8 @@ class BudgetItem(models.Model):
     
     @property
     def spent_amount(self):
-        """Calcule le montant déjà dépensé pour cette ligne."""
-        from decimal import Decimal
-        transactions = FinancialTransaction.objects.filter(
-            budget_item=self,
-            status='valide',
-            transaction_type='depense'
-        )
-        
-        total = sum(t.amount for t in transactions)
-        return Decimal(str(total)) if total else Decimal('0.00')
+        """Montant déjà dépensé pour cette ligne (cumul maintenu dans `spent_total`)."""
+        return self.spent_total
     
     @property
     def remaining_amount(self):
@@ -13,12 +13,80 @@ Sur Linux: sudo apt install tesseract-ocr tesseract-ocr-fra
 
 import re
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
+from django.conf import settings
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+_executor = None
+
+
+def prepare_image(path, max_dimension=2000):
+    """
+    Ouvre et prétraite une image pour l'OCR.
+    
+    L'image est réduite avant tout traitement : les JPEG sont décodés
+    directement à taille réduite (draft) et aucune dimension ne dépasse
+    max_dimension. Les photos de téléphone (12 Mpx et plus) sont ainsi
+    traitées plusieurs fois plus vite, sans perte de lisibilité.
+    """
+    from PIL import Image, ImageEnhance, ImageFilter
+    
+    img = Image.open(path)
+    img.draft('L', (max_dimension, max_dimension))
+    
+    # Convertir en niveaux de gris
+    if img.mode != 'L':
+        img = img.convert('L')
+    
+    img.thumbnail((max_dimension, max_dimension))
+    
+    try:
+        # Augmenter le contraste et la netteté
+        img = ImageEnhance.Contrast(img).enhance(2.0)
+        img = img.filter(ImageFilter.SHARPEN)
+    except Exception:
+        pass
+    
+    return img
+
+
+def image_to_text(path, lang='fra', max_dimension=2000):
+    """
+    Prétraitement et extraction du texte d'une image.
+    
+    Fonction de module (sérialisable) pour pouvoir être exécutée dans le
+    pool de processus.
+    """
+    import pytesseract
+    
+    return pytesseract.image_to_string(prepare_image(path, max_dimension), lang=lang)
+
+
+def get_process_pool():
+    """
+    Pool de processus dédié à l'OCR (OCR_PROCESS_POOL_SIZE > 0), créé à la
+    demande et partagé par le worker.
+    
+    Utile avec un worker Celery multi-threads (-P threads) sur une machine
+    multi-cœurs : le prétraitement Pillow et Tesseract s'exécutent en
+    parallèle sur les cœurs. Les processus enfants d'un worker prefork
+    (démons) ne peuvent pas créer de pool : l'OCR y reste exécuté dans
+    le processus.
+    """
+    global _executor
+    
+    size = getattr(settings, 'OCR_PROCESS_POOL_SIZE', 0)
+    if size <= 0 or multiprocessing.current_process().daemon:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=size)
+    return _executor
+
 
 class OCRService:
     """Service pour l'extraction OCR des reçus."""
@@ -39,87 +107,84 @@ class OCRService:
             logger.warning(f"Tesseract OCR not available: {e}")
             self.tesseract_available = False
     
-    def process_receipt(self, receipt_proof):
+    def extract_text(self, path):
+        """Texte d'une image (dans le pool de processus s'il est configuré)."""
+        max_dimension = getattr(settings, 'OCR_MAX_IMAGE_DIMENSION', 2000)
+        pool = get_process_pool()
+        if pool is not None:
+            return pool.submit(image_to_text, path, 'fra', max_dimension).result()
+        return image_to_text(path, 'fra', max_dimension)
+    
+    def analyze(self, receipt_proof):
         """
-        Traite une image de reçu avec OCR.
-        
-        Args:
-            receipt_proof: Instance de ReceiptProof
+        Extrait les données d'un reçu, sans rien enregistrer.
         
         Returns:
-            dict: Données extraites ou None si échec
+            dict: {'text', 'amount', 'date', 'confidence'} ou {'error'}
         """
         if not self.tesseract_available:
-            receipt_proof.ocr_status = 'echec'
-            receipt_proof.save()
             return {'error': 'Tesseract OCR not available'}
         
         try:
-            import pytesseract
-            from PIL import Image
-            
-            receipt_proof.ocr_status = 'en_cours'
-            receipt_proof.save()
-            
-            # Ouvrir l'image
-            img = Image.open(receipt_proof.image.path)
-            
-            # Prétraitement de l'image pour améliorer l'OCR
-            img = self._preprocess_image(img)
-            
-            # Extraction du texte
-            text = pytesseract.image_to_string(img, lang='fra')
-            
-            # Extraction des données
-            amount = self._extract_amount(text)
-            date = self._extract_date(text)
-            
-            # Calcul de la confiance (basé sur la présence de données)
-            confidence = self._calculate_confidence(text, amount, date)
-            
-            # Mise à jour du modèle
-            receipt_proof.ocr_raw_text = text
-            receipt_proof.ocr_extracted_amount = amount
-            receipt_proof.ocr_extracted_date = date
-            receipt_proof.ocr_confidence = confidence
-            receipt_proof.ocr_status = 'termine'
-            receipt_proof.ocr_processed_at = timezone.now()
-            receipt_proof.save()
-            
-            logger.info(f"OCR completed for receipt {receipt_proof.id}: amount={amount}, date={date}")
-            
-            return {
-                'text': text,
-                'amount': amount,
-                'date': date,
-                'confidence': confidence,
-            }
-        
+            text = self.extract_text(receipt_proof.image.path)
         except Exception as e:
             logger.error(f"OCR failed for receipt {receipt_proof.id}: {e}")
-            receipt_proof.ocr_status = 'echec'
-            receipt_proof.save()
             return {'error': str(e)}
+        
+        # Extraction des données
+        amount = self._extract_amount(text)
+        date = self._extract_date(text)
+        
+        return {
+            'text': text,
+            'amount': amount,
+            'date': date,
+            # Calcul de la confiance (basé sur la présence de données)
+            'confidence': self._calculate_confidence(text, amount, date),
+        }
     
-    def _preprocess_image(self, img):
-        """Prétraite l'image pour améliorer l'OCR."""
-        try:
-            from PIL import ImageEnhance, ImageFilter
-            
-            # Convertir en niveaux de gris
-            if img.mode != 'L':
-                img = img.convert('L')
-            
-            # Augmenter le contraste
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(2.0)
-            
-            # Augmenter la netteté
-            img = img.filter(ImageFilter.SHARPEN)
-            
-            return img
-        except Exception:
-            return img
+    def save_result(self, receipt_proof, result):
+        """
+        Enregistre le résultat de l'OCR en une seule requête UPDATE et
+        reporte les valeurs sur l'instance.
+        """
+        from .models import ReceiptProof
+        
+        if 'error' in result:
+            fields = {'ocr_status': ReceiptProof.OCRStatus.ECHEC}
+        else:
+            fields = {
+                'ocr_raw_text': result['text'],
+                'ocr_extracted_amount': result['amount'],
+                'ocr_extracted_date': result['date'],
+                'ocr_confidence': result['confidence'],
+                'ocr_status': ReceiptProof.OCRStatus.TERMINE,
+                'ocr_processed_at': timezone.now(),
+            }
+        
+        ReceiptProof.objects.filter(pk=receipt_proof.pk).update(**fields)
+        for field, value in fields.items():
+            setattr(receipt_proof, field, value)
+    
+    def process_receipt(self, receipt_proof):
+        """
+        Traite une image de reçu avec OCR.
+        
+        Args:
+            receipt_proof: Instance de ReceiptProof
+        
+        Returns:
+            dict: Données extraites ou {'error': ...} si échec
+        """
+        result = self.analyze(receipt_proof)
+        self.save_result(receipt_proof, result)
+        
+        if 'error' not in result:
+            logger.info(
+                f"OCR completed for receipt {receipt_proof.id}: "
+                f"amount={result['amount']}, date={result['date']}"
+            )
+        return result
     
     def _extract_amount(self, text):
         """Extrait le montant du texte."""
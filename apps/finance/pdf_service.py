@@ -1,13 +1,150 @@
 """
 Service de génération PDF pour les reçus fiscaux.
 
-Utilise WeasyPrint pour générer des PDF conformes.
+Utilise WeasyPrint (moteur partagé apps.core.pdf_engine) pour générer
+des PDF conformes.
 """
 
-import io
-from django.template.loader import render_to_string
 from django.core.files.base import ContentFile
-from django.conf import settings
+
+from apps.core import pdf_engine
+
+
+# CSS des reçus fiscaux (analysé une fois par processus par le moteur PDF)
+TAX_RECEIPT_CSS = '''
+@page {
+    size: A4;
+    margin: 2cm;
+}
+
+body {
+    font-family: 'Helvetica', 'Arial', sans-serif;
+    font-size: 11pt;
+    line-height: 1.5;
+    color: #333;
+}
+
+.header {
+    text-align: center;
+    margin-bottom: 30px;
+    border-bottom: 2px solid #0A36FF;
+    padding-bottom: 20px;
+}
+
+.header h1 {
+    color: #0A36FF;
+    font-size: 18pt;
+    margin: 0;
+}
+
+.header h2 {
+    font-size: 14pt;
+    color: #666;
+    margin: 10px 0 0 0;
+}
+
+.receipt-number {
+    text-align: right;
+    font-size: 12pt;
+    color: #0A36FF;
+    font-weight: bold;
+    margin-bottom: 20px;
+}
+
+.section {
+    margin-bottom: 25px;
+}
+
+.section-title {
+    font-weight: bold;
+    color: #0A36FF;
+    border-bottom: 1px solid #ddd;
+    padding-bottom: 5px;
+    margin-bottom: 10px;
+}
+
+.info-row {
+    display: flex;
+    margin-bottom: 5px;
+}
+
+.info-label {
+    width: 150px;
+    font-weight: bold;
+}
+
+.amount-box {
+    background: #f5f5f5;
+    border: 2px solid #0A36FF;
+    padding: 20px;
+    text-align: center;
+    margin: 30px 0;
+}
+
+.amount-box .amount {
+    font-size: 24pt;
+    font-weight: bold;
+    color: #0A36FF;
+}
+
+.amount-box .amount-text {
+    font-size: 12pt;
+    color: #666;
+    margin-top: 5px;
+}
+
+.legal-text {
+    font-size: 9pt;
+    color: #666;
+    border: 1px solid #ddd;
+    padding: 15px;
+    margin-top: 30px;
+    background: #fafafa;
+}
+
+.signature-section {
+    margin-top: 40px;
+    display: flex;
+    justify-content: space-between;
+}
+
+.signature-box {
+    width: 45%;
+}
+
+.signature-line {
+    border-bottom: 1px solid #333;
+    height: 60px;
+    margin-top: 10px;
+}
+
+.footer {
+    margin-top: 50px;
+    text-align: center;
+    font-size: 9pt;
+    color: #999;
+}
+'''
+
+
+def _tax_receipt_context(tax_receipt):
+    """Contexte du template d'un reçu fiscal."""
+    return {
+        'receipt': tax_receipt,
+        'church_name': "Église Évangélique Baptiste de Cabassou",
+        'church_address': "5 rue Calimbés 2, Route de Cabassou, 97300 Cayenne",
+        'church_siret': "XXX XXX XXX XXXXX",  # À configurer
+        'church_rna': "W9XXXXXXXX",  # Numéro RNA
+    }
+
+
+def _tax_receipt_filename(tax_receipt):
+    return f"recu_fiscal_{tax_receipt.receipt_number}.pdf"
+
+
+def _check_weasyprint():
+    if not pdf_engine.is_available():
+        raise ImportError("WeasyPrint n'est pas installé. Installez-le avec: pip install weasyprint")
 
 
 def generate_tax_receipt_pdf(tax_receipt):
@@ -20,144 +157,35 @@ def generate_tax_receipt_pdf(tax_receipt):
     Returns:
         bytes: Contenu du PDF
     """
-    try:
-        from weasyprint import HTML, CSS
-    except ImportError:
-        raise ImportError("WeasyPrint n'est pas installé. Installez-le avec: pip install weasyprint")
-    
-    # Contexte pour le template
-    context = {
-        'receipt': tax_receipt,
-        'church_name': "Église Évangélique Baptiste de Cabassou",
-        'church_address': "5 rue Calimbés 2, Route de Cabassou, 97300 Cayenne",
-        'church_siret': "XXX XXX XXX XXXXX",  # À configurer
-        'church_rna': "W9XXXXXXXX",  # Numéro RNA
-    }
+    _check_weasyprint()
+    return pdf_engine.render_template(
+        'finance/tax_receipt_pdf.html',
+        _tax_receipt_context(tax_receipt),
+        stylesheets=[TAX_RECEIPT_CSS],
+        name='tax_receipt',
+    )
+
+
+def generate_tax_receipt_pdfs(tax_receipts):
+    """
+    Génère les PDF de plusieurs reçus fiscaux en parallèle (pool de
+    processus du moteur PDF).
     
-    # Rendre le template HTML
-    html_content = render_to_string('finance/tax_receipt_pdf.html', context)
-    
-    # CSS pour le PDF
-    css = CSS(string='''
-        @page {
-            size: A4;
-            margin: 2cm;
-        }
-        
-        body {
-            font-family: 'Helvetica', 'Arial', sans-serif;
-            font-size: 11pt;
-            line-height: 1.5;
-            color: #333;
-        }
-        
-        .header {
-            text-align: center;
-            margin-bottom: 30px;
-            border-bottom: 2px solid #0A36FF;
-            padding-bottom: 20px;
-        }
-        
-        .header h1 {
-            color: #0A36FF;
-            font-size: 18pt;
-            margin: 0;
-        }
-        
-        .header h2 {
-            font-size: 14pt;
-            color: #666;
-            margin: 10px 0 0 0;
-        }
-        
-        .receipt-number {
-            text-align: right;
-            font-size: 12pt;
-            color: #0A36FF;
-            font-weight: bold;
-            margin-bottom: 20px;
-        }
-        
-        .section {
-            margin-bottom: 25px;
-        }
-        
-        .section-title {
-            font-weight: bold;
-            color: #0A36FF;
-            border-bottom: 1px solid #ddd;
-            padding-bottom: 5px;
-            margin-bottom: 10px;
-        }
-        
-        .info-row {
-            display: flex;
-            margin-bottom: 5px;
-        }
-        
-        .info-label {
-            width: 150px;
-            font-weight: bold;
-        }
-        
-        .amount-box {
-            background: #f5f5f5;
-            border: 2px solid #0A36FF;
-            padding: 20px;
-            text-align: center;
-            margin: 30px 0;
-        }
-        
-        .amount-box .amount {
-            font-size: 24pt;
-            font-weight: bold;
-            color: #0A36FF;
-        }
-        
-        .amount-box .amount-text {
-            font-size: 12pt;
-            color: #666;
-            margin-top: 5px;
-        }
-        
-        .legal-text {
-            font-size: 9pt;
-            color: #666;
-            border: 1px solid #ddd;
-            padding: 15px;
-            margin-top: 30px;
-            background: #fafafa;
-        }
-        
-        .signature-section {
-            margin-top: 40px;
-            display: flex;
-            justify-content: space-between;
-        }
-        
-        .signature-box {
-            width: 45%;
-        }
-        
-        .signature-line {
-            border-bottom: 1px solid #333;
-            height: 60px;
-            margin-top: 10px;
-        }
-        
-        .footer {
-            margin-top: 50px;
-            text-align: center;
-            font-size: 9pt;
-            color: #999;
-        }
-    ''')
-    
-    # Générer le PDF
-    html = HTML(string=html_content)
-    pdf_bytes = html.write_pdf(stylesheets=[css])
-    
-    return pdf_bytes
+    Returns:
+        list: Contenu des PDF, dans l'ordre des reçus
+    """
+    _check_weasyprint()
+    return pdf_engine.render_many(
+        (
+            {
+                'template_name': 'finance/tax_receipt_pdf.html',
+                'context': _tax_receipt_context(tax_receipt),
+                'stylesheets': [TAX_RECEIPT_CSS],
+            }
+            for tax_receipt in tax_receipts
+        ),
+        name='tax_receipt',
+    )
 
 
 def save_tax_receipt_pdf(tax_receipt):
@@ -169,15 +197,30 @@ def save_tax_receipt_pdf(tax_receipt):
     """
     pdf_bytes = generate_tax_receipt_pdf(tax_receipt)
     
-    # Nom du fichier
-    filename = f"recu_fiscal_{tax_receipt.receipt_number}.pdf"
-    
     # Sauvegarder dans le modèle
-    tax_receipt.pdf_file.save(filename, ContentFile(pdf_bytes), save=True)
+    tax_receipt.pdf_file.save(_tax_receipt_filename(tax_receipt), ContentFile(pdf_bytes), save=True)
     
     return tax_receipt.pdf_file
 
 
+def save_tax_receipt_pdfs(tax_receipts):
+    """Génère en parallèle et sauvegarde les PDF de plusieurs reçus fiscaux."""
+    tax_receipts = list(tax_receipts)
+    for tax_receipt, pdf_bytes in zip(tax_receipts, generate_tax_receipt_pdfs(tax_receipts)):
+        tax_receipt.pdf_file.save(_tax_receipt_filename(tax_receipt), ContentFile(pdf_bytes), save=True)
+    return tax_receipts
+
+
+class TaxReceiptPDFService:
+    """Génération des PDF de reçus fiscaux (vues finance)."""
+    
+    def generate_receipt_pdf(self, tax_receipt):
+        return generate_tax_receipt_pdf(tax_receipt)
+    
+    def generate_receipt_pdfs(self, tax_receipts):
+        return generate_tax_receipt_pdfs(tax_receipts)
+
+
 def number_to_words_fr(number):
     """Convertit un nombre en lettres (français)."""
     units = ['', 'un', 'deux', 'trois', 'quatre', 'cinq', 'six', 'sept', 'huit', 'neuf',
@@ -4,14 +4,18 @@ Service Layer pour le module Finance.
 Ce module centralise la logique métier pour:
 - La gestion des transactions financières (TransactionService)
 - La gestion des budgets (BudgetService)
+- La génération des reçus fiscaux annuels (TaxReceiptService)
 
 Requirements: 7.4
 """
 
+from collections import defaultdict
 from decimal import Decimal
 from datetime import date, timedelta
 from typing import Optional, Dict, Any, List
-from django.db.models import Sum, Q
+from django.db import transaction as db_transaction
+from django.db.models import Sum, Q, Count, F, OuterRef, Subquery, Value, DecimalField
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.conf import settings
 
@@ -22,7 +26,9 @@ from .models import (
     Budget, 
     BudgetItem, 
     BudgetCategory,
-    BudgetRequest
+    BudgetRequest,
+    TaxReceipt,
+    TaxReceiptSequence
 )
 
 
@@ -155,6 +161,9 @@ class TransactionService:
         """
         Valide une transaction en attente.
         
+        Le cumul dépensé de la ligne de budget liée est mis à jour dans
+        la même transaction SQL (cf. FinancialTransaction.save).
+        
         Args:
             transaction: La transaction à valider
             validated_by: Utilisateur qui valide la transaction
@@ -186,6 +195,9 @@ class TransactionService:
         """
         Annule une transaction.
         
+        Une dépense validée annulée est retirée du cumul de son budget
+        dans la même transaction SQL.
+        
         Args:
             transaction: La transaction à annuler
             cancelled_by: Utilisateur qui annule la transaction
@@ -213,74 +225,52 @@ class TransactionService:
         """
         Retourne les statistiques pour le dashboard financier.
         
+        Les totaux proviennent de FinanceStats (une requête, mise en cache
+        par site) ; seules les transactions récentes sont lues à chaque appel.
+        
         Args:
             site: Site pour filtrer les statistiques (optionnel)
         
         Returns:
             Dictionnaire contenant les statistiques
         """
-        today = date.today()
-        start_of_month = today.replace(day=1)
-        start_of_year = today.replace(month=1, day=1)
-        
-        # Filtre de base
-        base_filter = Q(status=FinancialTransaction.Status.VALIDE)
-        if site:
-            base_filter &= Q(site=site)
-        
-        # Stats du mois
-        month_filter = base_filter & Q(transaction_date__gte=start_of_month)
-        month_transactions = FinancialTransaction.objects.filter(month_filter)
-        
-        month_income = month_transactions.filter(
-            transaction_type__in=['don', 'dime', 'offrande']
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        
-        month_expenses = month_transactions.filter(
-            transaction_type='depense'
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        
-        # Stats de l'année
-        year_filter = base_filter & Q(transaction_date__gte=start_of_year)
-        year_transactions = FinancialTransaction.objects.filter(year_filter)
+        from .stats import FinanceStats
         
-        year_income = year_transactions.filter(
-            transaction_type__in=['don', 'dime', 'offrande']
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        
-        year_expenses = year_transactions.filter(
-            transaction_type='depense'
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        
-        # Transactions en attente
-        pending_filter = Q(status=FinancialTransaction.Status.EN_ATTENTE)
-        if site:
-            pending_filter &= Q(site=site)
-        pending_count = FinancialTransaction.objects.filter(pending_filter).count()
+        stats = FinanceStats.get_totals(site=site)
         
         # Transactions récentes
-        recent_filter = base_filter if site else Q()
-        recent_transactions = FinancialTransaction.objects.filter(
+        recent_filter = Q(status=FinancialTransaction.Status.VALIDE, site=site) if site else Q()
+        stats['recent_transactions'] = FinancialTransaction.objects.filter(
             recent_filter
         ).select_related('category', 'member').order_by(
             '-transaction_date', '-created_at'
         )[:10]
         
-        return {
-            'month_income': month_income,
-            'month_expenses': month_expenses,
-            'month_balance': month_income - month_expenses,
-            'year_income': year_income,
-            'year_expenses': year_expenses,
-            'year_balance': year_income - year_expenses,
-            'pending_count': pending_count,
-            'recent_transactions': recent_transactions,
-        }
+        return stats
     
     @classmethod
     def get_monthly_donations_data(cls, months: int = 12, site=None) -> Dict[str, Any]:
         """
-        Retourne les données de dons par mois pour les graphiques.
+        Retourne les données de dons par mois pour les graphiques (en cache).
+        
+        Args:
+            months: Nombre de mois à récupérer (défaut: 12)
+            site: Site pour filtrer (optionnel)
+        
+        Returns:
+            Dictionnaire avec labels (mois) et data (montants)
+        """
+        from .stats import FinanceStats
+        
+        return FinanceStats.cached(
+            f'monthly_donations:{months}', site,
+            lambda: cls._compute_monthly_donations_data(months, site)
+        )
+    
+    @classmethod
+    def _compute_monthly_donations_data(cls, months: int = 12, site=None) -> Dict[str, Any]:
+        """
+        Calcule les données de dons par mois pour les graphiques.
         
         Args:
             months: Nombre de mois à récupérer (défaut: 12)
@@ -355,7 +345,26 @@ class TransactionService:
     @classmethod
     def get_expenses_distribution_data(cls, months: int = 12, site=None) -> Dict[str, Any]:
         """
-        Retourne les données de répartition des dépenses par catégorie pour les graphiques.
+        Retourne les données de répartition des dépenses par catégorie pour les graphiques (en cache).
+        
+        Args:
+            months: Nombre de mois à analyser (défaut: 12)
+            site: Site pour filtrer (optionnel)
+        
+        Returns:
+            Dictionnaire avec labels (catégories) et data (montants)
+        """
+        from .stats import FinanceStats
+        
+        return FinanceStats.cached(
+            f'expenses_distribution:{months}', site,
+            lambda: cls._compute_expenses_distribution_data(months, site)
+        )
+    
+    @classmethod
+    def _compute_expenses_distribution_data(cls, months: int = 12, site=None) -> Dict[str, Any]:
+        """
+        Calcule les données de répartition des dépenses par catégorie pour les graphiques.
         
         Args:
             months: Nombre de mois à analyser (défaut: 12)
@@ -860,21 +869,25 @@ class BudgetService:
             status=Budget.Status.ACTIVE
         )
         
-        total_approved = active_budgets.aggregate(
-            total=Sum('total_approved')
-        )['total'] or Decimal('0.00')
-        
-        total_spent = sum(budget.spent_amount for budget in active_budgets)
+        totals = active_budgets.aggregate(
+            approved=Sum('total_approved'),
+            spent=Sum('spent_total'),
+        )
+        total_approved = totals['approved'] or Decimal('0.00')
+        total_spent = totals['spent'] or Decimal('0.00')
         
         pending_requests = BudgetRequest.objects.filter(
             status=BudgetRequest.Status.PENDING
         ).count()
         
-        # Stats par statut
-        budget_stats = {}
-        for status_code, status_name in Budget.Status.choices:
-            count = Budget.objects.filter(year=year, status=status_code).count()
-            budget_stats[status_name] = count
+        # Stats par statut (une seule requête groupée)
+        counts_by_status = dict(
+            Budget.objects.filter(year=year).order_by().values_list('status').annotate(count=Count('id'))
+        )
+        budget_stats = {
+            status_name: counts_by_status.get(status_code, 0)
+            for status_code, status_name in Budget.Status.choices
+        }
         
         return {
             'year': year,
@@ -887,7 +900,7 @@ class BudgetService:
             ),
             'pending_requests': pending_requests,
             'budget_stats': budget_stats,
-            'active_budgets_count': active_budgets.count(),
+            'active_budgets_count': counts_by_status.get(Budget.Status.ACTIVE, 0),
         }
     
     @classmethod
@@ -902,20 +915,82 @@ class BudgetService:
             Liste des lignes de budget dépassant le seuil
         """
         year = date.today().year
-        active_budgets = Budget.objects.filter(
-            year=year,
-            status=Budget.Status.ACTIVE
+        ratio = Decimal(str(threshold_percent)) / Decimal('100')
+        
+        return list(
+            BudgetItem.objects.filter(
+                budget__year=year,
+                budget__status=Budget.Status.ACTIVE,
+                approved_amount__gt=0,
+                spent_total__gte=F('approved_amount') * ratio,
+            ).select_related('budget', 'budget__group', 'budget__department', 'category')
         )
+    
+    @classmethod
+    def apply_spend_change(cls, previous, current):
+        """
+        Répercute la variation d'imputation d'une dépense sur les cumuls
+        `spent_total` de la ligne et du budget concernés.
         
-        low_budget_items = []
-        for budget in active_budgets:
-            for item in budget.items.all():
-                if item.approved_amount > 0:
-                    utilization = item.utilization_percentage
-                    if utilization >= threshold_percent:
-                        low_budget_items.append(item)
+        Les mises à jour utilisent des expressions F() : pas de lecture
+        préalable, pas de perte de mise à jour en cas de concurrence.
+        Doit être appelée dans la transaction qui modifie la dépense.
         
-        return low_budget_items
+        Args:
+            previous: Imputation avant modification (budget_item_id, montant) ou None
+            current: Imputation après modification (budget_item_id, montant) ou None
+        """
+        if previous == current:
+            return
+        
+        deltas = {}
+        if previous:
+            deltas[previous[0]] = deltas.get(previous[0], Decimal('0')) - previous[1]
+        if current:
+            deltas[current[0]] = deltas.get(current[0], Decimal('0')) + current[1]
+        
+        for item_id, delta in deltas.items():
+            if not delta:
+                continue
+            BudgetItem.objects.filter(pk=item_id).update(spent_total=F('spent_total') + delta)
+            Budget.objects.filter(items__pk=item_id).update(spent_total=F('spent_total') + delta)
+    
+    @classmethod
+    def recompute_budget_spend(cls, budgets=None) -> int:
+        """
+        Recalcule les cumuls dépensés à partir des transactions validées.
+        
+        Deux requêtes UPDATE (lignes puis budgets), quel que soit le volume.
+        
+        Args:
+            budgets: QuerySet de budgets à recalculer (défaut: tous)
+        
+        Returns:
+            Nombre de budgets recalculés
+        """
+        if budgets is None:
+            budgets = Budget.objects.all()
+        
+        amount_field = DecimalField(max_digits=12, decimal_places=2)
+        zero = Value(Decimal('0.00'), output_field=amount_field)
+        
+        item_spent = FinancialTransaction.objects.filter(
+            budget_item=OuterRef('pk'),
+            status=FinancialTransaction.Status.VALIDE,
+            transaction_type=FinancialTransaction.TransactionType.DEPENSE,
+        ).order_by().values('budget_item').annotate(total=Sum('amount')).values('total')
+        
+        budget_spent = BudgetItem.objects.filter(
+            budget=OuterRef('pk')
+        ).order_by().values('budget').annotate(total=Sum('spent_total')).values('total')
+        
+        with db_transaction.atomic():
+            BudgetItem.objects.filter(budget__in=budgets).update(
+                spent_total=Coalesce(Subquery(item_spent, output_field=amount_field), zero)
+            )
+            return budgets.update(
+                spent_total=Coalesce(Subquery(budget_spent, output_field=amount_field), zero)
+            )
     
     @classmethod
     def _update_budget_total(cls, budget: Budget):
@@ -928,3 +1003,103 @@ class BudgetService:
         total = sum(item.requested_amount for item in budget.items.all())
         budget.total_requested = total
         budget.save(update_fields=['total_requested'])
+
+
+class TaxReceiptService:
+    """
+    Génération des reçus fiscaux annuels.
+    
+    Toute l'année est traitée en un nombre fixe de requêtes, quel que soit
+    le nombre de donateurs : totaux par membre (GROUP BY), numéros réservés
+    en bloc (TaxReceiptSequence), reçus et liens vers les transactions
+    créés en masse.
+    """
+    
+    DONATION_TYPES = ('don', 'dime', 'offrande')
+    
+    @classmethod
+    def donations_for_year(cls, year: int):
+        """Dons validés d'une année, rattachés à un membre."""
+        return FinancialTransaction.objects.filter(
+            transaction_date__year=year,
+            status=FinancialTransaction.Status.VALIDE,
+            transaction_type__in=cls.DONATION_TYPES,
+            member__isnull=False,
+        )
+    
+    @classmethod
+    def generate_annual_receipts(cls, year: int) -> ServiceResult:
+        """
+        Crée les reçus fiscaux (brouillons) des membres donateurs de l'année.
+        
+        Les membres qui ont déjà un reçu non annulé pour l'année sont
+        ignorés : la génération peut être relancée sans doublon.
+        
+        Returns:
+            ServiceResult avec data={'created': int, 'total_amount': Decimal}
+        """
+        from apps.core.cache import invalidate_models
+        from apps.members.models import Member
+        
+        donations = cls.donations_for_year(year)
+        
+        already_issued = TaxReceipt.objects.filter(
+            fiscal_year=year,
+            member__isnull=False,
+        ).exclude(status=TaxReceipt.Status.CANCELLED).values('member_id')
+        
+        # Totaux de tous les donateurs en une requête
+        totals = {
+            row['member_id']: row['total']
+            for row in donations.exclude(
+                member_id__in=already_issued
+            ).values('member_id').annotate(
+                total=Sum('amount')
+            ).filter(total__gt=0).order_by('member_id')
+        }
+        if not totals:
+            return ServiceResult.ok({'created': 0, 'total_amount': Decimal('0')})
+        
+        members = Member.objects.only(
+            'id', 'first_name', 'last_name', 'email', 'address', 'postal_code', 'city'
+        ).in_bulk(list(totals))
+        transaction_ids = defaultdict(list)
+        for transaction_id, member_id in donations.filter(
+            member_id__in=list(totals)
+        ).values_list('id', 'member_id'):
+            transaction_ids[member_id].append(transaction_id)
+        
+        with db_transaction.atomic():
+            numbers = TaxReceiptSequence.reserve(year, len(totals))
+            receipts = []
+            for number, (member_id, total) in zip(numbers, totals.items()):
+                member = members[member_id]
+                receipts.append(TaxReceipt(
+                    receipt_number=number,
+                    fiscal_year=year,
+                    donor_name=member.full_name,
+                    donor_address=f"{member.address or ''}\n{member.postal_code or ''} {member.city or ''}".strip(),
+                    donor_email=member.email or '',
+                    member_id=member_id,
+                    total_amount=total,
+                    status=TaxReceipt.Status.DRAFT,
+                ))
+            TaxReceipt.objects.bulk_create(receipts)
+            
+            # Identifiants relus par numéro (indépendant du support de RETURNING)
+            receipt_ids = dict(
+                TaxReceipt.objects.filter(receipt_number__in=numbers).values_list('member_id', 'id')
+            )
+            Through = TaxReceipt.transactions.through
+            Through.objects.bulk_create([
+                Through(taxreceipt_id=receipt_ids[member_id], financialtransaction_id=transaction_id)
+                for member_id in totals
+                for transaction_id in transaction_ids[member_id]
+            ])
+        
+        invalidate_models(TaxReceipt)
+        
+        return ServiceResult.ok({
+            'created': len(receipts),
+            'total_amount': sum(totals.values(), Decimal('0')),
+        })
@@ -1,8 +1,9 @@
 """Signaux pour le module Finance."""
 
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import post_save, pre_delete, post_delete
 from django.dispatch import receiver
-from .models import FinancialTransaction
+from .models import Budget, BudgetItem, FinancialTransaction
 
 
 @receiver(post_save, sender=FinancialTransaction)
@@ -32,3 +33,50 @@ def notify_large_transaction(sender, instance, created, **kwargs):
                 notification_type='info',
                 link=f"/admin/finance/financialtransaction/{instance.pk}/change/"
             )
+
+
+@receiver(pre_delete, sender=BudgetItem)
+def capture_budget_item_spend(sender, instance, **kwargs):
+    """
+    Mémorise le cumul dépensé en base avant la suppression (l'instance
+    peut avoir été chargée avant les dernières dépenses).
+    """
+    instance._deleted_spent_total = BudgetItem.objects.filter(
+        pk=instance.pk
+    ).values_list('spent_total', flat=True).first()
+
+
+@receiver(post_delete, sender=BudgetItem)
+def release_budget_item_spend(sender, instance, **kwargs):
+    """
+    Retire le cumul dépensé d'une ligne supprimée du total de son budget.
+    
+    Les transactions liées passent à budget_item=NULL (SET_NULL) sans
+    passer par save(), d'où l'ajustement ici.
+    """
+    spent_total = getattr(instance, '_deleted_spent_total', None)
+    if spent_total:
+        Budget.objects.filter(pk=instance.budget_id).update(
+            spent_total=F('spent_total') - spent_total
+        )
+
+
+@receiver(pre_delete, sender=FinancialTransaction)
+def capture_transaction_spend(sender, instance, **kwargs):
+    """Mémorise l'imputation budgétaire en base avant la suppression."""
+    instance._deleted_budget_spend = instance._get_previous_budget_spend()
+
+
+@receiver(post_delete, sender=FinancialTransaction)
+def release_transaction_spend(sender, instance, **kwargs):
+    """
+    Retire la dépense d'une transaction supprimée de son budget.
+    
+    Couvre aussi QuerySet.delete() (action « supprimer » de l'admin),
+    qui n'appelle pas Model.delete(). Exécuté dans la transaction de la
+    suppression.
+    """
+    from .services import BudgetService
+    
+    BudgetService.apply_spend_change(getattr(instance, '_deleted_budget_spend', None), None)
+    instance._loaded_budget_spend = None
@@ -0,0 +1,147 @@
+"""
+Moteur de statistiques financières.
+
+Calcule en une seule requête d'agrégation conditionnelle l'ensemble des
+totaux période × type × statut utilisés par les tableaux de bord, et met
+en cache les résultats par site.
+
+Les entrées dépendent du tag 'finance.FinancialTransaction' (cf.
+apps.core.cache) : chaque écriture de transaction rend obsolètes toutes les
+entrées d'un coup, y compris lorsqu'une transaction change de site.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.core.cache import get_or_compute, invalidate_tags
+
+from .models import FinancialTransaction
+
+
+INCOME_TYPES = (
+    FinancialTransaction.TransactionType.DON,
+    FinancialTransaction.TransactionType.DIME,
+    FinancialTransaction.TransactionType.OFFRANDE,
+)
+EXPENSE_TYPES = (
+    FinancialTransaction.TransactionType.DEPENSE,
+)
+
+
+class FinanceStats:
+    """Statistiques financières agrégées et mises en cache par site."""
+
+    CACHE_TIMEOUT = 300
+    CACHE_TAGS = ('finance.FinancialTransaction',)
+
+    KINDS = {
+        'income': INCOME_TYPES,
+        'expenses': EXPENSE_TYPES,
+    }
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Rend obsolètes toutes les statistiques en cache."""
+        invalidate_tags(*cls.CACHE_TAGS)
+
+    @classmethod
+    def cached(cls, name: str, site, compute: Callable[[], Any], today: Optional[date] = None):
+        """
+        Retourne le résultat de `compute` mis en cache pour un site.
+
+        La date du jour fait partie de la clé : les bornes de mois et
+        d'année suivent le calendrier sans attendre l'expiration.
+        """
+        today = today or date.today()
+        site_key = getattr(site, 'pk', site) or 'all'
+        return get_or_compute(
+            f'finance_stats:{name}', (site_key, today), compute,
+            timeout=cls.CACHE_TIMEOUT, tags=cls.CACHE_TAGS,
+        )
+
+    # ------------------------------------------------------------------
+    # Agrégation
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def compute_totals(cls, site=None, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Calcule tous les totaux en une requête.
+
+        Returns:
+            Dictionnaire {
+                'totals': {période: {type: {statut: montant}}},
+                'counts': {statut: nombre de transactions},
+            }
+            avec période dans ('month', 'year') et type dans ('income', 'expenses').
+        """
+        today = today or date.today()
+        periods = {
+            'month': Q(transaction_date__gte=today.replace(day=1)),
+            'year': Q(transaction_date__gte=today.replace(month=1, day=1)),
+        }
+        statuses = [value for value, _ in FinancialTransaction.Status.choices]
+        zero = Value(Decimal('0'), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+        aggregates = {}
+        for period, period_filter in periods.items():
+            for kind, types in cls.KINDS.items():
+                for status in statuses:
+                    aggregates[f'{period}__{kind}__{status}'] = Coalesce(
+                        Sum('amount', filter=period_filter & Q(transaction_type__in=types, status=status)),
+                        zero,
+                    )
+        for status in statuses:
+            aggregates[f'count__{status}'] = Count('id', filter=Q(status=status))
+
+        queryset = FinancialTransaction.objects.all()
+        if site:
+            queryset = queryset.filter(site=site)
+
+        row = queryset.aggregate(**aggregates)
+
+        totals = {
+            period: {
+                kind: {status: row[f'{period}__{kind}__{status}'] for status in statuses}
+                for kind in cls.KINDS
+            }
+            for period in periods
+        }
+        counts = {status: row[f'count__{status}'] for status in statuses}
+        return {'totals': totals, 'counts': counts}
+
+    @classmethod
+    def get_totals(cls, site=None, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Totaux des transactions validées et nombre de transactions en attente.
+
+        Returns:
+            Dictionnaire avec month_income, month_expenses, month_balance,
+            year_income, year_expenses, year_balance, pending_count et le
+            détail complet ('totals', 'counts') de compute_totals.
+        """
+        today = today or date.today()
+        data = cls.cached('totals', site, lambda: cls.compute_totals(site, today), today)
+
+        validated = FinancialTransaction.Status.VALIDE
+        totals = data['totals']
+        stats = {
+            'pending_count': data['counts'][FinancialTransaction.Status.EN_ATTENTE],
+            'totals': totals,
+            'counts': data['counts'],
+        }
+        for period in ('month', 'year'):
+            income = totals[period]['income'][validated]
+            expenses = totals[period]['expenses'][validated]
+            stats[f'{period}_income'] = income
+            stats[f'{period}_expenses'] = expenses
+            stats[f'{period}_balance'] = income - expenses
+        return stats
@@ -8,7 +8,7 @@ Ce module contient les tâches asynchrones pour :
 """
 
 import logging
-from celery import shared_task
+from celery import chord, shared_task
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
@@ -17,12 +17,17 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
-def process_ocr_task(self, receipt_proof_id):
+def process_ocr_task(self, receipt_proof_id, batch_id=None):
     """
     Tâche Celery pour traiter l'OCR d'un justificatif.
     
+    Le justificatif est marqué « en cours » par l'appelant ; le résultat
+    est enregistré en une seule mise à jour, une fois les éventuelles
+    relances épuisées.
+    
     Args:
         receipt_proof_id (int): ID du ReceiptProof à traiter
+        batch_id (int): ID de l'OCRBatch dont les compteurs sont à mettre à jour
     
     Returns:
         dict: Résultat du traitement OCR
@@ -33,94 +38,77 @@ def process_ocr_task(self, receipt_proof_id):
     from .ocr_service import ocr_service
     
     try:
-        # Récupérer le justificatif
-        receipt_proof = ReceiptProof.objects.get(id=receipt_proof_id)
-        
-        logger.info(f"Starting OCR processing for receipt {receipt_proof_id}")
-        
-        # Marquer comme en cours
-        receipt_proof.ocr_status = ReceiptProof.OCRStatus.EN_COURS
-        receipt_proof.save()
-        
-        # Traiter avec OCR
-        result = ocr_service.process_receipt(receipt_proof)
-        
-        if 'error' in result:
-            # Marquer comme échec
-            receipt_proof.ocr_status = ReceiptProof.OCRStatus.ECHEC
-            receipt_proof.save()
-            
-            logger.error(f"OCR failed for receipt {receipt_proof_id}: {result['error']}")
-            
-            # Retry si c'est une erreur temporaire
-            if self.request.retries < self.max_retries:
-                logger.info(f"Retrying OCR for receipt {receipt_proof_id} (attempt {self.request.retries + 1})")
-                raise self.retry(countdown=60 * (self.request.retries + 1))
-            
-            return {
-                'success': False,
-                'error': result['error'],
-                'receipt_id': receipt_proof_id
-            }
-        
-        # Succès
-        receipt_proof.ocr_status = ReceiptProof.OCRStatus.TERMINE
-        receipt_proof.ocr_processed_at = timezone.now()
-        receipt_proof.save()
-        
-        logger.info(f"OCR completed successfully for receipt {receipt_proof_id}")
-        
-        # Notifier l'utilisateur qui a uploadé le justificatif
-        if receipt_proof.uploaded_by and receipt_proof.uploaded_by.email:
-            try:
-                send_ocr_completion_notification.delay(
-                    receipt_proof_id=receipt_proof_id,
-                    user_email=receipt_proof.uploaded_by.email,
-                    success=True,
-                    extracted_amount=str(result.get('amount', 'N/A')),
-                    extracted_date=str(result.get('date', 'N/A'))
-                )
-            except Exception as e:
-                logger.warning(f"Failed to send OCR completion notification: {e}")
-        
-        return {
-            'success': True,
-            'receipt_id': receipt_proof_id,
-            'extracted_amount': result.get('amount'),
-            'extracted_date': result.get('date'),
-            'confidence': result.get('confidence'),
-            'raw_text_length': len(result.get('text', ''))
-        }
-        
+        receipt_proof = ReceiptProof.objects.select_related('uploaded_by').get(id=receipt_proof_id)
     except ReceiptProof.DoesNotExist:
         logger.error(f"Receipt proof {receipt_proof_id} not found")
-        return {
-            'success': False,
-            'error': 'Receipt proof not found',
-            'receipt_id': receipt_proof_id
-        }
-        
+        return _ocr_task_result(receipt_proof_id, batch_id, error='Receipt proof not found')
+    
+    logger.info(f"Starting OCR processing for receipt {receipt_proof_id}")
+    
+    try:
+        result = ocr_service.analyze(receipt_proof)
     except Exception as exc:
         logger.error(f"Unexpected error in OCR processing for receipt {receipt_proof_id}: {exc}")
-        
-        # Marquer comme échec
+        result = {'error': str(exc)}
+    
+    if 'error' in result and self.request.retries < self.max_retries:
+        # Retry si c'est une erreur temporaire (le statut reste « en cours »)
+        logger.info(f"Retrying OCR for receipt {receipt_proof_id} (attempt {self.request.retries + 1})")
+        raise self.retry(countdown=60 * (self.request.retries + 1))
+    
+    ocr_service.save_result(receipt_proof, result)
+    
+    if 'error' in result:
+        logger.error(f"OCR failed for receipt {receipt_proof_id}: {result['error']}")
+        return _ocr_task_result(receipt_proof_id, batch_id, error=result['error'])
+    
+    logger.info(f"OCR completed successfully for receipt {receipt_proof_id}")
+    
+    # Notifier l'utilisateur qui a uploadé le justificatif
+    if receipt_proof.uploaded_by and receipt_proof.uploaded_by.email:
         try:
-            receipt_proof = ReceiptProof.objects.get(id=receipt_proof_id)
-            receipt_proof.ocr_status = ReceiptProof.OCRStatus.ECHEC
-            receipt_proof.save()
-        except:
-            pass
-        
-        # Retry si possible
-        if self.request.retries < self.max_retries:
-            logger.info(f"Retrying OCR for receipt {receipt_proof_id} due to unexpected error")
-            raise self.retry(exc=exc, countdown=60 * (self.request.retries + 1))
-        
-        return {
-            'success': False,
-            'error': str(exc),
-            'receipt_id': receipt_proof_id
-        }
+            send_ocr_completion_notification.delay(
+                receipt_proof_id=receipt_proof_id,
+                user_email=receipt_proof.uploaded_by.email,
+                success=True,
+                extracted_amount=str(result.get('amount', 'N/A')),
+                extracted_date=str(result.get('date', 'N/A'))
+            )
+        except Exception as e:
+            logger.warning(f"Failed to send OCR completion notification: {e}")
+    
+    return _ocr_task_result(
+        receipt_proof_id,
+        batch_id,
+        extracted_amount=str(result['amount']) if result['amount'] is not None else None,
+        extracted_date=result['date'].isoformat() if result['date'] else None,
+        confidence=result['confidence'],
+        raw_text_length=len(result.get('text', '')),
+    )
+
+
+def _ocr_task_result(receipt_proof_id, batch_id=None, error=None, **data):
+    """
+    Résultat (sérialisable) d'une tâche OCR ; met à jour les compteurs
+    du lot avec des incréments atomiques.
+    """
+    from django.db.models import F
+    from .models import OCRBatch
+    
+    success = error is None
+    if batch_id is not None:
+        OCRBatch.objects.filter(pk=batch_id).update(
+            processed=F('processed') + 1,
+            succeeded=F('succeeded') + int(success),
+            failed=F('failed') + int(not success),
+        )
+    
+    result = {'success': success, 'receipt_id': receipt_proof_id}
+    if success:
+        result.update(data)
+    else:
+        result['error'] = error
+    return result
 
 
 @shared_task
@@ -185,50 +173,80 @@ L'équipe EEBC"""
 
 
 @shared_task
-def batch_process_ocr(receipt_proof_ids):
+def batch_process_ocr(receipt_proof_ids, batch_id=None):
     """
     Traite plusieurs justificatifs OCR en lot.
     
+    Les justificatifs sont traités en parallèle (chord Celery : un groupe
+    de tâches process_ocr_task, puis finalize_ocr_batch une fois toutes
+    terminées). Cette tâche ne fait que répartir le travail : elle
+    n'occupe pas un worker en attendant les résultats.
+    
     Args:
         receipt_proof_ids (list): Liste des IDs de justificatifs à traiter
+        batch_id (int): OCRBatch de suivi (créé s'il n'est pas fourni)
+    
+    Returns:
+        int: ID de l'OCRBatch
+    """
+    from .models import OCRBatch, ReceiptProof
+    
+    if batch_id is None:
+        batch_id = OCRBatch.objects.create(
+            receipt_ids=list(receipt_proof_ids),
+            total=len(receipt_proof_ids),
+        ).pk
+    
+    if not receipt_proof_ids:
+        finalize_ocr_batch([], batch_id)
+        return batch_id
+    
+    ReceiptProof.objects.filter(id__in=receipt_proof_ids).update(
+        ocr_status=ReceiptProof.OCRStatus.EN_COURS
+    )
+    
+    chord(
+        process_ocr_task.s(receipt_id, batch_id) for receipt_id in receipt_proof_ids
+    )(finalize_ocr_batch.s(batch_id))
+    
+    return batch_id
+
+
+@shared_task
+def finalize_ocr_batch(results, batch_id):
+    """
+    Callback du chord OCR : clôture le lot et retourne le résumé.
     
     Returns:
         dict: Résumé du traitement en lot
     """
-    results = {
-        'total': len(receipt_proof_ids),
-        'success': 0,
+    from .models import OCRBatch
+    
+    summary = {
+        'batch_id': batch_id,
+        'total': len(results),
+        'success': sum(1 for result in results if result.get('success')),
         'failed': 0,
-        'errors': []
+        'errors': [
+            {'receipt_id': result.get('receipt_id'), 'error': result.get('error', 'Unknown error')}
+            for result in results
+            if not result.get('success')
+        ],
     }
+    summary['failed'] = len(summary['errors'])
     
-    for receipt_id in receipt_proof_ids:
-        try:
-            # Lancer la tâche OCR pour chaque justificatif
-            result = process_ocr_task.delay(receipt_id)
-            
-            # Attendre le résultat (avec timeout)
-            task_result = result.get(timeout=300)  # 5 minutes max par justificatif
-            
-            if task_result.get('success'):
-                results['success'] += 1
-            else:
-                results['failed'] += 1
-                results['errors'].append({
-                    'receipt_id': receipt_id,
-                    'error': task_result.get('error', 'Unknown error')
-                })
-                
-        except Exception as e:
-            results['failed'] += 1
-            results['errors'].append({
-                'receipt_id': receipt_id,
-                'error': str(e)
-            })
+    OCRBatch.objects.filter(pk=batch_id).update(
+        status=OCRBatch.Status.TERMINE,
+        processed=summary['total'],
+        succeeded=summary['success'],
+        failed=summary['failed'],
+        errors=summary['errors'],
+        completed_at=timezone.now(),
+    )
     
-    logger.info(f"Batch OCR processing completed: {results['success']} success, {results['failed']} failed")
+    logger.info(f"Batch OCR processing completed: {summary['success']} success, {summary['failed']} failed")
     
-    return results
+    return summary
 
 
 @shared_task
@@ -237,7 +255,7 @@ def cleanup_failed_ocr_tasks():
     Nettoie les justificatifs avec statut OCR "en_cours" depuis plus de 1 heure.
     Tâche de maintenance à exécuter périodiquement.
     """
-    from .models import ReceiptProof
+    from .models import OCRBatch, ReceiptProof
     from datetime import timedelta
     
     cutoff_time = timezone.now() - timedelta(hours=1)
@@ -256,8 +274,15 @@ def cleanup_failed_ocr_tasks():
         stuck_receipts.update(ocr_status=ReceiptProof.OCRStatus.ECHEC)
         logger.warning(f"Cleaned up {count} stuck OCR tasks")
     
+    # Lots dont le callback n'a pas été exécuté
+    stuck_batches = OCRBatch.objects.filter(
+        status=OCRBatch.Status.EN_COURS,
+        created_at__lt=cutoff_time
+    ).update(status=OCRBatch.Status.TERMINE, completed_at=timezone.now())
+    
     return {
         'cleaned_up': count,
+        'closed_batches': stuck_batches,
         'cutoff_time': cutoff_time.isoformat()
     }
 
@@ -289,4 +314,40 @@ def generate_ocr_statistics():
     
     logger.info(f"OCR Statistics: {stats}")
     
-    return stats
\ No newline at end of file
+    return stats
+
+
+@shared_task
+def send_tax_receipts(receipt_ids):
+    """
+    Génère (si besoin) le PDF puis envoie un lot de reçus fiscaux.
+    
+    Appelée en groupe par communication.tasks.send_donation_receipts_batch :
+    le rendu WeasyPrint des lots s'exécute en parallèle sur les workers.
+    
+    Returns:
+        dict: {'sent': int, 'failed': int}
+    """
+    from .models import TaxReceipt
+    from .pdf_service import save_tax_receipt_pdfs
+    
+    receipts = list(TaxReceipt.objects.filter(id__in=receipt_ids))
+    
+    # PDF manquants rendus en lot (moteur PDF partagé)
+    missing = [receipt for receipt in receipts if not receipt.pdf_file]
+    if missing:
+        try:
+            save_tax_receipt_pdfs(missing)
+        except Exception as e:
+            logger.error(f"Batch tax receipt PDF rendering failed: {e}")
+    
+    sent, failed = 0, 0
+    for receipt in receipts:
+        try:
+            receipt.send_by_email()
+            sent += 1
+        except Exception as e:
+            failed += 1
+            logger.error(f"Failed to send receipt {receipt.receipt_number}: {e}")
+    
+    return {'sent': sent, 'failed': failed}
@@ -0,0 +1,266 @@
+"""Tests des cumuls budgétaires et des reçus fiscaux."""
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.members.models import Member
+
+from .models import (
+    Budget, BudgetCategory, BudgetItem, FinancialTransaction, TaxReceipt, TaxReceiptSequence,
+)
+from .services import BudgetService, TaxReceiptService
+
+
+class BudgetSpendTests(TestCase):
+    """Cumuls spent_total tenus à jour par delta, comparés au recalcul complet."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = BudgetCategory.objects.create(name='Fonctionnement')
+        supplies = BudgetCategory.objects.create(name='Fournitures')
+        cls.budget = Budget.objects.create(name='Budget 2025', year=2025, total_requested=Decimal('800.00'))
+        cls.other_budget = Budget.objects.create(
+            name='Budget jeunesse 2025', year=2025, total_requested=Decimal('200.00'),
+        )
+        cls.item = BudgetItem.objects.create(
+            budget=cls.budget, category=category, requested_amount=Decimal('500.00'),
+        )
+        cls.sibling_item = BudgetItem.objects.create(
+            budget=cls.budget, category=supplies, requested_amount=Decimal('300.00'),
+        )
+        cls.other_item = BudgetItem.objects.create(
+            budget=cls.other_budget, category=category, requested_amount=Decimal('200.00'),
+        )
+
+    def expense(self, amount, item=None, status=FinancialTransaction.Status.VALIDE,
+                transaction_type=FinancialTransaction.TransactionType.DEPENSE):
+        return FinancialTransaction.objects.create(
+            amount=Decimal(amount),
+            transaction_type=transaction_type,
+            status=status,
+            transaction_date=date(2025, 3, 1),
+            budget_item=item or self.item,
+        )
+
+    def spent(self):
+        """Cumuls actuels : {ligne ou budget: spent_total}."""
+        totals = {('item', pk): spent for pk, spent in BudgetItem.objects.values_list('pk', 'spent_total')}
+        totals.update({('budget', pk): spent for pk, spent in Budget.objects.values_list('pk', 'spent_total')})
+        return totals
+
+    def assertSpent(self, item, budget):
+        self.item.refresh_from_db()
+        self.budget.refresh_from_db()
+        self.assertEqual(self.item.spent_total, Decimal(item))
+        self.assertEqual(self.budget.spent_total, Decimal(budget))
+        # Les deltas donnent le même résultat que le recalcul complet
+        incremental = self.spent()
+        BudgetService.recompute_budget_spend()
+        self.assertEqual(self.spent(), incremental)
+
+    def test_validated_expense_is_added(self):
+        self.expense('120.00')
+        self.expense('30.00', item=self.sibling_item)
+        self.assertSpent(item='120.00', budget='150.00')
+
+    def test_pending_expense_and_income_are_ignored(self):
+        self.expense('80.00', status=FinancialTransaction.Status.EN_ATTENTE)
+        self.expense('50.00', transaction_type=FinancialTransaction.TransactionType.DON)
+        self.assertSpent(item='0.00', budget='0.00')
+
+    def test_status_changes(self):
+        transaction = self.expense('80.00', status=FinancialTransaction.Status.EN_ATTENTE)
+
+        transaction.status = FinancialTransaction.Status.VALIDE
+        transaction.save()
+        self.assertSpent(item='80.00', budget='80.00')
+
+        transaction.status = FinancialTransaction.Status.ANNULE
+        transaction.save()
+        self.assertSpent(item='0.00', budget='0.00')
+
+    def test_amount_change(self):
+        transaction = self.expense('80.00')
+        transaction.amount = Decimal('65.50')
+        transaction.save()
+        self.assertSpent(item='65.50', budget='65.50')
+
+    def test_move_between_lines_of_the_same_budget(self):
+        transaction = self.expense('80.00')
+        transaction.budget_item = self.sibling_item
+        transaction.save()
+        self.assertSpent(item='0.00', budget='80.00')
+        self.sibling_item.refresh_from_db()
+        self.assertEqual(self.sibling_item.spent_total, Decimal('80.00'))
+
+    def test_move_to_another_budget(self):
+        transaction = self.expense('80.00')
+        transaction.budget_item = self.other_item
+        transaction.amount = Decimal('90.00')
+        transaction.save()
+        self.assertSpent(item='0.00', budget='0.00')
+        self.other_budget.refresh_from_db()
+        self.assertEqual(self.other_budget.spent_total, Decimal('90.00'))
+
+    def test_partially_loaded_instance(self):
+        self.expense('80.00')
+        transaction = FinancialTransaction.objects.only('id', 'amount').get()
+        transaction.amount = Decimal('100.00')
+        transaction.save()
+        self.assertSpent(item='100.00', budget='100.00')
+
+    def test_delete(self):
+        transaction = self.expense('80.00')
+        self.expense('20.00')
+        transaction.delete()
+        self.assertSpent(item='20.00', budget='20.00')
+
+    def test_queryset_delete(self):
+        self.expense('80.00')
+        self.expense('20.00')
+        self.expense('10.00', item=self.other_item)
+        FinancialTransaction.objects.filter(budget_item=self.item).delete()
+        self.assertSpent(item='0.00', budget='0.00')
+
+    def test_budget_item_delete(self):
+        self.expense('80.00')
+        self.expense('20.00', item=self.sibling_item)
+        self.item.delete()
+        self.budget.refresh_from_db()
+        self.assertEqual(self.budget.spent_total, Decimal('20.00'))
+        incremental = self.spent()
+        BudgetService.recompute_budget_spend()
+        self.assertEqual(self.spent(), incremental)
+
+
+def make_receipt(number, year=2025, member=None, status=TaxReceipt.Status.DRAFT):
+    return TaxReceipt.objects.create(
+        receipt_number=number,
+        fiscal_year=year,
+        donor_name='Donateur',
+        donor_address='Cayenne',
+        member=member,
+        total_amount=Decimal('10.00'),
+        status=status,
+    )
+
+
+class TaxReceiptSequenceTests(TestCase):
+
+    def test_reserve_returns_consecutive_block(self):
+        self.assertEqual(
+            TaxReceiptSequence.reserve(2025, 3),
+            ['RF-2025-0001', 'RF-2025-0002', 'RF-2025-0003'],
+        )
+        self.assertEqual(TaxReceiptSequence.reserve(2025), ['RF-2025-0004'])
+        self.assertEqual(TaxReceiptSequence.objects.get(fiscal_year=2025).last_number, 4)
+
+    def test_reserve_nothing(self):
+        self.assertEqual(TaxReceiptSequence.reserve(2025, 0), [])
+        self.assertFalse(TaxReceiptSequence.objects.exists())
+
+    def test_sequences_are_per_year(self):
+        TaxReceiptSequence.reserve(2024, 2)
+        self.assertEqual(TaxReceiptSequence.reserve(2025), ['RF-2025-0001'])
+
+    def test_sequence_is_seeded_from_existing_receipts(self):
+        make_receipt('RF-2025-0007')
+        make_receipt('RF-2025-0012')
+        make_receipt('RF-2024-0050', year=2024)
+        make_receipt('MANUEL-2025-A')
+
+        self.assertEqual(TaxReceiptSequence.reserve(2025, 2), ['RF-2025-0013', 'RF-2025-0014'])
+
+    def test_receipt_without_number_takes_next_in_sequence(self):
+        TaxReceiptSequence.reserve(2025, 2)
+        receipt = make_receipt('')
+        self.assertEqual(receipt.receipt_number, 'RF-2025-0003')
+
+
+class TaxReceiptServiceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = Member.objects.create(
+            first_name='Alice', last_name='Martin', email='alice@example.com',
+            city='Cayenne', status=Member.Status.ACTIF,
+        )
+        cls.bob = Member.objects.create(
+            first_name='Bob', last_name='Durand', status=Member.Status.ACTIF,
+        )
+        cls.carla = Member.objects.create(
+            first_name='Carla', last_name='Bernard', status=Member.Status.ACTIF,
+        )
+
+        Type = FinancialTransaction.TransactionType
+        cls.alice_don = cls.transaction(cls.alice, '50.00', Type.DON)
+        cls.alice_dime = cls.transaction(cls.alice, '25.00', Type.DIME)
+        cls.bob_offrande = cls.transaction(cls.bob, '40.00', Type.OFFRANDE)
+        # Exclus : dépense, don non validé, autre année, don anonyme
+        cls.transaction(cls.carla, '30.00', Type.DEPENSE)
+        cls.transaction(cls.carla, '30.00', Type.DON, status=FinancialTransaction.Status.EN_ATTENTE)
+        cls.transaction(cls.carla, '30.00', Type.DON, day=date(2024, 12, 31))
+        cls.transaction(None, '99.00', Type.DON)
+
+    @staticmethod
+    def transaction(member, amount, transaction_type, status=FinancialTransaction.Status.VALIDE,
+                    day=date(2025, 6, 1)):
+        return FinancialTransaction.objects.create(
+            member=member,
+            amount=Decimal(amount),
+            transaction_type=transaction_type,
+            status=status,
+            transaction_date=day,
+        )
+
+    def test_generates_one_draft_per_donor(self):
+        result = TaxReceiptService.generate_annual_receipts(2025)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.data, {'created': 2, 'total_amount': Decimal('115.00')})
+        receipts = {receipt.member: receipt for receipt in TaxReceipt.objects.filter(fiscal_year=2025)}
+        self.assertEqual(set(receipts), {self.alice, self.bob})
+        self.assertEqual(
+            sorted(receipt.receipt_number for receipt in receipts.values()),
+            ['RF-2025-0001', 'RF-2025-0002'],
+        )
+
+        alice_receipt = receipts[self.alice]
+        self.assertEqual(alice_receipt.total_amount, Decimal('75.00'))
+        self.assertEqual(alice_receipt.status, TaxReceipt.Status.DRAFT)
+        self.assertEqual(alice_receipt.donor_name, 'Alice Martin')
+        self.assertEqual(alice_receipt.donor_email, 'alice@example.com')
+
+    def test_links_receipts_to_their_transactions(self):
+        TaxReceiptService.generate_annual_receipts(2025)
+
+        alice_receipt = TaxReceipt.objects.get(member=self.alice)
+        bob_receipt = TaxReceipt.objects.get(member=self.bob)
+        self.assertEqual(set(alice_receipt.transactions.all()), {self.alice_don, self.alice_dime})
+        self.assertEqual(list(bob_receipt.transactions.all()), [self.bob_offrande])
+
+    def test_rerun_skips_members_with_a_receipt(self):
+        TaxReceiptService.generate_annual_receipts(2025)
+        self.transaction(self.carla, '20.00', FinancialTransaction.TransactionType.DON)
+
+        result = TaxReceiptService.generate_annual_receipts(2025)
+
+        self.assertEqual(result.data, {'created': 1, 'total_amount': Decimal('20.00')})
+        self.assertEqual(TaxReceipt.objects.filter(member=self.alice).count(), 1)
+        self.assertEqual(TaxReceipt.objects.get(member=self.carla).receipt_number, 'RF-2025-0003')
+
+    def test_cancelled_receipt_is_regenerated(self):
+        make_receipt('RF-2025-0005', member=self.alice, status=TaxReceipt.Status.CANCELLED)
+
+        TaxReceiptService.generate_annual_receipts(2025)
+
+        numbers = set(
+            TaxReceipt.objects.filter(member=self.alice).values_list('receipt_number', flat=True)
+        )
+        self.assertEqual(numbers, {'RF-2025-0005', 'RF-2025-0006'})
+
+    def test_nothing_to_generate(self):
+        result = TaxReceiptService.generate_annual_receipts(2023)
+        self.assertEqual(result.data, {'created': 0, 'total_amount': Decimal('0')})
+        self.assertFalse(TaxReceipt.objects.exists())
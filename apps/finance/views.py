@@ -5,7 +5,8 @@ from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib import messages
 from django.db.models import Sum, Count, Q
 from django.utils import timezone
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
+from django.urls import reverse
 from datetime import date, timedelta
 from decimal import Decimal
 
@@ -311,21 +312,8 @@ def tax_receipt_create(request):
             messages.error(request, f"Aucun don trouvé pour {member.full_name} en {fiscal_year}")
             return redirect('finance:tax_receipt_create')
         
-        # Générer le numéro de reçu
-        last_receipt = TaxReceipt.objects.filter(fiscal_year=fiscal_year).order_by('-receipt_number').first()
-        if last_receipt:
-            try:
-                last_num = int(last_receipt.receipt_number.split('-')[-1])
-                new_num = last_num + 1
-            except:
-                new_num = 1
-        else:
-            new_num = 1
-        receipt_number = f"RF-{fiscal_year}-{new_num:04d}"
-        
-        # Créer le reçu
+        # Créer le reçu (numéro attribué par TaxReceiptSequence)
         receipt = TaxReceipt.objects.create(
-            receipt_number=receipt_number,
             member=member,
             fiscal_year=fiscal_year,
             total_amount=total,
@@ -461,6 +449,7 @@ def batch_retry_ocr(request):
             return redirect('finance:receipt_proof_list')
         
         try:
+            from .models import OCRBatch
             from .tasks import batch_process_ocr
             
             # Filtrer pour ne garder que les justificatifs en échec ou non traités
@@ -473,9 +462,11 @@ def batch_retry_ocr(request):
                 messages.warning(request, "Aucun justificatif en échec trouvé dans la sélection.")
                 return redirect('finance:receipt_proof_list')
             
-            # Réinitialiser le statut des justificatifs sélectionnés
-            failed_receipts.update(
-                ocr_status=ReceiptProof.OCRStatus.NON_TRAITE,
+            receipt_ids_list = list(failed_receipts.values_list('id', flat=True))
+            
+            # Réinitialiser les justificatifs sélectionnés (marqués en cours)
+            ReceiptProof.objects.filter(id__in=receipt_ids_list).update(
+                ocr_status=ReceiptProof.OCRStatus.EN_COURS,
                 ocr_raw_text='',
                 ocr_extracted_amount=None,
                 ocr_extracted_date=None,
@@ -483,15 +474,20 @@ def batch_retry_ocr(request):
                 ocr_processed_at=None
             )
             
-            # Lancer le traitement en lot
-            receipt_ids_list = list(failed_receipts.values_list('id', flat=True))
-            task = batch_process_ocr.delay(receipt_ids_list)
+            # Lancer le traitement en lot (progression suivie sur le lot)
+            batch = OCRBatch.objects.create(
+                receipt_ids=receipt_ids_list,
+                total=len(receipt_ids_list),
+                created_by=request.user,
+            )
+            batch_process_ocr.delay(receipt_ids_list, batch.pk)
             
             messages.success(
                 request, 
                 f"Traitement OCR relancé pour {len(receipt_ids_list)} justificatif(s). "
                 f"Vous serez notifié par email une fois terminé."
             )
+            return redirect(f"{reverse('finance:receipt_proof_list')}?batch={batch.pk}")
             
         except Exception as e:
             messages.error(request, f"Erreur lors du lancement du traitement en lot : {e}")
@@ -539,34 +535,64 @@ def receipt_ocr_status_api(request, pk):
 @role_required('admin', 'finance')
 def batch_ocr_status_api(request):
     """
-    API endpoint pour vérifier le statut OCR de plusieurs justificatifs.
+    API endpoint pour suivre un traitement OCR en lot.
+    
+    La progression est lue sur l'OCRBatch (?batch=<id>) ; les statuts
+    des justificatifs du lot sont chargés en une requête. Le paramètre
+    ?ids=1,2,3 reste accepté pour une liste de justificatifs sans lot.
     
     Requirements: 17.2
     """
+    from .models import OCRBatch
+    
     try:
-        receipt_ids = request.GET.get('ids', '').split(',')
-        receipt_ids = [int(id.strip()) for id in receipt_ids if id.strip().isdigit()]
+        batch = None
+        batch_id = request.GET.get('batch', '')
+        if batch_id.isdigit():
+            batch = get_object_or_404(OCRBatch, pk=int(batch_id))
+            receipt_ids = batch.receipt_ids
+        else:
+            receipt_ids = request.GET.get('ids', '').split(',')
+            receipt_ids = [int(id.strip()) for id in receipt_ids if id.strip().isdigit()]
         
         if not receipt_ids:
             return JsonResponse({'success': False, 'error': 'No valid IDs provided'})
         
-        proofs = ReceiptProof.objects.filter(id__in=receipt_ids)
+        status_display = dict(ReceiptProof.OCRStatus.choices)
+        proofs = ReceiptProof.objects.filter(id__in=receipt_ids).values(
+            'id', 'ocr_status', 'ocr_extracted_amount', 'ocr_confidence', 'ocr_processed_at'
+        )
         
         results = {}
         for proof in proofs:
-            results[proof.id] = {
-                'status': proof.ocr_status,
-                'status_display': proof.get_ocr_status_display(),
-                'extracted_amount': str(proof.ocr_extracted_amount) if proof.ocr_extracted_amount else None,
-                'confidence': proof.ocr_confidence,
-                'processed_at': proof.ocr_processed_at.isoformat() if proof.ocr_processed_at else None,
+            results[proof['id']] = {
+                'status': proof['ocr_status'],
+                'status_display': status_display.get(proof['ocr_status'], proof['ocr_status']),
+                'extracted_amount': str(proof['ocr_extracted_amount']) if proof['ocr_extracted_amount'] else None,
+                'confidence': proof['ocr_confidence'],
+                'processed_at': proof['ocr_processed_at'].isoformat() if proof['ocr_processed_at'] else None,
             }
         
-        return JsonResponse({
+        response = {
             'success': True,
             'results': results
-        })
+        }
+        if batch is not None:
+            response['batch'] = {
+                'id': batch.pk,
+                'status': batch.status,
+                'total': batch.total,
+                'processed': batch.processed,
+                'succeeded': batch.succeeded,
+                'failed': batch.failed,
+                'progress': batch.progress_percentage,
+                'completed_at': batch.completed_at.isoformat() if batch.completed_at else None,
+            }
         
+        return JsonResponse(response)
+        
+    except Http404:
+        raise
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -605,7 +631,7 @@ def receipt_proof_upload(request):
         if form.is_valid():
             proof = form.save(commit=False)
             proof.uploaded_by = request.user
-            proof.ocr_status = ReceiptProof.OCRStatus.NON_TRAITE
+            proof.ocr_status = ReceiptProof.OCRStatus.EN_COURS
             proof.save()
             
             # Lancer la tâche OCR asynchrone
@@ -669,14 +695,15 @@ def receipt_process_ocr(request, pk):
     try:
         from .tasks import process_ocr_task
         
-        # Réinitialiser le statut
-        proof.ocr_status = ReceiptProof.OCRStatus.NON_TRAITE
-        proof.ocr_raw_text = ''
-        proof.ocr_extracted_amount = None
-        proof.ocr_extracted_date = None
-        proof.ocr_confidence = None
-        proof.ocr_processed_at = None
-        proof.save()
+        # Réinitialiser le justificatif (marqué en cours)
+        ReceiptProof.objects.filter(pk=proof.pk).update(
+            ocr_status=ReceiptProof.OCRStatus.EN_COURS,
+            ocr_raw_text='',
+            ocr_extracted_amount=None,
+            ocr_extracted_date=None,
+            ocr_confidence=None,
+            ocr_processed_at=None
+        )
         
         # Lancer la tâche OCR asynchrone
         task = process_ocr_task.delay(proof.id)
@@ -688,8 +715,7 @@ def receipt_process_ocr(request, pk):
         )
         
     except Exception as e:
-        proof.ocr_status = ReceiptProof.OCRStatus.ECHEC
-        proof.save()
+        ReceiptProof.objects.filter(pk=proof.pk).update(ocr_status=ReceiptProof.OCRStatus.ECHEC)
         messages.error(request, f"Erreur lors du lancement de l'OCR : {e}")
     
     return redirect('finance:receipt_proof_list')
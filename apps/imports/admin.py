@@ -7,14 +7,14 @@ class ImportLogAdmin(admin.ModelAdmin):
     list_display = ['file_name', 'import_type', 'status', 'total_rows', 'success_rows', 'error_rows', 'imported_by', 'started_at']
     list_filter = ['import_type', 'status', 'started_at']
     search_fields = ['file_name', 'imported_by__username']
-    readonly_fields = ['started_at', 'completed_at', 'duration', 'success_rate']
+    readonly_fields = ['started_at', 'completed_at', 'duration', 'success_rate', 'celery_task_id', 'checkpoint_at']
     
     fieldsets = (
         ('Informations générales', {
             'fields': ('import_type', 'file_name', 'file_path', 'imported_by')
         }),
         ('Statut', {
-            'fields': ('status', 'started_at', 'completed_at', 'duration')
+            'fields': ('status', 'started_at', 'completed_at', 'duration', 'celery_task_id', 'checkpoint_at')
         }),
         ('Statistiques', {
             'fields': ('total_rows', 'processed_rows', 'success_rows', 'error_rows', 'success_rate')
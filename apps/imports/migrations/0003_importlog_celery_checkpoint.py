@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-16 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0002_alter_importlog_import_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importlog',
+            name='celery_task_id',
+            field=models.CharField(blank=True, max_length=255, verbose_name='ID tâche Celery'),
+        ),
+        migrations.AddField(
+            model_name='importlog',
+            name='checkpoint_at',
+            field=models.DateTimeField(blank=True, help_text='Dernier lot de lignes validé ; un import interrompu reprend à processed_rows', null=True, verbose_name='Dernier point de contrôle'),
+        ),
+    ]
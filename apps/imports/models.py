@@ -56,6 +56,17 @@ class ImportLog(models.Model):
     started_at = models.DateTimeField(auto_now_add=True, verbose_name="Démarré à")
     completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Terminé à")
     
+    # Exécution en tâche Celery (cf. tasks.run_import)
+    celery_task_id = models.CharField(max_length=255, blank=True, verbose_name="ID tâche Celery")
+    checkpoint_at = models.DateTimeField(
+        null=True, blank=True,
+        verbose_name="Dernier point de contrôle",
+        help_text="Dernier lot de lignes validé ; un import interrompu reprend à processed_rows"
+    )
+    
+    ACTIVE_STATUSES = (Status.PENDING, Status.PROCESSING)
+    FINISHED_STATUSES = (Status.SUCCESS, Status.ERROR, Status.PARTIAL)
+    
     class Meta:
         verbose_name = "Journal d'import"
         verbose_name_plural = "Journaux d'import"
@@ -74,4 +85,8 @@ class ImportLog(models.Model):
     def success_rate(self):
         if self.total_rows > 0:
             return (self.success_rows / self.total_rows) * 100
-        return 0
\ No newline at end of file
+        return 0
+    
+    @property
+    def is_finished(self):
+        return self.status in self.FINISHED_STATUSES
@@ -2,25 +2,129 @@ import pandas as pd
 from datetime import datetime, date
 from django.utils import timezone
 from django.db import transaction
-from django.core.exceptions import ValidationError
+from django.conf import settings
+from apps.core.cache import invalidate_models
 from apps.members.models import Member
 from apps.bibleclub.models import Child, BibleClass, AgeGroup
 from .models import ImportLog
 
 
+TRUE_VALUES = ('oui', 'yes', 'true', '1', 'vrai')
+
+MEMBER_STATUS_MAPPING = {
+    'actif': Member.Status.ACTIF,
+    'inactif': Member.Status.INACTIF,
+    'visiteur': Member.Status.VISITEUR,
+    'transfere': Member.Status.TRANSFERE
+}
+
+
+def _name_key(first_name, last_name):
+    """Clé de rapprochement d'une personne : nom et prénom normalisés."""
+    return (str(first_name).strip().lower(), str(last_name).strip().lower())
+
+
+def _parse_date_column(series):
+    """
+    Convertit une colonne en dates (JJ/MM/AAAA ou AAAA-MM-JJ pour le texte).
+    
+    Returns:
+        tuple (Series de date ou None, masque des valeurs invalides)
+    """
+    present = series.notna()
+    is_text = series.map(lambda value: isinstance(value, str))
+    is_datetime = series.map(lambda value: isinstance(value, (datetime, date)))
+    
+    parsed = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    
+    text = series[present & is_text]
+    if not text.empty:
+        french = pd.to_datetime(text, format='%d/%m/%Y', errors='coerce')
+        iso = pd.to_datetime(text[french.isna()], format='%Y-%m-%d', errors='coerce')
+        parsed.loc[french.index] = french
+        parsed.loc[iso.index] = iso
+    
+    datetimes = series[present & is_datetime]
+    if not datetimes.empty:
+        parsed.loc[datetimes.index] = pd.to_datetime(datetimes, errors='coerce')
+    
+    dates = parsed.dt.date.astype(object).where(parsed.notna(), None)
+    return dates, present & parsed.isna()
+
+
+def _parse_bool_column(series):
+    """Convertit une colonne oui/non en booléens."""
+    return series.map(
+        lambda value: value.strip().lower() in TRUE_VALUES if isinstance(value, str) else bool(value)
+    )
+
+
 class ExcelImportService:
-    """Service pour l'import de données depuis des fichiers Excel."""
+    """
+    Service pour l'import de données depuis des fichiers Excel.
+    
+    Les colonnes sont converties et validées d'un bloc avec pandas, puis
+    les lignes sont écrites par lots de IMPORT_CHUNK_SIZE avec bulk_create /
+    bulk_update. Chaque lot et le point de contrôle de l'ImportLog
+    (compteurs, journaux) sont validés dans la même transaction : un import
+    interrompu reprend à processed_rows, sans rejouer les lignes validées.
+    
+    Si l'écriture en masse d'un lot échoue, le lot est rejoué ligne par
+    ligne pour attribuer l'erreur à la bonne ligne dans error_log.
+    """
+    
+    MEMBER_COLUMNS = {
+        'prenom': 'first_name', 'nom': 'last_name', 'email': 'email',
+        'telephone': 'phone', 'date_naissance': 'date_of_birth', 'genre': 'gender',
+        'adresse': 'address', 'ville': 'city', 'code_postal': 'postal_code',
+        'profession': 'profession', 'statut': 'status', 'date_arrivee': 'date_joined',
+        'baptise': 'is_baptized', 'date_bapteme': 'baptism_date',
+        'situation_familiale': 'marital_status', 'notes': 'notes'
+    }
+    MEMBER_DATE_FIELDS = ('date_of_birth', 'date_joined', 'baptism_date')
+    MEMBER_BOOL_FIELDS = ('is_baptized',)
+    
+    CHILD_COLUMNS = {
+        'prenom': 'first_name', 'nom': 'last_name', 'date_naissance': 'date_of_birth',
+        'genre': 'gender', 'nom_pere': 'father_name', 'telephone_pere': 'father_phone',
+        'email_pere': 'father_email', 'nom_mere': 'mother_name',
+        'telephone_mere': 'mother_phone', 'email_mere': 'mother_email',
+        'contact_urgence': 'emergency_contact', 'telephone_urgence': 'emergency_phone',
+        'allergies': 'allergies', 'notes_medicales': 'medical_notes',
+        'besoin_transport': 'needs_transport', 'adresse_ramassage': 'pickup_address',
+        'notes': 'notes'
+    }
+    CHILD_DATE_FIELDS = ('date_of_birth',)
+    CHILD_BOOL_FIELDS = ('needs_transport',)
+    CHILD_REQUIRED_FIELDS = ['first_name', 'last_name', 'date_of_birth', 'father_name', 'father_phone']
+    
+    # Champs recalculés avant écriture en masse (signal pre_save non déclenché)
+    MEMBER_GEOCODE_FIELDS = ['address_fingerprint', 'geocode_status', 'geocoded_at', 'latitude', 'longitude']
+    
+    CHECKPOINT_FIELDS = [
+        'total_rows', 'processed_rows', 'success_rows', 'error_rows',
+        'error_log', 'success_log', 'checkpoint_at',
+    ]
     
-    def __init__(self, import_log):
+    def __init__(self, import_log, chunk_size=None):
         self.import_log = import_log
-        self.errors = []
-        self.successes = []
+        self.chunk_size = chunk_size or getattr(settings, 'IMPORT_CHUNK_SIZE', 100)
+        
+        # Reprise : conserver les journaux des lots déjà validés
+        resuming = import_log.processed_rows > 0
+        self.errors = import_log.error_log.splitlines() if resuming and import_log.error_log else []
+        self.successes = import_log.success_log.splitlines() if resuming and import_log.success_log else []
+        
+        # Index des enregistrements existants (chargés une fois par import)
+        self.members_by_name = {}
+        self.children_by_key = {}
+        self.age_group_classes = []
     
     def process_import(self):
-        """Traite l'import selon le type."""
+        """Traite l'import selon le type (ou le reprend au dernier lot validé)."""
         try:
             self.import_log.status = ImportLog.Status.PROCESSING
-            self.import_log.save()
+            self.import_log.save(update_fields=['status'])
             
             if self.import_log.import_type == ImportLog.ImportType.MEMBERS:
                 self._import_members()
@@ -30,193 +134,375 @@ class ExcelImportService:
             self._finalize_import()
             
         except Exception as e:
-            self.import_log.status = ImportLog.Status.ERROR
-            self.import_log.error_log = str(e)
-            self.import_log.completed_at = timezone.now()
-            self.import_log.save()
+            # Les compteurs en base sont ceux du dernier point de contrôle
+            ImportLog.objects.filter(pk=self.import_log.pk).update(
+                status=ImportLog.Status.ERROR,
+                error_log='\n'.join(self.errors + [str(e)]),
+                completed_at=timezone.now(),
+            )
+            self.import_log.refresh_from_db()
             raise
     
-    def _import_members(self):
-        """Importe les membres depuis un fichier Excel."""
-        df = pd.read_excel(self.import_log.file_path.path)
-        
-        expected_columns = {
-            'prenom': 'first_name', 'nom': 'last_name', 'email': 'email',
-            'telephone': 'phone', 'date_naissance': 'date_of_birth', 'genre': 'gender',
-            'adresse': 'address', 'ville': 'city', 'code_postal': 'postal_code',
-            'profession': 'profession', 'statut': 'status', 'date_arrivee': 'date_joined',
-            'baptise': 'is_baptized', 'date_bapteme': 'baptism_date',
-            'situation_familiale': 'marital_status', 'notes': 'notes'
-        }
+    # ------------------------------------------------------------------
+    # Lecture et validation (par colonne)
+    # ------------------------------------------------------------------
+    
+    def _read_file(self):
+        return pd.read_excel(self.import_log.file_path.path).reset_index(drop=True)
+    
+    def _prepare_records(self, df, column_mapping, date_fields, bool_fields, required_fields,
+                         missing_message="Champ obligatoire manquant: {field}"):
+        """
+        Convertit et valide le fichier colonne par colonne.
         
-        self.import_log.total_rows = len(df)
-        self.import_log.save()
+        Comme pour l'ancien traitement ligne à ligne, seule la première
+        erreur d'une ligne (dans l'ordre des colonnes) est rapportée.
         
-        for index, row in df.iterrows():
-            try:
-                with transaction.atomic():
-                    self._process_member_row(row, expected_columns, index + 1)
-                    self.import_log.success_rows += 1
-            except Exception as e:
-                self.import_log.error_rows += 1
-                self.errors.append(f"Ligne {index + 1}: {str(e)}")
-            
-            self.import_log.processed_rows += 1
-            if self.import_log.processed_rows % 10 == 0:
-                self.import_log.save()
-    
-    def _process_member_row(self, row, column_mapping, row_number):
-        """Traite une ligne de membre."""
-        member_data = {}
+        Returns:
+            tuple ({index: données de la ligne}, {index: message d'erreur})
+        """
+        row_errors = {}
+        columns = {}
         
         for excel_col, model_field in column_mapping.items():
-            if excel_col in row and pd.notna(row[excel_col]):
-                value = row[excel_col]
-                
-                if model_field in ['date_of_birth', 'date_joined', 'baptism_date']:
-                    if isinstance(value, str):
+            if excel_col not in df.columns:
+                continue
+            series = df[excel_col]
+            present = series.notna()
+            invalid = pd.Series(False, index=df.index)
+            messages = None
+            
+            if model_field in date_fields:
+                series, invalid = _parse_date_column(series)
+                messages = df[excel_col].map(lambda value: f"Format de date invalide: {value}")
+            
+            elif model_field == 'gender':
+                series = series.where(~present, series.astype(str).str.upper())
+                invalid = present & ~series.isin(['M', 'F'])
+                messages = series.map(lambda value: f"Genre invalide: {value}")
+            
+            elif model_field in bool_fields:
+                series = series.where(~present, _parse_bool_column(series))
+            
+            elif model_field == 'status':
+                series = series.where(~present, series.astype(str).str.lower().map(
+                    lambda value: MEMBER_STATUS_MAPPING.get(value, Member.Status.ACTIF)
+                ))
+            
+            for index in invalid[invalid].index:
+                row_errors.setdefault(index, messages[index])
+            
+            columns[model_field] = (series, present)
+        
+        records = {}
+        for index in df.index:
+            if index in row_errors:
+                continue
+            data = {
+                field: series[index]
+                for field, (series, present) in columns.items()
+                if present[index]
+            }
+            missing = [field for field in required_fields if not data.get(field)]
+            if missing:
+                row_errors[index] = missing_message.format(field=missing[0])
+                continue
+            records[index] = data
+        
+        return records, row_errors
+    
+    # ------------------------------------------------------------------
+    # Traitement par lots
+    # ------------------------------------------------------------------
+    
+    def _import_rows(self, total, records, row_errors, write_bulk, write_one, reload_index):
+        """
+        Écrit les lignes par lots, à partir de la première ligne non validée.
+        
+        Args:
+            total: Nombre de lignes du fichier
+            records: {index: données} des lignes valides
+            row_errors: {index: message} des lignes invalides
+            write_bulk: Écrit un lot [(index, données)] en masse, retourne les messages
+            write_one: Écrit une ligne (repli), retourne le message
+            reload_index: Recharge les index après l'annulation d'un lot
+        """
+        self.import_log.total_rows = total
+        
+        for chunk_start in range(self.import_log.processed_rows, total, self.chunk_size):
+            indexes = range(chunk_start, min(chunk_start + self.chunk_size, total))
+            chunk = [(index, records[index]) for index in indexes if index in records]
+            chunk_errors = {index: row_errors[index] for index in indexes if index in row_errors}
+            
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        chunk_successes = write_bulk(chunk)
+                except Exception:
+                    # Rejouer le lot ligne par ligne pour isoler les erreurs
+                    reload_index()
+                    chunk_successes = []
+                    for index, data in chunk:
                         try:
-                            value = datetime.strptime(value, '%d/%m/%Y').date()
-                        except ValueError:
-                            try:
-                                value = datetime.strptime(value, '%Y-%m-%d').date()
-                            except ValueError:
-                                raise ValidationError(f"Format de date invalide: {value}")
-                    elif hasattr(value, 'date'):
-                        value = value.date()
-                
-                elif model_field == 'gender':
-                    value = value.upper()
-                    if value not in ['M', 'F']:
-                        raise ValidationError(f"Genre invalide: {value}")
-                
-                elif model_field == 'is_baptized':
-                    if isinstance(value, str):
-                        value = value.lower() in ['oui', 'yes', 'true', '1', 'vrai']
-                    else:
-                        value = bool(value)
+                            with transaction.atomic():
+                                chunk_successes.append(write_one(index, data))
+                        except Exception as e:
+                            chunk_errors[index] = str(e)
                 
-                elif model_field == 'status':
-                    status_mapping = {
-                        'actif': Member.Status.ACTIF,
-                        'inactif': Member.Status.INACTIF,
-                        'visiteur': Member.Status.VISITEUR,
-                        'transfere': Member.Status.TRANSFERE
-                    }
-                    value = status_mapping.get(value.lower(), Member.Status.ACTIF)
+                self.import_log.success_rows += len(chunk_successes)
+                self.import_log.error_rows += len(chunk_errors)
+                self.import_log.processed_rows += len(indexes)
+                self.successes.extend(chunk_successes)
+                self.errors.extend(
+                    f"Ligne {index + 1}: {message}" for index, message in sorted(chunk_errors.items())
+                )
                 
-                member_data[model_field] = value
+                self._checkpoint()
         
-        if not member_data.get('first_name') or not member_data.get('last_name'):
-            raise ValidationError("Prénom et nom obligatoires")
-        
-        existing_member = Member.objects.filter(
-            first_name__iexact=member_data['first_name'],
-            last_name__iexact=member_data['last_name']
-        ).first()
+        if not total:
+            self._checkpoint()
+    
+    def _checkpoint(self):
+        """Enregistre la progression (lue par la vue import_status)."""
+        self.import_log.error_log = '\n'.join(self.errors)
+        self.import_log.success_log = '\n'.join(self.successes)
+        self.import_log.checkpoint_at = timezone.now()
+        self.import_log.save(update_fields=self.CHECKPOINT_FIELDS)
+    
+    def _audit_bulk_write(self, model, created, updated_changes):
+        """
+        Journalise les écritures en masse (bulk_create / bulk_update ne
+        déclenchent pas les signaux d'audit).
+        """
+        from apps.core.models import AuditLog
+        from apps.core.signals import should_audit_model
+        
+        if not should_audit_model(model):
+            return
+        
+        extra_data = {'source': 'import', 'import_id': self.import_log.pk}
+        for instance in created:
+            AuditLog.log(
+                action=AuditLog.Action.CREATE,
+                user=self.import_log.imported_by,
+                model_name=model._meta.label,
+                object_id=instance.pk,
+                object_repr=str(instance),
+                changes={},
+                extra_data=extra_data
+            )
+        for instance, changes in updated_changes:
+            AuditLog.log(
+                action=AuditLog.Action.UPDATE,
+                user=self.import_log.imported_by,
+                model_name=model._meta.label,
+                object_id=instance.pk,
+                object_repr=str(instance),
+                changes=changes,
+                extra_data=extra_data
+            )
+    
+    # ------------------------------------------------------------------
+    # Membres
+    # ------------------------------------------------------------------
+    
+    def _import_members(self):
+        """Importe les membres depuis un fichier Excel."""
+        df = self._read_file()
+        records, row_errors = self._prepare_records(
+            df, self.MEMBER_COLUMNS, self.MEMBER_DATE_FIELDS, self.MEMBER_BOOL_FIELDS,
+            required_fields=['first_name', 'last_name'],
+            missing_message="Prénom et nom obligatoires"
+        )
         
-        if existing_member:
-            for field, value in member_data.items():
-                setattr(existing_member, field, value)
-            existing_member.save()
-            self.successes.append(f"Ligne {row_number}: {existing_member.full_name} mis à jour")
-        else:
-            member = Member.objects.create(**member_data)
-            self.successes.append(f"Ligne {row_number}: {member.full_name} créé")
+        self._load_members()
+        self._import_rows(
+            len(df), records, row_errors,
+            self._write_members, self._save_member, self._load_members
+        )
+    
+    def _load_members(self):
+        """Charge les membres existants, indexés par nom normalisé (une requête)."""
+        self.members_by_name = {}
+        for member in Member.objects.order_by('pk'):
+            self.members_by_name.setdefault(_name_key(member.first_name, member.last_name), member)
+    
+    def _write_members(self, chunk):
+        """Crée et met à jour les membres d'un lot en masse."""
+        from apps.members.geocoding import refresh_geocode_state
+        
+        to_create = []
+        to_update = {}
+        update_fields = set()
+        successes = []
+        
+        for index, data in chunk:
+            key = _name_key(data['first_name'], data['last_name'])
+            member = self.members_by_name.get(key)
+            
+            if member is None:
+                member = Member(**data)
+                self.members_by_name[key] = member
+                to_create.append(member)
+                successes.append(f"Ligne {index + 1}: {member.full_name} créé")
+            else:
+                for field, value in data.items():
+                    setattr(member, field, value)
+                if member.pk:
+                    to_update[member.pk] = member
+                    update_fields.update(data)
+                successes.append(f"Ligne {index + 1}: {member.full_name} mis à jour")
+        
+        for member in to_create:
+            refresh_geocode_state(member)
+        for member_id, member in zip(Member.objects.generate_member_ids(len(to_create)), to_create):
+            member.member_id = member_id
+        
+        now = timezone.now()
+        updated_changes = []
+        for member in to_update.values():
+            refresh_geocode_state(member)
+            member.updated_at = now
+            updated_changes.append((member, member.get_audit_changes()))
+        
+        Member.objects.bulk_create(to_create)
+        if to_update:
+            Member.objects.bulk_update(
+                list(to_update.values()),
+                sorted(update_fields) + self.MEMBER_GEOCODE_FIELDS + ['updated_at']
+            )
+        
+        self._audit_bulk_write(Member, to_create, updated_changes)
+        invalidate_models(Member)
+        for member in to_create + list(to_update.values()):
+            member.take_audit_snapshot()
+        
+        return successes
+    
+    def _save_member(self, index, data):
+        """Crée ou met à jour un membre (repli ligne par ligne, avec signaux)."""
+        key = _name_key(data['first_name'], data['last_name'])
+        member = self.members_by_name.get(key)
+        
+        if member is not None:
+            for field, value in data.items():
+                setattr(member, field, value)
+            member.save()
+            return f"Ligne {index + 1}: {member.full_name} mis à jour"
+        
+        member = Member.objects.create(**data)
+        self.members_by_name[key] = member
+        return f"Ligne {index + 1}: {member.full_name} créé"
+    
+    # ------------------------------------------------------------------
+    # Enfants
+    # ------------------------------------------------------------------
     
     def _import_children(self):
         """Importe les enfants depuis un fichier Excel."""
-        df = pd.read_excel(self.import_log.file_path.path)
-        
-        expected_columns = {
-            'prenom': 'first_name', 'nom': 'last_name', 'date_naissance': 'date_of_birth',
-            'genre': 'gender', 'nom_pere': 'father_name', 'telephone_pere': 'father_phone',
-            'email_pere': 'father_email', 'nom_mere': 'mother_name',
-            'telephone_mere': 'mother_phone', 'email_mere': 'mother_email',
-            'contact_urgence': 'emergency_contact', 'telephone_urgence': 'emergency_phone',
-            'allergies': 'allergies', 'notes_medicales': 'medical_notes',
-            'besoin_transport': 'needs_transport', 'adresse_ramassage': 'pickup_address',
-            'notes': 'notes'
-        }
-        
-        self.import_log.total_rows = len(df)
-        self.import_log.save()
+        df = self._read_file()
+        records, row_errors = self._prepare_records(
+            df, self.CHILD_COLUMNS, self.CHILD_DATE_FIELDS, self.CHILD_BOOL_FIELDS,
+            required_fields=self.CHILD_REQUIRED_FIELDS
+        )
         
-        for index, row in df.iterrows():
-            try:
-                with transaction.atomic():
-                    self._process_child_row(row, expected_columns, index + 1)
-                    self.import_log.success_rows += 1
-            except Exception as e:
-                self.import_log.error_rows += 1
-                self.errors.append(f"Ligne {index + 1}: {str(e)}")
+        self._load_age_groups()
+        self._assign_bible_classes(records)
+        self._load_children()
+        self._import_rows(
+            len(df), records, row_errors,
+            self._write_children, self._save_child, self._load_children
+        )
+    
+    def _load_age_groups(self):
+        """
+        Table des tranches d'âge en mémoire : [(min, max, classe active)],
+        triée par âge minimum comme AgeGroup.Meta.ordering.
+        """
+        first_class = {}
+        for bible_class in BibleClass.objects.filter(is_active=True, age_group__isnull=False):
+            first_class.setdefault(bible_class.age_group_id, bible_class)
+        
+        self.age_group_classes = [
+            (age_group.min_age, age_group.max_age, first_class.get(age_group.pk))
+            for age_group in AgeGroup.objects.order_by('min_age')
+        ]
+    
+    def _bible_class_for_age(self, age):
+        """Classe active de la première tranche d'âge contenant `age`."""
+        for min_age, max_age, bible_class in self.age_group_classes:
+            if min_age <= age <= max_age:
+                return bible_class
+        return None
+    
+    def _assign_bible_classes(self, records):
+        """Affecte une classe biblique à chaque enfant selon son âge."""
+        today = date.today()
+        classes_by_age = {}
+        for data in records.values():
+            age = (today - data['date_of_birth']).days // 365
+            if age not in classes_by_age:
+                classes_by_age[age] = self._bible_class_for_age(age)
+            if classes_by_age[age] is not None:
+                data['bible_class'] = classes_by_age[age]
+    
+    def _load_children(self):
+        """Charge les enfants existants, indexés par nom et date de naissance."""
+        self.children_by_key = {}
+        for child in Child.objects.order_by('pk'):
+            key = _name_key(child.first_name, child.last_name) + (child.date_of_birth,)
+            self.children_by_key.setdefault(key, child)
+    
+    def _write_children(self, chunk):
+        """Crée et met à jour les enfants d'un lot en masse."""
+        to_create = []
+        to_update = {}
+        update_fields = set()
+        successes = []
+        
+        for index, data in chunk:
+            key = _name_key(data['first_name'], data['last_name']) + (data['date_of_birth'],)
+            child = self.children_by_key.get(key)
             
-            self.import_log.processed_rows += 1
-            if self.import_log.processed_rows % 10 == 0:
-                self.import_log.save()
+            if child is None:
+                child = Child(**data)
+                self.children_by_key[key] = child
+                to_create.append(child)
+                successes.append(f"Ligne {index + 1}: {child.full_name} créé")
+            else:
+                for field, value in data.items():
+                    setattr(child, field, value)
+                if child.pk:
+                    to_update[child.pk] = child
+                    update_fields.update(data)
+                successes.append(f"Ligne {index + 1}: {child.full_name} mis à jour")
+        
+        now = timezone.now()
+        for child in to_update.values():
+            child.updated_at = now
+        
+        Child.objects.bulk_create(to_create)
+        if to_update:
+            Child.objects.bulk_update(list(to_update.values()), sorted(update_fields) + ['updated_at'])
+        
+        self._audit_bulk_write(Child, to_create, [(child, {}) for child in to_update.values()])
+        invalidate_models(Child)
+        return successes
     
-    def _process_child_row(self, row, column_mapping, row_number):
-        """Traite une ligne d'enfant."""
-        child_data = {}
-        
-        for excel_col, model_field in column_mapping.items():
-            if excel_col in row and pd.notna(row[excel_col]):
-                value = row[excel_col]
-                
-                if model_field == 'date_of_birth':
-                    if isinstance(value, str):
-                        try:
-                            value = datetime.strptime(value, '%d/%m/%Y').date()
-                        except ValueError:
-                            try:
-                                value = datetime.strptime(value, '%Y-%m-%d').date()
-                            except ValueError:
-                                raise ValidationError(f"Format de date invalide: {value}")
-                    elif hasattr(value, 'date'):
-                        value = value.date()
-                
-                elif model_field == 'gender':
-                    value = value.upper()
-                    if value not in ['M', 'F']:
-                        raise ValidationError(f"Genre invalide: {value}")
-                
-                elif model_field == 'needs_transport':
-                    if isinstance(value, str):
-                        value = value.lower() in ['oui', 'yes', 'true', '1', 'vrai']
-                    else:
-                        value = bool(value)
-                
-                child_data[model_field] = value
-        
-        required_fields = ['first_name', 'last_name', 'date_of_birth', 'father_name', 'father_phone']
-        for field in required_fields:
-            if not child_data.get(field):
-                raise ValidationError(f"Champ obligatoire manquant: {field}")
-        
-        # Assigner à une classe selon l'âge
-        birth_date = child_data['date_of_birth']
-        age = (date.today() - birth_date).days // 365
-        
-        age_group = AgeGroup.objects.filter(min_age__lte=age, max_age__gte=age).first()
-        if age_group:
-            bible_class = BibleClass.objects.filter(age_group=age_group, is_active=True).first()
-            if bible_class:
-                child_data['bible_class'] = bible_class
-        
-        existing_child = Child.objects.filter(
-            first_name__iexact=child_data['first_name'],
-            last_name__iexact=child_data['last_name'],
-            date_of_birth=child_data['date_of_birth']
-        ).first()
-        
-        if existing_child:
-            for field, value in child_data.items():
-                setattr(existing_child, field, value)
-            existing_child.save()
-            self.successes.append(f"Ligne {row_number}: {existing_child.full_name} mis à jour")
-        else:
-            child = Child.objects.create(**child_data)
-            self.successes.append(f"Ligne {row_number}: {child.full_name} créé")
+    def _save_child(self, index, data):
+        """Crée ou met à jour un enfant (repli ligne par ligne, avec signaux)."""
+        key = _name_key(data['first_name'], data['last_name']) + (data['date_of_birth'],)
+        child = self.children_by_key.get(key)
+        
+        if child is not None:
+            for field, value in data.items():
+                setattr(child, field, value)
+            child.save()
+            return f"Ligne {index + 1}: {child.full_name} mis à jour"
+        
+        child = Child.objects.create(**data)
+        self.children_by_key[key] = child
+        return f"Ligne {index + 1}: {child.full_name} créé"
     
     def _finalize_import(self):
         """Finalise l'import et met à jour les logs."""
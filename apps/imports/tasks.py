@@ -0,0 +1,96 @@
+"""
+Tâches Celery pour le module Imports.
+
+Ce module contient les tâches asynchrones pour :
+- L'import de fichiers Excel (membres, enfants), reprenable par lots
+- La relance des imports interrompus
+"""
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _stall_threshold():
+    """Date avant laquelle un import sans point de contrôle est considéré interrompu."""
+    return timezone.now() - timedelta(minutes=getattr(settings, 'IMPORT_STALL_MINUTES', 15))
+
+
+@shared_task(bind=True, ignore_result=True, acks_late=True, reject_on_worker_lost=True)
+def run_import(self, import_log_id):
+    """
+    Exécute (ou reprend) un import Excel.
+    
+    L'import est réservé par une mise à jour conditionnelle : une seule
+    tâche le traite à la fois. Si le worker est arrêté, le message est
+    redélivré (acks_late) et l'import reprend au dernier lot validé.
+    
+    Args:
+        import_log_id: ID de l'ImportLog à traiter
+    """
+    from .models import ImportLog
+    from .services import ExcelImportService
+    
+    task_id = self.request.id or ''
+    claimable = (
+        Q(status=ImportLog.Status.PENDING)
+        | Q(status=ImportLog.Status.PROCESSING, celery_task_id=task_id)
+        | Q(status=ImportLog.Status.PROCESSING, checkpoint_at__isnull=True, started_at__lt=_stall_threshold())
+        | Q(status=ImportLog.Status.PROCESSING, checkpoint_at__lt=_stall_threshold())
+    )
+    claimed = ImportLog.objects.filter(claimable, pk=import_log_id).update(
+        status=ImportLog.Status.PROCESSING,
+        celery_task_id=task_id,
+        checkpoint_at=timezone.now(),
+    )
+    if not claimed:
+        logger.info(f"Import {import_log_id} déjà terminé ou en cours de traitement")
+        return
+    
+    import_log = ImportLog.objects.get(pk=import_log_id)
+    if import_log.processed_rows:
+        logger.info(f"Reprise de l'import {import_log.pk} à la ligne {import_log.processed_rows + 1}")
+    
+    try:
+        ExcelImportService(import_log).process_import()
+        logger.info(
+            f"Import {import_log.pk} terminé: {import_log.success_rows} réussies, "
+            f"{import_log.error_rows} en erreur"
+        )
+    except Exception as e:
+        logger.error(f"Erreur lors de l'import {import_log.pk}: {e}")
+
+
+@shared_task(ignore_result=True)
+def resume_stalled_imports():
+    """
+    Relance les imports en attente ou en cours sans point de contrôle
+    récent (message perdu, worker arrêté sans redélivraison).
+    
+    Returns:
+        int: Nombre d'imports relancés
+    """
+    from .models import ImportLog
+    
+    threshold = _stall_threshold()
+    stalled = ImportLog.objects.filter(
+        status__in=ImportLog.ACTIVE_STATUSES,
+    ).filter(
+        Q(checkpoint_at__lt=threshold)
+        | Q(checkpoint_at__isnull=True, started_at__lt=threshold)
+    ).values_list('pk', flat=True)
+    
+    count = 0
+    for import_log_id in stalled:
+        run_import.delay(import_log_id)
+        count += 1
+    
+    if count:
+        logger.warning(f"{count} import(s) interrompu(s) relancé(s)")
+    return count
@@ -5,14 +5,15 @@ from django.http import HttpResponse, JsonResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.core.paginator import Paginator
+from django.db import transaction as db_transaction
 from django.db.models import Q
+from django.conf import settings
 import io
-import threading
 import pandas as pd
 
 from .models import ImportLog
 from .forms import ImportForm
-from .services import ExcelImportService, generate_template_excel, export_members_to_excel, export_children_to_excel
+from .services import generate_template_excel, export_members_to_excel, export_children_to_excel
 
 
 @login_required
@@ -63,22 +64,26 @@ def import_create(request):
     """
     if request.method == 'POST':
         form = ImportForm(request.POST, request.FILES)
-        if form.is_valid():
+        max_concurrent = getattr(settings, 'IMPORT_MAX_CONCURRENT_PER_USER', 1)
+        active_imports = ImportLog.objects.filter(
+            imported_by=request.user,
+            status__in=ImportLog.ACTIVE_STATUSES,
+        ).exclude(import_type=ImportLog.ImportType.EXPORT).count()
+        
+        if active_imports >= max_concurrent:
+            messages.error(
+                request,
+                f'Vous avez déjà {active_imports} import(s) en cours. '
+                'Attendez la fin du traitement avant d\'en lancer un nouveau.'
+            )
+        elif form.is_valid():
             import_log = form.save(commit=False)
             import_log.imported_by = request.user
             import_log.save()
             
-            # Lancer l'import en arrière-plan
-            def run_import():
-                try:
-                    service = ExcelImportService(import_log)
-                    service.process_import()
-                except Exception as e:
-                    print(f"Erreur lors de l'import: {e}")
-            
-            thread = threading.Thread(target=run_import)
-            thread.daemon = True
-            thread.start()
+            # Lancer l'import en tâche Celery (après validation de l'ImportLog)
+            from .tasks import run_import
+            db_transaction.on_commit(lambda: run_import.delay(import_log.pk))
             
             messages.success(request, 'Import lancé avec succès. Vous pouvez suivre le progrès dans la liste des imports.')
             return redirect('imports:detail', pk=import_log.pk)
@@ -27,7 +27,7 @@ class MemberAdmin(admin.ModelAdmin):
     form = MemberAdminForm  # Utiliser le formulaire personnalisé
     list_display = ['photo_thumbnail', 'member_id', 'last_name', 'first_name', 'site', 'phone', 'email', 'status', 'is_baptized', 'date_joined']
     list_display_links = ['photo_thumbnail', 'member_id', 'last_name', 'first_name']
-    list_filter = ['site', 'status', 'is_baptized', 'gender', 'marital_status', 'city', 'family']
+    list_filter = ['site', 'status', 'is_baptized', 'gender', 'marital_status', 'city', 'family', 'geocode_status']
     search_fields = ['member_id', 'first_name', 'last_name', 'email', 'phone', 'address']
     ordering = ['last_name', 'first_name']
     date_hierarchy = 'date_joined'
@@ -44,6 +44,10 @@ class MemberAdmin(admin.ModelAdmin):
         ('Contact', {
             'fields': ('email', 'phone', 'address', 'city', 'postal_code')
         }),
+        ('Géolocalisation', {
+            'fields': ('geocode_status', 'latitude', 'longitude', 'geocoded_at'),
+            'classes': ('collapse',)
+        }),
         ('Famille', {
             'fields': ('family', 'family_role', 'marital_status')
         }),
@@ -67,7 +71,7 @@ class MemberAdmin(admin.ModelAdmin):
         }),
     )
     
-    readonly_fields = ['member_id', 'photo_preview']
+    readonly_fields = ['member_id', 'photo_preview', 'geocode_status', 'latitude', 'longitude', 'geocoded_at']
     
     @admin.display(description='Photo')
     def photo_thumbnail(self, obj):
@@ -12,8 +12,7 @@ from django.http import JsonResponse
 from django.db.models import Count, Q
 
 from .models import Member
-from .geocoding import geocode_address
-from apps.core.models import Site, Neighborhood, Family
+from apps.core.models import GeocodeStatus, Site, Neighborhood, Family
 from apps.core.permissions import role_required, has_role
 
 
@@ -129,7 +128,12 @@ def members_map_view(request):
 @login_required
 @role_required('admin', 'secretariat')
 def members_map_data(request):
-    """API JSON pour les données de la carte avec géocodage."""
+    """
+    API JSON pour les données de la carte.
+    
+    Les coordonnées sont lues depuis la base (géocodage en tâche de fond,
+    cf. apps.members.tasks.geocode_pending_addresses).
+    """
     
     # Filtres
     site_id = request.GET.get('site')
@@ -145,10 +149,9 @@ def members_map_data(request):
         is_active=True,
         latitude__isnull=False,
         longitude__isnull=False
-    )
+    ).annotate(member_count=Count('members'))
     
     for site in sites_qs:
-        member_count = Member.objects.filter(site=site).count()
         sites_data.append({
             'type': 'site',
             'id': site.id,
@@ -157,14 +160,17 @@ def members_map_data(request):
             'lng': float(site.longitude),
             'address': site.address,
             'city': site.city,
-            'member_count': member_count,
+            'member_count': site.member_count,
         })
     
-    # Données des membres avec adresse
+    # Données des membres géocodés (coordonnées stockées, aucun appel externe)
     members_data = []
     members_qs = Member.objects.filter(
-        Q(address__isnull=False) & ~Q(address='')
-    ).select_related('site', 'family')
+        geocode_status=GeocodeStatus.OK
+    ).select_related('site', 'family').only(
+        'id', 'first_name', 'last_name', 'address', 'city', 'phone', 'status',
+        'latitude', 'longitude', 'site__name', 'family__name',
+    )
     
     if site_id:
         members_qs = members_qs.filter(site_id=site_id)
@@ -173,54 +179,37 @@ def members_map_data(request):
     if city_filter:
         members_qs = members_qs.filter(city__icontains=city_filter)
     
-    # Limiter pour éviter trop de requêtes de géocodage
-    members_qs = members_qs[:100]
-    
-    # Cache pour éviter de géocoder plusieurs fois la même adresse
-    geocode_cache = {}
-    
     for member in members_qs:
-        # Créer une clé de cache basée sur l'adresse
-        cache_key = f"{member.address}|{member.city}|{member.postal_code}"
+        lat, lng = float(member.latitude), float(member.longitude)
         
-        if cache_key in geocode_cache:
-            coords = geocode_cache[cache_key]
+        # Appliquer l'obfuscation si nécessaire
+        if obfuscate:
+            display_lat, display_lng = obfuscate_coordinates(lat, lng)
         else:
-            coords = geocode_address(
-                address=member.address,
-                city=member.city,
-                postal_code=member.postal_code
-            )
-            geocode_cache[cache_key] = coords
+            display_lat, display_lng = lat, lng
         
-        if coords:
-            # Appliquer l'obfuscation si nécessaire
-            if obfuscate:
-                display_lat, display_lng = obfuscate_coordinates(coords[0], coords[1])
-            else:
-                display_lat, display_lng = coords[0], coords[1]
-            
-            members_data.append({
-                'type': 'member',
-                'id': member.id,
-                'name': member.full_name,
-                'lat': display_lat,
-                'lng': display_lng,
-                'address': member.address,
-                'city': member.city,
-                'phone': member.phone or '',
-                'status': member.status,
-                'site': member.site.name if member.site else '',
-                'family': member.family.name if member.family else '',
-                'obfuscated': obfuscate,  # Indicateur pour le frontend
-            })
+        members_data.append({
+            'type': 'member',
+            'id': member.id,
+            'name': member.full_name,
+            'lat': display_lat,
+            'lng': display_lng,
+            'address': member.address,
+            'city': member.city,
+            'phone': member.phone or '',
+            'status': member.status,
+            'site': member.site.name if member.site else '',
+            'family': member.family.name if member.family else '',
+            'obfuscated': obfuscate,  # Indicateur pour le frontend
+        })
     
     # Statistiques
-    total_members = Member.objects.count()
-    members_with_address = Member.objects.filter(
-        Q(address__isnull=False) & ~Q(address='')
-    ).count()
-    members_geocoded = len(members_data)
+    stats = Member.objects.aggregate(
+        total_members=Count('id'),
+        members_with_address=Count('id', filter=Q(address__isnull=False) & ~Q(address='')),
+        members_pending=Count('id', filter=Q(geocode_status=GeocodeStatus.PENDING)),
+    )
+    stats['members_geocoded'] = len(members_data)
     
     # Villes uniques pour le filtre
     cities = Member.objects.exclude(
@@ -231,9 +220,5 @@ def members_map_data(request):
         'sites': sites_data,
         'members': members_data,
         'cities': list(cities),
-        'stats': {
-            'total_members': total_members,
-            'members_with_address': members_with_address,
-            'members_geocoded': members_geocoded,
-        }
+        'stats': stats,
     })
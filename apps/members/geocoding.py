@@ -2,17 +2,93 @@
 Service de géocodage pour convertir les adresses en coordonnées GPS.
 Utilise l'API Nominatim (OpenStreetMap) - gratuite et sans clé API.
 """
+import hashlib
+import logging
 import requests
 import time
-from functools import lru_cache
 
+logger = logging.getLogger(__name__)
 
 NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
 USER_AGENT = "EEBC-Gestion/1.0"
 
+# Champs d'adresse dont dépend le géocodage (Member et Family)
+ADDRESS_FIELDS = ('address', 'city', 'postal_code')
 
-@lru_cache(maxsize=500)
-def geocode_address(address, city="", postal_code="", country="Guyane française"):
+
+class GeocodingError(Exception):
+    """Échec technique du géocodage (réseau, délai, réponse invalide)."""
+
+
+def address_fingerprint(address, city="", postal_code=""):
+    """
+    Calcule une empreinte normalisée d'une adresse.
+    
+    Les différences de casse et d'espaces sont ignorées, afin de ne
+    re-géocoder que lorsque l'adresse change réellement.
+    
+    Returns:
+        str: Empreinte SHA-1 (40 caractères) ou '' si l'adresse est inexploitable
+    """
+    parts = [' '.join((part or '').lower().split()) for part in (address, city, postal_code)]
+    if not parts[0] and not parts[1]:
+        return ''
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def refresh_geocode_state(instance, trust_coordinates=False):
+    """
+    Met à jour l'empreinte et le statut de géocodage d'une instance avant sauvegarde.
+    
+    Si l'adresse a changé, l'instance repasse en attente de géocodage
+    (ou en "sans adresse") ; la tâche `geocode_pending_addresses` se
+    charge ensuite de renseigner les coordonnées.
+    
+    Args:
+        instance: Member ou Family
+        trust_coordinates: Conserver les coordonnées saisies manuellement
+            dans la même sauvegarde que l'adresse (les coordonnées
+            inchangées, devenues obsolètes, sont effacées)
+    
+    Returns:
+        bool: True si l'adresse a changé
+    """
+    from apps.core.models import GeocodeStatus
+    
+    fingerprint = address_fingerprint(instance.address, instance.city, instance.postal_code)
+    if fingerprint == instance.address_fingerprint and not instance._state.adding:
+        return False
+    
+    instance.address_fingerprint = fingerprint
+    instance.geocoded_at = None
+    
+    has_coordinates = instance.latitude is not None and instance.longitude is not None
+    if not fingerprint:
+        instance.geocode_status = GeocodeStatus.NO_ADDRESS
+    elif trust_coordinates and has_coordinates and _coordinates_edited(instance):
+        instance.geocode_status = GeocodeStatus.OK
+        return True
+    else:
+        instance.geocode_status = GeocodeStatus.PENDING
+    
+    instance.latitude = None
+    instance.longitude = None
+    return True
+
+
+def _coordinates_edited(instance):
+    """Indique si les coordonnées de l'instance diffèrent de celles en base."""
+    if instance._state.adding or instance.pk is None:
+        return True
+    stored = type(instance)._default_manager.filter(pk=instance.pk).values_list(
+        'latitude', 'longitude'
+    ).first()
+    if stored is None:
+        return True
+    return tuple(stored) != (instance.latitude, instance.longitude)
+
+
+def geocode_address(address, city="", postal_code="", country="Guyane française", raise_errors=False):
     """
     Convertit une adresse en coordonnées GPS.
     
@@ -21,6 +97,8 @@ def geocode_address(address, city="", postal_code="", country="Guyane française
         city: Ville
         postal_code: Code postal
         country: Pays (défaut: Guyane française)
+        raise_errors: Lever GeocodingError en cas d'échec technique au lieu
+            de retourner None
     
     Returns:
         tuple (latitude, longitude) ou None si non trouvé
@@ -55,21 +133,29 @@ def geocode_address(address, city="", postal_code="", country="Guyane française
             timeout=10
         )
         
-        if response.status_code == 200:
-            results = response.json()
-            if results:
-                lat = float(results[0]['lat'])
-                lon = float(results[0]['lon'])
-                return (lat, lon)
+        if response.status_code != 200:
+            raise GeocodingError(f"Réponse Nominatim {response.status_code}")
+        
+        results = response.json()
+        if results:
+            lat = float(results[0]['lat'])
+            lon = float(results[0]['lon'])
+            return (lat, lon)
         
         return None
         
+    except GeocodingError:
+        if raise_errors:
+            raise
+        return None
     except Exception as e:
-        print(f"Erreur géocodage: {e}")
+        if raise_errors:
+            raise GeocodingError(str(e)) from e
+        logger.warning(f"Erreur géocodage: {e}")
         return None
 
 
-def geocode_member(member):
+def geocode_member(member, raise_errors=False):
     """
     Géocode l'adresse d'un membre.
     
@@ -79,11 +165,12 @@ def geocode_member(member):
     return geocode_address(
         address=member.address,
         city=member.city,
-        postal_code=member.postal_code
+        postal_code=member.postal_code,
+        raise_errors=raise_errors
     )
 
 
-def geocode_family(family):
+def geocode_family(family, raise_errors=False):
     """
     Géocode l'adresse d'une famille.
     
@@ -93,10 +180,46 @@ def geocode_family(family):
     return geocode_address(
         address=family.address,
         city=family.city,
-        postal_code=family.postal_code
+        postal_code=family.postal_code,
+        raise_errors=raise_errors
     )
 
 
+def _batch_geocode(objects, geocode_func, delay):
+    """
+    Géocode une liste d'objets adressés avec délai entre les requêtes.
+    
+    Chaque adresse (empreinte) n'est interrogée qu'une fois par lot et
+    chaque requête réellement envoyée est suivie du délai. Les objets
+    dont le géocodage a échoué (réseau, délai dépassé...) sont absents du
+    résultat, pour être retentés plus tard.
+    
+    Returns:
+        dict {id: (lat, lon), ou None si l'adresse est introuvable}
+    """
+    results = {}
+    memo = {}
+    failed = object()
+    
+    for obj in objects:
+        if not (obj.address or obj.city):
+            continue
+        
+        fingerprint = address_fingerprint(obj.address, obj.city, obj.postal_code)
+        if fingerprint not in memo:
+            try:
+                memo[fingerprint] = geocode_func(obj, raise_errors=True)
+            except GeocodingError as e:
+                logger.warning(f"Erreur géocodage ({obj.__class__.__name__} {obj.pk}): {e}")
+                memo[fingerprint] = failed
+            time.sleep(delay)  # Respecter la limite de Nominatim
+        
+        if memo[fingerprint] is not failed:
+            results[obj.id] = memo[fingerprint]
+    
+    return results
+
+
 def batch_geocode_members(members, delay=1.0):
     """
     Géocode une liste de membres avec délai entre les requêtes.
@@ -107,15 +230,20 @@ def batch_geocode_members(members, delay=1.0):
         delay: Délai entre requêtes en secondes
     
     Returns:
-        dict {member_id: (lat, lon)}
+        dict {member_id: (lat, lon) ou None} (cf. _batch_geocode)
     """
-    results = {}
+    return _batch_geocode(members, geocode_member, delay)
+
+
+def batch_geocode_families(families, delay=1.0):
+    """
+    Géocode une liste de familles avec délai entre les requêtes.
     
-    for member in members:
-        if member.address or member.city:
-            coords = geocode_member(member)
-            if coords:
-                results[member.id] = coords
-            time.sleep(delay)  # Respecter la limite de Nominatim
+    Args:
+        families: QuerySet ou liste de familles
+        delay: Délai entre requêtes en secondes
     
-    return results
+    Returns:
+        dict {family_id: (lat, lon) ou None} (cf. _batch_geocode)
+    """
+    return _batch_geocode(families, geocode_family, delay)
@@ -81,18 +81,18 @@ class KanbanBoardView(RoleRequiredMixin, LoginRequiredMixin, TemplateView):
     
     def _get_members_needing_visit(self):
         """Retourne les membres qui n'ont pas été visités depuis longtemps."""
-        members = []
-        for member in Member.objects.filter(status='actif'):
-            if member.needs_visit:
-                members.append({
-                    'member': member,
-                    'days': member.days_since_last_visit,
-                    'last_visit': member.last_visit_date,
-                })
+        members = Member.objects.filter(
+            status=Member.Status.ACTIF
+        ).needing_visit_ranked()[:15]
         
-        # Trier par nombre de jours (les plus anciens en premier)
-        members.sort(key=lambda x: x['days'] if x['days'] else 9999, reverse=True)
-        return members[:15]
+        return [
+            {
+                'member': member,
+                'days': member.days_since_last_visit,
+                'last_visit': member.last_visit_date,
+            }
+            for member in members
+        ]
     
     def _get_stats(self):
         """Calcule les statistiques des visites."""
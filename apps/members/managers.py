@@ -6,7 +6,61 @@ import random
 import string
 
 
-class MemberManager(models.Manager):
+class MemberQuerySet(models.QuerySet):
+    """
+    QuerySet personnalisé pour le modèle Member.
+    Les méthodes sont aussi disponibles sur Member.objects.
+    """
+    
+    def with_last_visit(self):
+        """
+        Annote la date de la dernière visite effectuée (last_visit_date_anno).
+        
+        Sous-requête corrélée : pas de GROUP BY sur les colonnes du membre,
+        et combinable avec d'autres annotations.
+        """
+        from .models import VisitationLog
+        
+        last_visit = VisitationLog.objects.filter(
+            member=models.OuterRef('pk'),
+            status=VisitationLog.Status.EFFECTUE,
+            visit_date__isnull=False
+        ).order_by('-visit_date').values('visit_date')[:1]
+        
+        return self.annotate(last_visit_date_anno=models.Subquery(last_visit))
+    
+    def needing_visit_ranked(self, threshold_days=None):
+        """
+        Membres non visités depuis le seuil, les plus anciens en premier.
+        
+        Les membres jamais visités viennent en tête, puis par date de
+        dernière visite croissante. Filtre, tri et découpage ([:n]) sont
+        faits en SQL ; member.last_visit_date, days_since_last_visit et
+        needs_visit utilisent ensuite les annotations sans requête.
+        
+        Args:
+            threshold_days: Seuil en jours (défaut: MEMBER_VISIT_THRESHOLD_DAYS)
+        """
+        from django.conf import settings
+        from datetime import date, timedelta
+        
+        if threshold_days is None:
+            threshold_days = getattr(settings, 'MEMBER_VISIT_THRESHOLD_DAYS', 180)
+        threshold_date = date.today() - timedelta(days=threshold_days)
+        
+        return self.with_last_visit().filter(
+            models.Q(last_visit_date_anno__isnull=True) |
+            models.Q(last_visit_date_anno__lt=threshold_date)
+        ).annotate(
+            needs_visit_anno=models.Value(1, output_field=models.IntegerField())
+        ).order_by(
+            models.F('last_visit_date_anno').asc(nulls_first=True),
+            'last_name',
+            'first_name'
+        )
+
+
+class MemberManager(models.Manager.from_queryset(MemberQuerySet)):
     """
     Manager personnalisé pour le modèle Member.
     Contient la logique de génération d'ID et les requêtes optimisées.
@@ -43,6 +97,39 @@ class MemberManager(models.Manager):
         random_suffix = ''.join(random.choices(string.digits, k=6))
         return f"EEBC-{site_code}-{random_suffix}"
     
+    def generate_member_ids(self, count, site=None):
+        """
+        Génère `count` IDs membres uniques (imports en masse).
+        
+        Même format que generate_member_id, mais l'unicité est vérifiée
+        en une requête par tirage plutôt qu'une requête par ID.
+        
+        Args:
+            count: Nombre d'IDs à générer
+            site: Instance de Site (optionnel)
+            
+        Returns:
+            list: IDs membres uniques
+        """
+        site_code = site.code if site and getattr(site, 'code', None) else 'CAB'
+        
+        ids = set()
+        for attempt in range(100):
+            missing = count - len(ids)
+            if missing <= 0:
+                break
+            
+            # Fallback avec plus de chiffres si l'espace à 4 chiffres est saturé
+            digits = 4 if attempt < 10 else 6
+            candidates = {
+                f"EEBC-{site_code}-{''.join(random.choices(string.digits, k=digits))}"
+                for _ in range(missing * 2)
+            } - ids
+            taken = set(self.filter(member_id__in=candidates).values_list('member_id', flat=True))
+            ids.update(sorted(candidates - taken)[:missing])
+        
+        return list(ids)
+    
     def with_visit_stats(self):
         """
         Retourne un QuerySet avec les statistiques de visites annotées.
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.9 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_family_geocoding'),
+        ('members', '0003_initial_core'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='address_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=40, verbose_name="Empreinte de l'adresse"),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='geocode_status',
+            field=models.CharField(choices=[('pending', 'En attente'), ('ok', 'Géocodée'), ('not_found', 'Introuvable'), ('no_address', 'Sans adresse')], default='pending', max_length=10, verbose_name='Statut du géocodage'),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='geocoded_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Géocodé le'),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='latitude',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True, verbose_name='Latitude'),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='longitude',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True, verbose_name='Longitude'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['geocode_status', 'site'], name='members_mem_geocode_b63410_idx'),
+        ),
+    ]
@@ -3,10 +3,12 @@ from django.conf import settings
 import random
 import string
 
+from apps.core.models import AuditSnapshotMixin, GeocodeStatus
+
 from .managers import MemberManager
 
 
-class Member(models.Model):
+class Member(AuditSnapshotMixin, models.Model):
     """
     Modèle représentant un membre de l'église.
     Peut être lié ou non à un compte utilisateur.
@@ -96,6 +98,31 @@ class Member(models.Model):
     city = models.CharField(max_length=100, blank=True, verbose_name="Ville")
     postal_code = models.CharField(max_length=10, blank=True, verbose_name="Code postal")
     
+    # Géolocalisation (renseignée en tâche de fond, cf. apps.members.tasks)
+    latitude = models.DecimalField(
+        max_digits=9, decimal_places=6,
+        null=True, blank=True,
+        verbose_name="Latitude"
+    )
+    longitude = models.DecimalField(
+        max_digits=9, decimal_places=6,
+        null=True, blank=True,
+        verbose_name="Longitude"
+    )
+    geocode_status = models.CharField(
+        max_length=10,
+        choices=GeocodeStatus.choices,
+        default=GeocodeStatus.PENDING,
+        verbose_name="Statut du géocodage"
+    )
+    address_fingerprint = models.CharField(
+        max_length=40,
+        blank=True,
+        editable=False,
+        verbose_name="Empreinte de l'adresse"
+    )
+    geocoded_at = models.DateTimeField(null=True, blank=True, verbose_name="Géocodé le")
+    
     # Situation
     marital_status = models.CharField(
         max_length=15,
@@ -138,6 +165,9 @@ class Member(models.Model):
         verbose_name = "Membre"
         verbose_name_plural = "Membres"
         ordering = ['last_name', 'first_name']
+        indexes = [
+            models.Index(fields=['geocode_status', 'site']),
+        ]
     
     def __str__(self):
         prefix = f"[{self.member_id}] " if self.member_id else ""
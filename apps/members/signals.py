@@ -2,10 +2,13 @@
 Signals pour les modèles Member.
 Gère la logique métier déclenchée par les événements du modèle.
 """
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from apps.core.models import Family
+
+from .geocoding import ADDRESS_FIELDS, refresh_geocode_state
 from .models import Member, LifeEvent, VisitationLog
 
 
@@ -18,32 +21,30 @@ def generate_member_id_on_create(sender, instance, **kwargs):
         instance.member_id = Member.objects.generate_member_id(instance.site)
 
 
-@receiver(post_save, sender=Member)
-def log_member_creation(sender, instance, created, **kwargs):
+def _address_may_have_changed(update_fields):
+    """Indique si une sauvegarde partielle peut toucher l'adresse."""
+    return update_fields is None or any(field in update_fields for field in ADDRESS_FIELDS)
+
+
+@receiver(pre_save, sender=Member)
+def invalidate_member_geocode(sender, instance, update_fields=None, **kwargs):
     """
-    Log la création d'un nouveau membre dans l'audit trail.
+    Remet le membre en attente de géocodage si son adresse a changé.
+    Les coordonnées sont renseignées plus tard par la tâche Celery.
     """
-    if created:
-        from apps.core.models import AuditLog
-        from apps.core.signals import get_current_request
-        
-        request = get_current_request()
-        user = request.user if request and request.user.is_authenticated else None
-        
-        AuditLog.objects.create(
-            user=user,
-            action='member_created',
-            model_name='Member',
-            object_id=instance.pk,
-            object_repr=str(instance),
-            changes={
-                'member_id': instance.member_id,
-                'full_name': instance.full_name,
-                'site': str(instance.site) if instance.site else None,
-            },
-            ip_address=request.META.get('REMOTE_ADDR') if request else None,
-            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500] if request else '',
-        )
+    if _address_may_have_changed(update_fields):
+        refresh_geocode_state(instance)
+
+
+@receiver(pre_save, sender=Family)
+def invalidate_family_geocode(sender, instance, update_fields=None, **kwargs):
+    """
+    Remet la famille en attente de géocodage si son adresse a changé.
+    Les coordonnées saisies manuellement (formulaire famille) en même temps
+    que l'adresse sont conservées.
+    """
+    if _address_may_have_changed(update_fields):
+        refresh_geocode_state(instance, trust_coordinates=True)
 
 
 @receiver(post_save, sender=LifeEvent)
@@ -97,30 +98,3 @@ def handle_visit_completed(sender, instance, **kwargs):
         # Marquer l'événement de vie comme visité
         instance.life_event.visit_completed = True
         instance.life_event.save(update_fields=['visit_completed'])
-
-
-@receiver(post_delete, sender=Member)
-def log_member_deletion(sender, instance, **kwargs):
-    """
-    Log la suppression d'un membre dans l'audit trail.
-    """
-    from apps.core.models import AuditLog
-    from apps.core.signals import get_current_request
-    
-    request = get_current_request()
-    user = request.user if request and request.user.is_authenticated else None
-    
-    AuditLog.objects.create(
-        user=user,
-        action='member_deleted',
-        model_name='Member',
-        object_id=instance.pk,
-        object_repr=str(instance),
-        changes={
-            'member_id': instance.member_id,
-            'full_name': instance.full_name,
-            'deletion_reason': 'Manual deletion',
-        },
-        ip_address=request.META.get('REMOTE_ADDR') if request else None,
-        user_agent=request.META.get('HTTP_USER_AGENT', '')[:500] if request else '',
-    )
\ No newline at end of file
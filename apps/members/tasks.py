@@ -0,0 +1,119 @@
+"""
+Tâches Celery pour le module Membres.
+
+Ce module contient les tâches asynchrones pour :
+- Le géocodage des adresses des membres et des familles
+"""
+
+import logging
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _geocode_pending(model, batch_geocode, limit, trust_coordinates=False):
+    """
+    Géocode les instances en attente d'un modèle (Member ou Family).
+
+    Les mises à jour passent par `QuerySet.update()` : pas de signal,
+    donc pas d'entrée d'audit ni de nouvelle invalidation. Chaque mise à
+    jour est conditionnée à l'empreinte lue, pour ne pas écraser une
+    adresse modifiée pendant le traitement.
+
+    Les adresses dont le géocodage a échoué (erreur réseau, délai
+    dépassé) restent en attente et sont retentées à l'exécution suivante.
+
+    Returns:
+        dict: Compteurs {'geocoded', 'not_found', 'no_address', 'errors'}
+    """
+    from apps.core.models import GeocodeStatus
+    from .geocoding import address_fingerprint
+
+    pending = list(
+        model.objects.filter(geocode_status=GeocodeStatus.PENDING)
+        .only('id', 'address', 'city', 'postal_code', 'address_fingerprint', 'latitude', 'longitude')
+        .order_by('id')[:limit]
+    )
+
+    stats = {'geocoded': 0, 'not_found': 0, 'no_address': 0, 'errors': 0}
+    to_geocode = []
+    fingerprints = {}
+
+    def _record(obj, **values):
+        return model.objects.filter(
+            pk=obj.pk,
+            address_fingerprint=obj.address_fingerprint,
+            geocode_status=GeocodeStatus.PENDING,
+        ).update(address_fingerprint=fingerprints[obj.pk], **values)
+
+    for obj in pending:
+        fingerprints[obj.pk] = address_fingerprint(obj.address, obj.city, obj.postal_code)
+
+        if not fingerprints[obj.pk]:
+            _record(obj, geocode_status=GeocodeStatus.NO_ADDRESS, latitude=None, longitude=None)
+            stats['no_address'] += 1
+        elif trust_coordinates and obj.latitude is not None and obj.longitude is not None:
+            _record(obj, geocode_status=GeocodeStatus.OK)
+        else:
+            to_geocode.append(obj)
+
+    if not to_geocode:
+        return stats
+
+    delay = getattr(settings, 'GEOCODING_DELAY', 1.0)
+    results = batch_geocode(to_geocode, delay=delay)
+    now = timezone.now()
+
+    for obj in to_geocode:
+        if obj.pk not in results:
+            stats['errors'] += 1
+            continue
+        coords = results[obj.pk]
+        if coords:
+            _record(
+                obj,
+                latitude=round(coords[0], 6),
+                longitude=round(coords[1], 6),
+                geocode_status=GeocodeStatus.OK,
+                geocoded_at=now,
+            )
+            stats['geocoded'] += 1
+        else:
+            _record(obj, geocode_status=GeocodeStatus.NOT_FOUND, geocoded_at=now)
+            stats['not_found'] += 1
+
+    return stats
+
+
+@shared_task(bind=True, ignore_result=True)
+def geocode_pending_addresses(self, batch_size=None):
+    """
+    Géocode les adresses des membres et familles en attente.
+
+    Une adresse n'est (re)géocodée que lorsque son empreinte change
+    (cf. signals.invalidate_member_geocode). Le lot est limité pour
+    respecter la limite de Nominatim (1 requête/seconde).
+
+    Args:
+        batch_size: Nombre maximum d'adresses par modèle et par exécution
+
+    Returns:
+        dict: Compteurs par modèle
+    """
+    from apps.core.models import Family
+    from .geocoding import batch_geocode_members, batch_geocode_families
+    from .models import Member
+
+    batch_size = batch_size or getattr(settings, 'GEOCODING_BATCH_SIZE', 50)
+
+    results = {
+        'members': _geocode_pending(Member, batch_geocode_members, batch_size),
+        'families': _geocode_pending(
+            Family, batch_geocode_families, batch_size, trust_coordinates=True
+        ),
+    }
+
+    logger.info(f"Géocodage terminé: {results}")
+    return results
@@ -4,7 +4,7 @@ from django.contrib import messages
 from django.core.paginator import Paginator
 from django.db.models import Q
 from django.http import HttpResponse
-from datetime import date, timedelta
+from datetime import date
 from .models import Member, LifeEvent, VisitationLog
 from apps.core.permissions import role_required
 
@@ -381,20 +381,16 @@ def visit_complete(request, pk):
 @role_required('admin', 'secretariat', 'encadrant')
 def members_needing_visit(request):
     """Liste des membres nécessitant une visite (pas visités depuis 6 mois)."""
-    members = []
-    six_months_ago = date.today() - timedelta(days=180)
-    
-    for member in Member.objects.filter(status='actif'):
-        last_visit = member.last_visit_date
-        if last_visit is None or last_visit < six_months_ago:
-            members.append({
-                'member': member,
-                'last_visit': last_visit,
-                'days_since': member.days_since_last_visit,
-            })
-    
-    # Trier par ancienneté de visite
-    members.sort(key=lambda x: x['days_since'] if x['days_since'] else 9999, reverse=True)
+    members = [
+        {
+            'member': member,
+            'last_visit': member.last_visit_date,
+            'days_since': member.days_since_last_visit,
+        }
+        for member in Member.objects.filter(
+            status=Member.Status.ACTIF
+        ).needing_visit_ranked(threshold_days=180)
+    ]
     
     context = {
         'members': members,
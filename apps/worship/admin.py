@@ -390,16 +390,20 @@ class ServiceNotificationAdmin(admin.ModelAdmin):
     
     list_display = [
         'scheduled_service', 'scheduled_date', 'status_badge',
-        'channels', 'sent_at'
+        'channels', 'progress', 'sent_at'
     ]
     list_filter = ['status', 'scheduled_date']
-    readonly_fields = ['sent_at', 'error_message']
+    readonly_fields = [
+        'sent_at', 'error_message', 'started_at',
+        'total_messages', 'sent_messages', 'failed_messages'
+    ]
     
     actions = ['send_selected_notifications']
     
     def status_badge(self, obj):
         colors = {
             'pending': 'warning',
+            'sending': 'info',
             'sent': 'success',
             'failed': 'danger',
             'cancelled': 'secondary'
@@ -422,12 +426,20 @@ class ServiceNotificationAdmin(admin.ModelAdmin):
         return ' '.join(icons) or '-'
     channels.short_description = 'Canaux'
     
+    def progress(self, obj):
+        if not obj.total_messages:
+            return '-'
+        return f"{obj.sent_messages + obj.failed_messages}/{obj.total_messages} ({obj.failed_messages} échec(s))"
+    progress.short_description = 'Progression'
+    
     @admin.action(description='Envoyer les notifications sélectionnées')
     def send_selected_notifications(self, request, queryset):
-        sent = 0
-        for notif in queryset.filter(status='pending'):
-            notif.send()
-            if notif.status == 'sent':
-                sent += 1
+        from .tasks import send_schedule_notifications
+        
+        service_ids = list(
+            queryset.filter(status='pending').values_list('scheduled_service_id', flat=True)
+        )
+        if service_ids:
+            send_schedule_notifications.delay(service_ids=service_ids)
         
-        messages.success(request, f'{sent} notification(s) envoyée(s)')
+        messages.success(request, f'Envoi lancé pour {len(service_ids)} notification(s)')
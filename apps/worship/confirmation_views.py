@@ -187,27 +187,26 @@ def send_assignment_notification(request, pk):
 @role_required('admin', 'responsable_groupe')
 def send_all_notifications(request, service_pk):
     """
-    Envoyer les notifications à tous les membres en attente.
+    Envoyer les notifications à tous les membres en attente
+    (en tâche Celery, par lots et par canal).
     """
+    from django.db import transaction as db_transaction
+    from .tasks import send_role_assignment_notifications
+    
     service = get_object_or_404(ScheduledService, pk=service_pk)
     
-    pending_assignments = service.role_assignments.filter(
+    pending_count = service.role_assignments.filter(
         status='pending',
         notified_at__isnull=True
-    )
+    ).count()
     
     base_url = request.build_absolute_uri('/').rstrip('/')
-    sent_count = 0
-    
-    for assignment in pending_assignments:
-        try:
-            assignment.send_notification(base_url=base_url)
-            sent_count += 1
-        except Exception as e:
-            messages.error(request, f"Erreur pour {assignment.member.full_name}: {e}")
     
-    if sent_count:
-        messages.success(request, f"{sent_count} notification(s) envoyée(s)")
+    if pending_count:
+        db_transaction.on_commit(
+            lambda: send_role_assignment_notifications.delay(service.pk, base_url)
+        )
+        messages.success(request, f"Envoi de {pending_count} notification(s) lancé")
     else:
         messages.info(request, "Aucune notification à envoyer")
     
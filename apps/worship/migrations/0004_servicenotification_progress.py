@@ -0,0 +1,38 @@
+# Generated by Django 5.2.9 on 2026-10-16 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('worship', '0003_roleassignment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicenotification',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Envoi démarré le'),
+        ),
+        migrations.AddField(
+            model_name='servicenotification',
+            name='total_messages',
+            field=models.PositiveIntegerField(default=0, verbose_name='Messages à envoyer'),
+        ),
+        migrations.AddField(
+            model_name='servicenotification',
+            name='sent_messages',
+            field=models.PositiveIntegerField(default=0, verbose_name='Messages envoyés'),
+        ),
+        migrations.AddField(
+            model_name='servicenotification',
+            name='failed_messages',
+            field=models.PositiveIntegerField(default=0, verbose_name='Messages en échec'),
+        ),
+        migrations.AlterField(
+            model_name='servicenotification',
+            name='status',
+            field=models.CharField(choices=[('pending', 'En attente'), ('sending', "En cours d'envoi"), ('sent', 'Envoyé'), ('failed', 'Échec'), ('cancelled', 'Annulé')], default='pending', max_length=15, verbose_name='Statut'),
+        ),
+    ]
@@ -703,14 +703,20 @@ class ScheduledService(models.Model):
             }
         )
     
-    def send_notifications(self):
-        """Envoie les notifications à tous les participants."""
-        from django.utils import timezone
-        from apps.communication.notification_service import NotificationService
+    def build_notification_messages(self, participants=None):
+        """
+        Construit les messages de tous les participants, groupés par canal
+        (cf. apps.worship.notifications).
+        
+        Args:
+            participants: Résultat de get_all_participants (recalculé si absent)
+        """
+        from . import notifications
         
-        participants = self.get_all_participants()
-        notification_service = NotificationService()
+        if participants is None:
+            participants = self.get_all_participants()
         
+        messages = notifications.empty_channels()
         for p in participants:
             member = p['member']
             role = p['role']
@@ -728,26 +734,33 @@ Merci de confirmer votre disponibilité.
 Fraternellement,
 {self.schedule.site.name}"""
             
-            # Email
-            if self.schedule.notify_by_email and member.email:
-                notification_service.send_email(
-                    to_email=member.email,
-                    subject=f"Programme culte du {self.date.strftime('%d/%m/%Y')} - {role}",
-                    message=message
-                )
-            
-            # SMS
-            if self.schedule.notify_by_sms and member.phone:
-                short_msg = f"Culte {self.date.strftime('%d/%m')}: vous êtes {role}. Confirmez SVP."
-                notification_service.send_sms(member.phone, short_msg)
-            
-            # WhatsApp
-            if self.schedule.notify_by_whatsapp and member.whatsapp_number:
-                notification_service.send_whatsapp(member.whatsapp_number, message)
+            notifications.merge_channels(messages, notifications.participant_messages(
+                member,
+                self.schedule,
+                subject=f"Programme culte du {self.date.strftime('%d/%m/%Y')} - {role}",
+                text=message,
+                sms_text=f"Culte {self.date.strftime('%d/%m')}: vous êtes {role}. Confirmez SVP.",
+            ))
+        
+        return messages
+    
+    def send_notifications(self):
+        """
+        Envoie immédiatement les notifications à tous les participants.
+        
+        Les envois depuis l'interface passent par la tâche Celery
+        tasks.send_schedule_notifications (lots par canal).
+        """
+        from django.utils import timezone
+        from .notifications import send_now
+        
+        sent, failed, error = send_now(self.build_notification_messages())
+        if failed and not sent:
+            raise RuntimeError(error or "Aucune notification n'a pu être envoyée")
         
         self.notifications_sent = True
         self.notifications_sent_at = timezone.now()
-        self.save()
+        self.save(update_fields=['notifications_sent', 'notifications_sent_at'])
 
 
 class ServiceNotification(models.Model):
@@ -759,6 +772,7 @@ class ServiceNotification(models.Model):
     
     class Status(models.TextChoices):
         PENDING = 'pending', 'En attente'
+        SENDING = 'sending', 'En cours d\'envoi'
         SENT = 'sent', 'Envoyé'
         FAILED = 'failed', 'Échec'
         CANCELLED = 'cancelled', 'Annulé'
@@ -786,6 +800,12 @@ class ServiceNotification(models.Model):
     sent_at = models.DateTimeField(null=True, blank=True)
     error_message = models.TextField(blank=True)
     
+    # Progression de l'envoi par lots (cf. tasks.send_schedule_notifications)
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Envoi démarré le")
+    total_messages = models.PositiveIntegerField(default=0, verbose_name="Messages à envoyer")
+    sent_messages = models.PositiveIntegerField(default=0, verbose_name="Messages envoyés")
+    failed_messages = models.PositiveIntegerField(default=0, verbose_name="Messages en échec")
+    
     class Meta:
         verbose_name = "Notification de culte"
         verbose_name_plural = "Notifications de culte"
@@ -794,6 +814,13 @@ class ServiceNotification(models.Model):
     def __str__(self):
         return f"Notification pour {self.scheduled_service}"
     
+    @property
+    def progress_percentage(self):
+        if not self.total_messages:
+            return 100 if self.status == self.Status.SENT else 0
+        done = self.sent_messages + self.failed_messages
+        return min(100, round(done / self.total_messages * 100))
+    
     def send(self):
         """Envoie la notification."""
         from django.utils import timezone
@@ -1022,10 +1049,12 @@ class RoleAssignment(models.Model):
         
         service.save()
     
-    def send_notification(self, base_url=''):
-        """Envoie la notification avec les liens de confirmation."""
-        from django.utils import timezone
-        from apps.communication.notification_service import NotificationService
+    def build_notification_messages(self, base_url=''):
+        """
+        Construit les messages de confirmation, groupés par canal
+        (cf. apps.worship.notifications).
+        """
+        from .notifications import participant_messages
         
         schedule = self.scheduled_service.schedule
         service = self.scheduled_service
@@ -1051,25 +1080,27 @@ Merci de confirmer votre disponibilité :
 Fraternellement,
 {schedule.site.name}"""
         
-        notification_service = NotificationService()
-        
-        # Email
+        html_message = None
         if schedule.notify_by_email and self.member.email:
-            notification_service.send_email(
-                to_email=self.member.email,
-                subject=f"🙏 Confirmation requise - {self.get_role_display()} du {service.date.strftime('%d/%m')}",
-                message=message,
-                html_message=self._get_html_notification(confirm_url, decline_url)
-            )
+            html_message = self._get_html_notification(confirm_url, decline_url)
         
-        # SMS
-        if schedule.notify_by_sms and self.member.phone:
-            sms_msg = f"Culte {service.date.strftime('%d/%m')}: {self.get_role_display()}. Confirmez: {confirm_url}"
-            notification_service.send_sms(self.member.phone, sms_msg)
+        return participant_messages(
+            self.member,
+            schedule,
+            subject=f"🙏 Confirmation requise - {self.get_role_display()} du {service.date.strftime('%d/%m')}",
+            text=message,
+            sms_text=f"Culte {service.date.strftime('%d/%m')}: {self.get_role_display()}. Confirmez: {confirm_url}",
+            html=html_message,
+        )
+    
+    def send_notification(self, base_url=''):
+        """Envoie immédiatement la notification avec les liens de confirmation."""
+        from django.utils import timezone
+        from .notifications import send_now
         
-        # WhatsApp
-        if schedule.notify_by_whatsapp and self.member.whatsapp_number:
-            notification_service.send_whatsapp(self.member.whatsapp_number, message)
+        sent, failed, error = send_now(self.build_notification_messages(base_url))
+        if failed and not sent:
+            raise RuntimeError(error or "La notification n'a pas pu être envoyée")
         
         self.notified_at = timezone.now()
         self.save(update_fields=['notified_at'])
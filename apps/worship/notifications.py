@@ -0,0 +1,135 @@
+"""
+Notifications des plannings de culte - envoi groupé par canal.
+
+Les messages sont construits une fois (ScheduledService /
+RoleAssignment.build_notification_messages), regroupés par canal
+(email, SMS, WhatsApp), puis envoyés par lots depuis des tâches Celery
+(cf. tasks.send_schedule_notifications). Chaque message est un
+dictionnaire sérialisable :
+
+    {'to': adresse ou numéro, 'name': nom, 'subject': sujet (email),
+     'text': texte, 'html': HTML (email, optionnel),
+     'assignment_id': RoleAssignment (demandes de confirmation, optionnel)}
+"""
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+from django.utils.html import linebreaks
+
+logger = logging.getLogger(__name__)
+
+EMAIL = 'email'
+SMS = 'sms'
+WHATSAPP = 'whatsapp'
+CHANNELS = (EMAIL, SMS, WHATSAPP)
+
+
+def empty_channels() -> Dict[str, List[dict]]:
+    return {channel: [] for channel in CHANNELS}
+
+
+def merge_channels(target: Dict[str, List[dict]], messages: Dict[str, List[dict]]) -> Dict[str, List[dict]]:
+    """Ajoute les messages d'un participant aux listes par canal."""
+    for channel, channel_messages in messages.items():
+        target[channel].extend(channel_messages)
+    return target
+
+
+def participant_messages(member, schedule, subject, text, sms_text, html=None) -> Dict[str, List[dict]]:
+    """
+    Messages d'un participant selon les canaux activés sur le planning.
+
+    Args:
+        member: Instance de Member
+        schedule: Instance de MonthlySchedule (notify_by_*)
+        subject: Sujet de l'email
+        text: Message complet (email texte et WhatsApp)
+        sms_text: Message court (SMS)
+        html: Contenu HTML de l'email (généré depuis le texte par défaut)
+    """
+    messages = empty_channels()
+    name = member.full_name
+
+    if schedule.notify_by_email and member.email:
+        messages[EMAIL].append({
+            'to': member.email,
+            'name': name,
+            'subject': subject,
+            'text': text,
+            'html': html or linebreaks(text, autoescape=True),
+        })
+
+    if schedule.notify_by_sms and member.phone:
+        messages[SMS].append({'to': member.phone, 'name': name, 'text': sms_text})
+
+    if schedule.notify_by_whatsapp and member.whatsapp_number:
+        messages[WHATSAPP].append({'to': member.whatsapp_number, 'name': name, 'text': text})
+
+    return messages
+
+
+def batches(messages: List[dict], size: int) -> Iterable[List[dict]]:
+    for start in range(0, len(messages), size):
+        yield messages[start:start + size]
+
+
+def send_batch(channel: str, messages: List[dict]) -> Tuple[int, List[dict], str]:
+    """
+    Envoie un lot de messages d'un même canal.
+
+    Les emails partent sur une seule connexion SMTP (BulkEmailSender) ;
+    SMS et WhatsApp passent par le client Twilio de NotificationService.
+
+    Returns:
+        tuple (envoyés, messages en échec, dernière erreur)
+    """
+    if channel == EMAIL:
+        from apps.communication.models import EmailLog
+        from apps.core.infrastructure.bulk_email import BulkEmailSender
+
+        logs = BulkEmailSender.send_rendered(
+            (
+                (message['to'], message['name'], message['subject'], message['html'], message['text'])
+                for message in messages
+            ),
+            label=messages[0]['subject'] if messages else '',
+        )
+        failed = [
+            (message, log) for message, log in zip(messages, logs)
+            if log.status == EmailLog.Status.FAILED
+        ]
+        error = failed[-1][1].error_message if failed else ''
+        return len(logs) - len(failed), [message for message, _log in failed], error
+
+    from apps.communication.notification_service import NotificationService
+
+    service = NotificationService()
+    send = service._send_sms if channel == SMS else service._send_whatsapp
+    recipient_key = 'phone' if channel == SMS else 'whatsapp'
+
+    sent, failed, error = 0, [], ''
+    for message in messages:
+        try:
+            result = send({recipient_key: message['to'], 'name': message['name']}, message['text'])
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        if result.get('success'):
+            sent += 1
+        else:
+            failed.append(message)
+            error = result.get('error', '')
+            logger.warning(f"Échec {channel} vers {message['to']}: {error}")
+    return sent, failed, error
+
+
+def send_now(messages: Dict[str, List[dict]]) -> Tuple[int, int, str]:
+    """Envoie immédiatement tous les messages (chemin synchrone)."""
+    sent, failed, error = 0, 0, ''
+    for channel, channel_messages in messages.items():
+        if not channel_messages:
+            continue
+        batch_sent, batch_failed, batch_error = send_batch(channel, channel_messages)
+        sent += batch_sent
+        failed += len(batch_failed)
+        error = batch_error or error
+    return sent, failed, error
@@ -3,9 +3,280 @@ Tâches Celery pour le module Worship.
 
 Gère l'envoi automatique des notifications aux participants des cultes.
 """
-from celery import shared_task
+from celery import group, shared_task
+from django.conf import settings
+from django.db.models import Case, F, Q, Value, When
 from django.utils import timezone
-from datetime import date
+from datetime import date, timedelta
+
+from . import notifications
+
+
+# =============================================================================
+# ENVOI PAR LOTS (un type de tâche par canal pour des limites de débit distinctes)
+# =============================================================================
+
+RATE_UNITS = ('s', 'm', 'h')
+
+
+def _channel_rate(channel):
+    """
+    Limite de débit configurée pour un canal, en messages
+    (WORSHIP_<CANAL>_RATE_LIMIT, format Celery "20/m").
+
+    Returns:
+        tuple (nombre de messages, unité), ou None sans limite
+    """
+    value = getattr(settings, f'WORSHIP_{channel.upper()}_RATE_LIMIT', None)
+    if not value:
+        return None
+    count, _, unit = str(value).partition('/')
+    return float(count), unit if unit in RATE_UNITS else 's'
+
+
+def _channel_batch_size(channel):
+    """Taille des lots d'un canal, bornée par sa limite de débit."""
+    batch_size = getattr(settings, 'WORSHIP_NOTIFICATION_BATCH_SIZE', 25)
+    rate = _channel_rate(channel)
+    if rate is not None:
+        batch_size = min(batch_size, int(rate[0]))
+    return max(1, batch_size)
+
+
+def _task_rate_limit(channel):
+    """
+    Limite de débit Celery des tâches d'un canal : Celery limite les
+    exécutions de tâches, chacune envoyant un lot de messages ; la limite
+    en messages est donc divisée par la taille des lots.
+    """
+    rate = _channel_rate(channel)
+    if rate is None:
+        return None
+    count, unit = rate
+    return f"{count / _channel_batch_size(channel):g}/{unit}"
+
+
+def _send_channel_batch(channel, messages, notification_id=None):
+    try:
+        sent, failed, error = notifications.send_batch(channel, messages)
+    except Exception as e:
+        sent, failed, error = 0, messages, str(e)
+    if notification_id is not None:
+        _record_progress(notification_id, sent, len(failed), error)
+    _release_failed_assignments(failed)
+    return {'channel': channel, 'sent': sent, 'failed': len(failed)}
+
+
+def _release_failed_assignments(failed):
+    """
+    Remet en attente d'envoi (notified_at vide) les demandes de
+    confirmation dont un message a échoué : un nouvel envoi les reprendra.
+    """
+    assignment_ids = {message['assignment_id'] for message in failed if message.get('assignment_id')}
+    if not assignment_ids:
+        return
+    
+    from apps.worship.models import RoleAssignment
+    
+    RoleAssignment.objects.filter(pk__in=assignment_ids).update(notified_at=None)
+
+
+@shared_task(rate_limit=_task_rate_limit(notifications.EMAIL))
+def send_worship_email_batch(messages, notification_id=None):
+    """Envoie un lot d'emails de planning (une connexion SMTP)."""
+    return _send_channel_batch(notifications.EMAIL, messages, notification_id)
+
+
+@shared_task(rate_limit=_task_rate_limit(notifications.SMS))
+def send_worship_sms_batch(messages, notification_id=None):
+    """Envoie un lot de SMS de planning."""
+    return _send_channel_batch(notifications.SMS, messages, notification_id)
+
+
+@shared_task(rate_limit=_task_rate_limit(notifications.WHATSAPP))
+def send_worship_whatsapp_batch(messages, notification_id=None):
+    """Envoie un lot de messages WhatsApp de planning."""
+    return _send_channel_batch(notifications.WHATSAPP, messages, notification_id)
+
+
+CHANNEL_TASKS = {
+    notifications.EMAIL: send_worship_email_batch,
+    notifications.SMS: send_worship_sms_batch,
+    notifications.WHATSAPP: send_worship_whatsapp_batch,
+}
+
+
+def _batch_signatures(messages, notification_id=None):
+    """Signatures des tâches d'envoi, par canal et par lot."""
+    return [
+        CHANNEL_TASKS[channel].s(batch, notification_id)
+        for channel, channel_messages in messages.items()
+        for batch in notifications.batches(channel_messages, _channel_batch_size(channel))
+    ]
+
+
+def _record_progress(notification_id, sent, failed, error=''):
+    """Ajoute le résultat d'un lot aux compteurs (mises à jour atomiques)."""
+    from apps.worship.models import ServiceNotification
+    
+    updates = {
+        'sent_messages': F('sent_messages') + sent,
+        'failed_messages': F('failed_messages') + failed,
+    }
+    if error:
+        updates['error_message'] = error
+    ServiceNotification.objects.filter(pk=notification_id).update(**updates)
+    _finalize_notification(notification_id)
+
+
+def _finalize_notification(notification_id):
+    """
+    Clôture la notification lorsque tous les lots ont été traités
+    (le dernier lot terminé l'emporte, mise à jour conditionnelle).
+    """
+    from apps.worship.models import ScheduledService, ServiceNotification
+    
+    now = timezone.now()
+    finished = ServiceNotification.objects.filter(
+        pk=notification_id,
+        status=ServiceNotification.Status.SENDING,
+        total_messages__lte=F('sent_messages') + F('failed_messages'),
+    ).update(
+        status=Case(
+            When(total_messages__gt=0, sent_messages=0, then=Value(ServiceNotification.Status.FAILED)),
+            default=Value(ServiceNotification.Status.SENT),
+        ),
+        sent_at=now,
+    )
+    if finished:
+        ScheduledService.objects.filter(notification__pk=notification_id).update(
+            notifications_sent=True,
+            notifications_sent_at=now,
+        )
+
+
+def _claim_notification(service, total):
+    """
+    Passe la notification d'un culte à « en cours d'envoi ».
+    
+    Returns:
+        ServiceNotification, ou None si un envoi est déjà en cours
+        (un envoi bloqué depuis plus d'une heure peut être relancé)
+    """
+    from apps.worship.models import ServiceNotification
+    
+    schedule = service.schedule
+    notification, _created = ServiceNotification.objects.get_or_create(
+        scheduled_service=service,
+        defaults={
+            'scheduled_date': timezone.localdate(),
+            'notify_email': schedule.notify_by_email,
+            'notify_sms': schedule.notify_by_sms,
+            'notify_whatsapp': schedule.notify_by_whatsapp,
+        }
+    )
+    
+    now = timezone.now()
+    claimed = ServiceNotification.objects.filter(pk=notification.pk).exclude(
+        Q(status=ServiceNotification.Status.CANCELLED)
+        | Q(status=ServiceNotification.Status.SENDING, started_at__gte=now - timedelta(hours=1))
+    ).update(
+        status=ServiceNotification.Status.SENDING,
+        started_at=now,
+        total_messages=total,
+        sent_messages=0,
+        failed_messages=0,
+        error_message='',
+    )
+    return notification if claimed else None
+
+
+@shared_task
+def send_schedule_notifications(schedule_id=None, service_ids=None):
+    """
+    Notifie les participants des cultes non encore notifiés.
+    
+    Les participants de tous les cultes sont résolus en trois requêtes
+    (select_related des rôles, prefetch des choristes et musiciens), les
+    messages sont groupés par canal puis envoyés en parallèle par lots
+    (group Celery), avec une limite de débit par canal. La progression est
+    enregistrée sur chaque ServiceNotification.
+    
+    Args:
+        schedule_id: Limiter à un planning mensuel
+        service_ids: Limiter à des cultes précis
+    """
+    from apps.worship.models import ScheduledService
+    
+    services = ScheduledService.objects.filter(notifications_sent=False)
+    if schedule_id is not None:
+        services = services.filter(schedule_id=schedule_id)
+    if service_ids is not None:
+        services = services.filter(pk__in=service_ids)
+    services = services.select_related(
+        'schedule__site', 'preacher', 'worship_leader',
+        'choir_leader', 'sound_tech', 'projection'
+    ).prefetch_related('singers', 'musicians')
+    
+    signatures = []
+    claimed = 0
+    for service in services:
+        messages = service.build_notification_messages()
+        total = sum(len(channel_messages) for channel_messages in messages.values())
+        
+        notification = _claim_notification(service, total)
+        if notification is None:
+            continue
+        claimed += 1
+        
+        if total:
+            signatures.extend(_batch_signatures(messages, notification.pk))
+        else:
+            _finalize_notification(notification.pk)
+    
+    if signatures:
+        group(signatures).apply_async()
+    
+    return {'services': claimed, 'batches': len(signatures)}
+
+
+@shared_task
+def send_role_assignment_notifications(service_id, base_url=''):
+    """
+    Envoie les demandes de confirmation en attente d'un culte, par lots
+    et par canal (cf. send_schedule_notifications).
+    """
+    from apps.worship.models import RoleAssignment
+    
+    assignments = list(RoleAssignment.objects.filter(
+        scheduled_service_id=service_id,
+        status=RoleAssignment.Status.PENDING,
+        notified_at__isnull=True,
+    ).select_related('member', 'scheduled_service__schedule__site'))
+    
+    if not assignments:
+        return {'assignments': 0, 'batches': 0}
+    
+    # Marquer avant l'envoi : un second clic ne renvoie pas les mêmes demandes.
+    # Les demandes dont un message échoue sont remises en attente par le lot
+    # (cf. _release_failed_assignments).
+    RoleAssignment.objects.filter(
+        pk__in=[assignment.pk for assignment in assignments]
+    ).update(notified_at=timezone.now())
+    
+    messages = notifications.empty_channels()
+    for assignment in assignments:
+        assignment_messages = assignment.build_notification_messages(base_url)
+        for channel_messages in assignment_messages.values():
+            for message in channel_messages:
+                message['assignment_id'] = assignment.pk
+        notifications.merge_channels(messages, assignment_messages)
+    
+    signatures = _batch_signatures(messages)
+    if signatures:
+        group(signatures).apply_async()
+    
+    return {'assignments': len(assignments), 'batches': len(signatures)}
 
 
 @shared_task
@@ -21,30 +292,19 @@ def send_scheduled_notifications():
     
     today = date.today()
     
-    notifications = ServiceNotification.objects.filter(
-        status='pending',
+    service_ids = list(ServiceNotification.objects.filter(
+        status=ServiceNotification.Status.PENDING,
         scheduled_date__lte=today
-    )
+    ).values_list('scheduled_service_id', flat=True))
     
-    sent_count = 0
-    error_count = 0
-    
-    for notification in notifications:
-        try:
-            notification.send()
-            if notification.status == 'sent':
-                sent_count += 1
-            else:
-                error_count += 1
-        except Exception as e:
-            notification.status = 'failed'
-            notification.error_message = str(e)
-            notification.save()
-            error_count += 1
+    # Envoi par lots et par canal (cf. send_schedule_notifications)
+    result = send_schedule_notifications(service_ids=service_ids) if service_ids else {
+        'services': 0, 'batches': 0
+    }
     
     return {
-        'sent': sent_count,
-        'errors': error_count,
+        'services': result['services'],
+        'batches': result['batches'],
         'date': str(today)
     }
 
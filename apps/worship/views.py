@@ -211,18 +211,14 @@ def run_sheet_pdf(request, pk):
         pk=pk
     )
     
-    # Utiliser WeasyPrint pour générer le PDF
-    from django.template.loader import get_template
-    from weasyprint import HTML
+    # Générer le PDF avec le moteur WeasyPrint partagé
+    from apps.core import pdf_engine
     
-    template = get_template('worship/pdf/run_sheet.html')
-    html_content = template.render({
+    pdf = pdf_engine.render_template('worship/pdf/run_sheet.html', {
         'service': service,
         'roles': service.roles.filter(status='confirme'),
         'plan_items': service.plan_items.all().order_by('order', 'start_time'),
-    })
-    
-    pdf = HTML(string=html_content).write_pdf()
+    }, name='run_sheet')
     
     response = HttpResponse(pdf, content_type='application/pdf')
     filename = f"run_sheet_{service.event.start_date.strftime('%Y%m%d')}.pdf"
@@ -420,19 +416,21 @@ def publish_schedule(request, pk):
 @login_required
 @role_required('admin', 'responsable_groupe')
 def send_notifications(request, pk):
-    """Envoie les notifications pour tous les cultes."""
-    schedule = get_object_or_404(MonthlySchedule, pk=pk)
+    """
+    Lance l'envoi des notifications pour tous les cultes du planning.
     
-    sent = 0
-    for service in schedule.services.filter(notifications_sent=False):
-        try:
-            service.send_notifications()
-            sent += 1
-        except Exception as e:
-            messages.error(request, f"Erreur pour {service}: {e}")
+    L'envoi se fait en tâche Celery (tasks.send_schedule_notifications) ;
+    la progression est visible sur chaque ServiceNotification.
+    """
+    from django.db import transaction as db_transaction
+    from .tasks import send_schedule_notifications
+    
+    schedule = get_object_or_404(MonthlySchedule, pk=pk)
     
-    if sent:
-        messages.success(request, f"Notifications envoyées pour {sent} culte(s)")
+    pending = schedule.services.filter(notifications_sent=False).count()
+    if pending:
+        db_transaction.on_commit(lambda: send_schedule_notifications.delay(schedule.pk))
+        messages.success(request, f"Envoi des notifications lancé pour {pending} culte(s)")
     else:
         messages.info(request, "Aucune notification à envoyer")
     
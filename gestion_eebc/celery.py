@@ -34,6 +34,12 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour=7, minute=0),
     },
     
+    # Prolonger les occurrences des événements récurrents (avant les rappels)
+    'extend-event-occurrences': {
+        'task': 'apps.events.tasks.extend_event_occurrences',
+        'schedule': crontab(hour=6, minute=30),
+    },
+    
     # =========================================================================
     # NOTIFICATIONS MEMBRES
     # =========================================================================
@@ -50,6 +56,12 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour=9, minute=0, day_of_week=1),
     },
     
+    # Géocodage des adresses modifiées toutes les 15 minutes
+    'geocode-pending-addresses': {
+        'task': 'apps.members.tasks.geocode_pending_addresses',
+        'schedule': crontab(minute='*/15'),
+    },
+    
     # =========================================================================
     # WORSHIP - PLANIFICATION DES CULTES
     # =========================================================================
@@ -86,6 +98,30 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour=3, minute=0, day_of_month=1),
     },
     
+    # Réconciliation des montants collectés des campagnes tous les jours à 4h
+    'reconcile-campaign-totals': {
+        'task': 'apps.campaigns.tasks.reconcile_campaign_totals',
+        'schedule': crontab(hour=4, minute=0),
+    },
+    
+    # Relance des imports Excel interrompus toutes les 10 minutes
+    'resume-stalled-imports': {
+        'task': 'apps.imports.tasks.resume_stalled_imports',
+        'schedule': crontab(minute='*/10'),
+    },
+    
+    # Suppression des exports expirés toutes les heures
+    'cleanup-expired-export-jobs': {
+        'task': 'apps.core.tasks.cleanup_expired_export_jobs',
+        'schedule': crontab(minute=30),
+    },
+    
+    # Report des compteurs de vues des articles toutes les 5 minutes
+    'flush-article-view-counts': {
+        'task': 'apps.core.tasks.flush_article_view_counts',
+        'schedule': crontab(minute='*/5'),
+    },
+    
     # =========================================================================
     # BACKUP AUTOMATIQUE
     # =========================================================================
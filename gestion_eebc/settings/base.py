@@ -166,6 +166,25 @@ MEMBER_VISIT_THRESHOLD_DAYS = int(os.environ.get('MEMBER_VISIT_THRESHOLD_DAYS',
 RECURRING_ABSENCE_THRESHOLD = int(os.environ.get('RECURRING_ABSENCE_THRESHOLD', 3))
 ROLE_ASSIGNMENT_EXPIRY_HOURS = int(os.environ.get('ROLE_ASSIGNMENT_EXPIRY_HOURS', 48))
 
+# Notifications des plannings de culte : taille des lots et limite de débit
+# par canal, en messages par worker (format Celery : "30/m"). Les lots sont
+# bornés par la limite et la limite des tâches en est déduite.
+WORSHIP_NOTIFICATION_BATCH_SIZE = int(os.environ.get('WORSHIP_NOTIFICATION_BATCH_SIZE', 25))
+WORSHIP_EMAIL_RATE_LIMIT = os.environ.get('WORSHIP_EMAIL_RATE_LIMIT', '30/m')
+WORSHIP_SMS_RATE_LIMIT = os.environ.get('WORSHIP_SMS_RATE_LIMIT', '20/m')
+WORSHIP_WHATSAPP_RATE_LIMIT = os.environ.get('WORSHIP_WHATSAPP_RATE_LIMIT', '20/m')
+
+# OCR des justificatifs : dimension maximale des images avant OCR (pixels)
+# et pool de processus pour les workers multi-threads (0 = désactivé)
+OCR_MAX_IMAGE_DIMENSION = int(os.environ.get('OCR_MAX_IMAGE_DIMENSION', 2000))
+OCR_PROCESS_POOL_SIZE = int(os.environ.get('OCR_PROCESS_POOL_SIZE', 0))
+
+# Reçus fiscaux : nombre de reçus (PDF + email) par tâche lors de l'envoi annuel
+TAX_RECEIPT_BATCH_SIZE = int(os.environ.get('TAX_RECEIPT_BATCH_SIZE', 20))
+
+# Rendu PDF en lot : nombre de processus (0 = un par cœur)
+PDF_RENDER_WORKERS = int(os.environ.get('PDF_RENDER_WORKERS', 0))
+
 # Validation des données
 ALLOWED_EMAIL_DOMAINS = os.environ.get('ALLOWED_EMAIL_DOMAINS', '').split(',') if os.environ.get('ALLOWED_EMAIL_DOMAINS') else None
 MAX_FINANCIAL_AMOUNT = float(os.environ.get('MAX_FINANCIAL_AMOUNT', 1000000))  # 1M€
@@ -174,6 +193,46 @@ MAX_FINANCIAL_AMOUNT = float(os.environ.get('MAX_FINANCIAL_AMOUNT', 1000000))  #
 DEFAULT_NOTIFICATION_DAYS_BEFORE = int(os.environ.get('DEFAULT_NOTIFICATION_DAYS_BEFORE', 4))
 DEFAULT_NOTIFICATION_DAY = int(os.environ.get('DEFAULT_NOTIFICATION_DAY', 3))  # Mercredi
 
+# Événements récurrents : occurrences matérialisées jusqu'à J+N
+# (cf. apps.events.recurrence)
+EVENT_OCCURRENCE_HORIZON_DAYS = int(os.environ.get('EVENT_OCCURRENCE_HORIZON_DAYS', 400))
+
+# Géocodage des adresses (Nominatim : 1 requête/seconde)
+GEOCODING_BATCH_SIZE = int(os.environ.get('GEOCODING_BATCH_SIZE', 50))
+GEOCODING_DELAY = float(os.environ.get('GEOCODING_DELAY', 1.0))
+
+# Journal d'audit : écriture groupée en fin de requête/tâche
+AUDIT_LOG_BUFFER_SIZE = int(os.environ.get('AUDIT_LOG_BUFFER_SIZE', 500))
+AUDIT_LOG_ASYNC = os.environ.get('AUDIT_LOG_ASYNC', 'False').lower() in ('true', '1', 'yes')
+
+# Exports en tâche de fond (durée de conservation des fichiers, nombre
+# d'enregistrements au-delà duquel un export passe en tâche de fond)
+EXPORT_JOB_EXPIRY_HOURS = int(os.environ.get('EXPORT_JOB_EXPIRY_HOURS', 24))
+EXPORT_ASYNC_THRESHOLD = int(os.environ.get('EXPORT_ASYNC_THRESHOLD', 1000))
+
+# Imports Excel en tâche Celery (taille des lots validés, imports simultanés
+# par utilisateur, délai sans point de contrôle avant reprise)
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 100))
+IMPORT_MAX_CONCURRENT_PER_USER = int(os.environ.get('IMPORT_MAX_CONCURRENT_PER_USER', 1))
+IMPORT_STALL_MINUTES = int(os.environ.get('IMPORT_STALL_MINUTES', 15))
+
+# Cache applicatif (cf. apps.core.cache) : durée par défaut, durée max du
+# verrou anti-stampede, modèles dont les écritures n'invalident aucun tag
+CACHE_DEFAULT_TIMEOUT = int(os.environ.get('CACHE_DEFAULT_TIMEOUT', 300))
+CACHE_STAMPEDE_LOCK_TIMEOUT = int(os.environ.get('CACHE_STAMPEDE_LOCK_TIMEOUT', 30))
+# Site public : durée de vie max des pages et fragments en cache (secondes)
+PUBLIC_PAGE_CACHE_TIMEOUT = int(os.environ.get('PUBLIC_PAGE_CACHE_TIMEOUT', 600))
+# Vues d'articles : fenêtre pendant laquelle un même visiteur n'est compté
+# qu'une fois (secondes, 0 = pas de déduplication)
+ARTICLE_VIEW_DEDUPE_SECONDS = int(os.environ.get('ARTICLE_VIEW_DEDUPE_SECONDS', 1800))
+CACHE_UNTAGGED_MODELS = (
+    'core.AuditLog',
+    'core.ExportJob',
+    'communication.EmailLog',
+    'communication.SMSLog',
+    'imports.ImportLog',
+)
+
 # Pagination
 DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', 25))
 MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 100))
@@ -195,6 +254,15 @@ RATE_LIMIT_EXCLUDED_PATHS = [
     '/admin/jsi18n/',
 ]
 
+# Stricter limits per path prefix: {prefix: (requests, window in seconds)}.
+# Counted separately from the global limit and applied to admins too.
+RATE_LIMIT_PATH_LIMITS = {
+    '/app/accounts/login/': (10, 60),
+    '/don/creer-session/': (10, 60),
+    '/contact/': (10, 60),
+    '/inscription/': (10, 60),
+}
+
 
 # =============================================================================
 # URLS & WSGI
@@ -323,6 +391,9 @@ HOSTINGER_EMAIL_TIMEOUT = int(os.environ.get('HOSTINGER_EMAIL_TIMEOUT', 30))
 HOSTINGER_EMAIL_MAX_RETRIES = int(os.environ.get('HOSTINGER_EMAIL_MAX_RETRIES', 3))
 HOSTINGER_API_BASE_URL = os.environ.get('HOSTINGER_API_BASE_URL', 'https://developers.hostinger.com')
 
+# Envois en masse : nombre de messages par connexion SMTP (cf. BulkEmailSender)
+EMAIL_BULK_CHUNK_SIZE = int(os.environ.get('EMAIL_BULK_CHUNK_SIZE', 50))
+
 
 # =============================================================================
 # JAZZMIN CONFIGURATION
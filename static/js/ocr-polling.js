@@ -22,6 +22,13 @@ class OCRPoller {
     }
 
     startPollingForExistingReceipts() {
+        // Lot en cours : suivi par le lot plutôt que par justificatif
+        const batchId = new URLSearchParams(window.location.search).get('batch');
+        if (batchId) {
+            this.startBatchPolling(parseInt(batchId));
+            return;
+        }
+
         // Trouver tous les éléments avec statut "en_cours"
         const processingElements = document.querySelectorAll('[data-ocr-status="en_cours"]');
         
@@ -128,6 +135,52 @@ class OCRPoller {
         }
     }
 
+    startBatchPolling(batchId) {
+        // Un seul appel par intervalle pour tout le lot
+        const startTime = Date.now();
+        const intervalId = setInterval(async () => {
+            if (Date.now() - startTime > this.maxPollingTime) {
+                clearInterval(intervalId);
+                return;
+            }
+            try {
+                const response = await fetch(`/finance/api/receipts/batch-ocr-status/?batch=${batchId}`, {
+                    method: 'GET',
+                    headers: {
+                        'X-Requested-With': 'XMLHttpRequest',
+                        'Content-Type': 'application/json',
+                    }
+                });
+
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+
+                const data = await response.json();
+                if (!data.success) {
+                    console.error(`Batch OCR status check failed for batch ${batchId}:`, data.error);
+                    return;
+                }
+
+                Object.entries(data.results).forEach(([receiptId, receiptData]) => {
+                    this.updateOCRStatus(parseInt(receiptId), receiptData);
+                });
+
+                if (data.batch && data.batch.status === 'termine') {
+                    clearInterval(intervalId);
+                    const message = `OCR terminé : ${data.batch.succeeded} succès, ${data.batch.failed} échec(s)`;
+                    if (window.showToast) {
+                        window.showToast(message, data.batch.failed ? 'warning' : 'success');
+                    } else {
+                        console.log(message);
+                    }
+                }
+            } catch (error) {
+                console.error(`Error checking batch OCR status for batch ${batchId}:`, error);
+            }
+        }, this.pollingInterval);
+    }
+
     updateOCRStatus(receiptId, data) {
         const element = document.querySelector(`[data-receipt-id="${receiptId}"]`);
         